@@ -0,0 +1,77 @@
+"""Benchmark ConnectionManager write throughput in both connection modes.
+
+Each write is one ``write_connection()`` block inserting a single row,
+followed by a read through ``get_read_connection()``, which is the pattern
+tools such as add_entities follow. Close-before-write pays a reopen of
+both connections (plus its fixed sleeps) per write; the broker reuses one
+connection.
+
+Usage:
+    python benchmarks/bench_connection_modes.py
+    python benchmarks/bench_connection_modes.py --writes 50 500
+    python benchmarks/bench_connection_modes.py --checkpoint-every 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+from healthsim_agent.tools.connection import (
+    BROKER_MODE,
+    CLOSE_BEFORE_WRITE_MODE,
+    CheckpointPolicy,
+    ConnectionManager,
+)
+
+
+def _writes_per_second(
+    db_path: Path, mode: str, writes: int, policy: CheckpointPolicy
+) -> float:
+    conn = duckdb.connect(str(db_path))
+    conn.execute("CREATE OR REPLACE TABLE bench (id INTEGER, payload VARCHAR)")
+    conn.close()
+
+    manager = ConnectionManager(db_path=db_path, mode=mode, checkpoint_policy=policy)
+    try:
+        start = time.perf_counter()
+        for i in range(writes):
+            with manager.write_connection() as conn:
+                conn.execute("INSERT INTO bench VALUES (?, ?)", [i, "x" * 64])
+            manager.get_read_connection().execute("SELECT COUNT(*) FROM bench").fetchone()
+        return writes / (time.perf_counter() - start)
+    finally:
+        manager.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--writes", type=int, nargs="+", default=[20, 200],
+        help="Write counts to benchmark (close-before-write runs at most 50)",
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=None,
+        help="Broker checkpoint policy: checkpoint after this many writes",
+    )
+    args = parser.parse_args()
+    policy = CheckpointPolicy(every_writes=args.checkpoint_every)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.duckdb"
+        print(f"{'writes':>8} {'close-before-write/s':>21} {'broker/s':>10} {'speedup':>8}")
+        for writes in args.writes:
+            # Close-before-write sleeps 100 ms per write; cap its run length
+            legacy = _writes_per_second(
+                db_path, CLOSE_BEFORE_WRITE_MODE, min(writes, 50), CheckpointPolicy()
+            )
+            broker = _writes_per_second(db_path, BROKER_MODE, writes, policy)
+            print(f"{writes:>8,} {legacy:>21,.1f} {broker:>10,.1f} {broker / legacy:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
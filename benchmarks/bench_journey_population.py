@@ -0,0 +1,76 @@
+"""Benchmark bulk journey execution against the per-entity API.
+
+"per-entity" calls ``create_timeline`` and ``execute_timeline`` for each
+entity; "run_population" compiles the journey once and fills an
+EventTable.
+
+Usage:
+    python benchmarks/bench_journey_population.py
+    python benchmarks/bench_journey_population.py --entities 10000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date
+
+from pydantic import BaseModel
+
+from healthsim_agent.generation import JOURNEY_TEMPLATES, JourneyEngine, JourneySpecification
+
+
+class Patient(BaseModel):
+    patient_id: str
+    age: int
+    gender: str
+
+
+def record_event(entity, event, context):
+    return {"event": event.event_type, "parameters": context["event_parameters"]}
+
+
+def _engine(journey: JourneySpecification) -> JourneyEngine:
+    engine = JourneyEngine(seed=42)
+    for event in journey.events:
+        engine.register_handler(event.product, event.event_type, record_event)
+    return engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=5_000, help="Number of entities")
+    parser.add_argument("--workers", type=int, default=0, help="Also run with a process pool")
+    args = parser.parse_args()
+
+    journey = JourneySpecification.from_dict(JOURNEY_TEMPLATES["diabetic-first-year"])
+    patients = [
+        Patient(patient_id=f"P{i:07d}", age=40 + i % 40, gender="MF"[i % 2])
+        for i in range(args.entities)
+    ]
+    start = date(2025, 1, 1)
+
+    engine = _engine(journey)
+    began = time.perf_counter()
+    events = 0
+    for patient in patients:
+        timeline = engine.create_timeline(patient, "patient", journey, start)
+        events += len(engine.execute_timeline(timeline, patient))
+    per_entity = time.perf_counter() - began
+    print(f"per-entity:     {per_entity:8.2f}s  {events / per_entity:>12,.0f} events/s")
+
+    engine = _engine(journey)
+    began = time.perf_counter()
+    table = engine.run_population(patients, journey, start_date=start)
+    bulk = time.perf_counter() - began
+    print(f"run_population: {bulk:8.2f}s  {len(table) / bulk:>12,.0f} events/s")
+
+    if args.workers > 1:
+        began = time.perf_counter()
+        table = engine.run_population(patients, journey, start_date=start, workers=args.workers)
+        sharded = time.perf_counter() - began
+        print(f"workers={args.workers}:      {sharded:8.2f}s  {len(table) / sharded:>12,.0f} events/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""Benchmark ProfileExecutor throughput against the pre-SamplerPlan code.
+
+The "baseline" column runs the per-entity generation code ProfileExecutor
+used before profiles were compiled (copied into BaselineExecutor below):
+every attribute draw calls model_dump() and create_distribution() on its
+DistributionSpec. Only the seed manager is shared with the current
+executor, so both columns draw from the same per-entity streams.
+
+With numpy installed, the column-at-a-time path (``sample_columns``) is
+reported as well. ``--workers N`` adds sharded process-pool execution.
+
+Usage:
+    python benchmarks/bench_profile_executor.py
+    python benchmarks/bench_profile_executor.py --counts 10000 100000
+    python benchmarks/bench_profile_executor.py --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date
+from typing import Any
+
+from healthsim_agent.generation import (
+    PROFILE_TEMPLATES,
+    ProfileExecutor,
+    ProfileSpecification,
+)
+from healthsim_agent.generation.distributions import (
+    ConditionalDistribution,
+    create_distribution,
+)
+from healthsim_agent.generation.profile import DistributionSpec, DistributionType
+from healthsim_agent.generation.profile_executor import GeneratedEntity
+
+
+class BaselineExecutor(ProfileExecutor):
+    """ProfileExecutor with the pre-SamplerPlan entity generation path."""
+
+    def _generate_entity(self, index: int) -> GeneratedEntity:
+        rng = self.seed_manager.get_entity_rng(index)
+        entity = GeneratedEntity(index=index, seed=self.seed_manager.get_entity_seed(index))
+        if self.profile.demographics:
+            self._baseline_demographics(entity, rng)
+        if self.profile.clinical:
+            self._baseline_clinical(entity, rng)
+        if self.profile.coverage:
+            self._baseline_coverage(entity, rng)
+        return entity
+
+    def _baseline_demographics(self, entity: GeneratedEntity, rng: random.Random) -> None:
+        demo = self.profile.demographics
+        if demo.age:
+            entity.age = self._baseline_sample(demo.age, rng, as_int=True)
+            entity.birth_date = date(
+                date.today().year - entity.age, rng.randint(1, 12), rng.randint(1, 28)
+            )
+        if demo.gender:
+            entity.gender = self._baseline_sample(demo.gender, rng)
+        if demo.race:
+            entity.race = self._baseline_sample(demo.race, rng)
+        if demo.ethnicity:
+            entity.ethnicity = self._baseline_sample(demo.ethnicity, rng)
+        ref = demo.geography or demo.reference
+        if ref:
+            if ref.state:
+                entity.state = ref.state
+            if ref.fips:
+                entity.county_fips = ref.fips
+            elif ref.code:
+                entity.county_fips = ref.code
+
+    def _baseline_clinical(self, entity: GeneratedEntity, rng: random.Random) -> None:
+        clinical = self.profile.clinical
+        if clinical.primary_condition:
+            pc = clinical.primary_condition
+            if rng.random() < pc.prevalence:
+                entity.conditions.append(pc.code)
+        if clinical.severity:
+            entity.severity = self._baseline_sample(clinical.severity, rng)
+            entity.attributes["severity"] = entity.severity
+        for comorbidity in clinical.comorbidities or []:
+            if rng.random() < comorbidity.prevalence:
+                entity.conditions.append(comorbidity.code)
+        if clinical.lab_values:
+            context = {"severity": entity.severity} if entity.severity else {}
+            for lab_name, lab_dist in clinical.lab_values.items():
+                entity.lab_values[lab_name] = self._baseline_sample(lab_dist, rng, context=context)
+
+    def _baseline_coverage(self, entity: GeneratedEntity, rng: random.Random) -> None:
+        coverage = self.profile.coverage
+        entity.coverage_type = coverage.type
+        if coverage.plan_distribution:
+            plans = list(coverage.plan_distribution.keys())
+            weights = list(coverage.plan_distribution.values())
+            entity.plan_type = rng.choices(plans, weights=weights, k=1)[0]
+        elif coverage.plan_type:
+            entity.plan_type = self._baseline_sample(coverage.plan_type, rng)
+
+    def _baseline_sample(
+        self,
+        dist_spec: DistributionSpec,
+        rng: random.Random,
+        as_int: bool = False,
+        context: dict[str, Any] | None = None,
+    ) -> Any:
+        dist = create_distribution(dist_spec.model_dump(exclude_none=True))
+        if dist_spec.type == DistributionType.CONDITIONAL and context:
+            value = ConditionalDistribution(
+                rules=dist_spec.rules or [], default=dist_spec.default
+            ).sample(context, rng)
+        else:
+            value = dist.sample(rng)
+        if dist_spec.min is not None and value < dist_spec.min:
+            value = dist_spec.min
+        if dist_spec.max is not None and value > dist_spec.max:
+            value = dist_spec.max
+        if as_int:
+            value = int(round(value))
+        return value
+
+
+def _profile() -> ProfileSpecification:
+    spec = dict(PROFILE_TEMPLATES["medicare-diabetic"])
+    spec["clinical"] = {
+        **spec["clinical"],
+        "severity": {"type": "categorical", "weights": {"controlled": 0.6, "uncontrolled": 0.4}},
+        "lab_values": {
+            "a1c": {"type": "normal", "mean": 7.5, "std_dev": 1.2, "min": 5.0, "max": 14.0},
+            "ldl": {"type": "normal", "mean": 110, "std_dev": 30, "min": 40},
+        },
+    }
+    return ProfileSpecification.model_validate(spec)
+
+
+def _entities_per_second(executor_cls: type[ProfileExecutor], count: int) -> float:
+    executor = executor_cls(_profile(), seed=42)
+    start = time.perf_counter()
+    for index in range(count):
+        executor._generate_entity(index)
+    return count / (time.perf_counter() - start)
+
+
+def _columns_per_second(count: int) -> float | None:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return None
+    executor = ProfileExecutor(_profile(), seed=42)
+    start = time.perf_counter()
+    executor.sample_columns(count)
+    return count / (time.perf_counter() - start)
+
+
+def _sharded_per_second(count: int, workers: int) -> float:
+    executor = ProfileExecutor(_profile(), seed=42)
+    start = time.perf_counter()
+    executor.execute(count_override=count, workers=workers)
+    return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--counts", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+        help="Entity counts to benchmark",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Also benchmark sharded execution with this many processes",
+    )
+    args = parser.parse_args()
+
+    print(f"{'count':>10} {'baseline/s':>12} {'compiled/s':>12} {'speedup':>8} {'columns/s':>12}")
+    for count in args.counts:
+        before = _entities_per_second(BaselineExecutor, count)
+        after = _entities_per_second(ProfileExecutor, count)
+        columns = _columns_per_second(count)
+        columns_text = f"{columns:>12,.0f}" if columns is not None else f"{'n/a':>12}"
+        print(
+            f"{count:>10,} {before:>12,.0f} {after:>12,.0f} {after / before:>7.1f}x {columns_text}"
+        )
+
+    if args.workers > 1:
+        print(f"\n{'count':>10} {'workers':>8} {'sharded/s':>12}")
+        for count in args.counts:
+            sharded = _sharded_per_second(count, args.workers)
+            print(f"{count:>10,} {args.workers:>8} {sharded:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark assigning real providers to a cohort.
+
+Builds an in-memory network.providers table of synthetic NPPES rows
+spread over a few states, then assigns a provider to every member of a
+cohort. "per-member" runs one NetworkSimResolver.find_providers query
+per member (the old assign_provider_to_patient path); "pool" draws from
+a ProviderPool, which loads each state/taxonomy slice once.
+
+Usage:
+    python benchmarks/bench_provider_pool.py
+    python benchmarks/bench_provider_pool.py --providers 2000000 --members 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import duckdb
+
+from healthsim_agent.generation import NetworkSimResolver, ProviderPool
+
+STATES = ["CA", "TX", "FL", "NY", "PA"]
+CITIES = ["Springfield", "Riverside", "Franklin", "Greenville", "Fairview", "Salem"]
+TAXONOMIES = ["207Q00000X", "207R00000X", "363L00000X", "207RC0000X", "208D00000X"]
+
+
+def _build_providers(conn, count: int) -> None:
+    conn.execute("CREATE SCHEMA network")
+    conn.execute(f"""
+        CREATE TABLE network.providers AS
+        SELECT
+            CAST(1000000000 + i AS VARCHAR) AS npi,
+            '1' AS entity_type_code,
+            'Last' || i AS last_name,
+            'First' || i AS first_name,
+            NULL::VARCHAR AS middle_name,
+            'MD' AS credential,
+            NULL::VARCHAR AS gender,
+            NULL::VARCHAR AS organization_name,
+            list_extract({CITIES}, 1 + i % {len(CITIES)}) AS practice_city,
+            list_extract({STATES}, 1 + (i // 7) % {len(STATES)}) AS practice_state,
+            NULL::VARCHAR AS practice_zip,
+            NULL::VARCHAR AS practice_address_1,
+            NULL::VARCHAR AS practice_address_2,
+            NULL::VARCHAR AS phone,
+            list_extract({TAXONOMIES}, 1 + (i // 3) % {len(TAXONOMIES)}) AS taxonomy_1,
+            NULL::VARCHAR AS taxonomy_2,
+            NULL::VARCHAR AS taxonomy_3
+        FROM range({count}) t(i)
+    """)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--providers", type=int, default=500_000, help="Synthetic NPPES rows")
+    parser.add_argument("--members", type=int, default=50_000, help="Cohort size")
+    parser.add_argument(
+        "--per-member-sample", type=int, default=500,
+        help="Members timed on the per-member path (extrapolated to the cohort)",
+    )
+    args = parser.parse_args()
+
+    conn = duckdb.connect()
+    _build_providers(conn, args.providers)
+    rng = random.Random(42)
+    members = [
+        (rng.choice(STATES), rng.choice(CITIES), rng.choice(TAXONOMIES))
+        for _ in range(args.members)
+    ]
+
+    resolver = NetworkSimResolver(conn)
+    sample = members[:args.per_member_sample]
+    start = time.perf_counter()
+    for state, city, taxonomy in sample:
+        providers = resolver.find_providers(
+            state=state, city=city, taxonomy=taxonomy, limit=100,
+        )
+        rng.choice(providers)
+    per_member = (time.perf_counter() - start) / len(sample)
+
+    pool = ProviderPool(conn)
+    start = time.perf_counter()
+    for state, city, taxonomy in members:
+        pool.draw_provider(state, city=city, taxonomy=taxonomy, rng=rng)
+    pooled = time.perf_counter() - start
+    stats = pool.stats()
+
+    print(f"providers: {args.providers:,}  members: {args.members:,}")
+    print(f"per-member: {per_member * 1000:.2f} ms/member "
+          f"(~{per_member * args.members:.0f} s for the cohort)")
+    print(f"pool:       {pooled:.2f} s total ({stats['loads']} slice loads, "
+          f"{stats['rows']:,} rows in memory)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark skill-reference resolution for journey events.
+
+Collects every ``skill_ref`` event parameter from the skill-aware journey
+templates and resolves them for synthetic members, the way
+ParameterResolver does during a journey. Members vary the entity
+attributes the references use (control status, CKD stage, HF type), so
+context-keyed lookups see several distinct values.
+
+Usage:
+    python benchmarks/bench_skill_resolver.py
+    python benchmarks/bench_skill_resolver.py --members 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from healthsim_agent.generation.skill_journeys import SKILL_AWARE_TEMPLATES
+from healthsim_agent.generation.skill_reference import ParameterResolver, SkillResolver
+
+ENTITY_VALUES = {
+    "control_status": ["controlled", "uncontrolled", "poorly_controlled", "newly_diagnosed"],
+    "ckd_stage": ["stage_2", "stage_3a", "stage_3b", "stage_4"],
+    "hf_type": ["hfref", "hfpef", "hfmref"],
+}
+
+
+def _event_parameters() -> list[dict]:
+    return [
+        event["parameters"]
+        for template in SKILL_AWARE_TEMPLATES.values()
+        for event in template["events"]
+        if "skill_ref" in event.get("parameters", {})
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=1000, help="Members to resolve for")
+    args = parser.parse_args()
+
+    event_parameters = _event_parameters()
+    rng = random.Random(42)
+    members = [
+        {key: rng.choice(values) for key, values in ENTITY_VALUES.items()}
+        for _ in range(args.members)
+    ]
+
+    resolver = ParameterResolver(SkillResolver())
+    start = time.perf_counter()
+    for parameters in event_parameters:
+        resolver.resolve_event_parameters(parameters, members[0])
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for member in members:
+        for parameters in event_parameters:
+            resolver.resolve_event_parameters(parameters, member)
+    elapsed = time.perf_counter() - start
+    resolves = len(members) * len(event_parameters)
+
+    print(f"skill_ref parameters: {len(event_parameters)}")
+    print(f"first member (load + compile): {first * 1000:.1f} ms")
+    print(f"{resolves:,} resolves: {elapsed:.2f} s ({elapsed / resolves * 1e6:.1f} us/resolve)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark SkillRouter.route latency as custom skills are added.
+
+Loads the bundled skills, then registers synthetic skills with five
+random two-word triggers each, and times ``route`` on a fixed message.
+The old per-trigger substring scan grew linearly with the trigger count;
+the automaton should stay flat. The first route after adding skills
+rebuilds the automaton and is reported separately.
+
+Usage:
+    python benchmarks/bench_skill_router.py
+    python benchmarks/bench_skill_router.py --custom-skills 0 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+from pathlib import Path
+
+from healthsim_agent.skills import ParsedSkill, SkillLoader, SkillMetadata, SkillRouter
+
+MESSAGE = (
+    "Generate 50 diabetic patients with heart failure and an ED visit, then create "
+    "837 professional claims for each member and pharmacy fills for metformin."
+)
+
+
+def _add_custom_skills(loader: SkillLoader, count: int, rng: random.Random) -> None:
+    def word() -> str:
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+    for i in range(count):
+        metadata = SkillMetadata.from_frontmatter({
+            "name": f"custom-{i}",
+            "description": "Synthetic benchmark skill",
+            "trigger_phrases": [f"{word()} {word()}" for _ in range(5)],
+        })
+        loader.index.add_skill(ParsedSkill(
+            path=Path(f"custom/custom-{i}.md"),
+            metadata=metadata,
+            markdown_content="",
+            embedded_configs=[],
+        ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--custom-skills", type=int, nargs="+", default=[0, 200, 1000, 2000],
+        help="Numbers of synthetic skills to add on top of the bundled ones",
+    )
+    parser.add_argument("--routes", type=int, default=500, help="Routes timed per size")
+    args = parser.parse_args()
+
+    loader = SkillLoader()
+    router = SkillRouter(loader)
+    print(f"{'triggers':>9} {'rebuild ms':>11} {'us/route':>9}")
+    for count in args.custom_skills:
+        loader.reload()
+        _add_custom_skills(loader, count, random.Random(count))
+
+        start = time.perf_counter()
+        router.route(MESSAGE)
+        rebuild = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.routes):
+            router.route(MESSAGE)
+        per_route = (time.perf_counter() - start) / args.routes
+        triggers = len(loader.index.trigger_map)
+        print(f"{triggers:>9,} {rebuild * 1000:>11.1f} {per_route * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark agent tool dispatch overhead.
+
+Compares looking tools up in the shared registry (what the agent does now)
+with rebuilding the name -> executor mapping on every call (what
+_get_tool_executor used to do: re-run the tool imports and rebuild a dict
+of every tool). Tool names cycle through the agent's definitions, the way a
+long tool-heavy session would.
+
+Usage:
+    python benchmarks/bench_tool_dispatch.py
+    python benchmarks/bench_tool_dispatch.py --calls 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from healthsim_agent.agent import TOOL_DEFINITIONS, _get_tool_executor
+from healthsim_agent.tools.registry import ToolRegistry, _build_specs, get_tool_registry
+
+
+def _rebuild_lookup(name: str):
+    return ToolRegistry(_build_specs()).get_executor(name)
+
+
+def _time(lookup, names: list[str], calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        lookup(names[i % len(names)])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000, help="Tool lookups to time")
+    args = parser.parse_args()
+
+    names = [definition["name"] for definition in TOOL_DEFINITIONS]
+
+    start = time.perf_counter()
+    get_tool_registry().validate(TOOL_DEFINITIONS)
+    first = time.perf_counter() - start
+
+    rebuild_calls = max(1, args.calls // 100)
+    rebuild = _time(_rebuild_lookup, names, rebuild_calls)
+    cached = _time(_get_tool_executor, names, args.calls)
+
+    print(f"tools: {len(names)}")
+    print(f"build + validate: {first * 1000:.1f} ms")
+    print(f"rebuild per call: {rebuild / rebuild_calls * 1e6:.1f} us/lookup ({rebuild_calls:,} calls)")
+    print(f"shared registry:  {cached / args.calls * 1e6:.2f} us/lookup ({args.calls:,} calls)")
+
+
+if __name__ == "__main__":
+    main()
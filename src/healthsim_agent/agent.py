@@ -4,12 +4,16 @@ HealthSim Agent - Core Agent Implementation
 Orchestrates conversation flow, tool execution, and data generation
 with full Claude API tool calling support.
 """
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Callable, Generator
 import json
+import logging
+import threading
+import time
 
 from anthropic import Anthropic
 from anthropic.types import (
@@ -18,6 +22,8 @@ from anthropic.types import (
 
 from healthsim_agent.state.session import SessionState
 
+logger = logging.getLogger(__name__)
+
 
 class AgentMode(Enum):
     """Operating modes for the agent."""
@@ -34,6 +40,22 @@ class AgentConfig:
     debug: bool = False
     db_path: Path | None = None
     skills_path: Path | None = None
+    # Run independent read-only tool calls from one response concurrently.
+    # Needs the default broker connection mode; with
+    # HEALTHSIM_DB_MODE=close_before_write tools always run one at a time
+    parallel_tools: bool = True
+    max_tool_workers: int = 4
+    # Trim old tool results from the history sent to the API once it grows
+    # past this many (estimated) tokens; None sends the full history
+    history_token_budget: int | None = None
+    history_keep_recent: int = 4
+    # Tool results larger than this are stored and replaced by a preview
+    # the model can page with fetch_tool_result; None includes them in full
+    tool_result_max_chars: int | None = 50_000
+    # Mark the tool schema, system prompt and conversation history with
+    # prompt-cache breakpoints; log cache usage after every API call
+    prompt_caching: bool = True
+    log_cache_usage: bool = False
     
     @classmethod
     def from_file(cls, path: Path) -> "AgentConfig":
@@ -181,9 +203,9 @@ TOOL_DEFINITIONS = [
                 "city": {"type": "string"},
                 "state": {"type": "string", "description": "2-letter state code"},
                 "zip_code": {"type": "string"},
-                "name": {"type": "string", "description": "Provider name search"},
                 "limit": {"type": "integer", "default": 50}
-            }
+            },
+            "required": ["state"]
         }
     },
     {
@@ -415,9 +437,9 @@ TOOL_DEFINITIONS = [
         "input_schema": {
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Profile name to load"}
+                "name_or_id": {"type": "string", "description": "Profile name or ID"}
             },
-            "required": ["name"]
+            "required": ["name_or_id"]
         }
     },
     {
@@ -427,7 +449,7 @@ TOOL_DEFINITIONS = [
             "type": "object",
             "properties": {
                 "product": {"type": "string", "description": "Filter by product"},
-                "tags": {"type": "array", "items": {"type": "string"}, "description": "Filter by tags"},
+                "tag": {"type": "string", "description": "Filter by tag"},
                 "limit": {"type": "integer", "default": 50}
             }
         }
@@ -438,9 +460,9 @@ TOOL_DEFINITIONS = [
         "input_schema": {
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Profile name to delete"}
+                "name_or_id": {"type": "string", "description": "Profile name or ID"}
             },
-            "required": ["name"]
+            "required": ["name_or_id"]
         }
     },
     {
@@ -449,12 +471,12 @@ TOOL_DEFINITIONS = [
         "input_schema": {
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Profile name to execute"},
+                "name_or_id": {"type": "string", "description": "Profile name or ID"},
                 "count": {"type": "integer", "description": "Override count"},
                 "seed": {"type": "integer", "description": "Random seed"},
                 "save_to_cohort": {"type": "string", "description": "Cohort to save results to"}
             },
-            "required": ["name"]
+            "required": ["name_or_id"]
         }
     },
     # Journey Tools
@@ -478,9 +500,9 @@ TOOL_DEFINITIONS = [
         "input_schema": {
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Journey name to load"}
+                "name_or_id": {"type": "string", "description": "Journey name or ID"}
             },
-            "required": ["name"]
+            "required": ["name_or_id"]
         }
     },
     {
@@ -490,7 +512,7 @@ TOOL_DEFINITIONS = [
             "type": "object",
             "properties": {
                 "product": {"type": "string", "description": "Filter by product involvement"},
-                "tags": {"type": "array", "items": {"type": "string"}},
+                "tag": {"type": "string", "description": "Filter by tag"},
                 "include_builtin": {"type": "boolean", "default": True},
                 "limit": {"type": "integer", "default": 50}
             }
@@ -502,9 +524,9 @@ TOOL_DEFINITIONS = [
         "input_schema": {
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Journey name to delete"}
+                "name_or_id": {"type": "string", "description": "Journey name or ID"}
             },
-            "required": ["name"]
+            "required": ["name_or_id"]
         }
     },
     {
@@ -513,12 +535,11 @@ TOOL_DEFINITIONS = [
         "input_schema": {
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Journey name to execute"},
+                "name_or_id": {"type": "string", "description": "Journey name or ID"},
                 "seed": {"type": "integer", "description": "Random seed"},
-                "save_to_cohort": {"type": "string"},
-                "step_overrides": {"type": "object", "description": "Override parameters for specific steps"}
+                "save_to_cohort": {"type": "string"}
             },
-            "required": ["name"]
+            "required": ["name_or_id"]
         }
     },
     # Export Tools
@@ -550,6 +571,20 @@ TOOL_DEFINITIONS = [
             "required": ["data"]
         }
     },
+    {
+        "name": "fetch_tool_result",
+        "description": "Page through a tool result that was too large to include in full. Use the handle from the truncated result preview.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Handle from the truncated result"},
+                "offset": {"type": "integer", "default": 0, "description": "First item (row or line) to return"},
+                "limit": {"type": "integer", "default": 50, "description": "Items to return (max 100)"},
+                "path": {"type": "string", "description": "Dotted path of the list or text to page, e.g. 'data.entities.patients' (defaults to the preview's path)"}
+            },
+            "required": ["handle"]
+        }
+    },
     {
         "name": "export_ndjson",
         "description": "Export data to NDJSON (newline-delimited JSON) format.",
@@ -569,85 +604,95 @@ TOOL_DEFINITIONS = [
 # Tool Execution Mapping
 # ============================================================================
 
+def _schedule_tool_calls(tool_names: list[str]) -> list[list[int]]:
+    """Group tool calls into batches that may run concurrently.
+    
+    Runs of consecutive read-only tools (see ToolSpec.read_only) form one
+    batch; each write or unknown tool is a batch of its own, so reads never
+    overtake an earlier write and writes keep their relative order.
+    
+    Returns:
+        Batches of indexes into tool_names, in execution order
+    """
+    from healthsim_agent.tools.registry import get_tool_registry
+    
+    read_only = [get_tool_registry().is_read_only(name) for name in tool_names]
+    batches: list[list[int]] = []
+    for i in range(len(tool_names)):
+        if read_only[i] and i > 0 and read_only[i - 1]:
+            batches[-1].append(i)
+        else:
+            batches.append([i])
+    return batches
+
+
+@dataclass
+class ToolBatchStats:
+    """Timing of the tool calls from one model response."""
+    tool_count: int
+    wall_seconds: float
+    serial_seconds: float  # Sum of the individual tool durations
+    concurrent: bool
+    
+    @property
+    def saved_seconds(self) -> float:
+        """Wall-clock time saved versus running the tools one by one."""
+        return max(0.0, self.serial_seconds - self.wall_seconds)
+
+
+@dataclass
+class PromptCacheStats:
+    """Token usage across API calls, including prompt-cache reads and writes."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_input_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    
+    def record(self, usage: Any) -> None:
+        """Add one response's usage."""
+        self.calls += 1
+        self.input_tokens += getattr(usage, "input_tokens", 0) or 0
+        self.output_tokens += getattr(usage, "output_tokens", 0) or 0
+        self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", 0) or 0
+        self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", 0) or 0
+    
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens read from the cache."""
+        total = self.input_tokens + self.cache_read_input_tokens + self.cache_creation_input_tokens
+        return self.cache_read_input_tokens / total if total else 0.0
+
+
+# Marks the end of a cacheable prompt prefix
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _with_history_breakpoint(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Copy messages with a cache breakpoint on the last content block.
+    
+    Only the last message (and its last block) is copied; the others are
+    shared with the session's serialization cache and must not be modified.
+    """
+    if not messages:
+        return messages
+    last = messages[-1]
+    content = last["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = list(content)
+    if not blocks:
+        return messages
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return [*messages[:-1], {**last, "content": blocks}]
+
+
 def _get_tool_executor(tool_name: str) -> Callable | None:
     """Get the executor function for a tool."""
-    # Import tools lazily to avoid circular imports
-    from healthsim_agent.tools.cohort_tools import (
-        list_cohorts, load_cohort, save_cohort, add_entities, delete_cohort
-    )
-    from healthsim_agent.tools.query_tools import (
-        query, get_summary, list_tables
-    )
-    from healthsim_agent.tools.reference_tools import (
-        query_reference, search_providers
-    )
-    from healthsim_agent.tools.format_tools import (
-        transform_to_fhir, transform_to_ccda, transform_to_hl7v2,
-        transform_to_x12, transform_to_ncpdp, transform_to_mimic, list_output_formats
-    )
-    from healthsim_agent.tools.generation_tools import (
-        generate_patients, generate_members, generate_subjects,
-        generate_rx_members, check_formulary, list_skills, describe_skill
-    )
-    from healthsim_agent.tools.validation_tools import (
-        validate_data, fix_validation_issues
-    )
-    from healthsim_agent.tools.profile_journey_tools import (
-        save_profile, load_profile, list_profiles, delete_profile, execute_profile,
-        save_journey, load_journey, list_journeys, delete_journey, execute_journey
-    )
-    from healthsim_agent.tools.export_tools import (
-        export_json, export_csv, export_ndjson
-    )
-    
-    executors = {
-        "list_cohorts": list_cohorts,
-        "load_cohort": load_cohort,
-        "save_cohort": save_cohort,
-        "add_entities": add_entities,
-        "delete_cohort": delete_cohort,
-        "query": query,
-        "get_summary": get_summary,
-        "list_tables": list_tables,
-        "query_reference": query_reference,
-        "search_providers": search_providers,
-        "transform_to_fhir": transform_to_fhir,
-        "transform_to_ccda": transform_to_ccda,
-        "transform_to_hl7v2": transform_to_hl7v2,
-        "transform_to_x12": transform_to_x12,
-        "transform_to_ncpdp": transform_to_ncpdp,
-        "transform_to_mimic": transform_to_mimic,
-        "list_output_formats": list_output_formats,
-        # Generation tools
-        "generate_patients": generate_patients,
-        "generate_members": generate_members,
-        "generate_subjects": generate_subjects,
-        "generate_rx_members": generate_rx_members,
-        "check_formulary": check_formulary,
-        "list_skills": list_skills,
-        "describe_skill": describe_skill,
-        # Validation tools
-        "validate_data": validate_data,
-        "fix_validation_issues": fix_validation_issues,
-        # Profile tools
-        "save_profile": save_profile,
-        "load_profile": load_profile,
-        "list_profiles": list_profiles,
-        "delete_profile": delete_profile,
-        "execute_profile": execute_profile,
-        # Journey tools
-        "save_journey": save_journey,
-        "load_journey": load_journey,
-        "list_journeys": list_journeys,
-        "delete_journey": delete_journey,
-        "execute_journey": execute_journey,
-        # Export tools
-        "export_json": export_json,
-        "export_csv": export_csv,
-        "export_ndjson": export_ndjson,
-    }
+    from healthsim_agent.tools.registry import get_tool_registry
     
-    return executors.get(tool_name)
+    return get_tool_registry().get_executor(tool_name)
 
 
 @dataclass
@@ -669,6 +714,10 @@ class HealthSimAgent:
     _config: AgentConfig = field(default=None, init=False)
     _session: SessionState = field(default=None, init=False)
     _skills_context: str = field(default="", init=False)
+    _tool_stats: list[ToolBatchStats] = field(default_factory=list, init=False)
+    _system: str | list[dict[str, Any]] = field(default="", init=False)
+    _tools: list[dict[str, Any]] = field(default_factory=list, init=False)
+    _usage: PromptCacheStats = field(default_factory=PromptCacheStats, init=False)
     
     def __post_init__(self):
         """Initialize agent components."""
@@ -681,11 +730,19 @@ class HealthSimAgent:
         # Initialize Anthropic client
         self._client = Anthropic()
         
+        # Fail fast if TOOL_DEFINITIONS and the tool executors have drifted
+        from healthsim_agent.tools.registry import get_tool_registry
+        get_tool_registry().validate(TOOL_DEFINITIONS)
+        
         # Initialize session state
         self._session = SessionState()
         
         # Load skills context
         self._load_skills_context()
+        
+        # The system prompt and tool schema do not change during a session;
+        # build them once so every request sends the same prefix
+        self._prepare_static_prompt()
     
     def _load_skills_context(self) -> None:
         """Load skills to inform system prompt."""
@@ -748,6 +805,58 @@ Guidelines:
         
         return base_prompt
     
+    def _prepare_static_prompt(self) -> None:
+        """Build the system prompt and tool schema sent with every request."""
+        system_prompt = self._build_system_prompt()
+        if self._config.prompt_caching:
+            # Tools precede the system prompt in the cached prefix, so one
+            # breakpoint after each caches both
+            self._tools = [
+                *TOOL_DEFINITIONS[:-1],
+                {**TOOL_DEFINITIONS[-1], "cache_control": CACHE_CONTROL},
+            ]
+            self._system = [{"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL}]
+        else:
+            self._tools = list(TOOL_DEFINITIONS)
+            self._system = system_prompt
+    
+    def _messages_for_api(self) -> list[dict[str, Any]]:
+        """Get the session history to send, windowed per the config."""
+        messages = self._session.get_messages_for_api(
+            token_budget=self._config.history_token_budget,
+            keep_recent=self._config.history_keep_recent,
+        )
+        if self._config.prompt_caching:
+            messages = _with_history_breakpoint(messages)
+        return messages
+    
+    def _request(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+        """Arguments for messages.create / messages.stream."""
+        return {
+            "model": self._config.model,
+            "max_tokens": self._config.max_tokens,
+            "system": self._system,
+            "messages": messages,
+            "tools": self._tools,
+        }
+    
+    def _record_usage(self, response: Message) -> None:
+        """Accumulate token and cache usage from a response."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self._usage.record(usage)
+        if self._config.log_cache_usage or self._config.debug:
+            logger.info(
+                "API usage: input=%s output=%s cache_read=%s cache_creation=%s "
+                "(session cache hit rate %.0f%%)",
+                getattr(usage, "input_tokens", 0),
+                getattr(usage, "output_tokens", 0),
+                getattr(usage, "cache_read_input_tokens", 0) or 0,
+                getattr(usage, "cache_creation_input_tokens", 0) or 0,
+                self._usage.cache_hit_rate * 100,
+            )
+    
     def process_message(self, user_message: str) -> str:
         """
         Process a user message and return the agent's response.
@@ -758,16 +867,11 @@ Guidelines:
         self._session.add_message("user", user_message)
         
         # Build messages for API call
-        messages = self._session.get_messages_for_api()
+        messages = self._messages_for_api()
         
         # Call Claude with tools
-        response = self._client.messages.create(
-            model=self._config.model,
-            max_tokens=self._config.max_tokens,
-            system=self._build_system_prompt(),
-            messages=messages,
-            tools=TOOL_DEFINITIONS,
-        )
+        response = self._client.messages.create(**self._request(messages))
+        self._record_usage(response)
         
         # Handle tool calls in a loop
         while response.stop_reason == "tool_use":
@@ -781,16 +885,11 @@ Guidelines:
             self._session.add_message("user", tool_results)
             
             # Build messages for next API call
-            messages = self._session.get_messages_for_api()
+            messages = self._messages_for_api()
             
             # Continue conversation
-            response = self._client.messages.create(
-                model=self._config.model,
-                max_tokens=self._config.max_tokens,
-                system=self._build_system_prompt(),
-                messages=messages,
-                tools=TOOL_DEFINITIONS,
-            )
+            response = self._client.messages.create(**self._request(messages))
+            self._record_usage(response)
         
         # Extract final text response
         assistant_message = self._extract_text(response)
@@ -800,30 +899,116 @@ Guidelines:
         
         return assistant_message
     
-    def _execute_tool_calls(self, response: Message) -> list[ToolResultBlockParam]:
-        """Execute all tool calls in a response."""
-        results = []
+    def _execute_tool_calls(
+        self,
+        response: Message,
+        on_tool_start: Callable[[str, dict], None] | None = None,
+        on_tool_end: Callable[[str, dict], None] | None = None,
+    ) -> list[ToolResultBlockParam]:
+        """Execute all tool calls in a response.
         
-        for block in response.content:
-            if isinstance(block, ToolUseBlock):
-                tool_name = block.name
-                tool_input = block.input
-                tool_id = block.id
-                
-                if self._config.debug:
-                    print(f"Executing tool: {tool_name}")
-                    print(f"Input: {json.dumps(tool_input, indent=2)}")
-                
-                # Execute the tool
-                result = self._execute_single_tool(tool_name, tool_input)
-                
-                results.append({
-                    "type": "tool_result",
-                    "tool_use_id": tool_id,
-                    "content": json.dumps(result, default=str),
-                })
+        Consecutive read-only tools run concurrently on a bounded thread
+        pool when enabled (see _schedule_tool_calls). In-memory tools
+        (LATENCY_FAST) are not worth a thread and run inline while the rest
+        of their batch is on the pool. Results are returned in the order of
+        the tool_use blocks.
+        
+        Callbacks:
+            on_tool_start: Called when a tool starts (name, input)
+            on_tool_end: Called when a tool completes (name, result)
+        
+        Callbacks run on the worker thread of their tool, one at a time.
+        """
+        blocks = [block for block in response.content if isinstance(block, ToolUseBlock)]
+        outputs: list[Any] = [None] * len(blocks)
+        durations = [0.0] * len(blocks)
+        callback_lock = threading.Lock()
+        
+        def run(i: int) -> None:
+            block = blocks[i]
+            if self._config.debug:
+                print(f"Executing tool: {block.name}")
+                print(f"Input: {json.dumps(block.input, indent=2)}")
+            if on_tool_start:
+                with callback_lock:
+                    on_tool_start(block.name, block.input)
+            
+            started = time.perf_counter()
+            outputs[i] = self._execute_single_tool(block.name, block.input)
+            durations[i] = time.perf_counter() - started
+            
+            if on_tool_end:
+                with callback_lock:
+                    on_tool_end(block.name, outputs[i])
+        
+        from healthsim_agent.tools.registry import get_tool_registry
+        
+        registry = get_tool_registry()
+        batches = _schedule_tool_calls([block.name for block in blocks])
+        pooled = [[i for i in batch if not registry.is_fast(blocks[i].name)] for batch in batches]
+        concurrent = self._can_run_tools_concurrently(pooled)
         
-        return results
+        started = time.perf_counter()
+        if concurrent:
+            workers = min(self._config.max_tool_workers, max(len(b) for b in pooled))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for batch, slow in zip(batches, pooled):
+                    futures = [pool.submit(run, i) for i in slow]
+                    for i in batch:
+                        if i not in slow:
+                            run(i)
+                    # Wait for the batch and re-raise worker errors
+                    for future in futures:
+                        future.result()
+        else:
+            for i in range(len(blocks)):
+                run(i)
+        
+        stats = ToolBatchStats(
+            tool_count=len(blocks),
+            wall_seconds=time.perf_counter() - started,
+            serial_seconds=sum(durations),
+            concurrent=concurrent,
+        )
+        self._tool_stats.append(stats)
+        if self._config.debug:
+            print(
+                f"Ran {stats.tool_count} tools in {stats.wall_seconds:.3f}s "
+                f"(serial {stats.serial_seconds:.3f}s, saved {stats.saved_seconds:.3f}s)"
+            )
+        
+        return [
+            {
+                "type": "tool_result",
+                "tool_use_id": block.id,
+                "content": self._tool_result_content(block.name, result),
+            }
+            for block, result in zip(blocks, outputs)
+        ]
+    
+    def _tool_result_content(self, tool_name: str, result: Any) -> str:
+        """Serialize a tool result, spilling it to storage if too large."""
+        from healthsim_agent.tools.result_tools import budget_tool_result
+        
+        return budget_tool_result(tool_name, result, self._config.tool_result_max_chars)
+    
+    def _can_run_tools_concurrently(self, batches: list[list[int]]) -> bool:
+        """Whether any batch has enough pooled calls to use the thread pool.
+        
+        Requires parallel_tools and the broker connection mode (the default).
+        """
+        if not self._config.parallel_tools or self._config.max_tool_workers < 2:
+            return False
+        if all(len(batch) < 2 for batch in batches):
+            return False
+        
+        # Only the broker gives each thread its own read cursor; the
+        # close-before-write read connection must not be shared across threads
+        try:
+            from healthsim_agent.tools.connection import get_manager
+            return get_manager().is_broker
+        except Exception:
+            return False
     
     def _execute_single_tool(self, tool_name: str, tool_input: dict) -> dict:
         """Execute a single tool and return result."""
@@ -878,18 +1063,12 @@ Guidelines:
         self._session.add_message("user", user_message)
         
         # Build messages for API call
-        messages = self._session.get_messages_for_api()
+        messages = self._messages_for_api()
         
         full_response = ""
         
         # Stream the response
-        with self._client.messages.stream(
-            model=self._config.model,
-            max_tokens=self._config.max_tokens,
-            system=self._build_system_prompt(),
-            messages=messages,
-            tools=TOOL_DEFINITIONS,
-        ) as stream:
+        with self._client.messages.stream(**self._request(messages)) as stream:
             # Stream text as it arrives (must iterate BEFORE get_final_message)
             for text in stream.text_stream:
                 if on_text:
@@ -898,26 +1077,11 @@ Guidelines:
             
             # Get final message AFTER streaming text
             response = stream.get_final_message()
+        self._record_usage(response)
         
         # Handle tool calls
         while response.stop_reason == "tool_use":
-            tool_results = []
-            
-            for block in response.content:
-                if isinstance(block, ToolUseBlock):
-                    if on_tool_start:
-                        on_tool_start(block.name, block.input)
-                    
-                    result = self._execute_single_tool(block.name, block.input)
-                    
-                    if on_tool_end:
-                        on_tool_end(block.name, result)
-                    
-                    tool_results.append({
-                        "type": "tool_result",
-                        "tool_use_id": block.id,
-                        "content": json.dumps(result, default=str),
-                    })
+            tool_results = self._execute_tool_calls(response, on_tool_start, on_tool_end)
             
             # Add assistant message (with tool_use blocks) to session
             self._session.add_message("assistant", response.content)
@@ -926,16 +1090,10 @@ Guidelines:
             self._session.add_message("user", tool_results)
             
             # Build messages for next API call
-            messages = self._session.get_messages_for_api()
+            messages = self._messages_for_api()
             
             # Stream continuation
-            with self._client.messages.stream(
-                model=self._config.model,
-                max_tokens=self._config.max_tokens,
-                system=self._build_system_prompt(),
-                messages=messages,
-                tools=TOOL_DEFINITIONS,
-            ) as stream:
+            with self._client.messages.stream(**self._request(messages)) as stream:
                 # Stream text as it arrives (must iterate BEFORE get_final_message)
                 for text in stream.text_stream:
                     if on_text:
@@ -944,6 +1102,7 @@ Guidelines:
                 
                 # Get final message AFTER streaming text
                 response = stream.get_final_message()
+            self._record_usage(response)
         
         # Final text extraction
         final_text = self._extract_text(response)
@@ -1001,6 +1160,16 @@ Guidelines:
         except:
             return False
     
+    @property
+    def tool_stats(self) -> list[ToolBatchStats]:
+        """Timing of each response's tool calls, oldest first."""
+        return self._tool_stats
+    
+    @property
+    def usage(self) -> PromptCacheStats:
+        """Token and prompt-cache usage for this agent's API calls."""
+        return self._usage
+    
     @property
     def message_count(self) -> int:
         """Get number of messages in session."""
@@ -10,7 +10,9 @@ Reference database is read-only; generated data goes to session state.
 """
 
 from typing import Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from healthsim_agent.db.reference.cache import ReferenceQueryCache
 
 
 @dataclass
@@ -41,16 +43,23 @@ class ReferenceQueries:
     - CDC PLACES: Health indicators by geography
     - Census/SVI: Demographics and social vulnerability
     - ADI: Area Deprivation Index
+    
+    Results of the reference lookups are cached (see ReferenceQueryCache)
+    and cleared when reference data is reimported; execute_custom and the
+    utility methods always hit the database.
     """
     
-    def __init__(self, connection):
+    def __init__(self, connection, cache: ReferenceQueryCache | None = None):
         """
         Initialize with database connection.
         
         Args:
             connection: DatabaseConnection instance
+            cache: Result cache; defaults to a new cache for this instance.
+                Pass ReferenceQueryCache(max_entries=0) to disable caching.
         """
         self.conn = connection
+        self.cache = cache if cache is not None else ReferenceQueryCache()
     
     # =========================================================================
     # NPPES Provider Queries
@@ -118,7 +127,7 @@ class ReferenceQueries:
         LIMIT {limit}
         """
         
-        return self.conn.execute_query(query, limit=limit)
+        return self._execute(query, limit=limit)
     
     def get_provider_by_npi(self, npi: str) -> QueryResult:
         """
@@ -135,7 +144,7 @@ class ReferenceQueries:
         FROM nppes_providers
         WHERE npi = '{npi}'
         """
-        return self.conn.execute_query(query, limit=1)
+        return self._execute(query, limit=1)
     
     def count_providers_by_specialty(
         self,
@@ -164,7 +173,7 @@ class ReferenceQueries:
         ORDER BY provider_count DESC
         LIMIT {limit}
         """
-        return self.conn.execute_query(query, limit=limit)
+        return self._execute(query, limit=limit)
     
     # =========================================================================
     # Demographics Queries (Census/SVI)
@@ -215,7 +224,7 @@ class ReferenceQueries:
         WHERE {where}
         LIMIT {limit}
         """
-        return self.conn.execute_query(query, limit=limit)
+        return self._execute(query, limit=limit)
     
     def get_population_by_age_gender(
         self,
@@ -249,7 +258,7 @@ class ReferenceQueries:
         FROM svi_county
         WHERE {where}
         """
-        return self.conn.execute_query(query, limit=100)
+        return self._execute(query, limit=100)
     
     # =========================================================================
     # Health Indicator Queries (CDC PLACES)
@@ -298,7 +307,7 @@ class ReferenceQueries:
         WHERE {where}
         LIMIT {limit}
         """
-        return self.conn.execute_query(query, limit=limit)
+        return self._execute(query, limit=limit)
     
     def get_disease_prevalence(
         self,
@@ -333,7 +342,7 @@ class ReferenceQueries:
         ORDER BY data_value DESC
         LIMIT 50
         """
-        return self.conn.execute_query(query, limit=50)
+        return self._execute(query, limit=50)
     
     # =========================================================================
     # Area Deprivation Index (ADI) Queries
@@ -377,12 +386,16 @@ class ReferenceQueries:
         WHERE {where}
         LIMIT {limit}
         """
-        return self.conn.execute_query(query, limit=limit)
+        return self._execute(query, limit=limit)
     
     # =========================================================================
     # Utility Methods
     # =========================================================================
     
+    def cache_stats(self) -> dict[str, Any]:
+        """Get hit/miss statistics for the result cache."""
+        return self.cache.stats()
+    
     def list_available_tables(self) -> list[str]:
         """List all tables in the reference database."""
         return self.conn.list_tables()
@@ -411,3 +424,23 @@ class ReferenceQueries:
             QueryResult with query results
         """
         return self.conn.execute_query(query, limit=limit)
+    
+    def _execute(self, query: str, limit: int) -> QueryResult:
+        """Run a reference query through the result cache.
+        
+        Failed queries are not cached. Callers get their own copy of the
+        result so mutating it cannot affect later hits.
+        """
+        key = self.cache.make_key(query, (limit,))
+        result = self.cache.get_or_compute(
+            key,
+            lambda: self.conn.execute_query(query, limit=limit),
+            cacheable=lambda r: isinstance(r, QueryResult) and r.error is None,
+        )
+        if not isinstance(result, QueryResult):
+            return result
+        return replace(
+            result,
+            columns=list(result.columns),
+            data=[list(row) for row in result.data],
+        )
@@ -1,5 +1,10 @@
 """Reference data loading utilities."""
 
+from healthsim_agent.db.reference.cache import (
+    ReferenceQueryCache,
+    get_reference_cache,
+    invalidate_reference_caches,
+)
 from healthsim_agent.db.reference.loader import (
     REFERENCE_TABLES,
     get_reference_status,
@@ -21,6 +26,10 @@ __all__ = [
     "get_reference_status",
     "is_reference_data_loaded",
     "REFERENCE_TABLES",
+    # Query cache
+    "ReferenceQueryCache",
+    "get_reference_cache",
+    "invalidate_reference_caches",
     # PopulationSim importers
     "import_places_tract",
     "import_places_county",
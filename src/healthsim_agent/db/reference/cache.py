@@ -0,0 +1,190 @@
+"""Result cache for reference-data queries.
+
+Reference tables (CDC PLACES, SVI, ADI) only change when they are
+re-imported, but profile building and geography-aware generation look up
+the same counties and tracts over and over. ReferenceQueryCache memoizes
+query results keyed by the normalized SQL and its parameters, bounded by
+entry count (least recently used evicted first) and age.
+
+import_all_reference_data() calls invalidate_reference_caches(), which
+empties every live cache.
+
+Example:
+    >>> cache = ReferenceQueryCache(max_entries=256, ttl_seconds=600)
+    >>> rows = cache.get_or_compute(
+    ...     cache.make_key("SELECT * FROM population.places_county WHERE stateabbr = ?", ["CA"]),
+    ...     lambda: conn.execute(sql, ["CA"]).fetchall(),
+    ... )
+    >>> cache.stats()["hits"]
+    0
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 3600.0
+
+# Every live cache, so a re-import can invalidate them all
+_caches: "weakref.WeakSet[ReferenceQueryCache]" = weakref.WeakSet()
+_caches_lock = threading.Lock()
+
+
+class ReferenceQueryCache:
+    """Thread-safe LRU + TTL cache of reference query results.
+
+    Args:
+        max_entries: Results kept before the least recently used is
+            evicted; 0 disables caching
+        ttl_seconds: Age after which a result is recomputed; None for no
+            expiry (invalidation only)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+    ):
+        if max_entries < 0:
+            raise ValueError("max_entries must be non-negative")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+        with _caches_lock:
+            _caches.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(sql: str, params: Any = None, scope: Hashable = None) -> tuple:
+        """Build a cache key from a query, its parameters and a scope.
+
+        Whitespace in the SQL is collapsed so formatting differences do not
+        split entries. ``scope`` separates databases (e.g. the DB path).
+        """
+        if isinstance(params, dict):
+            params = tuple(sorted(params.items()))
+        elif params is not None:
+            params = tuple(params)
+        return (scope, " ".join(sql.split()), params)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], T],
+        cacheable: Callable[[T], bool] = lambda value: True,
+    ) -> T:
+        """Return the cached result for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key (see make_key)
+            compute: Runs the query; called outside the lock
+            cacheable: Whether a computed result may be stored (e.g. not
+                error results)
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+
+        value = compute()
+        if cacheable(value):
+            self.put(key, value)
+        return value
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Look up a key; returns (found, value) and counts a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl_seconds is None or time.monotonic() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, value
+                del self._entries[key]
+                self._expirations += 1
+            self._misses += 1
+            return False, None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a result as most recently used, evicting beyond max_entries."""
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached result (e.g. after reference data changes)."""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counts, hit rate and current size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+def invalidate_reference_caches() -> int:
+    """Empty every live ReferenceQueryCache.
+
+    Returns:
+        Number of caches invalidated
+    """
+    with _caches_lock:
+        caches = list(_caches)
+    for cache in caches:
+        cache.invalidate()
+    return len(caches)
+
+
+_shared_cache: Optional[ReferenceQueryCache] = None
+# Separate from _caches_lock, which ReferenceQueryCache.__init__ acquires
+_shared_cache_lock = threading.Lock()
+
+
+def get_reference_cache() -> ReferenceQueryCache:
+    """Get the process-wide cache used by the reference tools."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ReferenceQueryCache()
+        return _shared_cache
+
+
+__all__ = [
+    "ReferenceQueryCache",
+    "invalidate_reference_caches",
+    "get_reference_cache",
+    "DEFAULT_MAX_ENTRIES",
+    "DEFAULT_TTL_SECONDS",
+]
@@ -7,6 +7,7 @@ from typing import Any
 
 import duckdb
 
+from healthsim_agent.db.reference.cache import invalidate_reference_caches
 from healthsim_agent.db.reference.populationsim import (
     import_adi_blockgroup,
     import_places_county,
@@ -31,7 +32,12 @@ def import_all_reference_data(
     verbose: bool = True,
     schema: str = "population",
 ) -> dict[str, int]:
-    """Import all PopulationSim reference datasets."""
+    """Import all PopulationSim reference datasets.
+
+    Cached reference query results and the shared provider pools are
+    invalidated afterwards, even if some importers failed (a partial import
+    may still have replaced tables).
+    """
     results = {}
 
     importers = [
@@ -55,6 +61,10 @@ def import_all_reference_data(
             if verbose:
                 print(f"ERROR: {e}")
 
+    invalidate_reference_caches()
+    # Imported here to keep the generation package out of db imports
+    from healthsim_agent.generation.provider_pool import reset_provider_pools
+    reset_provider_pools()
     return results
 
 
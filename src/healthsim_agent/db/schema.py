@@ -78,6 +78,15 @@ CREATE TABLE IF NOT EXISTS cohort_tags (
 );
 """
 
+COHORT_SUMMARY_CACHE_DDL = """
+CREATE TABLE IF NOT EXISTS cohort_summary_cache (
+    cohort_id       VARCHAR PRIMARY KEY,
+    state           JSON NOT NULL,
+    as_of           DATE NOT NULL,
+    updated_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
 # ============================================================================
 # CANONICAL TABLES - PatientSim
 # ============================================================================
@@ -428,6 +437,7 @@ ALL_DDL = [
     COHORTS_DDL,
     COHORT_ENTITIES_DDL,
     COHORT_TAGS_DDL,
+    COHORT_SUMMARY_CACHE_DDL,
     PATIENTS_DDL,
     ENCOUNTERS_DDL,
     DIAGNOSES_DDL,
@@ -457,7 +467,7 @@ def get_canonical_tables() -> List[str]:
 
 def get_state_tables() -> List[str]:
     """Get list of state management table names."""
-    return ['cohorts', 'cohort_entities', 'cohort_tags']
+    return ['cohorts', 'cohort_entities', 'cohort_tags', 'cohort_summary_cache']
 
 
 def get_system_tables() -> List[str]:
@@ -25,6 +25,10 @@ from healthsim_agent.generation.distributions import (
     ConditionalDistribution,
     create_distribution,
 )
+from healthsim_agent.generation.conditions import (
+    CONDITION_OPERATORS,
+    compile_condition,
+)
 
 # Profile schema
 from healthsim_agent.generation.profile import (
@@ -86,9 +90,22 @@ from healthsim_agent.generation.profile_executor import (
     ExecutionResult,
     ValidationMetric,
     ValidationReport,
+    ValidationAccumulator,
     ProfileExecutor,
     execute_profile,
 )
+from healthsim_agent.generation.sinks import (
+    EntitySink,
+    NDJSONSink,
+    DuckDBSink,
+    ParquetSink,
+    entity_to_record,
+)
+from healthsim_agent.generation.sampler_plan import (
+    CompiledDistribution,
+    SamplerPlan,
+    compile_distribution,
+)
 
 # Journey engine
 from healthsim_agent.generation.journey_engine import (
@@ -106,11 +123,17 @@ from healthsim_agent.generation.journey_engine import (
     JourneyTimelineEvent,
     Timeline,
     JourneyEngine,
+    CompiledJourney,
+    EventTable,
     create_journey_engine,
     create_simple_journey,
     get_journey_template,
     JOURNEY_TEMPLATES,
 )
+from healthsim_agent.generation.timeline_registry import (
+    TimelineRegistry,
+    DuckDBTimelineStore,
+)
 
 # Journey validation
 from healthsim_agent.generation.journey_validation import (
@@ -245,6 +268,13 @@ from healthsim_agent.generation.networksim_reference import (
     assign_provider_to_patient,
     assign_facility_to_patient,
 )
+from healthsim_agent.generation.provider_pool import (
+    ProviderPool,
+    ProviderSlice,
+    FacilitySlice,
+    get_provider_pool,
+    reset_provider_pools,
+)
 
 # Geography-aware profile builder
 from healthsim_agent.generation.geography_builder import (
@@ -273,6 +303,8 @@ __all__ = [
     "AgeDistribution",
     "ConditionalDistribution",
     "create_distribution",
+    "CONDITION_OPERATORS",
+    "compile_condition",
     # Profile
     "DistributionType",
     "DistributionSpec",
@@ -317,8 +349,17 @@ __all__ = [
     "ExecutionResult",
     "ValidationMetric",
     "ValidationReport",
+    "ValidationAccumulator",
     "ProfileExecutor",
     "execute_profile",
+    "EntitySink",
+    "NDJSONSink",
+    "DuckDBSink",
+    "ParquetSink",
+    "entity_to_record",
+    "CompiledDistribution",
+    "SamplerPlan",
+    "compile_distribution",
     # Journey engine
     "BaseEventType",
     "PatientEventType",
@@ -334,10 +375,14 @@ __all__ = [
     "JourneyTimelineEvent",
     "Timeline",
     "JourneyEngine",
+    "CompiledJourney",
+    "EventTable",
     "create_journey_engine",
     "create_simple_journey",
     "get_journey_template",
     "JOURNEY_TEMPLATES",
+    "TimelineRegistry",
+    "DuckDBTimelineStore",
     # Journey validation
     "ValidationSeverity",
     "ValidationCategory",
@@ -442,6 +487,11 @@ __all__ = [
     "get_facilities_by_geography",
     "assign_provider_to_patient",
     "assign_facility_to_patient",
+    "ProviderPool",
+    "ProviderSlice",
+    "FacilitySlice",
+    "get_provider_pool",
+    "reset_provider_pools",
     # Geography builder
     "GeographyProfile",
     "GeographyAwareProfileBuilder",
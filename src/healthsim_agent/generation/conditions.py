@@ -0,0 +1,179 @@
+"""Condition evaluation shared by distributions and journeys.
+
+Provides one set of comparison operators used by both the structured
+``EventCondition`` (field/operator/value) in the journey engine and the
+string conditions in ``ConditionalDistribution`` rules.
+
+String conditions are parsed once with ``ast`` into a tree of closures.
+Only comparisons (==, !=, <, <=, >, >=, in, not in), boolean and/or/not,
+literals and context names (optionally dotted, e.g. ``demographics.age``)
+are accepted; anything else compiles to a predicate that is always False.
+Evaluation never calls ``eval()``.
+
+Example:
+    >>> is_severe = compile_condition("severity == 'severe' and age >= 65")
+    >>> is_severe({"severity": "severe", "age": 70})
+    True
+"""
+
+from __future__ import annotations
+
+import ast
+import operator
+from collections.abc import Callable
+from typing import Any
+
+
+# Shared operator table, keyed by EventCondition operator names
+CONDITION_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "in": lambda actual, value: actual in value,
+    "not_in": lambda actual, value: actual not in value,
+    "contains": lambda actual, value: value in actual,
+}
+
+_AST_OPERATORS: dict[type[ast.cmpop], Callable[[Any, Any], bool]] = {
+    ast.Eq: CONDITION_OPERATORS["eq"],
+    ast.NotEq: CONDITION_OPERATORS["ne"],
+    ast.Gt: CONDITION_OPERATORS["gt"],
+    ast.GtE: CONDITION_OPERATORS["gte"],
+    ast.Lt: CONDITION_OPERATORS["lt"],
+    ast.LtE: CONDITION_OPERATORS["lte"],
+    ast.In: CONDITION_OPERATORS["in"],
+    ast.NotIn: CONDITION_OPERATORS["not_in"],
+}
+
+Predicate = Callable[[dict[str, Any]], bool]
+_Getter = Callable[[dict[str, Any]], Any]
+
+
+class _MissingField(LookupError):
+    """Raised when a condition references a name absent from the context."""
+
+
+_MISSING = object()
+
+
+def resolve_field(context: dict[str, Any], path: str) -> Any:
+    """Navigate a dotted path through nested dicts.
+
+    Args:
+        context: Context dictionary
+        path: Field path such as ``"demographics.age"``
+
+    Returns:
+        The value at the path, or None if any segment is missing
+    """
+    current: Any = context
+    for part in path.split("."):
+        if isinstance(current, dict) and part in current:
+            current = current[part]
+        else:
+            return None
+    return current
+
+
+def _field_getter(path: str) -> _Getter:
+    parts = tuple(path.split("."))
+
+    def get(context: dict[str, Any]) -> Any:
+        current: Any = context
+        for part in parts:
+            if not isinstance(current, dict):
+                raise _MissingField(path)
+            current = current.get(part, _MISSING)
+            if current is _MISSING:
+                raise _MissingField(path)
+        return current
+
+    return get
+
+
+def _dotted_name(node: ast.expr) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted_name(node.value)
+        return f"{base}.{node.attr}" if base else None
+    return None
+
+
+def _compile_operand(node: ast.expr) -> _Getter:
+    name = _dotted_name(node)
+    if name is not None:
+        return _field_getter(name)
+    # Literals: strings, numbers, None/True/False, -1, lists/tuples/sets of literals
+    value = ast.literal_eval(node)
+    return lambda context: value
+
+
+def _compile_node(node: ast.expr) -> Predicate:
+    if isinstance(node, ast.BoolOp):
+        parts = tuple(_compile_node(value) for value in node.values)
+        if isinstance(node.op, ast.And):
+            return lambda context: all(part(context) for part in parts)
+        return lambda context: any(part(context) for part in parts)
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        inner = _compile_node(node.operand)
+        return lambda context: not inner(context)
+
+    if isinstance(node, ast.Compare):
+        operands = (_compile_operand(node.left),) + tuple(
+            _compile_operand(comparator) for comparator in node.comparators
+        )
+        ops = tuple(_AST_OPERATORS[type(op)] for op in node.ops)
+
+        def compare(context: dict[str, Any]) -> bool:
+            left = operands[0](context)
+            for op, right_getter in zip(ops, operands[1:]):
+                right = right_getter(context)
+                if not op(left, right):
+                    return False
+                left = right
+            return True
+
+        return compare
+
+    # Bare names/literals are evaluated for truthiness
+    getter = _compile_operand(node)
+    return lambda context: bool(getter(context))
+
+
+def _never(context: dict[str, Any]) -> bool:
+    return False
+
+
+def compile_condition(condition: str) -> Predicate:
+    """Compile a condition string into a reusable predicate.
+
+    A condition that fails to parse, or that uses anything beyond
+    comparisons, boolean operators, literals and names, compiles to a
+    predicate that always returns False. At evaluation time, a missing
+    context name or an incomparable pair of values (e.g. ``None < 5``)
+    also yields False.
+
+    Args:
+        condition: Expression such as ``"severity == 'controlled'"``
+
+    Returns:
+        Callable taking a context dict and returning a bool
+    """
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+        predicate = _compile_node(tree.body)
+    except (SyntaxError, ValueError, KeyError, TypeError):
+        return _never
+
+    def evaluate(context: dict[str, Any]) -> bool:
+        try:
+            return bool(predicate(context))
+        except (_MissingField, TypeError):
+            return False
+
+    return evaluate
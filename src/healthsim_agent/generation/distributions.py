@@ -4,6 +4,11 @@ Statistical distributions for data generation.
 Provides distribution classes for generating values according
 to various statistical distributions.
 
+Each distribution samples scalars with ``sample(rng)`` from a
+``random.Random``. The main distributions also provide
+``sample_array(n, generator)``, which fills a whole column at once from a
+``numpy.random.Generator``. That needs the optional numpy dependency.
+
 Ported from: healthsim-workspace/packages/core/src/healthsim/generation/distributions.py
 """
 
@@ -14,6 +19,47 @@ from typing import Any
 
 from pydantic import BaseModel
 
+from healthsim_agent.generation.conditions import compile_condition
+
+# Optional vectorized sampling support
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def require_numpy() -> None:
+    """Raise ImportError if numpy (needed for array sampling) is missing."""
+    if np is None:
+        raise ImportError(
+            "numpy is required for vectorized sampling. "
+            "Install with: pip install 'healthsim-agent[fast]'"
+        )
+
+
+def weighted_indices(
+    weights: list[float],
+    n: int,
+    generator: "np.random.Generator",
+) -> "np.ndarray":
+    """Draw n indices into ``weights`` with probability proportional to weight.
+
+    Args:
+        weights: Non-negative weights (need not sum to 1)
+        n: Number of draws
+        generator: numpy random generator
+
+    Returns:
+        Integer array of length n
+    """
+    require_numpy()
+    cum_weights = np.cumsum(np.asarray(weights, dtype=float))
+    total = cum_weights[-1]
+    if total <= 0:
+        raise ValueError("Total of weights must be greater than zero")
+    indices = np.searchsorted(cum_weights, generator.random(n) * total, side="right")
+    return np.minimum(indices, len(cum_weights) - 1)
+
 
 class Distribution(ABC):
     """Abstract base class for statistical distributions."""
@@ -23,6 +69,25 @@ class Distribution(ABC):
         """Sample a value from the distribution."""
         ...
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        """Sample n values at once from a numpy Generator.
+
+        The base implementation draws scalars with ``sample()`` from a
+        ``random.Random`` seeded by the generator; subclasses override it
+        with a vectorized version.
+
+        Args:
+            n: Number of values
+            generator: numpy random generator (see
+                ``HierarchicalSeedManager.get_column_generator``)
+
+        Returns:
+            numpy array of length n
+        """
+        require_numpy()
+        rng = random.Random(int(generator.integers(2**63)))
+        return np.array([self.sample(rng) for _ in range(n)])
+
 
 class WeightedChoice(BaseModel):
     """Weighted random selection from options.
@@ -106,6 +171,10 @@ class NormalDistribution(Distribution, BaseModel):
     def sample_int(self, rng: random.Random | None = None) -> int:
         return round(self.sample(rng))
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        require_numpy()
+        return generator.normal(self.mean, self.std_dev, n)
+
     def sample_bounded(
         self,
         min_val: float | None = None,
@@ -152,6 +221,10 @@ class UniformDistribution(Distribution, BaseModel):
             rng = random.Random()
         return rng.randint(int(self.min_val), int(self.max_val))
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        require_numpy()
+        return generator.uniform(self.min_val, self.max_val, n)
+
 
 class LogNormalDistribution(Distribution, BaseModel):
     """Log-normal distribution for right-skewed positive values.
@@ -167,6 +240,13 @@ class LogNormalDistribution(Distribution, BaseModel):
     std_dev: float
     min_val: float = 0.0
 
+    def _log_params(self) -> tuple[float, float]:
+        """Underlying normal mu/sigma for the configured mean and std_dev."""
+        variance = self.std_dev**2
+        mu = math.log(self.mean**2 / math.sqrt(variance + self.mean**2))
+        sigma = math.sqrt(math.log(1 + variance / self.mean**2))
+        return mu, sigma
+
     def sample(self, rng: random.Random | None = None) -> float:
         if rng is None:
             rng = random.Random()
@@ -174,13 +254,17 @@ class LogNormalDistribution(Distribution, BaseModel):
         if self.mean <= 0:
             return self.min_val
 
-        variance = self.std_dev**2
-        mu = math.log(self.mean**2 / math.sqrt(variance + self.mean**2))
-        sigma = math.sqrt(math.log(1 + variance / self.mean**2))
-
+        mu, sigma = self._log_params()
         value = rng.lognormvariate(mu, sigma)
         return max(value, self.min_val)
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        require_numpy()
+        if self.mean <= 0:
+            return np.full(n, float(self.min_val))
+        mu, sigma = self._log_params()
+        return np.maximum(generator.lognormal(mu, sigma, n), self.min_val)
+
 
 class CategoricalDistribution(Distribution, BaseModel):
     """Categorical distribution for discrete choices with weights.
@@ -219,6 +303,13 @@ class CategoricalDistribution(Distribution, BaseModel):
 
         return rng.choices(categories, weights=probs, k=count)
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        require_numpy()
+        if not self.weights:
+            raise ValueError("No categories defined")
+        categories = np.array(list(self.weights.keys()), dtype=object)
+        return categories[weighted_indices(list(self.weights.values()), n, generator)]
+
 
 class AgeBandDistribution(Distribution, BaseModel):
     """Age distribution using census-style age bands.
@@ -268,6 +359,14 @@ class AgeBandDistribution(Distribution, BaseModel):
             rng = random.Random()
         return [self.sample(rng) for _ in range(count)]
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        require_numpy()
+        if not self.bands:
+            raise ValueError("No age bands defined")
+        bounds = np.array([self._parse_band(label) for label in self.bands])
+        chosen = bounds[weighted_indices(list(self.bands.values()), n, generator)]
+        return generator.integers(chosen[:, 0], chosen[:, 1], endpoint=True)
+
 
 class ExplicitDistribution(Distribution, BaseModel):
     """Distribution with explicit values and weights.
@@ -295,6 +394,14 @@ class ExplicitDistribution(Distribution, BaseModel):
 
         return rng.choices(items, weights=weights, k=1)[0]
 
+    def sample_array(self, n: int, generator: "np.random.Generator") -> "np.ndarray":
+        require_numpy()
+        if not self.values:
+            raise ValueError("No values to select from")
+        items = np.empty(len(self.values), dtype=object)
+        items[:] = [v[0] for v in self.values]
+        return items[weighted_indices([v[1] for v in self.values], n, generator)]
+
 
 class AgeDistribution:
     """Age distribution for population generation.
@@ -377,33 +484,33 @@ class ConditionalDistribution:
     def __init__(self, rules: list[dict[str, Any]], default: dict[str, Any] | None = None):
         """Initialize conditional distribution.
 
+        Each rule's condition is compiled once; the distribution objects
+        are built on first use and reused for every later sample.
+
         Args:
             rules: List of {condition, distribution} dicts
             default: Default distribution if no condition matches
         """
         self.rules = rules
         self.default = default
+        self._predicates = [compile_condition(rule.get("condition", "")) for rule in rules]
+        self._distributions: dict[int, Distribution] = {}
+        self._default_distribution: Distribution | None = None
 
     def _evaluate_condition(self, condition: str, context: dict[str, Any]) -> bool:
         """Evaluate a simple condition string against context.
 
-        Supports: ==, !=, >=, <=, >, <, and, or
+        Supports: ==, !=, >=, <=, >, <, in, not in, and, or, not
         """
-        # Simple eval with restricted namespace
-        # For safety, only allow certain operations
-        try:
-            # Replace attribute access with dict access
-            expr = condition
-            for key in context:
-                # Handle string values
-                if isinstance(context[key], str):
-                    expr = expr.replace(f"{key}", f"context['{key}']")
-                else:
-                    expr = expr.replace(f"{key}", f"context['{key}']")
-
-            return eval(expr, {"context": context, "__builtins__": {}})
-        except Exception:
-            return False
+        return compile_condition(condition)(context)
+
+    def _rule_distribution(self, index: int) -> Distribution:
+        """Get the cached distribution for a rule, creating it on first use."""
+        dist = self._distributions.get(index)
+        if dist is None:
+            dist = create_distribution(self.rules[index]["distribution"])
+            self._distributions[index] = dist
+        return dist
 
     def sample(
         self,
@@ -419,19 +526,72 @@ class ConditionalDistribution:
         Returns:
             Sampled value from matching distribution
         """
-        for rule in self.rules:
-            condition = rule.get("condition", "")
-            if self._evaluate_condition(condition, context):
-                dist = create_distribution(rule["distribution"])
-                return dist.sample(rng)
+        return self.select(context).sample(rng)
+
+    def select(self, context: dict[str, Any]) -> Distribution:
+        """Get the distribution for the first rule matching the context.
+
+        Args:
+            context: Dictionary of entity attributes for condition evaluation
+
+        Returns:
+            The matching rule's distribution, or the default distribution
+
+        Raises:
+            ValueError: If nothing matches and there is no default
+        """
+        for index, predicate in enumerate(self._predicates):
+            if predicate(context):
+                return self._rule_distribution(index)
 
         # No condition matched, use default
         if self.default:
-            dist = create_distribution(self.default)
-            return dist.sample(rng)
+            if self._default_distribution is None:
+                self._default_distribution = create_distribution(self.default)
+            return self._default_distribution
 
         raise ValueError("No condition matched and no default distribution")
 
+    def sample_array(
+        self,
+        n: int,
+        generator: "np.random.Generator",
+        context: dict[str, "np.ndarray"] | None = None,
+    ) -> "np.ndarray":
+        """Sample n values, choosing each row's rule from column contexts.
+
+        Rows are grouped by their distinct context values; each group is
+        filled with one ``sample_array`` call on its matching distribution.
+
+        Args:
+            n: Number of values
+            generator: numpy random generator
+            context: Column arrays (each of length n) keyed by attribute name
+
+        Returns:
+            numpy array of length n
+        """
+        require_numpy()
+        if not context:
+            return self.select({}).sample_array(n, generator)
+
+        keys = list(context)
+        rows = list(zip(*(context[key] for key in keys)))
+        groups: dict[tuple, list[int]] = {}
+        for index, row in enumerate(rows):
+            groups.setdefault(row, []).append(index)
+
+        out: np.ndarray | None = None
+        for row, indices in groups.items():
+            row_context = {k: v for k, v in zip(keys, row) if v is not None}
+            values = self.select(row_context).sample_array(len(indices), generator)
+            if out is None:
+                out = np.empty(n, dtype=values.dtype)
+            elif out.dtype != values.dtype and out.dtype != object:
+                out = out.astype(np.result_type(out.dtype, values.dtype))
+            out[indices] = values
+        return out if out is not None else np.empty(0)
+
 
 def create_distribution(spec: dict[str, Any]) -> Distribution:
     """Factory function to create a distribution from a specification.
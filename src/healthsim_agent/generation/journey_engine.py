@@ -14,17 +14,24 @@ Ported from: healthsim-workspace/packages/core/src/healthsim/generation/journey_
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import random
+import re
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Any, Protocol
+from typing import Any, ClassVar, Protocol
 
 from pydantic import BaseModel, Field
 
+from healthsim_agent.generation.conditions import CONDITION_OPERATORS, resolve_field
+from healthsim_agent.generation.timeline_registry import TimelineRegistry
+
 
 # =============================================================================
 # Event Type System
@@ -182,37 +189,14 @@ class EventCondition(BaseModel):
             return False
         
         # Apply operator
-        if self.operator == "eq":
-            return actual == self.value
-        elif self.operator == "ne":
-            return actual != self.value
-        elif self.operator == "gt":
-            return actual > self.value
-        elif self.operator == "gte":
-            return actual >= self.value
-        elif self.operator == "lt":
-            return actual < self.value
-        elif self.operator == "lte":
-            return actual <= self.value
-        elif self.operator == "in":
-            return actual in self.value
-        elif self.operator == "not_in":
-            return actual not in self.value
-        elif self.operator == "contains":
-            return self.value in actual
-        
-        return False
+        op = CONDITION_OPERATORS.get(self.operator)
+        if op is None:
+            return False
+        return op(actual, self.value)
     
     def _get_field_value(self, context: dict, path: str) -> Any:
         """Navigate to nested field value."""
-        parts = path.split(".")
-        current = context
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-        return current
+        return resolve_field(context, path)
 
 
 # =============================================================================
@@ -311,6 +295,10 @@ class JourneySpecification(BaseModel):
 # Timeline Classes
 # =============================================================================
 
+# ${entity.attr} references in event parameters
+_ENTITY_VAR_PATTERN = re.compile(r"\$\{entity\.(\w+)\}")
+
+
 @dataclass
 class JourneyTimelineEvent:
     """A scheduled event on a timeline."""
@@ -341,9 +329,42 @@ class JourneyTimelineEvent:
     triggered_events: list[str] = field(default_factory=list)
 
 
+class _EventList(list):
+    """List that counts its mutations so Timeline can tell when to reindex."""
+    
+    version = 0
+
+
+def _counting_mutator(name: str) -> Callable:
+    method = getattr(list, name)
+    
+    def mutator(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+    
+    mutator.__name__ = name
+    return mutator
+
+
+for _name in (
+    "__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+    "insert", "pop", "remove", "clear", "sort", "reverse",
+):
+    setattr(_EventList, _name, _counting_mutator(_name))
+del _name
+
+
 @dataclass 
 class Timeline:
-    """Timeline of events for an entity."""
+    """Timeline of events for an entity.
+    
+    ``events`` is kept in chronological order (events on the same date
+    stay in insertion order). Inserts use bisection, and lookups by
+    ``timeline_event_id`` and by date go through dict indexes. Code that
+    changes ``events`` directly (append, item assignment, pop, or
+    assigning a new list) is still supported; the list counts its
+    mutations and the indexes are rebuilt the next time they are used.
+    """
     
     entity_id: str
     entity_type: str  # "patient", "member", "rx_member", etc.
@@ -356,34 +377,80 @@ class Timeline:
     # Cross-product correlation
     linked_timelines: dict[str, str] = field(default_factory=dict)  # product -> timeline_id
     
+    # Indexes over events (scheduled dates parallel to events, id -> event, date -> events)
+    _dates: list[date] = field(default_factory=list, init=False, repr=False, compare=False)
+    _by_id: dict[str, JourneyTimelineEvent] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _by_date: dict[date, list[JourneyTimelineEvent]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_events: list[JourneyTimelineEvent] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _indexed_version: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if not isinstance(self.events, _EventList):
+            self.events = _EventList(self.events)
+    
+    def _ensure_index(self) -> None:
+        """Rebuild indexes if ``events`` was replaced or modified directly."""
+        if (
+            self._indexed_events is self.events
+            and self.events.version == self._indexed_version
+        ):
+            return
+        if not isinstance(self.events, _EventList):
+            self.events = _EventList(self.events)
+        self.events.sort(key=lambda e: e.scheduled_date)
+        self._dates = [e.scheduled_date for e in self.events]
+        self._by_id = {}
+        self._by_date = {}
+        for event in self.events:
+            self._by_id.setdefault(event.timeline_event_id, event)
+            self._by_date.setdefault(event.scheduled_date, []).append(event)
+        self._indexed_events = self.events
+        self._indexed_version = self.events.version
+    
     def add_event(self, event: JourneyTimelineEvent) -> None:
         """Add event to timeline, maintaining chronological order."""
-        self.events.append(event)
-        self.events.sort(key=lambda e: e.scheduled_date)
+        self._ensure_index()
+        position = bisect_right(self._dates, event.scheduled_date)
+        self.events.insert(position, event)
+        self._indexed_version = self.events.version
+        self._dates.insert(position, event.scheduled_date)
+        self._by_id.setdefault(event.timeline_event_id, event)
+        self._by_date.setdefault(event.scheduled_date, []).append(event)
     
     def get_pending_events(self) -> list[JourneyTimelineEvent]:
         """Get all pending events in chronological order."""
+        self._ensure_index()
         return [e for e in self.events if e.status == "pending"]
     
     def get_events_by_date(self, target_date: date) -> list[JourneyTimelineEvent]:
         """Get events scheduled for a specific date."""
-        return [e for e in self.events if e.scheduled_date == target_date]
+        self._ensure_index()
+        return list(self._by_date.get(target_date, ()))
     
     def get_events_up_to(self, target_date: date) -> list[JourneyTimelineEvent]:
         """Get pending events up to and including target date."""
-        return [
-            e for e in self.events 
-            if e.status == "pending" and e.scheduled_date <= target_date
-        ]
+        self._ensure_index()
+        end = bisect_right(self._dates, target_date)
+        return [e for e in self.events[:end] if e.status == "pending"]
+    
+    def get_event(self, event_id: str) -> JourneyTimelineEvent | None:
+        """Get an event by its timeline_event_id."""
+        self._ensure_index()
+        return self._by_id.get(event_id)
     
     def mark_executed(self, event_id: str, result: dict[str, Any]) -> None:
         """Mark an event as executed with result."""
-        for event in self.events:
-            if event.timeline_event_id == event_id:
-                event.status = "executed"
-                event.executed_at = datetime.utcnow()
-                event.result = result
-                break
+        event = self.get_event(event_id)
+        if event is not None:
+            event.status = "executed"
+            event.executed_at = datetime.utcnow()
+            event.result = result
 
 
 # =============================================================================
@@ -425,11 +492,17 @@ class JourneyEngine:
         >>> results = engine.execute_timeline(timeline, patient, up_to_date=date.today())
     """
     
-    def __init__(self, seed: int | None = None):
+    def __init__(
+        self,
+        seed: int | None = None,
+        timeline_registry: TimelineRegistry | None = None,
+    ):
         """Initialize the journey engine.
         
         Args:
             seed: Random seed for reproducibility
+            timeline_registry: Registry (and retention policy) for active
+                timelines; defaults to an unbounded registry
         """
         self.seed = seed
         self._rng = random.Random(seed)
@@ -441,7 +514,9 @@ class JourneyEngine:
         self._trigger_handlers: dict[str, Callable] = {}
         
         # Active timelines for cross-product coordination
-        self._active_timelines: dict[str, Timeline] = {}
+        self._active_timelines = (
+            timeline_registry if timeline_registry is not None else TimelineRegistry()
+        )
     
     def register_handler(
         self,
@@ -559,9 +634,18 @@ class JourneyEngine:
             timeline.end_date = max(e.scheduled_date for e in timeline.events)
         
         # Register as active timeline
-        self._active_timelines[timeline.entity_id] = timeline
+        self._active_timelines.register(timeline)
         
         return timeline
+    
+    @property
+    def timeline_registry(self) -> TimelineRegistry:
+        """Registry of active timelines (see ``TimelineRegistry.stats``)."""
+        return self._active_timelines
+    
+    def get_active_timeline(self, entity_id: str) -> Timeline | None:
+        """Get a registered timeline by entity ID."""
+        return self._active_timelines.get(entity_id)
 
     def execute_event(
         self,
@@ -661,14 +745,11 @@ class JourneyEngine:
     
     def _resolve_entity_var(self, value: str, entity: dict[str, Any]) -> Any:
         """Resolve ${entity.x} variables in a string."""
-        import re
-        pattern = r"\$\{entity\.(\w+)\}"
-        
         def replacer(match):
             attr = match.group(1)
             return str(entity.get(attr, match.group(0)))
         
-        result = re.sub(pattern, replacer, value)
+        result = _ENTITY_VAR_PATTERN.sub(replacer, value)
         
         # If entire string was a variable, return the actual value
         if value.startswith("${entity.") and value.endswith("}"):
@@ -707,8 +788,211 @@ class JourneyEngine:
                 **result,
             })
         
+        self._active_timelines.release_if_complete(timeline)
         return results
     
+    def run_population(
+        self,
+        entities: list[Any],
+        journey: JourneySpecification | CompiledJourney,
+        entity_type: str = "patient",
+        start_date: date | None = None,
+        parameters: dict[str, Any] | None = None,
+        up_to_date: date | None = None,
+        context: dict[str, Any] | None = None,
+        workers: int | None = None,
+        shard_size: int | None = None,
+    ) -> EventTable:
+        """Schedule and execute a journey for many entities in bulk.
+        
+        The journey is compiled once and each entity is converted to a dict
+        once. Unlike calling ``create_timeline`` per entity, probabilistic
+        events draw from a per-entity stream (derived from the engine seed,
+        entity ID and journey ID), so results do not depend on entity order
+        or on ``workers``. Timelines are not registered as active.
+        
+        Args:
+            entities: Entities (patients, members, etc.)
+            journey: Journey specification, or one compiled with
+                ``CompiledJourney.compile``
+            entity_type: Type identifier for the entities
+            start_date: When timelines start (default today)
+            parameters: Override journey parameters
+            up_to_date: Execute events up to this date (default all)
+            context: Additional execution context passed to handlers
+            workers: Run entity shards in this many processes; handlers
+                and entities must be picklable, and handler side effects
+                on entities stay in the worker
+            shard_size: Entities per shard (default: four shards per worker)
+            
+        Returns:
+            EventTable with one row per scheduled event, in entity order
+        """
+        compiled = (
+            journey if isinstance(journey, CompiledJourney)
+            else CompiledJourney.compile(journey)
+        )
+        entities = list(entities)
+        options = _PopulationOptions(
+            entity_type=entity_type,
+            start_date=start_date or date.today(),
+            parameters=parameters or {},
+            up_to_date=up_to_date or date.max,
+            context=context or {},
+        )
+        
+        if workers and workers > 1 and len(entities) > 1:
+            return self._run_population_sharded(
+                compiled, entities, options, workers, shard_size
+            )
+        
+        table = EventTable()
+        for entity in entities:
+            self._run_entity(compiled, entity, options, table)
+        return table
+    
+    def _run_population_sharded(
+        self,
+        compiled: CompiledJourney,
+        entities: list[Any],
+        options: _PopulationOptions,
+        workers: int,
+        shard_size: int | None = None,
+    ) -> EventTable:
+        """Run entity shards in a process pool and merge them in order."""
+        size = shard_size or -(-len(entities) // (workers * 4))
+        shards = [entities[i:i + size] for i in range(0, len(entities), size)]
+        
+        worker_engine = copy.copy(self)
+        worker_engine._active_timelines = TimelineRegistry()
+        
+        table = EventTable()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=_init_population_worker,
+            initargs=(worker_engine, compiled, options),
+        ) as pool:
+            for shard_table in pool.map(_run_population_shard, shards):
+                table.extend(shard_table)
+        return table
+    
+    def _run_entity(
+        self,
+        compiled: CompiledJourney,
+        entity: Any,
+        options: _PopulationOptions,
+        table: EventTable,
+    ) -> None:
+        """Schedule and execute one entity's events into the table."""
+        entity_id = self._get_entity_id(entity)
+        entity_dict = self._entity_to_dict(entity)
+        condition_context = self._build_context(entity, options.entity_type, options.parameters)
+        rng = random.Random(self._derive_seed(entity_id, compiled.journey_id))
+        seed_hash = hashlib.md5(f"{self.seed or 0}:{entity_id}:".encode())
+        
+        scheduled_events: dict[str, date] = {}
+        current_date = options.start_date
+        scheduled: list[tuple[JourneyTimelineEvent, CompiledEvent]] = []
+        
+        for step in compiled.events:
+            if step.probability < 1.0 and rng.random() > step.probability:
+                continue
+            if step.conditions and not self._evaluate_conditions(
+                step.conditions, condition_context
+            ):
+                continue
+            
+            if step.depends_on:
+                base_date = scheduled_events.get(step.depends_on, current_date)
+            else:
+                base_date = current_date
+            
+            # Same seed as _derive_seed, reusing the hashed entity prefix
+            event_hash = seed_hash.copy()
+            event_hash.update(step.event_id_bytes)
+            event_seed = int(event_hash.hexdigest()[:8], 16)
+            if step.fixed_delay is not None:
+                event_date = base_date + step.fixed_delay
+            else:
+                event_date = base_date + step.delay.to_timedelta(event_seed)
+            
+            scheduled.append((JourneyTimelineEvent(
+                timeline_event_id=f"{entity_id}_{step.event_id}_{event_seed}",
+                journey_id=compiled.journey_id,
+                event_definition_id=step.event_id,
+                scheduled_date=event_date,
+                event_type=step.event_type,
+                event_name=step.name,
+                product=step.product,
+                condition=step.condition,
+                parameters=dict(step.parameters),
+            ), step))
+            scheduled_events[step.event_id] = event_date
+            if not step.depends_on:
+                current_date = event_date
+        
+        # Stable sort keeps same-date events in journey order, as Timeline does
+        scheduled.sort(key=lambda pair: pair[0].scheduled_date)
+        
+        for event, step in scheduled:
+            outputs = error = None
+            if event.scheduled_date <= options.up_to_date:
+                status, outputs, error = self._execute_compiled_event(
+                    event, step, entity, entity_dict, options.context
+                )
+            else:
+                status = "pending"
+            table.append(
+                entity_id=entity_id,
+                timeline_event_id=event.timeline_event_id,
+                event_definition_id=event.event_definition_id,
+                event_type=event.event_type,
+                event_name=event.event_name,
+                product=event.product,
+                scheduled_date=event.scheduled_date,
+                status=status,
+                parameters=event.resolved_parameters or event.parameters,
+                outputs=outputs,
+                error=error,
+            )
+    
+    def _execute_compiled_event(
+        self,
+        event: JourneyTimelineEvent,
+        step: CompiledEvent,
+        entity: Any,
+        entity_dict: dict[str, Any],
+        context: dict[str, Any],
+    ) -> tuple[str, dict[str, Any] | None, str | None]:
+        """Execute one event like ``execute_event``; returns (status, outputs, error)."""
+        handler = self._handlers.get(event.product, {}).get(event.event_type)
+        if handler is None:
+            return "skipped", None, f"No handler for {event.product}/{event.event_type}"
+        
+        try:
+            resolved_params = event.parameters
+            if step.templated_keys:
+                resolved_params = dict(resolved_params)
+                for key in step.templated_keys:
+                    resolved_params[key] = self._resolve_entity_var(
+                        resolved_params[key], entity_dict
+                    )
+            event.resolved_parameters = resolved_params
+            
+            exec_context = dict(context)
+            exec_context["event_parameters"] = resolved_params
+            
+            result = handler(entity, event, exec_context)
+            event.status = "executed"
+            event.executed_at = datetime.utcnow()
+            event.result = result
+            
+            self._process_triggers(event, result, exec_context)
+            return "executed", result, None
+        except Exception as e:
+            event.status = "failed"
+            return "failed", None, str(e)
+    
     def _process_triggers(
         self,
         event: JourneyTimelineEvent,
@@ -771,6 +1055,150 @@ class JourneyEngine:
         return f"{entity_id}_{event_def_id}_{self._derive_seed(entity_id, event_def_id)}"
 
 
+# =============================================================================
+# Batch Execution
+# =============================================================================
+
+@dataclass(frozen=True)
+class CompiledEvent:
+    """An event definition with per-event work done once at compile time."""
+    
+    event_id: str
+    event_id_bytes: bytes
+    name: str
+    event_type: str
+    product: str
+    probability: float
+    conditions: tuple[EventCondition, ...]
+    depends_on: str | None
+    delay: DelaySpec
+    fixed_delay: timedelta | None  # Set when the delay is not randomized
+    condition: str | None
+    parameters: dict[str, Any]
+    templated_keys: tuple[str, ...]  # Parameters containing ${entity.x}
+
+
+@dataclass(frozen=True)
+class CompiledJourney:
+    """A JourneySpecification prepared for bulk execution.
+    
+    Example:
+        >>> compiled = CompiledJourney.compile(journey)
+        >>> table = engine.run_population(patients, compiled)
+    """
+    
+    journey_id: str
+    events: tuple[CompiledEvent, ...]
+    
+    @classmethod
+    def compile(cls, journey: JourneySpecification) -> CompiledJourney:
+        """Compile a journey specification.
+        
+        Args:
+            journey: Journey to compile
+            
+        Returns:
+            CompiledJourney with events in definition order
+        """
+        events = []
+        for event_def in journey.events:
+            delay = event_def.delay
+            randomized = delay.distribution in ("uniform", "normal")
+            events.append(CompiledEvent(
+                event_id=event_def.event_id,
+                event_id_bytes=event_def.event_id.encode(),
+                name=event_def.name,
+                event_type=event_def.event_type,
+                product=event_def.product,
+                probability=event_def.probability,
+                conditions=tuple(event_def.conditions),
+                depends_on=event_def.depends_on,
+                delay=delay,
+                fixed_delay=None if randomized else timedelta(days=delay.days),
+                condition=event_def.condition,
+                parameters=dict(event_def.parameters),
+                templated_keys=tuple(
+                    key for key, value in event_def.parameters.items()
+                    if isinstance(value, str) and "${entity." in value
+                ),
+            ))
+        return cls(journey_id=journey.journey_id, events=tuple(events))
+
+
+@dataclass
+class EventTable:
+    """Columnar table of journey events produced by ``run_population``.
+    
+    ``status`` is "executed", "skipped" (no handler), "failed" or
+    "pending" (scheduled after ``up_to_date``).
+    """
+    
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "entity_id",
+        "timeline_event_id",
+        "event_definition_id",
+        "event_type",
+        "event_name",
+        "product",
+        "scheduled_date",
+        "status",
+        "parameters",
+        "outputs",
+        "error",
+    )
+    
+    columns: dict[str, list[Any]] = field(
+        default_factory=lambda: {name: [] for name in EventTable.COLUMNS}
+    )
+    
+    def __len__(self) -> int:
+        return len(self.columns["entity_id"])
+    
+    def append(self, **row: Any) -> None:
+        """Append one event row."""
+        for name in self.COLUMNS:
+            self.columns[name].append(row.get(name))
+    
+    def extend(self, other: EventTable) -> None:
+        """Append all rows of another table."""
+        for name in self.COLUMNS:
+            self.columns[name].extend(other.columns[name])
+    
+    def to_records(self) -> list[dict[str, Any]]:
+        """Convert to a list of row dicts."""
+        return [dict(zip(self.COLUMNS, row)) for row in zip(*self.columns.values())]
+
+
+@dataclass(frozen=True)
+class _PopulationOptions:
+    entity_type: str
+    start_date: date
+    parameters: dict[str, Any]
+    up_to_date: date
+    context: dict[str, Any]
+
+
+# Per-process state for sharded run_population
+_population_worker: tuple[JourneyEngine, CompiledJourney, _PopulationOptions] | None = None
+
+
+def _init_population_worker(
+    engine: JourneyEngine,
+    compiled: CompiledJourney,
+    options: _PopulationOptions,
+) -> None:
+    global _population_worker
+    _population_worker = (engine, compiled, options)
+
+
+def _run_population_shard(entities: list[Any]) -> EventTable:
+    engine, compiled, options = _population_worker
+    table = EventTable()
+    for entity in entities:
+        engine._run_entity(compiled, entity, options, table)
+    return table
+
+
 # =============================================================================
 # Convenience Functions
 # =============================================================================
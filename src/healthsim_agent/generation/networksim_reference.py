@@ -173,6 +173,58 @@ FACILITY_TYPE_MAP = {
 }
 
 
+# Column order of provider/facility rows, as selected from the network schema
+PROVIDER_COLUMNS = (
+    "npi", "entity_type_code", "last_name", "first_name", "middle_name",
+    "credential", "gender", "organization_name",
+    "practice_city", "practice_state", "practice_zip",
+    "practice_address_1", "practice_address_2", "phone",
+    "taxonomy_1", "taxonomy_2", "taxonomy_3",
+)
+FACILITY_COLUMNS = ("ccn", "name", "type", "city", "state", "zip", "phone", "beds", "subtype")
+
+PROVIDER_SELECT = ", ".join(PROVIDER_COLUMNS)
+FACILITY_SELECT = ", ".join(FACILITY_COLUMNS)
+
+
+def provider_from_row(row: tuple) -> Provider:
+    """Build a Provider from a row in PROVIDER_COLUMNS order."""
+    return Provider(
+        npi=row[0],
+        entity_type=EntityType(row[1]) if row[1] else EntityType.INDIVIDUAL,
+        last_name=row[2],
+        first_name=row[3],
+        middle_name=row[4],
+        credential=row[5],
+        gender=row[6],
+        organization_name=row[7],
+        practice_city=row[8],
+        practice_state=row[9],
+        practice_zip=row[10],
+        practice_address_1=row[11],
+        practice_address_2=row[12],
+        phone=row[13],
+        taxonomy_1=row[14],
+        taxonomy_2=row[15],
+        taxonomy_3=row[16],
+    )
+
+
+def facility_from_row(row: tuple) -> Facility:
+    """Build a Facility from a row in FACILITY_COLUMNS order."""
+    return Facility(
+        ccn=row[0],
+        name=row[1],
+        facility_type=row[2],
+        city=row[3],
+        state=row[4],
+        zip_code=row[5],
+        phone=row[6],
+        beds=row[7],
+        subtype=row[8],
+    )
+
+
 def get_healthsim_db_path() -> Path:
     """Get the path to canonical HealthSim DuckDB database."""
     module_path = Path(__file__).resolve()
@@ -235,11 +287,7 @@ class NetworkSimResolver:
             order_clause = "ORDER BY npi"
         
         query = f"""
-            SELECT npi, entity_type_code, last_name, first_name, middle_name,
-                   credential, gender, organization_name,
-                   practice_city, practice_state, practice_zip,
-                   practice_address_1, practice_address_2, phone,
-                   taxonomy_1, taxonomy_2, taxonomy_3
+            SELECT {PROVIDER_SELECT}
             FROM {self.SCHEMA}.providers
             WHERE {where_clause}
             {order_clause}
@@ -248,29 +296,7 @@ class NetworkSimResolver:
         
         results = self.conn.execute(query, params).fetchall()
         
-        providers = []
-        for row in results:
-            providers.append(Provider(
-                npi=row[0],
-                entity_type=EntityType(row[1]) if row[1] else EntityType.INDIVIDUAL,
-                last_name=row[2],
-                first_name=row[3],
-                middle_name=row[4],
-                credential=row[5],
-                gender=row[6],
-                organization_name=row[7],
-                practice_city=row[8],
-                practice_state=row[9],
-                practice_zip=row[10],
-                practice_address_1=row[11],
-                practice_address_2=row[12],
-                phone=row[13],
-                taxonomy_1=row[14],
-                taxonomy_2=row[15],
-                taxonomy_3=row[16],
-            ))
-        
-        return providers
+        return [provider_from_row(row) for row in results]
     
     def find_facilities(
         self,
@@ -320,7 +346,7 @@ class NetworkSimResolver:
             order_clause = "ORDER BY ccn"
         
         query = f"""
-            SELECT ccn, name, type, city, state, zip, phone, beds, subtype
+            SELECT {FACILITY_SELECT}
             FROM {self.SCHEMA}.facilities
             WHERE {where_clause}
             {order_clause}
@@ -329,30 +355,12 @@ class NetworkSimResolver:
         
         results = self.conn.execute(query, params).fetchall()
         
-        facilities = []
-        for row in results:
-            facilities.append(Facility(
-                ccn=row[0],
-                name=row[1],
-                facility_type=row[2],
-                city=row[3],
-                state=row[4],
-                zip_code=row[5],
-                phone=row[6],
-                beds=row[7],
-                subtype=row[8],
-            ))
-        
-        return facilities
+        return [facility_from_row(row) for row in results]
     
     def get_provider_by_npi(self, npi: str) -> Optional[Provider]:
         """Get a specific provider by NPI."""
         query = f"""
-            SELECT npi, entity_type_code, last_name, first_name, middle_name,
-                   credential, gender, organization_name,
-                   practice_city, practice_state, practice_zip,
-                   practice_address_1, practice_address_2, phone,
-                   taxonomy_1, taxonomy_2, taxonomy_3
+            SELECT {PROVIDER_SELECT}
             FROM {self.SCHEMA}.providers
             WHERE npi = ?
         """
@@ -361,30 +369,12 @@ class NetworkSimResolver:
         if not result:
             return None
         
-        return Provider(
-            npi=result[0],
-            entity_type=EntityType(result[1]) if result[1] else EntityType.INDIVIDUAL,
-            last_name=result[2],
-            first_name=result[3],
-            middle_name=result[4],
-            credential=result[5],
-            gender=result[6],
-            organization_name=result[7],
-            practice_city=result[8],
-            practice_state=result[9],
-            practice_zip=result[10],
-            practice_address_1=result[11],
-            practice_address_2=result[12],
-            phone=result[13],
-            taxonomy_1=result[14],
-            taxonomy_2=result[15],
-            taxonomy_3=result[16],
-        )
+        return provider_from_row(result)
     
     def get_facility_by_ccn(self, ccn: str) -> Optional[Facility]:
         """Get a specific facility by CCN."""
         query = f"""
-            SELECT ccn, name, type, city, state, zip, phone, beds, subtype
+            SELECT {FACILITY_SELECT}
             FROM {self.SCHEMA}.facilities
             WHERE ccn = ?
         """
@@ -393,17 +383,7 @@ class NetworkSimResolver:
         if not result:
             return None
         
-        return Facility(
-            ccn=result[0],
-            name=result[1],
-            facility_type=result[2],
-            city=result[3],
-            state=result[4],
-            zip_code=result[5],
-            phone=result[6],
-            beds=result[7],
-            subtype=result[8],
-        )
+        return facility_from_row(result)
     
     def count_providers(
         self,
@@ -536,35 +516,24 @@ def assign_provider_to_patient(
     specialty: Optional[str] = None,
     seed: Optional[int] = None,
 ) -> Optional[Provider]:
-    """Assign a provider to a patient based on geography."""
+    """Assign a provider to a patient based on geography.
+    
+    Draws from the connection's shared ProviderPool, so each state and
+    specialty is queried once however many patients are assigned. Prefers
+    providers in the patient's city, falling back to the whole state.
+    """
+    from healthsim_agent.generation.provider_pool import get_provider_pool
+    
     if seed is not None:
         random.seed(seed)
     
-    resolver = NetworkSimResolver(conn)
-    
     taxonomy = None
     if specialty:
         taxonomy = TAXONOMY_MAP.get(specialty.lower().replace(" ", "_"), specialty)
     
-    if patient_city:
-        providers = resolver.find_providers(
-            state=patient_state,
-            city=patient_city,
-            taxonomy=taxonomy,
-            limit=100,
-            random_sample=False,
-        )
-        if providers:
-            return random.choice(providers)
-    
-    providers = resolver.find_providers(
-        state=patient_state,
-        taxonomy=taxonomy,
-        limit=100,
-        random_sample=False,
+    return get_provider_pool(conn).draw_provider(
+        patient_state, city=patient_city, taxonomy=taxonomy, rng=random,
     )
-    
-    return random.choice(providers) if providers else None
 
 
 def assign_facility_to_patient(
@@ -574,36 +543,19 @@ def assign_facility_to_patient(
     facility_type: str = "hospital",
     seed: Optional[int] = None,
 ) -> Optional[Facility]:
-    """Assign a facility to a patient based on geography."""
-    if seed is not None:
-        random.seed(seed)
+    """Assign a facility to a patient based on geography.
     
-    resolver = NetworkSimResolver(conn)
+    Draws from the connection's shared ProviderPool, preferring facilities
+    in the patient's city and falling back to the whole state.
+    """
+    from healthsim_agent.generation.provider_pool import get_provider_pool
     
-    resolved_type = FACILITY_TYPE_MAP.get(
-        facility_type.lower().replace(" ", "_"),
-        facility_type
-    )
-    
-    if patient_city:
-        facilities = resolver.find_facilities(
-            state=patient_state,
-            city=patient_city,
-            facility_type=resolved_type,
-            limit=50,
-            random_sample=False,
-        )
-        if facilities:
-            return random.choice(facilities)
+    if seed is not None:
+        random.seed(seed)
     
-    facilities = resolver.find_facilities(
-        state=patient_state,
-        facility_type=resolved_type,
-        limit=50,
-        random_sample=False,
+    return get_provider_pool(conn).draw_facility(
+        patient_state, city=patient_city, facility_type=facility_type, rng=random,
     )
-    
-    return random.choice(facilities) if facilities else None
 
 
 __all__ = [
@@ -616,6 +568,10 @@ __all__ = [
     "TAXONOMY_MAP",
     "FACILITY_TYPE_MAP",
     "NetworkSimResolver",
+    "PROVIDER_COLUMNS",
+    "FACILITY_COLUMNS",
+    "provider_from_row",
+    "facility_from_row",
     "get_healthsim_db_path",
     "get_networksim_db_path",
     "get_providers_by_geography",
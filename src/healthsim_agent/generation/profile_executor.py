@@ -13,22 +13,35 @@ Ported from: healthsim-workspace/packages/core/src/healthsim/generation/profile_
 from __future__ import annotations
 
 import random
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Any
-
-from healthsim_agent.generation.distributions import (
-    CategoricalDistribution,
-    ConditionalDistribution,
-    NormalDistribution,
-    UniformDistribution,
-    create_distribution,
-)
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any
+
 from healthsim_agent.generation.profile import (
     DistributionSpec,
     DistributionType,
     ProfileSpecification,
 )
+from healthsim_agent.generation.distributions import np, require_numpy
+from healthsim_agent.generation.sampler_plan import SamplerPlan, compile_distribution
+
+if TYPE_CHECKING:
+    from healthsim_agent.generation.sinks import EntitySink
+
+
+_MASK64 = (1 << 64) - 1
+_SPLITMIX_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _splitmix64(state: int) -> int:
+    """SplitMix64 output function for a 64-bit state."""
+    z = (state + _SPLITMIX_GAMMA) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
 
 
 class HierarchicalSeedManager:
@@ -38,6 +51,10 @@ class HierarchicalSeedManager:
     - Adding entities without changing existing ones
     - Filtering subset while maintaining reproducibility
     - Parallel generation with deterministic results
+
+    Entity seeds are the outputs of a SplitMix64 sequence keyed by the
+    master seed, so the seed for any index is computed directly without
+    generating the seeds before it.
     """
 
     def __init__(self, master_seed: int | None = None):
@@ -47,8 +64,7 @@ class HierarchicalSeedManager:
             master_seed: Root seed (None for random)
         """
         self.master_seed = master_seed or random.randint(0, 2**31 - 1)
-        self._master_rng = random.Random(self.master_seed)
-        self._entity_seeds: dict[int, int] = {}
+        self._key = _splitmix64(self.master_seed & _MASK64)
 
     def get_entity_seed(self, entity_index: int) -> int:
         """Get deterministic seed for a specific entity.
@@ -57,14 +73,10 @@ class HierarchicalSeedManager:
             entity_index: 0-based index of the entity
 
         Returns:
-            Seed value for this entity
+            Seed value for this entity (31-bit)
         """
-        if entity_index not in self._entity_seeds:
-            # Generate seeds sequentially to ensure determinism
-            while len(self._entity_seeds) <= entity_index:
-                idx = len(self._entity_seeds)
-                self._entity_seeds[idx] = self._master_rng.randint(0, 2**31 - 1)
-        return self._entity_seeds[entity_index]
+        state = (self._key + entity_index * _SPLITMIX_GAMMA) & _MASK64
+        return _splitmix64(state) >> 33
 
     def get_entity_rng(self, entity_index: int) -> random.Random:
         """Get a Random instance for a specific entity.
@@ -77,10 +89,29 @@ class HierarchicalSeedManager:
         """
         return random.Random(self.get_entity_seed(entity_index))
 
+    def get_column_generator(self, column: str) -> np.random.Generator:
+        """Get a numpy Generator for filling one attribute column.
+
+        Each column gets an independent stream derived from the master
+        seed and the column name, so adding a column never shifts the
+        values of another. Requires numpy.
+
+        Args:
+            column: Column name (e.g. "age", "lab:a1c")
+
+        Returns:
+            numpy Generator seeded for this column
+        """
+        require_numpy()
+        entropy = [self.master_seed, zlib.crc32(column.encode("utf-8"))]
+        return np.random.default_rng(np.random.SeedSequence(entropy))
+
     def reset(self) -> None:
-        """Reset to initial state."""
-        self._master_rng = random.Random(self.master_seed)
-        self._entity_seeds.clear()
+        """Reset to initial state.
+
+        Seeds are derived statelessly from the master seed, so there is
+        nothing to rewind; kept for API compatibility.
+        """
 
 
 @dataclass
@@ -159,6 +190,119 @@ class ValidationReport:
         return len(self.errors) == 0 and all(m.passed for m in self.metrics)
 
 
+class ValidationAccumulator:
+    """Streaming counters for validating entities against a profile.
+
+    Entities can be fed in any number of batches; ``report()`` yields the
+    same metrics as validating the full list at once, without keeping the
+    entities.
+
+    Example:
+        >>> accumulator = ValidationAccumulator(profile)
+        >>> for batch in executor.execute_iter(batch_size=10_000):
+        ...     accumulator.update(batch)
+        >>> report = accumulator.report()
+    """
+
+    def __init__(self, profile: ProfileSpecification):
+        self.profile = profile
+        self.count = 0
+        self.age_sum = 0
+        self.age_count = 0
+        self.gender_counts: dict[str, int] = {}
+        self.condition_counts: dict[str, int] = {}
+        self.plan_counts: dict[str, int] = {}
+
+    def update(self, entities: list[GeneratedEntity]) -> None:
+        """Add a batch of entities to the counters."""
+        self.count += len(entities)
+        for entity in entities:
+            if entity.age is not None:
+                self.age_sum += entity.age
+                self.age_count += 1
+            if entity.gender is not None:
+                self.gender_counts[entity.gender] = self.gender_counts.get(entity.gender, 0) + 1
+            for code in set(entity.conditions):
+                self.condition_counts[code] = self.condition_counts.get(code, 0) + 1
+            if entity.plan_type is not None:
+                self.plan_counts[entity.plan_type] = self.plan_counts.get(entity.plan_type, 0) + 1
+
+    def report(self) -> ValidationReport:
+        """Build the validation report from the counters so far."""
+        report = ValidationReport()
+        if not self.count:
+            report.warnings.append("No entities generated")
+            return report
+
+        if self.profile.demographics:
+            self._demographic_metrics(report)
+        if self.profile.clinical:
+            self._clinical_metrics(report)
+        if self.profile.coverage:
+            self._coverage_metrics(report)
+
+        return report
+
+    def _share(self, counts: dict[str, int], key: str) -> float:
+        return counts.get(key, 0) / self.count
+
+    def _demographic_metrics(self, report: ValidationReport) -> None:
+        demo = self.profile.demographics
+
+        # Validate age distribution
+        if demo.age and demo.age.type == DistributionType.NORMAL and self.age_count:
+            report.metrics.append(ValidationMetric(
+                name="Age (mean)",
+                target=demo.age.mean or 0,
+                actual=self.age_sum / self.age_count,
+                tolerance=0.05,
+            ))
+
+        # Validate gender distribution
+        if demo.gender and demo.gender.type == DistributionType.CATEGORICAL:
+            for gender, target_pct in (demo.gender.weights or {}).items():
+                report.metrics.append(ValidationMetric(
+                    name=f"Gender {gender}",
+                    target=target_pct,
+                    actual=self._share(self.gender_counts, gender),
+                    tolerance=0.05,
+                ))
+
+    def _clinical_metrics(self, report: ValidationReport) -> None:
+        clinical = self.profile.clinical
+
+        # Validate primary condition prevalence
+        if clinical.primary_condition:
+            pc = clinical.primary_condition
+            report.metrics.append(ValidationMetric(
+                name=f"Primary condition {pc.code}",
+                target=pc.prevalence,
+                actual=self._share(self.condition_counts, pc.code),
+                tolerance=0.05,
+            ))
+
+        # Validate comorbidities
+        for comorbidity in clinical.comorbidities or []:
+            report.metrics.append(ValidationMetric(
+                name=f"Comorbidity {comorbidity.code}",
+                target=comorbidity.prevalence,
+                actual=self._share(self.condition_counts, comorbidity.code),
+                tolerance=0.10,  # More tolerance for comorbidities
+            ))
+
+    def _coverage_metrics(self, report: ValidationReport) -> None:
+        coverage = self.profile.coverage
+
+        # Validate plan distribution
+        for plan, target_pct in (coverage.plan_distribution or {}).items():
+            report.metrics.append(ValidationMetric(
+                name=f"Plan {plan}",
+                target=target_pct,
+                actual=self._share(self.plan_counts, plan),
+                tolerance=0.05,
+            ))
+
+
 class ProfileExecutor:
     """Execute profile specifications to generate entities.
 
@@ -168,6 +312,9 @@ class ProfileExecutor:
     3. Order-independent: Entity N is always the same regardless of count
     4. Validating: Output distributions checked against specification
 
+    The specification is compiled once into an immutable SamplerPlan on
+    first use, so per-entity generation only draws random numbers.
+
     Example:
         >>> spec = ProfileSpecification.from_json(json_string)
         >>> executor = ProfileExecutor(spec)
@@ -190,17 +337,36 @@ class ProfileExecutor:
         self.seed = seed or profile.generation.seed or random.randint(0, 2**31 - 1)
         self.seed_manager = HierarchicalSeedManager(self.seed)
         self._reference_data: dict[str, Any] = {}
+        self._plan: SamplerPlan | None = None
+
+    @property
+    def plan(self) -> SamplerPlan:
+        """Sampler plan compiled from the profile (built once, lazily)."""
+        if self._plan is None:
+            self._plan = SamplerPlan.compile(self.profile)
+        return self._plan
 
     def execute(
         self,
         count_override: int | None = None,
         dry_run: bool = False,
+        vectorized: bool = False,
+        workers: int | None = None,
+        shard_size: int | None = None,
     ) -> ExecutionResult:
         """Execute the profile to generate entities.
 
         Args:
             count_override: Override the count from profile
             dry_run: If True, generate sample only
+            vectorized: Fill each attribute column at once with numpy
+                (see ``sample_columns``). Output is deterministic per seed
+                but differs from the default per-entity stream.
+            workers: Generate index shards in this many processes. Shards
+                are merged in index order, so the entities are identical
+                to a serial run. Ignored when ``vectorized`` is set.
+            shard_size: Entities per shard (default: count split into
+                four shards per worker)
 
         Returns:
             ExecutionResult with generated entities and validation
@@ -212,10 +378,12 @@ class ProfileExecutor:
         if dry_run:
             count = min(count, 5)  # Sample only
 
-        entities: list[GeneratedEntity] = []
-        for i in range(count):
-            entity = self._generate_entity(i)
-            entities.append(entity)
+        if vectorized:
+            entities = self._entities_from_columns(self.sample_columns(count), count)
+        elif workers and workers > 1 and count > 1:
+            entities = self._execute_sharded(count, workers, shard_size)
+        else:
+            entities = [self._generate_entity(i) for i in range(count)]
 
         duration = time.time() - start_time
         validation = self._validate(entities)
@@ -229,6 +397,199 @@ class ProfileExecutor:
             duration_seconds=duration,
         )
 
+    def execute_iter(
+        self,
+        count_override: int | None = None,
+        batch_size: int = 10_000,
+    ) -> Iterator[list[GeneratedEntity]]:
+        """Generate entities lazily in fixed-size batches.
+
+        Only one batch is held at a time; entities are identical to those
+        from ``execute()`` with the same seed.
+
+        Args:
+            count_override: Override the count from profile
+            batch_size: Entities per yielded batch
+
+        Yields:
+            Lists of at most ``batch_size`` entities, in index order
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        count = count_override or self.profile.generation.count
+        for start in range(0, count, batch_size):
+            stop = min(start + batch_size, count)
+            yield [self._generate_entity(i) for i in range(start, stop)]
+
+    def execute_to_sink(
+        self,
+        sink: EntitySink,
+        count_override: int | None = None,
+        batch_size: int = 10_000,
+    ) -> ExecutionResult:
+        """Stream generated entities into a sink with bounded memory.
+
+        Validation metrics are accumulated batch by batch, so the result
+        matches ``execute()`` except that ``entities`` is left empty.
+        The sink is closed when generation finishes.
+
+        Args:
+            sink: Destination such as NDJSONSink, ParquetSink or DuckDBSink
+            count_override: Override the count from profile
+            batch_size: Entities generated and written per batch
+
+        Returns:
+            ExecutionResult with count and validation (no entities)
+        """
+        import time
+        start_time = time.time()
+
+        accumulator = ValidationAccumulator(self.profile)
+        with sink:
+            for batch in self.execute_iter(count_override, batch_size):
+                sink.write(batch)
+                accumulator.update(batch)
+
+        return ExecutionResult(
+            profile_id=self.profile.id,
+            seed=self.seed,
+            count=accumulator.count,
+            entities=[],
+            validation=accumulator.report(),
+            duration_seconds=time.time() - start_time,
+        )
+
+    def _execute_sharded(
+        self,
+        count: int,
+        workers: int,
+        shard_size: int | None = None,
+    ) -> list[GeneratedEntity]:
+        """Generate entities in index shards across a process pool.
+
+        Each worker builds its own executor once (same profile and seed);
+        ``map`` returns shards in submission order, which is index order.
+        """
+        size = shard_size or -(-count // (workers * 4))
+        shards = [(start, min(start + size, count)) for start in range(0, count, size)]
+
+        entities: list[GeneratedEntity] = []
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=_init_shard_worker,
+            initargs=(self.profile, self.seed),
+        ) as pool:
+            for shard in pool.map(_generate_shard, shards):
+                entities.extend(shard)
+        return entities
+
+    def sample_columns(self, count: int) -> dict[str, np.ndarray]:
+        """Sample every profile attribute for ``count`` entities as columns.
+
+        Each column is drawn in one call from its own generator (see
+        ``HierarchicalSeedManager.get_column_generator``). Requires numpy.
+
+        Columns present depend on the profile: ``age``, ``birth_month``,
+        ``birth_day``, ``gender``, ``race``, ``ethnicity``, ``severity``,
+        ``plan_type``, ``condition:<code>`` (bool masks) and
+        ``lab:<name>``.
+
+        Args:
+            count: Number of entities
+
+        Returns:
+            Dict of column name to numpy array of length ``count``
+        """
+        require_numpy()
+        plan = self.plan
+        seeds = self.seed_manager
+        columns: dict[str, np.ndarray] = {}
+
+        if plan.age:
+            columns["age"] = plan.age.sample_array(
+                count, seeds.get_column_generator("age"), as_int=True
+            )
+            birth = seeds.get_column_generator("birth_date")
+            columns["birth_month"] = birth.integers(1, 12, count, endpoint=True)
+            columns["birth_day"] = birth.integers(1, 28, count, endpoint=True)
+
+        for name in ("gender", "race", "ethnicity"):
+            dist = getattr(plan, name)
+            if dist:
+                columns[name] = dist.sample_array(count, seeds.get_column_generator(name))
+
+        # Conditions, in the order the scalar path appends them
+        condition_prevalence = list(plan.comorbidities)
+        if plan.primary_condition:
+            condition_prevalence.insert(0, plan.primary_condition)
+        for code, prevalence in condition_prevalence:
+            draws = seeds.get_column_generator(f"condition:{code}").random(count)
+            columns[f"condition:{code}"] = draws < prevalence
+
+        if plan.severity:
+            columns["severity"] = plan.severity.sample_array(
+                count, seeds.get_column_generator("severity")
+            )
+
+        context = {"severity": columns["severity"]} if "severity" in columns else None
+        for lab_name, lab_dist in plan.lab_values:
+            columns[f"lab:{lab_name}"] = lab_dist.sample_array(
+                count, seeds.get_column_generator(f"lab:{lab_name}"), context=context
+            )
+
+        if plan.plan_choice:
+            columns["plan_type"] = plan.plan_choice.sample_array(
+                count, seeds.get_column_generator("plan_type")
+            )
+        elif plan.plan_type:
+            columns["plan_type"] = plan.plan_type.sample_array(
+                count, seeds.get_column_generator("plan_type")
+            )
+
+        return columns
+
+    def _entities_from_columns(
+        self,
+        columns: dict[str, np.ndarray],
+        count: int,
+    ) -> list[GeneratedEntity]:
+        """Materialize GeneratedEntity objects from sampled columns."""
+        plan = self.plan
+        values = {name: column.tolist() for name, column in columns.items()}
+        condition_codes = [
+            name.split(":", 1)[1] for name in values if name.startswith("condition:")
+        ]
+        lab_names = [name for name, _ in plan.lab_values]
+        birth_year = date.today().year
+
+        entities: list[GeneratedEntity] = []
+        for i in range(count):
+            entity = GeneratedEntity(index=i, seed=self.seed_manager.get_entity_seed(i))
+            if "age" in values:
+                entity.age = values["age"][i]
+                entity.birth_date = date(
+                    birth_year - entity.age, values["birth_month"][i], values["birth_day"][i]
+                )
+            entity.gender = values["gender"][i] if "gender" in values else None
+            entity.race = values["race"][i] if "race" in values else None
+            entity.ethnicity = values["ethnicity"][i] if "ethnicity" in values else None
+            if plan.has_geography:
+                entity.state = plan.state
+                entity.county_fips = plan.county_fips
+            entity.conditions = [
+                code for code in condition_codes if values[f"condition:{code}"][i]
+            ]
+            if "severity" in values:
+                entity.severity = values["severity"][i]
+                entity.attributes["severity"] = entity.severity
+            entity.lab_values = {name: values[f"lab:{name}"][i] for name in lab_names}
+            if plan.has_coverage:
+                entity.coverage_type = plan.coverage_type
+                entity.plan_type = values["plan_type"][i] if "plan_type" in values else None
+            entities.append(entity)
+
+        return entities
+
     def _generate_entity(self, index: int) -> GeneratedEntity:
         """Generate a single entity at the given index.
 
@@ -238,23 +599,22 @@ class ProfileExecutor:
         Returns:
             Generated entity with all attributes
         """
-        rng = self.seed_manager.get_entity_rng(index)
-        entity = GeneratedEntity(
-            index=index,
-            seed=self.seed_manager.get_entity_seed(index),
-        )
+        plan = self.plan
+        seed = self.seed_manager.get_entity_seed(index)
+        rng = random.Random(seed)
+        entity = GeneratedEntity(index=index, seed=seed)
 
         # Generate demographics
         if self.profile.demographics:
-            self._generate_demographics(entity, rng)
+            self._generate_demographics(entity, rng, plan)
 
         # Generate clinical attributes
         if self.profile.clinical:
-            self._generate_clinical(entity, rng)
+            self._generate_clinical(entity, rng, plan)
 
         # Generate coverage
-        if self.profile.coverage:
-            self._generate_coverage(entity, rng)
+        if plan.has_coverage:
+            self._generate_coverage(entity, rng, plan)
 
         return entity
 
@@ -262,15 +622,12 @@ class ProfileExecutor:
         self,
         entity: GeneratedEntity,
         rng: random.Random,
+        plan: SamplerPlan,
     ) -> None:
         """Generate demographic attributes for an entity."""
-        demo = self.profile.demographics
-        if not demo:
-            return
-
         # Age
-        if demo.age:
-            entity.age = self._sample_distribution(demo.age, rng, as_int=True)
+        if plan.age:
+            entity.age = plan.age.sample(rng, as_int=True)
             # Calculate birth date from age
             today = date.today()
             birth_year = today.year - entity.age
@@ -281,93 +638,77 @@ class ProfileExecutor:
             )
 
         # Gender
-        if demo.gender:
-            entity.gender = self._sample_distribution(demo.gender, rng)
+        if plan.gender:
+            entity.gender = plan.gender.sample(rng)
 
         # Race
-        if demo.race:
-            entity.race = self._sample_distribution(demo.race, rng)
+        if plan.race:
+            entity.race = plan.race.sample(rng)
 
         # Ethnicity
-        if demo.ethnicity:
-            entity.ethnicity = self._sample_distribution(demo.ethnicity, rng)
+        if plan.ethnicity:
+            entity.ethnicity = plan.ethnicity.sample(rng)
 
         # Geography (from reference or explicit)
-        if demo.geography or demo.reference:
-            self._generate_geography(entity, rng)
+        if plan.has_geography:
+            self._generate_geography(entity, rng, plan)
 
     def _generate_geography(
         self,
         entity: GeneratedEntity,
         rng: random.Random,
+        plan: SamplerPlan,
     ) -> None:
         """Generate geographic attributes."""
-        demo = self.profile.demographics
-        ref = demo.geography or demo.reference if demo else None
-        if not ref:
-            return
-
         # For now, use simple state/county assignment
         # TODO: Integrate with PopulationSim reference data
-        if ref.state:
-            entity.state = ref.state
-        if ref.fips:
-            entity.county_fips = ref.fips
-        elif ref.code:
-            entity.county_fips = ref.code
+        if plan.state:
+            entity.state = plan.state
+        if plan.county_fips:
+            entity.county_fips = plan.county_fips
 
     def _generate_clinical(
         self,
         entity: GeneratedEntity,
         rng: random.Random,
+        plan: SamplerPlan,
     ) -> None:
         """Generate clinical attributes for an entity."""
-        clinical = self.profile.clinical
-        if not clinical:
-            return
-
         # Primary condition
-        if clinical.primary_condition:
-            pc = clinical.primary_condition
-            if rng.random() < pc.prevalence:
-                entity.conditions.append(pc.code)
+        if plan.primary_condition:
+            code, prevalence = plan.primary_condition
+            if rng.random() < prevalence:
+                entity.conditions.append(code)
 
         # Severity (affects lab values)
-        if clinical.severity:
-            entity.severity = self._sample_distribution(clinical.severity, rng)
+        if plan.severity:
+            entity.severity = plan.severity.sample(rng)
             entity.attributes["severity"] = entity.severity
 
         # Comorbidities
-        if clinical.comorbidities:
-            for comorbidity in clinical.comorbidities:
-                if rng.random() < comorbidity.prevalence:
-                    entity.conditions.append(comorbidity.code)
+        for code, prevalence in plan.comorbidities:
+            if rng.random() < prevalence:
+                entity.conditions.append(code)
 
         # Lab values (potentially conditional on severity)
-        if clinical.lab_values:
+        if plan.lab_values:
             context = {"severity": entity.severity} if entity.severity else {}
-            for lab_name, lab_dist in clinical.lab_values.items():
-                value = self._sample_distribution(lab_dist, rng, context=context)
-                entity.lab_values[lab_name] = value
+            for lab_name, lab_dist in plan.lab_values:
+                entity.lab_values[lab_name] = lab_dist.sample(rng, context=context)
 
     def _generate_coverage(
         self,
         entity: GeneratedEntity,
         rng: random.Random,
+        plan: SamplerPlan,
     ) -> None:
         """Generate coverage attributes for an entity."""
-        coverage = self.profile.coverage
-        if not coverage:
-            return
-
-        entity.coverage_type = coverage.type
+        entity.coverage_type = plan.coverage_type
 
-        if coverage.plan_distribution:
-            plans = list(coverage.plan_distribution.keys())
-            weights = list(coverage.plan_distribution.values())
-            entity.plan_type = rng.choices(plans, weights=weights, k=1)[0]
-        elif coverage.plan_type:
-            entity.plan_type = self._sample_distribution(coverage.plan_type, rng)
+        if plan.plan_choice:
+            entity.plan_type = plan.plan_choice.sample(rng)
+        elif plan.plan_type:
+            entity.plan_type = plan.plan_type.sample(rng)
 
     def _sample_distribution(
         self,
@@ -378,6 +719,9 @@ class ProfileExecutor:
     ) -> Any:
         """Sample a value from a distribution specification.
 
+        Compiles the spec on every call; entity generation uses the
+        precompiled ``plan`` instead.
+
         Args:
             dist_spec: The distribution specification
             rng: Random number generator
@@ -387,29 +731,7 @@ class ProfileExecutor:
         Returns:
             Sampled value
         """
-        spec_dict = dist_spec.model_dump(exclude_none=True)
-        dist = create_distribution(spec_dict)
-
-        # Handle conditional distributions
-        if dist_spec.type == DistributionType.CONDITIONAL and context:
-            cond_dist = ConditionalDistribution(
-                rules=dist_spec.rules or [],
-                default=dist_spec.default,
-            )
-            value = cond_dist.sample(context, rng)
-        else:
-            value = dist.sample(rng)
-
-        # Apply bounds if specified
-        if dist_spec.min is not None and value < dist_spec.min:
-            value = dist_spec.min
-        if dist_spec.max is not None and value > dist_spec.max:
-            value = dist_spec.max
-
-        if as_int:
-            value = int(round(value))
-
-        return value
+        return compile_distribution(dist_spec).sample(rng, as_int=as_int, context=context)
 
     def _validate(self, entities: list[GeneratedEntity]) -> ValidationReport:
         """Validate generated entities against profile specification.
@@ -420,129 +742,23 @@ class ProfileExecutor:
         Returns:
             Validation report with metrics and issues
         """
-        report = ValidationReport()
-        if not entities:
-            report.warnings.append("No entities generated")
-            return report
+        accumulator = ValidationAccumulator(self.profile)
+        accumulator.update(entities)
+        return accumulator.report()
 
-        count = len(entities)
 
-        # Validate demographics
-        if self.profile.demographics:
-            self._validate_demographics(entities, report)
+# Per-process executor used by sharded execution
+_shard_executor: ProfileExecutor | None = None
 
-        # Validate clinical
-        if self.profile.clinical:
-            self._validate_clinical(entities, report)
 
-        # Validate coverage
-        if self.profile.coverage:
-            self._validate_coverage(entities, report)
-
-        return report
-
-    def _validate_demographics(
-        self,
-        entities: list[GeneratedEntity],
-        report: ValidationReport,
-    ) -> None:
-        """Validate demographic distributions."""
-        demo = self.profile.demographics
-        if not demo:
-            return
-
-        count = len(entities)
-
-        # Validate age distribution
-        if demo.age and demo.age.type == DistributionType.NORMAL:
-            ages = [e.age for e in entities if e.age is not None]
-            if ages:
-                actual_mean = sum(ages) / len(ages)
-                target_mean = demo.age.mean or 0
-                report.metrics.append(ValidationMetric(
-                    name="Age (mean)",
-                    target=target_mean,
-                    actual=actual_mean,
-                    tolerance=0.05,
-                ))
-
-        # Validate gender distribution
-        if demo.gender and demo.gender.type == DistributionType.CATEGORICAL:
-            for gender, target_pct in (demo.gender.weights or {}).items():
-                actual_count = sum(1 for e in entities if e.gender == gender)
-                actual_pct = actual_count / count if count > 0 else 0
-                report.metrics.append(ValidationMetric(
-                    name=f"Gender {gender}",
-                    target=target_pct,
-                    actual=actual_pct,
-                    tolerance=0.05,
-                ))
-
-    def _validate_clinical(
-        self,
-        entities: list[GeneratedEntity],
-        report: ValidationReport,
-    ) -> None:
-        """Validate clinical distributions."""
-        clinical = self.profile.clinical
-        if not clinical:
-            return
+def _init_shard_worker(profile: ProfileSpecification, seed: int) -> None:
+    global _shard_executor
+    _shard_executor = ProfileExecutor(profile, seed=seed)
 
-        count = len(entities)
 
-        # Validate primary condition prevalence
-        if clinical.primary_condition:
-            pc = clinical.primary_condition
-            actual_count = sum(
-                1 for e in entities if pc.code in e.conditions
-            )
-            actual_pct = actual_count / count if count > 0 else 0
-            report.metrics.append(ValidationMetric(
-                name=f"Primary condition {pc.code}",
-                target=pc.prevalence,
-                actual=actual_pct,
-                tolerance=0.05,
-            ))
-
-        # Validate comorbidities
-        if clinical.comorbidities:
-            for comorbidity in clinical.comorbidities:
-                actual_count = sum(
-                    1 for e in entities if comorbidity.code in e.conditions
-                )
-                actual_pct = actual_count / count if count > 0 else 0
-                report.metrics.append(ValidationMetric(
-                    name=f"Comorbidity {comorbidity.code}",
-                    target=comorbidity.prevalence,
-                    actual=actual_pct,
-                    tolerance=0.10,  # More tolerance for comorbidities
-                ))
-
-    def _validate_coverage(
-        self,
-        entities: list[GeneratedEntity],
-        report: ValidationReport,
-    ) -> None:
-        """Validate coverage distributions."""
-        coverage = self.profile.coverage
-        if not coverage:
-            return
-
-        count = len(entities)
-
-        # Validate plan distribution
-        if coverage.plan_distribution:
-            for plan, target_pct in coverage.plan_distribution.items():
-                actual_count = sum(
-                    1 for e in entities if e.plan_type == plan
-                )
-                actual_pct = actual_count / count if count > 0 else 0
-                report.metrics.append(ValidationMetric(
-                    name=f"Plan {plan}",
-                    target=target_pct,
-                    actual=actual_pct,
-                    tolerance=0.05,
-                ))
+def _generate_shard(bounds: tuple[int, int]) -> list[GeneratedEntity]:
+    start, stop = bounds
+    return [_shard_executor._generate_entity(i) for i in range(start, stop)]
 
 
 def execute_profile(
@@ -0,0 +1,347 @@
+"""In-memory provider and facility pools for NPPES-backed assignment.
+
+Assigning real providers one query at a time (a scan of the 8.9M-row
+network.providers table per patient or claim) does not scale to large
+cohorts. A ProviderPool loads each geography/taxonomy slice once, keeps it
+column-wise with a city index, and serves seeded random draws from memory.
+Slices are kept in least-recently-used order and evicted once the pool
+holds more than ``max_rows`` rows in total, so a few statewide slices
+cannot pin an unbounded share of the table in memory.
+
+get_provider_pool() returns the pool shared by every generator in the
+process (one per connection). Slices do not expire on their own:
+reset_provider_pools() drops them, and import_all_reference_data() calls
+it next to invalidate_reference_caches(). Anything else that reimports
+the network tables should call it too.
+
+Example:
+    >>> pool = get_provider_pool(conn)
+    >>> rng = random.Random(42)
+    >>> provider = pool.draw_provider("TX", city="Austin", taxonomy="207Q00000X", rng=rng)
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Sequence
+
+from healthsim_agent.generation.distributions import np
+from healthsim_agent.generation.networksim_reference import (
+    FACILITY_COLUMNS,
+    FACILITY_SELECT,
+    FACILITY_TYPE_MAP,
+    PROVIDER_COLUMNS,
+    PROVIDER_SELECT,
+    EntityType,
+    Facility,
+    Provider,
+    facility_from_row,
+    provider_from_row,
+)
+
+
+# About 1 KB of Python objects per 17-column provider row
+DEFAULT_MAX_ROWS = 250_000
+
+
+def _fetch_columns(cursor, columns: Sequence[str]) -> dict[str, list]:
+    """Fetch a query result as one Python list per column.
+
+    Uses DuckDB's numpy fetch when numpy is installed (about 4x faster than
+    building row tuples for wide results); NULLs come back as None either way.
+    """
+    if np is not None:
+        arrays = cursor.fetchnumpy()
+        return {name: arrays[name].tolist() for name in columns}
+    rows = cursor.fetchall()
+    transposed = zip(*rows) if rows else ([] for _ in columns)
+    return {name: list(values) for name, values in zip(columns, transposed)}
+
+
+class _Slice:
+    """Rows of one slice stored as columns, in key (NPI/CCN) order."""
+
+    COLUMNS: tuple[str, ...] = ()
+    CITY_COLUMN = ""
+
+    def __init__(self, columns: dict[str, list]):
+        self.columns = {name: columns[name] for name in self.COLUMNS}
+        self.size = len(self.columns[self.COLUMNS[0]])
+        self._city_index: dict[str, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def rows(self, city: str | None = None) -> Sequence[int]:
+        """Row numbers in the slice, or only those in a city (case-insensitive)."""
+        if not city:
+            return range(self.size)
+        if self._city_index is None:
+            index: dict[str, list[int]] = {}
+            for row, value in enumerate(self.columns[self.CITY_COLUMN]):
+                if value:
+                    index.setdefault(value.upper(), []).append(row)
+            self._city_index = index
+        return self._city_index.get(city.upper(), [])
+
+    def row(self, row: int) -> tuple:
+        """One row as a tuple in COLUMNS order."""
+        return tuple(values[row] for values in self.columns.values())
+
+    def draw_row(self, rng: Any, city: str | None = None) -> int | None:
+        """Draw a row number, preferring the city and falling back to the slice."""
+        rows = self.rows(city)
+        if not rows:
+            rows = self.rows()
+        return rng.choice(rows) if rows else None
+
+
+class ProviderSlice(_Slice):
+    """Providers matching one (state, taxonomy, entity type) filter."""
+
+    COLUMNS = PROVIDER_COLUMNS
+    CITY_COLUMN = "practice_city"
+
+    def provider(self, row: int) -> Provider:
+        return provider_from_row(self.row(row))
+
+
+class FacilitySlice(_Slice):
+    """Facilities matching one (state, facility type) filter."""
+
+    COLUMNS = FACILITY_COLUMNS
+    CITY_COLUMN = "city"
+
+    def facility(self, row: int) -> Facility:
+        return facility_from_row(self.row(row))
+
+
+class ProviderPool:
+    """Provider and facility slices loaded once and drawn from in memory.
+
+    Args:
+        conn: DuckDB connection with the network schema. Defaults to the
+            tools' shared read connection, looked up on each load.
+        max_rows: Total rows kept across slices before the least recently
+            used slices are evicted. The slice just loaded is always kept,
+            even when it alone is larger.
+    """
+
+    SCHEMA = "network"
+
+    def __init__(self, conn=None, max_rows: int = DEFAULT_MAX_ROWS):
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        self.conn = conn
+        self.max_rows = max_rows
+        self._slices: OrderedDict[tuple, _Slice] = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._loads = 0
+        self._evictions = 0
+
+    def provider_slice(
+        self,
+        state: str,
+        taxonomy: str | None = None,
+        taxonomy_patterns: Sequence[str] = (),
+        entity_type: EntityType | None = None,
+    ) -> ProviderSlice:
+        """Get the providers in a state, loading them on first use.
+
+        Args:
+            state: Practice state abbreviation
+            taxonomy: Taxonomy code matched against taxonomy_1..3
+            taxonomy_patterns: LIKE patterns matched against taxonomy_1
+                (e.g. "207Q%"), any of which may match
+            entity_type: Individual or organization providers only
+        """
+        state = state.upper()
+        patterns = tuple(taxonomy_patterns)
+        key = ("provider", state, taxonomy, patterns, entity_type)
+
+        def load() -> ProviderSlice:
+            conditions = ["practice_state = ?"]
+            params: list[Any] = [state]
+            if taxonomy:
+                conditions.append("(taxonomy_1 = ? OR taxonomy_2 = ? OR taxonomy_3 = ?)")
+                params.extend([taxonomy] * 3)
+            if patterns:
+                conditions.append(
+                    "(" + " OR ".join("taxonomy_1 LIKE ?" for _ in patterns) + ")"
+                )
+                params.extend(patterns)
+            if entity_type:
+                conditions.append("entity_type_code = ?")
+                params.append(entity_type.value)
+
+            query = f"""
+                SELECT {PROVIDER_SELECT}
+                FROM {self.SCHEMA}.providers
+                WHERE {" AND ".join(conditions)}
+                ORDER BY npi
+            """
+            cursor = self._connection().execute(query, params)
+            return ProviderSlice(_fetch_columns(cursor, PROVIDER_COLUMNS))
+
+        return self._get_slice(key, load)
+
+    def facility_slice(self, state: str, facility_type: str | None = None) -> FacilitySlice:
+        """Get the facilities in a state, loading them on first use.
+
+        Args:
+            state: State abbreviation
+            facility_type: Facility type name (see FACILITY_TYPE_MAP) or code
+        """
+        state = state.upper()
+        type_code = None
+        if facility_type:
+            type_code = FACILITY_TYPE_MAP.get(
+                facility_type.lower().replace(" ", "_"), facility_type
+            )
+        key = ("facility", state, type_code)
+
+        def load() -> FacilitySlice:
+            conditions = ["state = ?"]
+            params: list[Any] = [state]
+            if type_code:
+                conditions.append("type = ?")
+                params.append(type_code)
+
+            query = f"""
+                SELECT {FACILITY_SELECT}
+                FROM {self.SCHEMA}.facilities
+                WHERE {" AND ".join(conditions)}
+                ORDER BY ccn
+            """
+            cursor = self._connection().execute(query, params)
+            return FacilitySlice(_fetch_columns(cursor, FACILITY_COLUMNS))
+
+        return self._get_slice(key, load)
+
+    def draw_provider(
+        self,
+        state: str,
+        city: str | None = None,
+        taxonomy: str | None = None,
+        taxonomy_patterns: Sequence[str] = (),
+        entity_type: EntityType | None = None,
+        rng: Any = None,
+    ) -> Provider | None:
+        """Draw a random provider, from the city if it has any, else the state.
+
+        Args:
+            rng: random.Random (or the random module) to draw with; defaults
+                to the module-level generator
+
+        Returns:
+            Provider, or None if the slice is empty
+        """
+        providers = self.provider_slice(state, taxonomy, taxonomy_patterns, entity_type)
+        row = providers.draw_row(rng or random, city)
+        return providers.provider(row) if row is not None else None
+
+    def draw_facility(
+        self,
+        state: str,
+        city: str | None = None,
+        facility_type: str | None = None,
+        rng: Any = None,
+    ) -> Facility | None:
+        """Draw a random facility, from the city if it has any, else the state.
+
+        Returns:
+            Facility, or None if the slice is empty
+        """
+        facilities = self.facility_slice(state, facility_type)
+        row = facilities.draw_row(rng or random, city)
+        return facilities.facility(row) if row is not None else None
+
+    def clear(self) -> None:
+        """Drop all loaded slices (e.g. after reference data changes)."""
+        with self._lock:
+            self._slices.clear()
+            self._rows = 0
+
+    def stats(self) -> dict[str, int]:
+        """Slice counts and cache hit/load/eviction totals."""
+        with self._lock:
+            return {
+                "slices": len(self._slices),
+                "rows": self._rows,
+                "hits": self._hits,
+                "loads": self._loads,
+                "evictions": self._evictions,
+            }
+
+    def _get_slice(self, key: tuple, load) -> Any:
+        with self._lock:
+            found = self._slices.get(key)
+            if found is not None:
+                self._slices.move_to_end(key)
+                self._hits += 1
+                return found
+
+            found = load()
+            self._loads += 1
+            self._slices[key] = found
+            self._rows += len(found)
+            while self._rows > self.max_rows and len(self._slices) > 1:
+                _, evicted = self._slices.popitem(last=False)
+                self._rows -= len(evicted)
+                self._evictions += 1
+            return found
+
+    def _connection(self):
+        if self.conn is not None:
+            return self.conn
+        from healthsim_agent.tools.connection import get_manager
+        return get_manager().get_read_connection()
+
+
+# =============================================================================
+# Shared Pools
+# =============================================================================
+
+_default_pool: ProviderPool | None = None
+_connection_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+
+
+def get_provider_pool(conn=None) -> ProviderPool:
+    """Get the pool shared by all generators for a connection.
+
+    Args:
+        conn: DuckDB connection, or None for the tools' shared database
+    """
+    global _default_pool
+    with _pools_lock:
+        if conn is None:
+            if _default_pool is None:
+                _default_pool = ProviderPool()
+            return _default_pool
+        pool = _connection_pools.get(conn)
+        if pool is None:
+            pool = _connection_pools[conn] = ProviderPool(conn)
+        return pool
+
+
+def reset_provider_pools() -> None:
+    """Drop every shared pool so the next draws reload from the database."""
+    global _default_pool
+    with _pools_lock:
+        _default_pool = None
+        _connection_pools.clear()
+
+
+__all__ = [
+    "ProviderPool",
+    "ProviderSlice",
+    "FacilitySlice",
+    "get_provider_pool",
+    "reset_provider_pools",
+]
@@ -0,0 +1,387 @@
+"""Compiled sampler plans for profile execution.
+
+A ProfileSpecification is compiled once into an immutable SamplerPlan:
+cumulative-weight tables, parsed age bands, precomputed log-normal
+parameters and bound min/max clamps. Generating an entity then only
+draws random numbers; no pydantic models are built per attribute.
+
+Every sampler consumes the random stream exactly like the distribution
+classes in ``distributions.py`` do, so a plan produces identical output
+for the same seed.
+
+Samplers also expose ``sample_array(n, generator)`` for column-at-a-time
+generation from a ``numpy.random.Generator`` (requires numpy). Array
+draws use numpy's stream, so they are reproducible per seed but are not
+the same values as the scalar path.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from bisect import bisect
+from dataclasses import dataclass
+from typing import Any
+
+from healthsim_agent.generation.distributions import (
+    AgeBandDistribution,
+    CategoricalDistribution,
+    ConditionalDistribution,
+    np,
+    require_numpy,
+)
+from healthsim_agent.generation.profile import (
+    DistributionSpec,
+    DistributionType,
+    ProfileSpecification,
+)
+
+
+@dataclass(frozen=True)
+class ChoiceSampler:
+    """Weighted choice over a prebuilt cumulative-weight table.
+
+    Mirrors ``random.Random.choices(..., k=1)`` draw for draw.
+    """
+
+    items: tuple[Any, ...]
+    cum_weights: tuple[float, ...]
+
+    @classmethod
+    def from_weights(cls, items: list[Any], weights: list[float]) -> ChoiceSampler:
+        if not items:
+            raise ValueError("No options to select from")
+        cum_weights: list[float] = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            cum_weights.append(total)
+        if cum_weights[-1] <= 0.0:
+            raise ValueError("Total of weights must be greater than zero")
+        return cls(items=tuple(items), cum_weights=tuple(cum_weights))
+
+    def sample(self, rng: random.Random) -> Any:
+        total = self.cum_weights[-1] + 0.0
+        index = bisect(self.cum_weights, rng.random() * total, 0, len(self.items) - 1)
+        return self.items[index]
+
+    def sample_indices(self, n: int, generator: np.random.Generator) -> np.ndarray:
+        """Draw n item indices at once."""
+        require_numpy()
+        cum_weights = np.asarray(self.cum_weights)
+        draws = generator.random(n) * cum_weights[-1]
+        return np.minimum(np.searchsorted(cum_weights, draws, side="right"), len(self.items) - 1)
+
+    def sample_array(self, n: int, generator: np.random.Generator) -> np.ndarray:
+        require_numpy()
+        items = np.empty(len(self.items), dtype=object)
+        items[:] = self.items
+        return items[self.sample_indices(n, generator)]
+
+
+@dataclass(frozen=True)
+class NormalSampler:
+    """Gaussian draw with fixed parameters."""
+
+    mean: float
+    std_dev: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.gauss(self.mean, self.std_dev)
+
+    def sample_array(self, n: int, generator: np.random.Generator) -> np.ndarray:
+        return generator.normal(self.mean, self.std_dev, n)
+
+
+@dataclass(frozen=True)
+class LogNormalSampler:
+    """Log-normal draw with mu/sigma derived once from mean/std_dev."""
+
+    mu: float
+    sigma: float
+    min_val: float
+    degenerate: bool = False
+
+    @classmethod
+    def from_moments(cls, mean: float, std_dev: float, min_val: float) -> LogNormalSampler:
+        if mean <= 0:
+            return cls(mu=0.0, sigma=0.0, min_val=min_val, degenerate=True)
+        variance = std_dev**2
+        mu = math.log(mean**2 / math.sqrt(variance + mean**2))
+        sigma = math.sqrt(math.log(1 + variance / mean**2))
+        return cls(mu=mu, sigma=sigma, min_val=min_val)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.degenerate:
+            return self.min_val
+        return max(rng.lognormvariate(self.mu, self.sigma), self.min_val)
+
+    def sample_array(self, n: int, generator: np.random.Generator) -> np.ndarray:
+        require_numpy()
+        if self.degenerate:
+            return np.full(n, float(self.min_val))
+        return np.maximum(generator.lognormal(self.mu, self.sigma, n), self.min_val)
+
+
+@dataclass(frozen=True)
+class UniformSampler:
+    """Uniform draw between two fixed bounds."""
+
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+
+    def sample_array(self, n: int, generator: np.random.Generator) -> np.ndarray:
+        return generator.uniform(self.low, self.high, n)
+
+
+@dataclass(frozen=True)
+class AgeBandSampler:
+    """Band choice followed by a uniform integer age within the band."""
+
+    bands: ChoiceSampler
+
+    def sample(self, rng: random.Random) -> int:
+        min_age, max_age = self.bands.sample(rng)
+        return rng.randint(min_age, max_age)
+
+    def sample_array(self, n: int, generator: np.random.Generator) -> np.ndarray:
+        require_numpy()
+        bounds = np.asarray(self.bands.items)
+        chosen = bounds[self.bands.sample_indices(n, generator)]
+        return generator.integers(chosen[:, 0], chosen[:, 1], endpoint=True)
+
+
+@dataclass(frozen=True)
+class CompiledDistribution:
+    """A distribution spec compiled to a sampler plus its min/max clamps."""
+
+    sampler: Any
+    min: float | None = None
+    max: float | None = None
+    conditional: ConditionalDistribution | None = None
+
+    def sample(
+        self,
+        rng: random.Random,
+        as_int: bool = False,
+        context: dict[str, Any] | None = None,
+    ) -> Any:
+        """Draw one value, applying conditional rules, clamps and rounding."""
+        if self.conditional is not None:
+            value = self.conditional.sample(context or {}, rng)
+        else:
+            value = self.sampler.sample(rng)
+
+        if self.min is not None and value < self.min:
+            value = self.min
+        if self.max is not None and value > self.max:
+            value = self.max
+
+        if as_int:
+            value = int(round(value))
+
+        return value
+
+    def sample_array(
+        self,
+        n: int,
+        generator: np.random.Generator,
+        as_int: bool = False,
+        context: dict[str, np.ndarray] | None = None,
+    ) -> np.ndarray:
+        """Draw n values as a column, applying clamps and rounding.
+
+        Args:
+            n: Number of values
+            generator: numpy random generator
+            as_int: Round to integers (int64 array)
+            context: For conditional specs, column arrays keyed by attribute
+
+        Returns:
+            numpy array of length n
+        """
+        require_numpy()
+        if self.conditional is not None:
+            values = self.conditional.sample_array(n, generator, context)
+        else:
+            values = self.sampler.sample_array(n, generator)
+
+        if self.min is not None or self.max is not None:
+            values = np.clip(values, self.min, self.max)
+
+        if as_int:
+            values = np.rint(values.astype(float)).astype(np.int64)
+
+        return values
+
+
+def compile_distribution(spec: DistributionSpec) -> CompiledDistribution:
+    """Compile a DistributionSpec into a reusable sampler.
+
+    Validation that ``create_distribution`` performs (e.g. categorical
+    weights summing to 1.0) happens here, once, instead of per draw.
+
+    Args:
+        spec: The distribution specification
+
+    Returns:
+        CompiledDistribution bound to the spec's parameters and clamps
+
+    Raises:
+        ValueError: If the spec is invalid or of an unknown type
+    """
+    dist_type = spec.type
+    conditional = None
+    sampler: Any = None
+
+    if dist_type == DistributionType.CATEGORICAL:
+        weights = spec.weights or {}
+        # Reuse the model's weight-sum validation
+        CategoricalDistribution(weights=weights)
+        if not weights:
+            raise ValueError("No categories defined")
+        sampler = ChoiceSampler.from_weights(list(weights), list(weights.values()))
+
+    elif dist_type == DistributionType.NORMAL:
+        sampler = NormalSampler(
+            mean=spec.mean if spec.mean is not None else 0,
+            std_dev=spec.std_dev if spec.std_dev is not None else 1,
+        )
+
+    elif dist_type == DistributionType.LOG_NORMAL:
+        sampler = LogNormalSampler.from_moments(
+            mean=spec.mean if spec.mean is not None else 100,
+            std_dev=spec.std_dev if spec.std_dev is not None else 50,
+            min_val=spec.min if spec.min is not None else 0,
+        )
+
+    elif dist_type == DistributionType.UNIFORM:
+        sampler = UniformSampler(
+            low=spec.min if spec.min is not None else 0,
+            high=spec.max if spec.max is not None else 1,
+        )
+
+    elif dist_type == DistributionType.AGE_BANDS:
+        bands = spec.bands or {}
+        if not bands:
+            raise ValueError("No age bands defined")
+        parser = AgeBandDistribution(bands=bands)
+        sampler = AgeBandSampler(bands=ChoiceSampler.from_weights(
+            [parser._parse_band(label) for label in bands],
+            list(bands.values()),
+        ))
+
+    elif dist_type == DistributionType.EXPLICIT:
+        values = spec.values or []
+        if not values:
+            raise ValueError("No values to select from")
+        sampler = ChoiceSampler.from_weights(
+            [v["value"] for v in values],
+            [v["weight"] for v in values],
+        )
+
+    elif dist_type == DistributionType.CONDITIONAL:
+        conditional = ConditionalDistribution(
+            rules=spec.rules or [],
+            default=spec.default,
+        )
+
+    else:
+        raise ValueError(f"Unknown distribution type: {dist_type}")
+
+    return CompiledDistribution(
+        sampler=sampler,
+        min=spec.min,
+        max=spec.max,
+        conditional=conditional,
+    )
+
+
+def _compile_optional(spec: DistributionSpec | None) -> CompiledDistribution | None:
+    return compile_distribution(spec) if spec is not None else None
+
+
+@dataclass(frozen=True)
+class SamplerPlan:
+    """Immutable, precompiled view of a ProfileSpecification.
+
+    Built once per executor; holds only what entity generation needs.
+
+    Example:
+        >>> plan = SamplerPlan.compile(spec)
+        >>> age = plan.age.sample(rng, as_int=True)
+    """
+
+    # Demographics
+    age: CompiledDistribution | None = None
+    gender: CompiledDistribution | None = None
+    race: CompiledDistribution | None = None
+    ethnicity: CompiledDistribution | None = None
+    has_geography: bool = False
+    state: str | None = None
+    county_fips: str | None = None
+    # Clinical
+    primary_condition: tuple[str, float] | None = None
+    severity: CompiledDistribution | None = None
+    comorbidities: tuple[tuple[str, float], ...] = ()
+    lab_values: tuple[tuple[str, CompiledDistribution], ...] = ()
+    # Coverage
+    has_coverage: bool = False
+    coverage_type: str | None = None
+    plan_choice: ChoiceSampler | None = None
+    plan_type: CompiledDistribution | None = None
+
+    @classmethod
+    def compile(cls, profile: ProfileSpecification) -> SamplerPlan:
+        """Compile a profile specification into a sampler plan.
+
+        Args:
+            profile: The profile specification to compile
+
+        Returns:
+            SamplerPlan ready for repeated entity generation
+        """
+        fields: dict[str, Any] = {}
+
+        demo = profile.demographics
+        if demo:
+            fields["age"] = _compile_optional(demo.age)
+            fields["gender"] = _compile_optional(demo.gender)
+            fields["race"] = _compile_optional(demo.race)
+            fields["ethnicity"] = _compile_optional(demo.ethnicity)
+            ref = demo.geography or demo.reference
+            if ref:
+                fields["has_geography"] = True
+                fields["state"] = ref.state or None
+                fields["county_fips"] = ref.fips or ref.code or None
+
+        clinical = profile.clinical
+        if clinical:
+            pc = clinical.primary_condition
+            if pc:
+                fields["primary_condition"] = (pc.code, pc.prevalence)
+            fields["severity"] = _compile_optional(clinical.severity)
+            fields["comorbidities"] = tuple(
+                (c.code, c.prevalence) for c in clinical.comorbidities or []
+            )
+            fields["lab_values"] = tuple(
+                (name, compile_distribution(dist))
+                for name, dist in (clinical.lab_values or {}).items()
+            )
+
+        coverage = profile.coverage
+        if coverage:
+            fields["has_coverage"] = True
+            fields["coverage_type"] = coverage.type
+            if coverage.plan_distribution:
+                fields["plan_choice"] = ChoiceSampler.from_weights(
+                    list(coverage.plan_distribution),
+                    list(coverage.plan_distribution.values()),
+                )
+            elif coverage.plan_type:
+                fields["plan_type"] = compile_distribution(coverage.plan_type)
+
+        return cls(**fields)
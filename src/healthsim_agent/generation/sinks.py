@@ -0,0 +1,200 @@
+"""Entity sinks for streaming profile execution.
+
+A sink receives batches of GeneratedEntity objects from
+``ProfileExecutor.execute_to_sink`` and writes them out immediately, so
+memory stays bounded by the batch size rather than the cohort size.
+
+Sinks:
+- NDJSONSink: one JSON object per line
+- DuckDBSink: rows appended to a DuckDB table
+- ParquetSink: one Parquet part file per batch, written with DuckDB COPY
+
+Example:
+    >>> executor = ProfileExecutor(spec)
+    >>> result = executor.execute_to_sink(NDJSONSink("cohort.ndjson"))
+"""
+
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import duckdb
+
+if TYPE_CHECKING:
+    from healthsim_agent.generation.profile_executor import GeneratedEntity
+
+
+# Column name -> DuckDB type for flattened entities
+ENTITY_COLUMNS: dict[str, str] = {
+    "index": "BIGINT",
+    "seed": "BIGINT",
+    "age": "INTEGER",
+    "gender": "VARCHAR",
+    "birth_date": "DATE",
+    "race": "VARCHAR",
+    "ethnicity": "VARCHAR",
+    "state": "VARCHAR",
+    "county_fips": "VARCHAR",
+    "city": "VARCHAR",
+    "zip_code": "VARCHAR",
+    "conditions": "VARCHAR[]",
+    "severity": "VARCHAR",
+    "lab_values": "JSON",
+    "coverage_type": "VARCHAR",
+    "plan_type": "VARCHAR",
+    "identifiers": "JSON",
+    "attributes": "JSON",
+}
+
+_JSON_COLUMNS = ("lab_values", "identifiers", "attributes")
+
+
+def entity_to_record(entity: GeneratedEntity) -> dict[str, Any]:
+    """Convert an entity to a JSON-serializable dict.
+
+    Args:
+        entity: Generated entity
+
+    Returns:
+        Dict with the entity's fields; dates as ISO strings
+    """
+    record = asdict(entity)
+    if entity.birth_date is not None:
+        record["birth_date"] = entity.birth_date.isoformat()
+    return record
+
+
+def _entity_columns(entities: list[GeneratedEntity]) -> list[list[Any]]:
+    """Transpose a batch into one list per ENTITY_COLUMNS entry."""
+    columns: list[list[Any]] = []
+    for name in ENTITY_COLUMNS:
+        values = [getattr(entity, name) for entity in entities]
+        if name in _JSON_COLUMNS:
+            values = [json.dumps(value, default=str) for value in values]
+        columns.append(values)
+    return columns
+
+
+def _select_unnest_sql() -> str:
+    return "SELECT " + ", ".join(
+        f'UNNEST(?::{sql_type}[]) AS "{name}"'
+        for name, sql_type in ENTITY_COLUMNS.items()
+    )
+
+
+def _create_table_sql(table: str) -> str:
+    columns = ", ".join(f'"{name}" {sql_type}' for name, sql_type in ENTITY_COLUMNS.items())
+    return f"CREATE TABLE IF NOT EXISTS {table} ({columns})"
+
+
+class EntitySink(ABC):
+    """Destination for batches of generated entities.
+
+    Sinks are context managers; ``close()`` flushes and releases resources.
+    """
+
+    rows_written: int = 0
+
+    @abstractmethod
+    def write(self, entities: list[GeneratedEntity]) -> None:
+        """Write one batch of entities."""
+        ...
+
+    def close(self) -> None:
+        """Flush and release resources."""
+
+    def __enter__(self) -> EntitySink:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class NDJSONSink(EntitySink):
+    """Append entities to a newline-delimited JSON file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self.rows_written = 0
+
+    def write(self, entities: list[GeneratedEntity]) -> None:
+        self._file.writelines(
+            json.dumps(entity_to_record(entity), default=str) + "\n" for entity in entities
+        )
+        self.rows_written += len(entities)
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class DuckDBSink(EntitySink):
+    """Append entities to a DuckDB table, one columnar INSERT per batch.
+
+    Args:
+        connection: Open DuckDB connection (not closed by the sink)
+        table: Target table, created if missing
+        replace: Drop any existing table first
+    """
+
+    def __init__(
+        self,
+        connection: duckdb.DuckDBPyConnection,
+        table: str = "generated_entities",
+        replace: bool = False,
+    ):
+        self.connection = connection
+        self.table = table
+        self.rows_written = 0
+        if replace:
+            connection.execute(f"DROP TABLE IF EXISTS {table}")
+        connection.execute(_create_table_sql(table))
+        self._insert_sql = f"INSERT INTO {table} {_select_unnest_sql()}"
+
+    def write(self, entities: list[GeneratedEntity]) -> None:
+        if not entities:
+            return
+        self.connection.execute(self._insert_sql, _entity_columns(entities))
+        self.rows_written += len(entities)
+
+
+class ParquetSink(EntitySink):
+    """Write each batch as a Parquet part file in a directory.
+
+    Produces ``part-00000.parquet``, ``part-00001.parquet``, ... which can
+    be read back as one dataset, e.g.
+    ``SELECT * FROM read_parquet('out/*.parquet')``.
+
+    Args:
+        directory: Output directory (created if missing)
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rows_written = 0
+        self.files: list[Path] = []
+        self._connection = duckdb.connect()
+        self._select_sql = _select_unnest_sql()
+
+    def write(self, entities: list[GeneratedEntity]) -> None:
+        if not entities:
+            return
+        path = self.directory / f"part-{len(self.files):05d}.parquet"
+        self._connection.execute(
+            f"CREATE OR REPLACE TEMP TABLE _parquet_batch AS {self._select_sql}",
+            _entity_columns(entities),
+        )
+        quoted = str(path).replace("'", "''")
+        self._connection.execute(f"COPY _parquet_batch TO '{quoted}' (FORMAT PARQUET)")
+        self.files.append(path)
+        self.rows_written += len(entities)
+
+    def close(self) -> None:
+        self._connection.close()
@@ -8,7 +8,10 @@ Ported from: healthsim-workspace/packages/core/src/healthsim/generation/skill_re
 
 from __future__ import annotations
 
+import copy
+import json
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -59,12 +62,72 @@ def get_skills_root() -> Path:
     return current / "skills"
 
 
+# =============================================================================
+# Compiled Skill Lookups
+# =============================================================================
+
+@dataclass
+class _CompiledSkill:
+    """Lookup tables derived from one skill, each filled in on first use.
+    
+    - sections: section names -> content searched by mapped lookups
+    - headings: section names -> ``###`` headings (lowercased) and bodies
+    - config_values: embedded config key -> first value seen
+    - results: (lookup, context value) -> resolved parameters
+    """
+    skill: ParsedSkill
+    sections: dict[tuple[str, ...], str] = field(default_factory=dict)
+    headings: dict[tuple[str, ...], list[tuple[str, str]]] = field(default_factory=dict)
+    config_values: dict[Any, Any] | None = None
+    results: dict[tuple[str, str | None], dict[str, Any] | None] = field(default_factory=dict)
+
+
+def _heading_sections(content: str) -> list[tuple[str, str]]:
+    """Split content at every ``###`` into (heading, body) pairs.
+    
+    The heading is the rest of the line after ``###`` and any whitespace,
+    lowercased; the body runs to the next ``###``. This mirrors the regex
+    ``###\\s*<value>.*?\\n(.*?)(?=###|\\Z)`` so a context lookup is a scan
+    for the first heading starting with the value.
+    """
+    sections = []
+    start = content.find("###")
+    while start != -1:
+        text_start = start + 3
+        while text_start < len(content) and content[text_start].isspace():
+            text_start += 1
+        line_end = content.find("\n", text_start)
+        heading = content[text_start:line_end].lower()
+        if line_end == -1:
+            # Only a line break inside the whitespace can end the heading
+            line_end = content.rfind("\n", start + 3, text_start)
+            heading = ""
+        if line_end != -1:
+            body_end = content.find("###", line_end + 1)
+            body = content[line_end + 1:body_end if body_end != -1 else len(content)]
+            sections.append((heading, body))
+        start = content.find("###", start + 1)
+    return sections
+
+
 # =============================================================================
 # Skill Resolver
 # =============================================================================
 
 class SkillResolver:
-    """Resolves skill references to concrete parameter values."""
+    """Resolves skill references to concrete parameter values.
+    
+    Skill files are located through a name -> path index built from one
+    walk of the skills tree, and parsed through the loader's on-disk cache.
+    Each loaded skill is compiled into lookup tables (_CompiledSkill) and
+    results are memoized per (skill, lookup, context value), so resolving
+    the same reference for many entities does not re-scan the markdown.
+    """
+    
+    PRODUCT_DIRS = [
+        "patientsim", "membersim", "rxmembersim", "trialsim", "common", "networksim",
+        "populationsim",
+    ]
     
     LOOKUP_MAPPINGS = {
         "diagnosis_code": {
@@ -108,6 +171,8 @@ class SkillResolver:
         self.skills_root = skills_root or get_skills_root()
         self.loader = SkillLoader(self.skills_root)
         self._cache: dict[str, ParsedSkill] = {}
+        self._skill_paths: dict[str, list[Path]] | None = None
+        self._compiled: dict[str, _CompiledSkill] = {}
     
     def load_skill(self, skill_name: str) -> ParsedSkill | None:
         """Load a skill by name."""
@@ -127,19 +192,31 @@ class SkillResolver:
             return None
     
     def _find_skill_file(self, skill_name: str) -> Path | None:
-        """Find skill file by name."""
+        """Find skill file by name.
+        
+        A file directly under a product directory wins; otherwise the first
+        file anywhere in the tree with a matching stem.
+        """
         normalized = skill_name.lower().replace("_", "-")
+        candidates = self._skill_file_index().get(normalized)
+        if not candidates:
+            return None
         
-        for product in ["patientsim", "membersim", "rxmembersim", "trialsim", "common", "networksim", "populationsim"]:
+        for product in self.PRODUCT_DIRS:
             path = self.skills_root / product / f"{normalized}.md"
-            if path.exists():
+            if path in candidates:
                 return path
         
-        for md_file in self.skills_root.rglob("*.md"):
-            if md_file.stem.lower() == normalized:
-                return md_file
-        
-        return None
+        return candidates[0]
+    
+    def _skill_file_index(self) -> dict[str, list[Path]]:
+        """Map lowercased file stem -> skill files, built on first use."""
+        if self._skill_paths is None:
+            index: dict[str, list[Path]] = {}
+            for md_file in self.loader.skill_files():
+                index.setdefault(md_file.stem.lower(), []).append(md_file)
+            self._skill_paths = index
+        return self._skill_paths
     
     def resolve(
         self,
@@ -193,21 +270,62 @@ class SkillResolver:
         lookup: str,
         context: dict[str, Any],
     ) -> dict[str, Any] | None:
-        """Look up a value in the skill."""
+        """Look up a value in the skill (memoized per context value)."""
         mapping = self.LOOKUP_MAPPINGS.get(lookup)
+        context_value = None
+        if mapping and (context_key := mapping.get("context_key")):
+            context_value = context.get(context_key, "")
         
+        compiled = self._compile(skill)
+        key = (lookup, context_value)
+        try:
+            cached = key in compiled.results
+        except TypeError:
+            # Unhashable context value: compute without memoizing
+            return self._compute_lookup(compiled, lookup, mapping, context_value)
+        if not cached:
+            compiled.results[key] = self._compute_lookup(
+                compiled, lookup, mapping, context_value,
+            )
+        
+        # Deep copy so callers cannot alter the memoized result
+        return copy.deepcopy(compiled.results[key])
+    
+    def _compile(self, skill: ParsedSkill) -> _CompiledSkill:
+        """Get the lookup tables for a skill, creating them on first use."""
+        key = str(skill.path)
+        compiled = self._compiled.get(key)
+        if compiled is None or compiled.skill is not skill:
+            compiled = _CompiledSkill(skill)
+            self._compiled[key] = compiled
+        return compiled
+    
+    def _compute_lookup(
+        self,
+        compiled: _CompiledSkill,
+        lookup: str,
+        mapping: dict | None,
+        context_value: Any,
+    ) -> dict[str, Any] | None:
+        """Look up a value using the skill's compiled tables."""
         if not mapping:
-            return self._direct_lookup(skill, lookup, context)
+            return self._direct_lookup(compiled, lookup)
         
-        sections = mapping.get("sections", [])
-        content = self._get_sections_content(skill, sections)
+        sections = tuple(mapping.get("sections", []))
+        content = compiled.sections.get(sections)
+        if content is None:
+            content = self._get_sections_content(compiled.skill, list(sections))
+            compiled.sections[sections] = content
         
         if not content:
             return None
         
-        if context_key := mapping.get("context_key"):
-            context_value = context.get(context_key, "").lower().replace("_", "-")
-            return self._context_lookup(content, context_value, mapping)
+        if context_value is not None:
+            context_value = context_value.lower().replace("_", "-")
+            headings = compiled.headings.get(sections)
+            if headings is None:
+                headings = compiled.headings[sections] = _heading_sections(content)
+            return self._context_lookup(headings, context_value)
         
         if pattern := mapping.get("pattern"):
             return self._pattern_lookup(content, pattern, mapping.get("fields"))
@@ -219,15 +337,19 @@ class SkillResolver:
     
     def _direct_lookup(
         self,
-        skill: ParsedSkill,
+        compiled: _CompiledSkill,
         lookup: str,
-        context: dict[str, Any],
     ) -> dict[str, Any] | None:
-        """Direct lookup in skill content."""
-        # Check embedded configs
-        for config in skill.embedded_configs:
-            if lookup in config.data:
-                return {"value": config.data[lookup]}
+        """Direct lookup of a key in the skill's embedded configs."""
+        if compiled.config_values is None:
+            values: dict[Any, Any] = {}
+            for config in compiled.skill.embedded_configs:
+                for config_key, config_value in config.data.items():
+                    values.setdefault(config_key, config_value)
+            compiled.config_values = values
+        
+        if lookup in compiled.config_values:
+            return {"value": compiled.config_values[lookup]}
         
         return None
     
@@ -240,7 +362,6 @@ class SkillResolver:
             section_name = config.section_name.lower()
             for target_section in sections:
                 if target_section.lower() in section_name:
-                    import json
                     content_parts.append(json.dumps(config.data))
         
         # Include raw markdown if no structured content found
@@ -251,23 +372,19 @@ class SkillResolver:
     
     def _context_lookup(
         self,
-        content: str,
+        headings: list[tuple[str, str]],
         context_value: str,
-        mapping: dict,
     ) -> dict[str, Any] | None:
-        """Look up based on context value."""
-        section_pattern = rf"###\s*{re.escape(context_value)}.*?\n(.*?)(?=###|\Z)"
-        match = re.search(section_pattern, content, re.IGNORECASE | re.DOTALL)
-        
-        if match:
-            section_content = match.group(1)
-            json_match = re.search(r"\{[^}]+\}", section_content, re.DOTALL)
-            if json_match:
-                import json
-                try:
-                    return json.loads(json_match.group())
-                except json.JSONDecodeError:
-                    pass
+        """Look up the JSON under the first ``###`` heading starting with the value."""
+        for heading, body in headings:
+            if heading.startswith(context_value):
+                json_match = re.search(r"\{[^}]+\}", body, re.DOTALL)
+                if json_match:
+                    try:
+                        return json.loads(json_match.group())
+                    except json.JSONDecodeError:
+                        pass
+                return None
         
         return None
     
@@ -288,8 +405,6 @@ class SkillResolver:
     
     def _json_lookup(self, content: str, json_key: str) -> dict[str, Any] | None:
         """Look up a key from JSON in content."""
-        import json
-        
         json_pattern = r"```json\s*([\s\S]*?)```"
         for match in re.finditer(json_pattern, content):
             try:
@@ -304,10 +419,9 @@ class SkillResolver:
     def list_skills(self) -> list[str]:
         """List available skills."""
         skills = []
-        if self.skills_root.exists():
-            for md_file in self.skills_root.rglob("*.md"):
-                if md_file.stem not in ("README", "SKILL"):
-                    skills.append(md_file.stem)
+        for md_file in self.loader.skill_files():
+            if md_file.stem not in ("README", "SKILL"):
+                skills.append(md_file.stem)
         return sorted(set(skills))
 
 
@@ -0,0 +1,301 @@
+"""Bounded registry of active journey timelines.
+
+JourneyEngine registers every timeline it creates so cross-product
+coordination can find it again by entity ID. In a long-running process
+that keeps generating cohorts, an unbounded dict grows forever. The
+registry supports these retention policies, which can be combined:
+
+- ``max_size``: keep at most this many timelines (least recently used
+  are evicted first)
+- ``drop_on_complete``: forget a timeline once it has no pending events
+- ``weak``: evicted timelines stay reachable only while something else
+  (e.g. an orchestrator result) still references them
+- ``spill_store``: evicted timelines that still matter (pending events or
+  cross-product links) are written to DuckDB and reloaded on demand
+
+With no options the registry keeps everything, as before.
+
+Example:
+    >>> registry = TimelineRegistry(max_size=10_000, drop_on_complete=True)
+    >>> engine = JourneyEngine(seed=42, timeline_registry=registry)
+    >>> registry.stats()["size"]
+    0
+"""
+
+from __future__ import annotations
+
+import json
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import duckdb
+
+if TYPE_CHECKING:
+    from healthsim_agent.generation.journey_engine import Timeline
+
+
+def timeline_to_dict(timeline: Timeline) -> dict[str, Any]:
+    """Convert a timeline to JSON-compatible primitives.
+
+    Event parameters and results are stored as-is; values JSON cannot
+    represent (e.g. dates inside parameters) come back as strings.
+    """
+    return {
+        "entity_id": timeline.entity_id,
+        "entity_type": timeline.entity_type,
+        "journey_ids": list(timeline.journey_ids),
+        "start_date": timeline.start_date.isoformat(),
+        "end_date": timeline.end_date.isoformat() if timeline.end_date else None,
+        "linked_timelines": dict(timeline.linked_timelines),
+        "events": [
+            {
+                "timeline_event_id": e.timeline_event_id,
+                "journey_id": e.journey_id,
+                "event_definition_id": e.event_definition_id,
+                "scheduled_date": e.scheduled_date.isoformat(),
+                "event_type": e.event_type,
+                "event_name": e.event_name,
+                "product": e.product,
+                "condition": e.condition,
+                "parameters": e.parameters,
+                "status": e.status,
+                "executed_at": e.executed_at.isoformat() if e.executed_at else None,
+                "result": e.result,
+                "resolved_parameters": e.resolved_parameters,
+                "triggered_events": list(e.triggered_events),
+            }
+            for e in timeline.events
+        ],
+    }
+
+
+def timeline_from_dict(data: dict[str, Any]) -> Timeline:
+    """Rebuild a timeline from ``timeline_to_dict`` output."""
+    from healthsim_agent.generation.journey_engine import JourneyTimelineEvent, Timeline
+
+    events = []
+    for e in data["events"]:
+        e = dict(e)
+        e["scheduled_date"] = date.fromisoformat(e["scheduled_date"])
+        if e["executed_at"]:
+            e["executed_at"] = datetime.fromisoformat(e["executed_at"])
+        events.append(JourneyTimelineEvent(**e))
+
+    return Timeline(
+        entity_id=data["entity_id"],
+        entity_type=data["entity_type"],
+        journey_ids=data["journey_ids"],
+        start_date=date.fromisoformat(data["start_date"]),
+        end_date=date.fromisoformat(data["end_date"]) if data["end_date"] else None,
+        events=events,
+        linked_timelines=data["linked_timelines"],
+    )
+
+
+class DuckDBTimelineStore:
+    """Spill store keeping serialized timelines in a DuckDB table.
+
+    Args:
+        connection: Open DuckDB connection, or a database path
+            (default: private in-memory database)
+        table: Table name, created if missing
+    """
+
+    def __init__(
+        self,
+        connection: duckdb.DuckDBPyConnection | str | Path | None = None,
+        table: str = "spilled_timelines",
+    ):
+        if connection is None or isinstance(connection, (str, Path)):
+            connection = duckdb.connect(str(connection) if connection else ":memory:")
+        self.connection = connection
+        self.table = table
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "entity_id VARCHAR PRIMARY KEY, timeline JSON)"
+        )
+
+    def put(self, timeline: Timeline) -> None:
+        """Store (or replace) a timeline."""
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?)",
+            [timeline.entity_id, json.dumps(timeline_to_dict(timeline), default=str)],
+        )
+
+    def get(self, entity_id: str) -> Timeline | None:
+        """Load a timeline, or None if not stored."""
+        row = self.connection.execute(
+            f"SELECT timeline FROM {self.table} WHERE entity_id = ?", [entity_id]
+        ).fetchone()
+        return timeline_from_dict(json.loads(row[0])) if row else None
+
+    def delete(self, entity_id: str) -> None:
+        """Remove a stored timeline if present."""
+        self.connection.execute(f"DELETE FROM {self.table} WHERE entity_id = ?", [entity_id])
+
+    def count(self) -> int:
+        """Number of stored timelines."""
+        return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all stored timelines."""
+        self.connection.execute(f"DELETE FROM {self.table}")
+
+
+def _has_pending(timeline: Timeline) -> bool:
+    return any(e.status == "pending" for e in timeline.events)
+
+
+class TimelineRegistry:
+    """Entity ID -> Timeline map with configurable retention.
+
+    Args:
+        max_size: Maximum timelines held strongly (None for unbounded;
+            defaults to 0 when ``weak`` is set)
+        drop_on_complete: Forget timelines with no pending events when
+            ``release_if_complete`` is called
+        weak: Keep evicted timelines reachable through weak references
+        spill_store: Where to write evicted timelines that still have
+            pending events or cross-product links
+    """
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        drop_on_complete: bool = False,
+        weak: bool = False,
+        spill_store: DuckDBTimelineStore | None = None,
+    ):
+        if max_size is not None and max_size < 0:
+            raise ValueError("max_size must be non-negative")
+        self.max_size = 0 if (weak and max_size is None) else max_size
+        self.drop_on_complete = drop_on_complete
+        self.weak = weak
+        self.spill_store = spill_store
+
+        self._timelines: OrderedDict[str, Timeline] = OrderedDict()
+        self._weak: weakref.WeakValueDictionary[str, Timeline] = weakref.WeakValueDictionary()
+        self._spilled: set[str] = set()
+
+        self._evictions = 0
+        self._completed_drops = 0
+        self._spill_writes = 0
+        self._spill_loads = 0
+        self._peak_size = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Weak references and DuckDB connections cannot be pickled, so a
+        # registry crosses process boundaries (e.g. to population workers)
+        # as an empty one with the same retention policy and no spill store
+        return {
+            "max_size": self.max_size,
+            "drop_on_complete": self.drop_on_complete,
+            "weak": self.weak,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def __len__(self) -> int:
+        return len(self._timelines)
+
+    def __contains__(self, entity_id: object) -> bool:
+        return entity_id in self._timelines or entity_id in self._weak or entity_id in self._spilled
+
+    def __setitem__(self, entity_id: str, timeline: Timeline) -> None:
+        self.register(timeline, entity_id)
+
+    def register(self, timeline: Timeline, entity_id: str | None = None) -> None:
+        """Add or refresh a timeline as most recently used."""
+        key = entity_id or timeline.entity_id
+        self._weak.pop(key, None)
+        if key in self._spilled:
+            self._spilled.discard(key)
+            self.spill_store.delete(key)
+        self._timelines[key] = timeline
+        self._timelines.move_to_end(key)
+        self._peak_size = max(self._peak_size, len(self._timelines))
+        self._enforce_size()
+
+    def get(self, entity_id: str) -> Timeline | None:
+        """Look up a timeline, reloading it from the spill store if needed."""
+        timeline = self._timelines.get(entity_id)
+        if timeline is not None:
+            self._timelines.move_to_end(entity_id)
+            return timeline
+
+        timeline = self._weak.get(entity_id)
+        if timeline is None and entity_id in self._spilled:
+            timeline = self.spill_store.get(entity_id)
+            self._spill_loads += 1
+        if timeline is not None:
+            self.register(timeline, entity_id)
+        return timeline
+
+    def discard(self, entity_id: str) -> None:
+        """Forget a timeline wherever it is held."""
+        self._timelines.pop(entity_id, None)
+        self._weak.pop(entity_id, None)
+        if entity_id in self._spilled:
+            self._spilled.discard(entity_id)
+            self.spill_store.delete(entity_id)
+
+    def release_if_complete(self, timeline: Timeline) -> bool:
+        """Apply drop-on-complete after a timeline has been executed.
+
+        Only drops the entry if it is this timeline; a newer timeline
+        registered for the same entity is kept.
+
+        Returns:
+            True if the timeline was dropped
+        """
+        if not self.drop_on_complete or _has_pending(timeline):
+            return False
+        entity_id = timeline.entity_id
+        registered = self._timelines.get(entity_id) or self._weak.get(entity_id)
+        if registered is timeline:
+            self.discard(entity_id)
+            self._completed_drops += 1
+            return True
+        return False
+
+    def clear(self) -> None:
+        """Forget all timelines, including spilled ones."""
+        self._timelines.clear()
+        self._weak.clear()
+        if self._spilled:
+            for entity_id in self._spilled:
+                self.spill_store.delete(entity_id)
+            self._spilled.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Registry size and eviction counters."""
+        return {
+            "size": len(self._timelines),
+            "weak_size": len(self._weak),
+            "spilled": len(self._spilled),
+            "peak_size": self._peak_size,
+            "evictions": self._evictions,
+            "completed_drops": self._completed_drops,
+            "spill_writes": self._spill_writes,
+            "spill_loads": self._spill_loads,
+        }
+
+    def _enforce_size(self) -> None:
+        if self.max_size is None:
+            return
+        while len(self._timelines) > self.max_size:
+            entity_id, timeline = self._timelines.popitem(last=False)
+            self._evictions += 1
+            if self.spill_store is not None and (
+                timeline.linked_timelines or _has_pending(timeline)
+            ):
+                self.spill_store.put(timeline)
+                self._spilled.add(entity_id)
+                self._spill_writes += 1
+            if self.weak:
+                # Checked before the spill store, so a live copy wins over a stale one
+                self._weak[entity_id] = timeline
@@ -232,40 +232,39 @@ class MemberGenerator(BaseGenerator):
     ) -> tuple[str, str, str]:
         """Get provider information, optionally from NPPES.
         
+        Real providers are drawn from the shared ProviderPool, which loads
+        each state/specialty slice once rather than querying per claim.
+        
         Returns:
             Tuple of (npi, provider_name, facility_name)
         """
         if use_real_providers and state:
             try:
-                from healthsim_agent.tools.reference_tools import search_providers
+                from healthsim_agent.generation.networksim_reference import EntityType
+                from healthsim_agent.generation.provider_pool import get_provider_pool
+                from healthsim_agent.tools.reference_tools import specialty_taxonomy_patterns
                 
-                result = search_providers(
-                    state=state,
-                    specialty=specialty or "Family Medicine",
-                    entity_type="individual",
-                    limit=50,
+                provider = get_provider_pool().draw_provider(
+                    state,
+                    taxonomy_patterns=specialty_taxonomy_patterns(specialty or "Family Medicine"),
+                    entity_type=EntityType.INDIVIDUAL,
+                    rng=self.rng,
                 )
                 
-                if result.success and result.data.get("providers"):
-                    providers = result.data["providers"]
-                    provider = self.random_choice(providers)
-                    
-                    npi = provider.get("npi", str(self.random_int(1000000000, 9999999999)))
+                if provider:
+                    npi = provider.npi or str(self.random_int(1000000000, 9999999999))
                     
-                    # Build name from NPPES data - use 'name' field or fallback
-                    name = provider.get("name", "")
-                    credential = provider.get("credential", "MD")
-                    if name:
-                        name = f"{name}, {credential}" if credential else name
+                    # Build name from NPPES data, falling back to a placeholder
+                    credential = provider.credential
+                    if provider.first_name and provider.last_name:
+                        name = f"{provider.first_name} {provider.last_name}"
                     else:
-                        # Fallback to first/last fields if available
-                        first = provider.get("provider_first_name", "")
-                        last = provider.get("provider_last_name_legal_name", "Dr. Provider")
-                        name = f"{first} {last}, {credential}".strip()
+                        name = provider.last_name or "Dr. Provider"
+                    if credential:
+                        name = f"{name}, {credential}"
                     
-                    # Get organization if available
-                    org = provider.get("provider_organization_name_legal_business_name", "")
-                    facility = org if org else "Medical Practice"
+                    # NPPES only names an organization for organization NPIs
+                    facility = provider.organization_name or "Medical Practice"
                     
                     return npi, name, facility
             except Exception:
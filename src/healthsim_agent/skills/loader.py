@@ -6,8 +6,16 @@ This implements the hybrid skill format (Option C) where:
 3. Embedded YAML/JSON code blocks are parsed for tools
 
 Single file = single source of truth for both AI and tools.
+
+Parsed skills are cached on disk (one pickle per skill, checked against
+the file's path, mtime and size) so warm starts only stat and unpickle
+instead of re-parsing. The cache lives in ~/.healthsim/cache, or
+HEALTHSIM_CACHE_DIR if set.
 """
 from __future__ import annotations
+import hashlib
+import os
+import pickle
 import re
 import yaml
 import json
@@ -17,6 +25,25 @@ from typing import Any
 from .models import ParsedSkill, SkillMetadata, EmbeddedConfig, SkillIndex
 
 
+DEFAULT_CACHE_DIR = Path.home() / ".healthsim" / "cache"
+
+# Bump when parsing or the models change so stale caches are discarded
+CACHE_VERSION = 1
+
+
+def _cache_key(path: Path) -> str:
+    return hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:16]
+
+
+def get_cache_dir() -> Path:
+    """Get the parsed-skill cache directory from environment or default.
+    
+    Returns:
+        Path to the cache directory
+    """
+    return Path(os.environ.get("HEALTHSIM_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+
+
 class SkillLoader:
     """Load and parse HealthSim skills from markdown files.
     
@@ -25,6 +52,9 @@ class SkillLoader:
     - YAML frontmatter (name, description, triggers)
     - Full markdown content (for system prompt)
     - Embedded YAML/JSON blocks (for tool configs)
+    
+    Parsed skills are kept in an on-disk cache; a file is only re-parsed
+    when its mtime or size changes.
     """
     
     # Regex patterns for parsing
@@ -42,18 +72,29 @@ class SkillLoader:
         re.MULTILINE | re.DOTALL
     )
     
-    def __init__(self, skills_dir: Path | str | None = None):
+    def __init__(
+        self,
+        skills_dir: Path | str | None = None,
+        cache_dir: Path | str | None = None,
+        use_cache: bool = True,
+    ):
         """Initialize loader with skills directory path.
         
         Args:
             skills_dir: Path to skills directory. Defaults to skills/
                        relative to the package root.
+            cache_dir: Directory for the parsed-skill cache. Defaults to
+                      get_cache_dir().
+            use_cache: Set False to always parse and never touch the cache.
         """
         if skills_dir is None:
             # Default: go up from src/healthsim_agent/skills/ to repo root, then skills/
             skills_dir = Path(__file__).parent.parent.parent.parent / "skills"
         self.skills_dir = Path(skills_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else get_cache_dir()
+        self.use_cache = use_cache
         self._index: SkillIndex | None = None
+        self._files: list[Path] | None = None
     
     @property
     def index(self) -> SkillIndex:
@@ -66,6 +107,23 @@ class SkillLoader:
         """Force reload all skills."""
         self._index = self.load_all()
         return self._index
+    
+    @property
+    def cache_path(self) -> Path:
+        """Cache directory for this skills directory (one entry file per skill)."""
+        return self.cache_dir / f"skills-{_cache_key(self.skills_dir.resolve())}"
+    
+    def skill_files(self) -> list[Path]:
+        """List the .md files under the skills directory.
+        
+        The tree is walked once and the listing reused until load_all()
+        or reload() rescans it.
+        """
+        if self._files is None:
+            self._files = (
+                list(self.skills_dir.rglob("*.md")) if self.skills_dir.exists() else []
+            )
+        return self._files
 
     def load_all(self) -> SkillIndex:
         """Load all skills from the skills directory.
@@ -76,11 +134,11 @@ class SkillLoader:
         """
         index = SkillIndex()
         
-        if not self.skills_dir.exists():
-            return index
-        
         # Find all .md files recursively
-        for skill_path in self.skills_dir.rglob("*.md"):
+        self._files = None
+        skill_files = self.skill_files()
+        
+        for skill_path in skill_files:
             # Skip README files
             if skill_path.name.lower() == "readme.md":
                 continue
@@ -93,20 +151,71 @@ class SkillLoader:
                 # Log but continue loading other skills
                 print(f"Warning: Failed to load {skill_path}: {e}")
         
+        if self.use_cache:
+            self._prune_cache(skill_files)
+        
         return index
     
     def load_skill(self, path: Path) -> ParsedSkill | None:
         """Load and parse a single skill file.
         
+        Returns the cached parse when the file's mtime and size are
+        unchanged, otherwise parses the file and caches the result.
+        
         Args:
             path: Path to the skill .md file
             
         Returns:
             ParsedSkill or None if file doesn't exist or lacks frontmatter
         """
-        if not path.exists():
+        try:
+            stat = path.stat()
+        except OSError:
             return None
         
+        if not self.use_cache:
+            return self._parse_skill(path)
+        
+        entry_path = self.cache_path / f"{_cache_key(path)}.pickle"
+        signature = (str(path), stat.st_mtime_ns, stat.st_size)
+        try:
+            with open(entry_path, "rb") as f:
+                entry = pickle.load(f)
+            if entry["version"] == CACHE_VERSION and entry["signature"] == signature:
+                return entry["skill"]
+        except Exception:
+            # Missing, corrupt or incompatible entry - parse and overwrite it
+            pass
+        
+        skill = self._parse_skill(path)
+        self._write_cache_entry(
+            entry_path, {"version": CACHE_VERSION, "signature": signature, "skill": skill}
+        )
+        return skill
+    
+    def _write_cache_entry(self, entry_path: Path, entry: dict[str, Any]) -> None:
+        """Write one cache entry; failures (read-only home, full disk) are ignored."""
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # Atomic swap so concurrent processes never read a partial entry
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    
+    def _prune_cache(self, skill_files: list[Path]) -> None:
+        """Delete cache entries for skill files that no longer exist."""
+        if not self.cache_path.is_dir():
+            return
+        live = {f"{_cache_key(path)}.pickle" for path in skill_files}
+        for entry_path in self.cache_path.glob("*.pickle"):
+            if entry_path.name not in live:
+                entry_path.unlink(missing_ok=True)
+    
+    def _parse_skill(self, path: Path) -> ParsedSkill | None:
+        """Read and parse a skill file, bypassing the cache."""
         content = path.read_text(encoding="utf-8")
         
         # Extract YAML frontmatter
@@ -0,0 +1,113 @@
+"""Multi-phrase matcher - finds many phrases in a message in one pass.
+
+An Aho-Corasick automaton over all phrases is built once; matching then
+costs O(message length + matches) no matter how many phrases there are.
+SkillRouter uses it for skill triggers and product keywords.
+
+Example:
+    >>> matcher = PhraseMatcher(["heart failure", "ed", "patient"])
+    >>> matcher.find("ed visit for heart failure patients")
+    ['heart failure', 'ed', 'patient']
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Iterable
+
+
+# Endings allowed after a whole-word match, so "patient" matches "patients"
+PLURAL_SUFFIXES = ("", "s", "es")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton matching a fixed set of phrases.
+    
+    Matching is case-sensitive; callers lowercase phrases and text. With
+    ``whole_words`` a phrase must start and end on a word boundary (a
+    trailing plural "s"/"es" is allowed), so "ed" does not match inside
+    "generated". Boundaries only apply where the phrase itself starts or
+    ends with a letter, digit or underscore.
+    
+    Args:
+        phrases: Phrases to match; empty strings and duplicates are dropped
+        whole_words: Require word boundaries around matches
+    """
+    
+    def __init__(self, phrases: Iterable[str], whole_words: bool = True):
+        self.phrases: list[str] = list(dict.fromkeys(p for p in phrases if p))
+        self.whole_words = whole_words
+        
+        # Trie: per-node transitions and the phrase IDs ending there
+        goto: list[dict[str, int]] = [{}]
+        output: list[tuple[int, ...]] = [()]
+        for phrase_id, phrase in enumerate(self.phrases):
+            node = 0
+            for ch in phrase:
+                child = goto[node].get(ch)
+                if child is None:
+                    child = len(goto)
+                    goto[node][ch] = child
+                    goto.append({})
+                    output.append(())
+                node = child
+            output[node] += (phrase_id,)
+        
+        # Failure links (longest proper suffix that is also a trie path),
+        # filled breadth-first so each node's outputs include its suffixes'
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                suffix = fail[node]
+                while suffix and ch not in goto[suffix]:
+                    suffix = fail[suffix]
+                fail[child] = goto[suffix].get(ch, 0)
+                output[child] += output[fail[child]]
+        
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._lengths = [len(p) for p in self.phrases]
+        self._word_start = [_is_word_char(p[0]) for p in self.phrases]
+        self._word_end = [_is_word_char(p[-1]) for p in self.phrases]
+    
+    def __len__(self) -> int:
+        return len(self.phrases)
+    
+    def find(self, text: str) -> list[str]:
+        """Return the phrases occurring in text.
+        
+        Each phrase is reported once, in the order phrases were given.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        found: set[int] = set()
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for phrase_id in output[node]:
+                if phrase_id not in found and (
+                    not self.whole_words or self._on_boundaries(text, phrase_id, end)
+                ):
+                    found.add(phrase_id)
+        return [self.phrases[i] for i in sorted(found)]
+    
+    def _on_boundaries(self, text: str, phrase_id: int, end: int) -> bool:
+        start = end - self._lengths[phrase_id]
+        if self._word_start[phrase_id] and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if not self._word_end[phrase_id]:
+            return True
+        for suffix in PLURAL_SUFFIXES:
+            stop = end + len(suffix)
+            if text.startswith(suffix, end) and (
+                stop >= len(text) or not _is_word_char(text[stop])
+            ):
+                return True
+        return False
@@ -99,16 +99,21 @@ class SkillIndex:
     - skills: name -> ParsedSkill (primary lookup)
     - trigger_map: trigger phrase -> list of skill names
     - product_map: product name -> list of skill names
+    
+    ``version`` increases on every change, so derived structures (such as
+    SkillRouter's trigger automaton) know when to rebuild.
     """
     skills: dict[str, ParsedSkill] = field(default_factory=dict)  # name -> skill
     trigger_map: dict[str, list[str]] = field(default_factory=dict)  # trigger -> skill names
     product_map: dict[str, list[str]] = field(default_factory=dict)  # product -> skill names
+    version: int = field(default=0, compare=False)
     
     def add_skill(self, skill: ParsedSkill) -> None:
         """Add a skill to the index.
         
         Updates all three indexes (skills, triggers, products).
         """
+        self.version += 1
         self.skills[skill.metadata.name] = skill
         
         # Index by product
@@ -10,7 +10,8 @@ from dataclasses import dataclass, field
 from typing import Any
 
 from .loader import SkillLoader
-from .models import ParsedSkill
+from .matcher import PhraseMatcher
+from .models import ParsedSkill, SkillIndex
 
 
 @dataclass
@@ -34,6 +35,10 @@ class SkillRouter:
     
     Uses a combination of trigger phrase matching and keyword
     detection to find the most relevant skills for a user request.
+    Triggers and product keywords are matched as whole words (plurals
+    allowed) by one automaton, built once per skill index and rebuilt
+    after SkillLoader.reload, so routing cost does not grow with the
+    number of skills.
     """
     
     # Product keywords for routing (lowercase)
@@ -78,6 +83,25 @@ class SkillRouter:
             loader: SkillLoader instance. Creates new one if not provided.
         """
         self.loader = loader or SkillLoader()
+        self._matcher: PhraseMatcher | None = None
+        self._matcher_index: SkillIndex | None = None
+        self._matcher_version = -1
+    
+    def _phrase_matcher(self) -> PhraseMatcher:
+        """Get the automaton over all triggers and product keywords.
+        
+        Rebuilt only when the loader's index is replaced (reload) or
+        changed since the last build.
+        """
+        index = self.loader.index
+        if self._matcher_index is not index or self._matcher_version != index.version:
+            phrases = list(index.trigger_map)
+            for keywords in self.PRODUCT_KEYWORDS.values():
+                phrases.extend(keywords)
+            self._matcher = PhraseMatcher(phrases)
+            self._matcher_index = index
+            self._matcher_version = index.version
+        return self._matcher
     
     def route(self, message: str) -> RoutingResult:
         """Route a user message to relevant skills.
@@ -93,19 +117,21 @@ class SkillRouter:
         Returns:
             RoutingResult with matched skills and confidence
         """
-        message_lower = message.lower()
+        # One pass finds both trigger phrases and product keywords
+        matched_phrases = self._phrase_matcher().find(message.lower())
+        trigger_map = self.loader.index.trigger_map
         
         # Find matching triggers
         matched_triggers = []
         matched_skill_names = set()
         
-        for trigger, skill_names in self.loader.index.trigger_map.items():
-            if trigger in message_lower:
-                matched_triggers.append(trigger)
-                matched_skill_names.update(skill_names)
+        for phrase in matched_phrases:
+            if phrase in trigger_map:
+                matched_triggers.append(phrase)
+                matched_skill_names.update(trigger_map[phrase])
         
         # Detect suggested product from keywords
-        suggested_product = self._detect_product(message_lower)
+        suggested_product = self._product_from_matches(set(matched_phrases))
         
         # If no trigger matches but we detected a product, get product skills
         if not matched_skill_names and suggested_product:
@@ -146,10 +172,14 @@ class SkillRouter:
         Scores each product based on keyword matches and
         returns the highest-scoring product.
         """
+        return self._product_from_matches(set(self._phrase_matcher().find(message)))
+    
+    def _product_from_matches(self, matched: set[str]) -> str | None:
+        """Pick the product with the most keywords among matched phrases."""
         scores = {}
         
         for product, keywords in self.PRODUCT_KEYWORDS.items():
-            score = sum(1 for kw in keywords if kw in message)
+            score = sum(1 for kw in keywords if kw in matched)
             if score > 0:
                 scores[product] = score
         
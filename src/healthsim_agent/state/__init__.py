@@ -53,6 +53,7 @@ from healthsim_agent.state.summary import (
     generate_summary,
     get_cohort_by_name,
 )
+from healthsim_agent.state.summary_cache import SummaryCache
 from healthsim_agent.state.auto_persist import (
     AutoPersistService,
     PersistResult,
@@ -132,6 +133,7 @@ __all__ = [
     "ENTITY_COUNT_TABLES",
     "generate_summary",
     "get_cohort_by_name",
+    "SummaryCache",
     # Auto persist (Structured RAG)
     "AutoPersistService",
     "PersistResult",
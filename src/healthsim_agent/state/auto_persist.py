@@ -19,8 +19,10 @@ from typing import Any
 from uuid import uuid4
 import re
 import json
+import time
 
-from .summary import CohortSummary, generate_summary, get_cohort_by_name
+from .summary import CohortSummary, build_sample_query, generate_summary, get_cohort_by_name
+from .summary_cache import SummaryCache
 from .auto_naming import generate_cohort_name, sanitize_name
 from .serializers import get_serializer, get_table_info, ENTITY_TABLE_MAP
 
@@ -38,6 +40,7 @@ class PersistResult:
     is_new_cohort: bool
     batch_number: int | None = None
     total_batches: int | None = None
+    rows_per_second: float | None = None
     
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -50,6 +53,7 @@ class PersistResult:
             'is_new_cohort': self.is_new_cohort,
             'batch_number': self.batch_number,
             'total_batches': self.total_batches,
+            'rows_per_second': self.rows_per_second,
             'summary': self.summary.to_dict() if self.summary else None,
         }
 
@@ -291,6 +295,46 @@ def _ensure_unique_name(name: str, connection) -> str:
         name = f"{base_name}-{counter}"
 
 
+def _build_column_buffers(
+    rows: list[dict[str, Any]],
+    id_column: str,
+) -> list[dict[str, list]]:
+    """
+    Pivot serialized rows into columnar buffers, one per column set.
+    
+    Rows are grouped by the keys they carry, so each upsert only inserts
+    and updates the columns its rows actually supply: a missing column
+    keeps its DEFAULT on insert and its current value on conflict, as in
+    the row-by-row path. Rows sharing an ID are merged in order (later
+    values win), matching the row-by-row insert-then-update behavior
+    (a single ON CONFLICT statement cannot touch the same key twice).
+    
+    Args:
+        rows: Serialized entity rows (already carrying cohort_id and ID)
+        id_column: Primary key column of the target table
+        
+    Returns:
+        List of dicts mapping column name to a list of values, one per
+        unique row
+    """
+    merged: dict[Any, dict[str, Any]] = {}
+    for row in rows:
+        entity_id = row[id_column]
+        if entity_id in merged:
+            merged[entity_id] = {**merged[entity_id], **row}
+        else:
+            merged[entity_id] = row
+    
+    groups: dict[frozenset, list[dict[str, Any]]] = {}
+    for row in merged.values():
+        groups.setdefault(frozenset(row), []).append(row)
+    
+    return [
+        {col: [row[col] for row in group] for col in group[0]}
+        for group in groups.values()
+    ]
+
+
 class AutoPersistService:
     """
     Service for auto-persisting generated entities.
@@ -325,23 +369,40 @@ class AutoPersistService:
         service.add_tag(cohort_id, 'training')
     """
     
-    def __init__(self, connection=None):
+    def __init__(self, connection=None, summary_cache: SummaryCache | None = None):
         """
         Initialize the service.
         
         Args:
             connection: Database connection (lazy loaded if not provided)
+            summary_cache: Cache of summary aggregates (created on the
+                service's connection if not provided)
         """
         self._conn = connection
+        self._summary_cache = summary_cache
     
     @property
     def conn(self):
         """Get database connection."""
         if self._conn is None:
-            from healthsim_agent.database import DatabaseConnection
-            self._conn = DatabaseConnection("data/healthsim-reference.duckdb")
+            from healthsim_agent.tools.connection import ManagedConnection
+            self._conn = ManagedConnection()
         return self._conn
     
+    @property
+    def summary_cache(self) -> SummaryCache:
+        """Get the summary aggregate cache."""
+        if self._summary_cache is None:
+            self._summary_cache = SummaryCache(self.conn)
+        return self._summary_cache
+    
+    def _invalidate_summary(self, cohort_id: str) -> None:
+        """Drop cached summary aggregates, ignoring cache failures."""
+        try:
+            self.summary_cache.invalidate(cohort_id)
+        except Exception:
+            pass
+    
     # ========================================================================
     # Core Scenario Management
     # ========================================================================
@@ -428,6 +489,7 @@ class AutoPersistService:
         tags: list[str] | None = None,
         batch_number: int | None = None,
         total_batches: int | None = None,
+        bulk: bool = False,
     ) -> PersistResult:
         """
         Persist entities to DuckDB and return summary.
@@ -436,6 +498,11 @@ class AutoPersistService:
         - Creates new cohort with auto-generated name
         - Uses context_keywords for naming if available
         
+        With bulk=True the whole batch is serialized into a columnar
+        buffer and written with one INSERT ... ON CONFLICT DO UPDATE per
+        distinct column set instead of one statement per entity. Use it
+        for large cohorts.
+        
         Args:
             entities: List of entity dictionaries to persist
             entity_type: Type of entities (patient, claim, etc.)
@@ -446,6 +513,7 @@ class AutoPersistService:
             tags: Tags for the cohort
             batch_number: Current batch number (for progress tracking)
             total_batches: Total number of batches (for progress tracking)
+            bulk: Write the batch with set-based upsert statements
             
         Returns:
             PersistResult with summary (NOT full entity data)
@@ -500,51 +568,43 @@ class AutoPersistService:
             cohort_name = result.rows[0][0]
         
         # Persist entities
-        entity_ids = []
+        rows = [
+            self._serialize_row(entity, serializer, cohort_id, id_column)
+            for entity in entities
+        ]
+        entity_ids = [row[id_column] for row in rows]
         
-        for entity in entities:
-            # Serialize entity
-            if serializer:
-                serialized = serializer(entity)
-            else:
-                serialized = entity.copy()
-            
-            # Add cohort_id (database column)
-            serialized['cohort_id'] = cohort_id
-            
-            # Get or generate entity ID
-            entity_id = serialized.get(id_column) or str(uuid4())
-            serialized[id_column] = entity_id
-            entity_ids.append(entity_id)
-            
-            # Build insert statement
-            columns = list(serialized.keys())
-            placeholders = ', '.join(['?' for _ in columns])
-            column_str = ', '.join(columns)
-            
-            try:
-                self.conn.execute(f"""
-                    INSERT INTO {table_name} ({column_str})
-                    VALUES ({placeholders})
-                """, list(serialized.values()))
-            except Exception as e:
-                # Handle duplicate key by updating
-                if 'duplicate' in str(e).lower() or 'unique' in str(e).lower():
-                    set_clause = ', '.join([f"{col} = ?" for col in columns if col != id_column])
-                    values = [v for k, v in serialized.items() if k != id_column]
-                    values.append(entity_id)
-                    
-                    self.conn.execute(f"""
-                        UPDATE {table_name}
-                        SET {set_clause}
-                        WHERE {id_column} = ?
-                    """, values)
-                else:
-                    raise
+        # Rows about to be overwritten can't be merged into cached aggregates
+        try:
+            replaced = self.summary_cache.owners_of(table_name, id_column, entity_ids)
+        except Exception:
+            replaced = None
+        
+        # Throughput covers only the writes, not serialization or lookups
+        started = time.perf_counter()
+        if bulk:
+            self._bulk_upsert(rows, table_name, id_column)
+        else:
+            for row in rows:
+                self._upsert_row(row, table_name, id_column)
+        
+        elapsed = time.perf_counter() - started
+        rows_per_second = len(entities) / elapsed if elapsed > 0 else None
         
         # Update cohort timestamp
         self._update_cohort_timestamp(cohort_id)
         
+        # Keep summary aggregates current
+        if replaced is None:
+            self._invalidate_summary(cohort_id)
+        else:
+            try:
+                self.summary_cache.record_write(
+                    cohort_id, table_name, id_column, entity_ids, replaced
+                )
+            except Exception:
+                self._invalidate_summary(cohort_id)
+        
         # Generate summary
         try:
             summary = generate_summary(
@@ -552,6 +612,7 @@ class AutoPersistService:
                 include_samples=True,
                 samples_per_type=3,
                 connection=self.conn,
+                cache=self.summary_cache,
             )
         except Exception:
             summary = None
@@ -566,8 +627,101 @@ class AutoPersistService:
             is_new_cohort=is_new_cohort,
             batch_number=batch_number,
             total_batches=total_batches,
+            rows_per_second=rows_per_second,
         )
     
+    @staticmethod
+    def _serialize_row(
+        entity: dict,
+        serializer,
+        cohort_id: str,
+        id_column: str,
+    ) -> dict[str, Any]:
+        """Serialize one entity and stamp its cohort_id and entity ID."""
+        if serializer:
+            serialized = serializer(entity)
+        else:
+            serialized = entity.copy()
+        
+        # Add cohort_id (database column)
+        serialized['cohort_id'] = cohort_id
+        
+        # Get or generate entity ID
+        serialized[id_column] = serialized.get(id_column) or str(uuid4())
+        return serialized
+    
+    def _upsert_row(
+        self,
+        serialized: dict[str, Any],
+        table_name: str,
+        id_column: str,
+    ) -> str:
+        """Insert one serialized row, falling back to UPDATE on a duplicate key."""
+        entity_id = serialized[id_column]
+        
+        # Build insert statement
+        columns = list(serialized.keys())
+        placeholders = ', '.join(['?' for _ in columns])
+        column_str = ', '.join(columns)
+        
+        try:
+            self.conn.execute(f"""
+                INSERT INTO {table_name} ({column_str})
+                VALUES ({placeholders})
+            """, list(serialized.values()))
+        except Exception as e:
+            # Handle duplicate key by updating
+            if 'duplicate' in str(e).lower() or 'unique' in str(e).lower():
+                set_clause = ', '.join([f"{col} = ?" for col in columns if col != id_column])
+                values = [v for k, v in serialized.items() if k != id_column]
+                values.append(entity_id)
+                
+                self.conn.execute(f"""
+                    UPDATE {table_name}
+                    SET {set_clause}
+                    WHERE {id_column} = ?
+                """, values)
+            else:
+                raise
+        
+        return entity_id
+    
+    def _bulk_upsert(
+        self,
+        rows: list[dict[str, Any]],
+        table_name: str,
+        id_column: str,
+    ) -> list[str]:
+        """
+        Upsert a batch of serialized rows with set-based statements.
+        
+        Each column of the buffer is bound as one list parameter and
+        UNNEST-ed back into rows inside DuckDB, so the statement cost is
+        paid once per distinct column set (normally once per batch)
+        rather than once per entity.
+        
+        Returns:
+            Entity IDs in input order
+        """
+        for buffer in _build_column_buffers(rows, id_column):
+            columns = list(buffer.keys())
+            
+            select_list = ', '.join(f"UNNEST(?) AS {col}" for col in columns)
+            update_cols = [col for col in columns if col != id_column]
+            if update_cols:
+                set_clause = ', '.join(f"{col} = EXCLUDED.{col}" for col in update_cols)
+                conflict_clause = f"ON CONFLICT ({id_column}) DO UPDATE SET {set_clause}"
+            else:
+                conflict_clause = f"ON CONFLICT ({id_column}) DO NOTHING"
+            
+            self.conn.execute(f"""
+                INSERT INTO {table_name} ({', '.join(columns)})
+                SELECT {select_list}
+                {conflict_clause}
+            """, [buffer[col] for col in columns])
+        
+        return [row[id_column] for row in rows]
+    
     def get_cohort_summary(
         self,
         cohort_id: str | None = None,
@@ -604,6 +758,7 @@ class AutoPersistService:
             include_samples=include_samples,
             samples_per_type=samples_per_type,
             connection=self.conn,
+            cache=self.summary_cache,
         )
     
     def query_cohort(
@@ -864,6 +1019,8 @@ class AutoPersistService:
             DELETE FROM cohorts WHERE id = ?
         """, [cohort_id])
         
+        self._invalidate_summary(cohort_id)
+        
         return {
             'cohort_id': cohort_id,
             'name': name,
@@ -945,15 +1102,20 @@ class AutoPersistService:
         entity_type: str,
         count: int = 3,
         strategy: str = "diverse",
+        stratify_by: str | None = None,
     ) -> list[dict]:
         """
         Get sample entities for pattern consistency.
         
+        Only the sampled rows are read from the database.
+        
         Args:
             cohort_id: Scenario to get samples from
             entity_type: Type of entities to sample
             count: Number of samples (default 3)
             strategy: Sampling strategy ("diverse", "random", "recent")
+            stratify_by: For "diverse", a column (or "age_band") to
+                spread samples across
                 
         Returns:
             List of sample entity dictionaries
@@ -970,32 +1132,22 @@ class AutoPersistService:
         table_name, id_column = table_info
         
         # Build query based on strategy
+        base_query = f"SELECT * FROM {table_name} WHERE cohort_id = ?"
         if strategy == "random":
-            order_clause = "ORDER BY RANDOM()"
+            query = f"{base_query} ORDER BY RANDOM() LIMIT {int(count)}"
         elif strategy == "recent":
-            order_clause = "ORDER BY created_at DESC"
+            query = f"{base_query} ORDER BY created_at DESC LIMIT {int(count)}"
         else:
-            order_clause = "ORDER BY created_at"
+            query = build_sample_query(table_name, count, stratify_by)
         
         try:
-            result = self.conn.execute(f"""
-                SELECT * FROM {table_name}
-                WHERE cohort_id = ?
-                {order_clause}
-            """, [cohort_id])
+            result = self.conn.execute(query, [cohort_id])
             
             if not result.rows:
                 return []
             
             columns = result.columns
-            
-            # For diverse sampling, take evenly spaced samples
-            if strategy == "diverse" and len(result.rows) > count:
-                step = len(result.rows) / count
-                indices = [int(i * step) for i in range(count)]
-                selected = [result.rows[i] for i in indices]
-            else:
-                selected = result.rows[:count]
+            selected = result.rows[:count]
             
             # Convert to dicts
             samples = []
@@ -56,8 +56,8 @@ def export_to_json(
     from healthsim_agent.state.auto_persist import get_auto_persist_service
     
     if connection is None:
-        from healthsim_agent.database import DatabaseConnection
-        connection = DatabaseConnection("data/healthsim-reference.duckdb")
+        from healthsim_agent.tools.connection import ManagedConnection
+        connection = ManagedConnection()
     
     # Get cohort
     cohort = get_cohort_by_name(cohort_id, connection)
@@ -138,8 +138,8 @@ def import_from_json(
     from healthsim_agent.state.auto_persist import get_auto_persist_service
     
     if connection is None:
-        from healthsim_agent.database import DatabaseConnection
-        connection = DatabaseConnection("data/healthsim-reference.duckdb")
+        from healthsim_agent.tools.connection import ManagedConnection
+        connection = ManagedConnection()
     
     input_path = Path(input_path)
     if not input_path.exists():
@@ -295,8 +295,8 @@ def export_cohort_for_sharing(
     from healthsim_agent.state.auto_persist import get_auto_persist_service
     
     if connection is None:
-        from healthsim_agent.database import DatabaseConnection
-        connection = DatabaseConnection("data/healthsim-reference.duckdb")
+        from healthsim_agent.tools.connection import ManagedConnection
+        connection = ManagedConnection()
     
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
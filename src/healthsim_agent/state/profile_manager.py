@@ -103,8 +103,8 @@ class ProfileManager:
     def conn(self):
         """Get database connection."""
         if self._conn is None:
-            from healthsim_agent.db import DatabaseConnection
-            self._conn = DatabaseConnection("data/healthsim-reference.duckdb")
+            from healthsim_agent.tools.connection import ManagedConnection
+            self._conn = ManagedConnection()
         return self._conn
     
     def _ensure_tables(self) -> None:
@@ -7,16 +7,143 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 from uuid import uuid4
+import json
+
+# Most recent messages never trimmed by token-budget windowing; covers the
+# pending tool_use/tool_result exchange of the current turn
+DEFAULT_KEEP_RECENT = 4
+
+# Characters of a trimmed tool result kept as a preview
+TRIMMED_PREVIEW_CHARS = 200
+
+
+def _serialize_block(block: Any) -> dict[str, Any] | None:
+    """Convert a content block to a JSON-compatible dict."""
+    if hasattr(block, 'model_dump'):
+        # Pydantic model
+        return block.model_dump()
+    if hasattr(block, 'to_dict'):
+        return block.to_dict()
+    if isinstance(block, dict):
+        return block
+    if hasattr(block, 'text'):
+        return {"type": "text", "text": block.text}
+    if hasattr(block, 'name'):
+        # Tool use block
+        return {
+            "type": "tool_use",
+            "id": getattr(block, 'id', ''),
+            "name": block.name,
+            "input": getattr(block, 'input', {}),
+        }
+    return None
+
+
+def _serialize_content(content: str | list[Any]) -> str | list[dict[str, Any]]:
+    """Serialize message content (a string or list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    result = []
+    for block in content:
+        serialized = _serialize_block(block)
+        if serialized is not None:
+            result.append(serialized)
+    return result
+
+
+def _trim_tool_result(block: dict[str, Any]) -> dict[str, Any]:
+    """Replace a tool result's content with a short preview."""
+    content = block.get("content", "")
+    if not isinstance(content, str):
+        content = json.dumps(content, default=str)
+    if len(content) <= TRIMMED_PREVIEW_CHARS:
+        return block
+    return {
+        **block,
+        "content": (
+            f"[Earlier tool result trimmed from history ({len(content):,} chars). "
+            f"Preview: {content[:TRIMMED_PREVIEW_CHARS]}...]"
+        ),
+    }
 
 
 @dataclass
 class Message:
-    """A single message in the conversation."""
+    """A single message in the conversation.
+    
+    The API form (to_api) is computed once and memoized. Assigning new
+    content is detected automatically; after mutating content in place,
+    call invalidate().
+    """
     role: str  # "user" or "assistant"
     content: str | list[Any]  # Can be string or list of content blocks
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     
+    # Memoized API serialization
+    _api: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _api_source: Any = field(default=None, init=False, repr=False, compare=False)
+    _api_tokens: int | None = field(default=None, init=False, repr=False, compare=False)
+    _api_trimmed: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _api_trimmed_tokens: int | None = field(default=None, init=False, repr=False, compare=False)
+    
+    def to_api(self) -> dict[str, Any]:
+        """Get the message formatted for the Anthropic API.
+        
+        The returned dict is shared with later calls; do not modify it.
+        """
+        if (
+            self._api is None
+            or self._api_source is not self.content
+            or self._api["role"] != self.role
+        ):
+            self._api = {"role": self.role, "content": _serialize_content(self.content)}
+            self._api_source = self.content
+            self._api_tokens = None
+            self._api_trimmed = None
+            self._api_trimmed_tokens = None
+        return self._api
+    
+    def to_api_trimmed(self) -> dict[str, Any]:
+        """Get the API form with large tool results replaced by previews."""
+        api = self.to_api()
+        if self._api_trimmed is None:
+            content = api["content"]
+            if isinstance(content, list) and any(
+                block.get("type") == "tool_result" for block in content
+            ):
+                trimmed = [
+                    _trim_tool_result(block) if block.get("type") == "tool_result" else block
+                    for block in content
+                ]
+                self._api_trimmed = {"role": api["role"], "content": trimmed}
+            else:
+                self._api_trimmed = api
+        return self._api_trimmed
+    
+    @property
+    def api_token_estimate(self) -> int:
+        """Estimated tokens of the API form (~4 characters per token)."""
+        self.to_api()
+        if self._api_tokens is None:
+            self._api_tokens = len(json.dumps(self._api, default=str)) // 4
+        return self._api_tokens
+    
+    @property
+    def trimmed_token_estimate(self) -> int:
+        """Estimated tokens of the trimmed API form."""
+        trimmed = self.to_api_trimmed()
+        if self._api_trimmed_tokens is None:
+            self._api_trimmed_tokens = len(json.dumps(trimmed, default=str)) // 4
+        return self._api_trimmed_tokens
+    
+    def invalidate(self) -> None:
+        """Drop the memoized API form after editing content in place."""
+        self._api = None
+        self._api_tokens = None
+        self._api_trimmed = None
+        self._api_trimmed_tokens = None
+    
     @property
     def text_content(self) -> str:
         """Extract text content regardless of format."""
@@ -79,36 +206,50 @@ class SessionState:
         self.generated_items.append(item)
         return item
     
-    def get_messages_for_api(self) -> list[dict[str, Any]]:
-        """Get messages formatted for the Anthropic API."""
+    def get_messages_for_api(
+        self,
+        token_budget: int | None = None,
+        keep_recent: int = DEFAULT_KEEP_RECENT,
+    ) -> list[dict[str, Any]]:
+        """Get messages formatted for the Anthropic API.
+        
+        Each message is serialized once and memoized (see Message.to_api),
+        so a turn costs O(new messages) serialization work.
+        
+        Args:
+            token_budget: If the estimated history size exceeds this many
+                tokens, tool results in older messages are replaced by short
+                previews, oldest first, until it fits. None keeps everything.
+            keep_recent: Number of most recent messages never trimmed
+        
+        Returns:
+            API message dicts; shared with the cache, so do not modify them
+        """
+        if token_budget is None:
+            return [msg.to_api() for msg in self.messages]
+        
+        total = sum(msg.api_token_estimate for msg in self.messages)
+        trimmable = max(0, len(self.messages) - keep_recent)
         result = []
-        for msg in self.messages:
-            if isinstance(msg.content, str):
-                result.append({"role": msg.role, "content": msg.content})
-            else:
-                # Content blocks - serialize properly
-                content = []
-                for block in msg.content:
-                    if hasattr(block, 'model_dump'):
-                        # Pydantic model
-                        content.append(block.model_dump())
-                    elif hasattr(block, 'to_dict'):
-                        content.append(block.to_dict())
-                    elif isinstance(block, dict):
-                        content.append(block)
-                    elif hasattr(block, 'text'):
-                        content.append({"type": "text", "text": block.text})
-                    elif hasattr(block, 'name'):
-                        # Tool use block
-                        content.append({
-                            "type": "tool_use",
-                            "id": getattr(block, 'id', ''),
-                            "name": block.name,
-                            "input": getattr(block, 'input', {}),
-                        })
-                result.append({"role": msg.role, "content": content})
+        for i, msg in enumerate(self.messages):
+            api = msg.to_api()
+            if total > token_budget and i < trimmable:
+                trimmed = msg.to_api_trimmed()
+                if trimmed is not api:
+                    total -= msg.api_token_estimate - msg.trimmed_token_estimate
+                    api = trimmed
+            result.append(api)
         return result
     
+    def history_token_estimate(self) -> int:
+        """Estimated tokens of the full (untrimmed) API history."""
+        return sum(msg.api_token_estimate for msg in self.messages)
+    
+    def invalidate_api_cache(self) -> None:
+        """Drop every message's memoized API form (e.g. after bulk edits)."""
+        for msg in self.messages:
+            msg.invalidate()
+    
     def get_recent_messages(self, n: int = 10) -> list[Message]:
         """Get the n most recent messages."""
         return self.messages[-n:]
@@ -146,37 +287,13 @@ class SessionState:
     
     def to_dict(self) -> dict[str, Any]:
         """Serialize session state to dictionary."""
-        def serialize_content(content):
-            """Serialize message content."""
-            if isinstance(content, str):
-                return content
-            # List of content blocks
-            result = []
-            for block in content:
-                if hasattr(block, 'model_dump'):
-                    result.append(block.model_dump())
-                elif hasattr(block, 'to_dict'):
-                    result.append(block.to_dict())
-                elif isinstance(block, dict):
-                    result.append(block)
-                elif hasattr(block, 'text'):
-                    result.append({"type": "text", "text": block.text})
-                elif hasattr(block, 'name'):
-                    result.append({
-                        "type": "tool_use",
-                        "id": getattr(block, 'id', ''),
-                        "name": block.name,
-                        "input": getattr(block, 'input', {}),
-                    })
-            return result
-        
         return {
             "session_id": self.session_id,
             "created_at": self.created_at.isoformat(),
             "messages": [
                 {
                     "role": m.role,
-                    "content": serialize_content(m.content),
+                    "content": _serialize_content(m.content),
                     "timestamp": m.timestamp.isoformat(),
                     "metadata": m.metadata,
                 }
@@ -16,6 +16,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, date
 from typing import Any
 import json
+import re
 
 
 @dataclass
@@ -139,6 +140,99 @@ ENTITY_COUNT_TABLES = {
     'network_facilities': 'network_facilities',
 }
 
+# Default stratification column per sampled table (see get_diverse_samples)
+DEFAULT_SAMPLE_STRATA = {
+    'patients': 'gender',
+    'encounters': 'class_code',
+    'members': 'gender',
+    'claims': 'claim_type',
+    'subjects': 'treatment_arm',
+    'prescriptions': 'drug_name',
+}
+
+# Named stratification expressions usable in place of a column name
+STRATA_EXPRESSIONS = {
+    'age_band': (
+        "CAST(FLOOR(EXTRACT(YEAR FROM AGE(CURRENT_DATE, birth_date)) / 10) * 10 AS INTEGER)"
+    ),
+}
+
+# Internal columns left out of samples
+SAMPLE_EXCLUDED_COLUMNS = ('cohort_id', 'created_at', 'generation_seed')
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def build_sample_query(
+    table_name: str,
+    count: int,
+    stratify_by: str | None = None,
+    order_by: str = 'created_at',
+) -> str:
+    """
+    Build a DuckDB query returning at most ``count`` sample rows of a cohort.
+    
+    Only the chosen rows leave the database. The query takes one
+    parameter, the cohort_id.
+    
+    Without ``stratify_by``, rows are evenly spaced in ``order_by`` order
+    (the same rows the previous in-Python selection returned). With it,
+    rows are taken round-robin across strata: the earliest row of each
+    stratum first, then the second of each, and so on.
+    
+    Args:
+        table_name: Entity table
+        count: Maximum number of rows
+        stratify_by: Column name, or a key of STRATA_EXPRESSIONS
+        order_by: Column defining row order within the cohort
+        
+    Returns:
+        SQL string
+        
+    Raises:
+        ValueError: If order_by or stratify_by is not a plain identifier
+    """
+    if not _IDENTIFIER.match(order_by):
+        raise ValueError(f"Invalid order column: {order_by}")
+    count = int(count)
+    
+    if stratify_by is not None:
+        stratum = STRATA_EXPRESSIONS.get(stratify_by)
+        if stratum is None:
+            if not _IDENTIFIER.match(stratify_by):
+                raise ValueError(f"Invalid stratification column: {stratify_by}")
+            stratum = f'"{stratify_by}"'
+        return f"""
+            SELECT * EXCLUDE (_sample_pos, _sample_stratum) FROM (
+                SELECT *,
+                    {stratum} AS _sample_stratum,
+                    row_number() OVER (
+                        PARTITION BY {stratum} ORDER BY "{order_by}"
+                    ) AS _sample_pos
+                FROM {table_name}
+                WHERE cohort_id = ?
+            )
+            ORDER BY _sample_pos, _sample_stratum NULLS LAST, "{order_by}"
+            LIMIT {count}
+        """
+    
+    return f"""
+        WITH base AS (
+            SELECT *, row_number() OVER (ORDER BY "{order_by}") - 1 AS _sample_pos
+            FROM {table_name}
+            WHERE cohort_id = ?
+        ),
+        picks AS (
+            SELECT CAST(FLOOR(i * GREATEST(
+                (SELECT COUNT(*) FROM base)::DOUBLE / {count}, 1.0
+            )) AS BIGINT) AS _sample_pos
+            FROM range({count}) AS r(i)
+        )
+        SELECT * EXCLUDE (_sample_pos) FROM base
+        WHERE _sample_pos IN (SELECT _sample_pos FROM picks)
+        ORDER BY _sample_pos
+    """
+
 
 class SummaryGenerator:
     """
@@ -150,24 +244,28 @@ class SummaryGenerator:
     Usage:
         generator = SummaryGenerator(connection)
         summary = generator.generate(cohort_id)
+    
+    With a SummaryCache, counts and statistics come from the persisted
+    aggregates instead of being recomputed on every call.
     """
     
-    def __init__(self, connection=None):
+    def __init__(self, connection=None, cache=None):
         """
         Initialize the summary generator.
         
         Args:
             connection: DuckDB connection (lazy loaded if not provided)
+            cache: Optional SummaryCache for counts and statistics
         """
         self._conn = connection
+        self.cache = cache
     
     @property
     def conn(self):
         """Get database connection."""
         if self._conn is None:
-            from healthsim_agent.database import DatabaseConnection
-            db_path = "data/healthsim-reference.duckdb"
-            self._conn = DatabaseConnection(db_path)
+            from healthsim_agent.tools.connection import ManagedConnection
+            self._conn = ManagedConnection()
         return self._conn
     
     def get_entity_counts(self, cohort_id: str) -> dict[str, int]:
@@ -342,42 +440,71 @@ class SummaryGenerator:
         
         return stats
     
+    def calculate_statistics(
+        self,
+        cohort_id: str,
+        entity_counts: dict[str, int],
+    ) -> dict[str, Any]:
+        """Calculate statistics based on what entities exist."""
+        statistics = {}
+        
+        if entity_counts.get('patients', 0) > 0:
+            statistics.update(self.calculate_patient_statistics(cohort_id))
+        
+        if entity_counts.get('encounters', 0) > 0:
+            statistics.update(self.calculate_encounter_statistics(cohort_id))
+        
+        if entity_counts.get('claims', 0) > 0:
+            statistics.update(self.calculate_claims_statistics(cohort_id))
+        
+        if entity_counts.get('diagnoses', 0) > 0:
+            statistics.update(self.calculate_diagnosis_statistics(cohort_id))
+        
+        return statistics
+    
+    def _load_cached(self, cohort_id: str) -> tuple[dict, dict] | None:
+        """Counts and statistics from the summary cache, if usable."""
+        if self.cache is None:
+            return None
+        
+        from .summary_cache import statistics_from_state
+        
+        try:
+            state = self.cache.load(cohort_id)
+        except Exception:
+            return None
+        return dict(state['counts']), statistics_from_state(state)
+    
     def get_diverse_samples(
         self,
         cohort_id: str,
         entity_type: str,
         table_name: str,
         count: int = 3,
+        stratify_by: str | None = None,
     ) -> list[dict]:
         """
         Get diverse sample entities for pattern consistency.
         
-        Tries to select samples that show variety (e.g., different genders,
-        age ranges, conditions) rather than just random selection.
+        Sampling runs inside DuckDB (see build_sample_query), so only the
+        selected rows are transferred. Pass ``stratify_by`` (a column such
+        as "gender", or "age_band") to draw across its values; if that
+        query fails, evenly spaced rows are returned instead.
         """
-        samples = []
+        queries = [build_sample_query(table_name, count)]
+        if stratify_by:
+            queries.insert(0, build_sample_query(table_name, count, stratify_by))
         
-        try:
-            # Get all rows ordered by created_at
-            result = self.conn.execute(f"""
-                SELECT * FROM {table_name}
-                WHERE cohort_id = ?
-                ORDER BY created_at
-            """, [cohort_id])
+        for query in queries:
+            try:
+                result = self.conn.execute(query, [cohort_id])
+            except Exception:
+                continue
             
+            samples = []
             if result.rows:
                 columns = result.columns
-                total = len(result.rows)
-                
-                if total <= count:
-                    indices = list(range(total))
-                else:
-                    # Take evenly spaced samples
-                    step = total / count
-                    indices = [int(i * step) for i in range(count)]
-                
-                for idx in indices:
-                    row = result.rows[idx]
+                for row in result.rows[:count]:
                     sample = {}
                     for i, col in enumerate(columns):
                         value = row[i]
@@ -385,20 +512,19 @@ class SummaryGenerator:
                         if isinstance(value, (datetime, date)):
                             value = str(value)
                         # Skip internal columns
-                        if col not in ('cohort_id', 'created_at', 'generation_seed'):
+                        if col not in SAMPLE_EXCLUDED_COLUMNS:
                             sample[col] = value
                     samples.append(sample)
-            
-        except Exception:
-            pass
+            return samples
         
-        return samples
+        return []
     
     def generate(
         self,
         cohort_id: str,
         include_samples: bool = True,
         samples_per_type: int = 3,
+        stratify_samples: bool = False,
     ) -> CohortSummary:
         """
         Generate a token-efficient summary of a cohort.
@@ -407,6 +533,8 @@ class SummaryGenerator:
             cohort_id: UUID of the cohort
             include_samples: Whether to include sample entities
             samples_per_type: Number of samples per major entity type
+            stratify_samples: Spread samples across DEFAULT_SAMPLE_STRATA
+                columns instead of taking evenly spaced rows
             
         Returns:
             CohortSummary with counts, statistics, and optional samples
@@ -442,25 +570,13 @@ class SummaryGenerator:
         """, [cohort_id])
         summary.tags = [row[0] for row in tags_result.rows] if tags_result.rows else []
         
-        # Get entity counts
-        summary.entity_counts = self.get_entity_counts(cohort_id)
-        
-        # Calculate statistics based on what entities exist
-        statistics = {}
-        
-        if summary.entity_counts.get('patients', 0) > 0:
-            statistics.update(self.calculate_patient_statistics(cohort_id))
-        
-        if summary.entity_counts.get('encounters', 0) > 0:
-            statistics.update(self.calculate_encounter_statistics(cohort_id))
-        
-        if summary.entity_counts.get('claims', 0) > 0:
-            statistics.update(self.calculate_claims_statistics(cohort_id))
-        
-        if summary.entity_counts.get('diagnoses', 0) > 0:
-            statistics.update(self.calculate_diagnosis_statistics(cohort_id))
-        
-        summary.statistics = statistics
+        cached = self._load_cached(cohort_id)
+        if cached is not None:
+            summary.entity_counts, summary.statistics = cached
+        else:
+            # Get entity counts
+            summary.entity_counts = self.get_entity_counts(cohort_id)
+            summary.statistics = self.calculate_statistics(cohort_id, summary.entity_counts)
         
         # Get samples if requested
         if include_samples:
@@ -480,7 +596,11 @@ class SummaryGenerator:
                 if summary.entity_counts.get(entity_type, 0) > 0:
                     entity_samples = self.get_diverse_samples(
                         cohort_id, entity_type, table_name,
-                        count=samples_per_type
+                        count=samples_per_type,
+                        stratify_by=(
+                            DEFAULT_SAMPLE_STRATA.get(table_name)
+                            if stratify_samples else None
+                        ),
                     )
                     if entity_samples:
                         samples[entity_type] = entity_samples
@@ -502,8 +622,8 @@ def get_cohort_by_name(name: str, connection=None) -> str | None:
         Cohort ID if found, None otherwise
     """
     if connection is None:
-        from healthsim_agent.database import DatabaseConnection
-        connection = DatabaseConnection("data/healthsim-reference.duckdb")
+        from healthsim_agent.tools.connection import ManagedConnection
+        connection = ManagedConnection()
     
     # Try exact match first
     result = connection.execute("""
@@ -542,6 +662,8 @@ def generate_summary(
     include_samples: bool = True,
     samples_per_type: int = 3,
     connection=None,
+    cache=None,
+    stratify_samples: bool = False,
 ) -> CohortSummary:
     """
     Generate a token-efficient summary of a cohort.
@@ -553,9 +675,14 @@ def generate_summary(
         include_samples: Whether to include sample entities
         samples_per_type: Number of samples per major entity type
         connection: Optional database connection
+        cache: Optional SummaryCache for counts and statistics
+        stratify_samples: Spread samples across DEFAULT_SAMPLE_STRATA
+            columns instead of taking evenly spaced rows
         
     Returns:
         CohortSummary with counts, statistics, and optional samples
     """
-    generator = SummaryGenerator(connection)
-    return generator.generate(cohort_id, include_samples, samples_per_type)
+    generator = SummaryGenerator(connection, cache=cache)
+    return generator.generate(
+        cohort_id, include_samples, samples_per_type, stratify_samples=stratify_samples
+    )
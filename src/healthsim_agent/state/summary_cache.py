@@ -0,0 +1,507 @@
+"""
+Persisted, incrementally maintained cohort summary aggregates.
+
+SummaryGenerator computes entity counts and statistics with one COUNT per
+entity table plus several aggregate queries per summary. This module keeps
+the same numbers in the ``cohort_summary_cache`` table as *mergeable*
+state - counts, sums, min/max and histogram buckets - so that:
+
+- reading a summary is a single-row lookup
+- the persist path merges the aggregates of just the rows it wrote
+- a full recompute happens only after invalidation (overwritten rows,
+  cohort deletion) or when the cached ages are from an earlier day
+
+Per-cohort state (stored as JSON)::
+
+    {
+        "version": 1,
+        "counts": {"patients": 100, "encounters": 250},
+        "entity_store": {"patients": 100},     # cohort_entities by type
+        "patients": {"ages": [[72, 4], ...], "gender": [["F", 52], ...]},
+        "encounters": {"min_date": "...", "max_date": "...",
+                       "class_code": [["AMB", 200], ...]},
+        "claims": {"total_charge": ..., "total_paid": ...,
+                   "patient_responsibility": ..., "charge_count": ...,
+                   "claim_type": [["professional", 80], ...]},
+        "diagnoses": {"codes": [["E11.9", "Type 2 diabetes", 40], ...]},
+    }
+
+Histograms are stored as lists so NULL keys survive the JSON round trip.
+Sections are None when their source query failed (e.g. missing column),
+mirroring SummaryGenerator, which then omits those statistics.
+
+Works with both connection styles used in the package: wrappers whose
+``execute`` returns an object with ``.rows``, and raw DuckDB connections.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any
+
+from healthsim_agent.db.schema import COHORT_SUMMARY_CACHE_DDL
+
+from .summary import ENTITY_COUNT_TABLES
+
+
+STATE_VERSION = 1
+
+# Entity table -> count key (ENTITY_COUNT_TABLES maps the other way)
+_COUNT_KEYS = {table: key for key, table in ENTITY_COUNT_TABLES.items()}
+
+# Number of entries shown for ranked histograms
+TOP_N = 5
+
+
+def _fetch(connection, sql: str, params: list | None = None) -> list:
+    """Run a query and return its rows for either connection style."""
+    result = connection.execute(sql, params or [])
+    rows = getattr(result, 'rows', None)
+    if rows is None:
+        rows = result.fetchall()
+    return list(rows)
+
+
+def _number(value) -> float | None:
+    return float(value) if value is not None else None
+
+
+def _iso(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()[:10]
+    return str(value)[:10]
+
+
+# ============================================================================
+# Section aggregates
+# ============================================================================
+
+def _patient_section(connection, where: str, params: list, as_of: date) -> dict:
+    ages = _fetch(connection, f"""
+        SELECT EXTRACT(YEAR FROM AGE(?::DATE, birth_date))::INT AS age, COUNT(*)
+        FROM patients
+        WHERE {where} AND birth_date IS NOT NULL
+        GROUP BY age
+    """, [as_of] + params)
+    gender = _fetch(connection, f"""
+        SELECT gender, COUNT(*) FROM patients
+        WHERE {where}
+        GROUP BY gender
+    """, params)
+    return {
+        'ages': [[row[0], row[1]] for row in ages],
+        'gender': [[row[0], row[1]] for row in gender],
+    }
+
+
+def _encounter_section(connection, where: str, params: list, as_of: date) -> dict:
+    dates = _fetch(connection, f"""
+        SELECT
+            MIN(CAST(admission_time AS DATE)),
+            MAX(CAST(admission_time AS DATE))
+        FROM encounters
+        WHERE {where} AND admission_time IS NOT NULL
+    """, params)
+    classes = _fetch(connection, f"""
+        SELECT class_code, COUNT(*) FROM encounters
+        WHERE {where}
+        GROUP BY class_code
+    """, params)
+    min_date, max_date = dates[0] if dates else (None, None)
+    return {
+        'min_date': _iso(min_date),
+        'max_date': _iso(max_date),
+        'class_code': [[row[0], row[1]] for row in classes],
+    }
+
+
+def _claims_section(connection, where: str, params: list, as_of: date) -> dict:
+    totals = _fetch(connection, f"""
+        SELECT
+            SUM(total_charge),
+            SUM(total_paid),
+            SUM(patient_responsibility),
+            COUNT(total_charge)
+        FROM claims
+        WHERE {where}
+    """, params)
+    types = _fetch(connection, f"""
+        SELECT claim_type, COUNT(*) FROM claims
+        WHERE {where}
+        GROUP BY claim_type
+    """, params)
+    charge, paid, responsibility, charge_count = totals[0]
+    return {
+        'total_charge': _number(charge),
+        'total_paid': _number(paid),
+        'patient_responsibility': _number(responsibility),
+        'charge_count': charge_count or 0,
+        'claim_type': [[row[0], row[1]] for row in types],
+    }
+
+
+def _diagnosis_section(connection, where: str, params: list, as_of: date) -> dict:
+    codes = _fetch(connection, f"""
+        SELECT code, description, COUNT(*) FROM diagnoses
+        WHERE {where}
+        GROUP BY code, description
+    """, params)
+    return {'codes': [[row[0], row[1], row[2]] for row in codes]}
+
+
+# Entity table -> aggregate function for its statistics section
+SECTION_BUILDERS = {
+    'patients': _patient_section,
+    'encounters': _encounter_section,
+    'claims': _claims_section,
+    'diagnoses': _diagnosis_section,
+}
+
+
+# ============================================================================
+# Merging
+# ============================================================================
+
+def _merge_histogram(left: list, right: list) -> list:
+    """Add bucket counts; every entry is [*key, count]."""
+    merged: dict[tuple, int] = {}
+    for entry in list(left) + list(right):
+        key = tuple(entry[:-1])
+        merged[key] = merged.get(key, 0) + entry[-1]
+    return [[*key, count] for key, count in merged.items()]
+
+
+def _merge_value(name: str, left: Any, right: Any) -> Any:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if isinstance(left, list):
+        return _merge_histogram(left, right)
+    if name.startswith('min_'):
+        return min(left, right)
+    if name.startswith('max_'):
+        return max(left, right)
+    return left + right
+
+
+def merge_section(left: dict | None, right: dict | None) -> dict | None:
+    """
+    Merge two aggregate sections of the same shape.
+
+    Lists are histograms (bucket counts add), ``min_*``/``max_*`` keep
+    the extreme, and everything else is summed. A None section stays None
+    so a query that failed once keeps failing the same way.
+    """
+    if left is None or right is None:
+        return None
+    return {name: _merge_value(name, left.get(name), right.get(name)) for name in left}
+
+
+def _add_counts(left: dict[str, int], right: dict[str, int]) -> dict[str, int]:
+    merged = dict(left)
+    for key, count in right.items():
+        merged[key] = merged.get(key, 0) + count
+    return {key: count for key, count in merged.items() if count > 0}
+
+
+# ============================================================================
+# Rendering
+# ============================================================================
+
+def _top(histogram: list, n: int = TOP_N) -> list:
+    return sorted(histogram, key=lambda entry: entry[-1], reverse=True)[:n]
+
+
+def statistics_from_state(state: dict) -> dict[str, Any]:
+    """
+    Render cached aggregates as SummaryGenerator statistics.
+
+    Produces the same keys and rounding as the calculate_*_statistics
+    methods of SummaryGenerator.
+    """
+    counts = state.get('counts', {})
+    stats: dict[str, Any] = {}
+
+    patients = state.get('patients')
+    if counts.get('patients', 0) > 0 and patients:
+        ages = patients['ages']
+        total = sum(n for _, n in ages)
+        if total:
+            avg = sum(age * n for age, n in ages) / total
+            stats['age_range'] = {
+                'min': min(age for age, _ in ages),
+                'max': max(age for age, _ in ages),
+                'avg': round(avg, 1) if avg else None,
+            }
+        if patients['gender']:
+            stats['gender_distribution'] = {g: n for g, n in patients['gender'] if g}
+
+    encounters = state.get('encounters')
+    if counts.get('encounters', 0) > 0 and encounters:
+        if encounters['min_date']:
+            stats['date_range'] = {
+                'min': encounters['min_date'],
+                'max': encounters['max_date'],
+            }
+        if encounters['class_code']:
+            stats['encounter_types'] = {
+                code: n for code, n in _top(encounters['class_code']) if code
+            }
+
+    claims = state.get('claims')
+    if counts.get('claims', 0) > 0 and claims:
+        if claims['total_charge']:
+            paid = claims['total_paid']
+            responsibility = claims['patient_responsibility']
+            avg_charge = (
+                claims['total_charge'] / claims['charge_count']
+                if claims['charge_count'] else 0
+            )
+            stats['financials'] = {
+                'total_billed': round(claims['total_charge'], 2),
+                'total_paid': round(paid, 2) if paid else 0,
+                'total_patient_resp': round(responsibility, 2) if responsibility else 0,
+                'avg_charge': round(avg_charge, 2) if avg_charge else 0,
+            }
+        if claims['claim_type']:
+            stats['claim_types'] = {t: n for t, n in claims['claim_type'] if t}
+
+    diagnoses = state.get('diagnoses')
+    if counts.get('diagnoses', 0) > 0 and diagnoses and diagnoses['codes']:
+        stats['top_diagnoses'] = [
+            {'code': code, 'description': description, 'count': n}
+            for code, description, n in _top(diagnoses['codes']) if code
+        ]
+
+    return stats
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class SummaryCache:
+    """
+    Cohort summary aggregates persisted in ``cohort_summary_cache``.
+
+    Usage:
+        cache = SummaryCache(connection)
+        state = cache.load(cohort_id)          # O(1) once cached
+
+        # In a write path
+        replaced = cache.owners_of('patients', 'id', ids)
+        ... write rows ...
+        cache.record_write(cohort_id, 'patients', 'id', ids, replaced)
+
+    Every method that touches the database lets exceptions propagate;
+    callers treat the cache as best-effort and fall back to direct
+    queries.
+    """
+
+    def __init__(self, connection, read_only: bool = False):
+        """
+        Initialize the cache.
+
+        Args:
+            connection: Database connection (either connection style)
+            read_only: Never create the cache table (for read-only
+                connections); lookups then fail if it does not exist
+        """
+        self.conn = connection
+        self._table_ready = read_only
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.incremental_updates = 0
+        self.invalidations = 0
+
+    def _ensure_table(self) -> None:
+        if not self._table_ready:
+            self.conn.execute(COHORT_SUMMARY_CACHE_DDL)
+            self._table_ready = True
+
+    @staticmethod
+    def _today() -> date:
+        return date.today()
+
+    def get(self, cohort_id: str) -> dict | None:
+        """
+        Return cached state, or None if absent or stale.
+
+        Entries are stale once the day changes, since cached ages are
+        relative to the day they were computed.
+        """
+        self._ensure_table()
+        rows = _fetch(self.conn, """
+            SELECT state, as_of FROM cohort_summary_cache WHERE cohort_id = ?
+        """, [cohort_id])
+        if rows:
+            state = json.loads(rows[0][0])
+            if state.get('version') == STATE_VERSION and _iso(rows[0][1]) == _iso(self._today()):
+                self.hits += 1
+                return state
+        self.misses += 1
+        return None
+
+    def load(self, cohort_id: str) -> dict:
+        """Return cached state, rebuilding it on a miss."""
+        state = self.get(cohort_id)
+        if state is None:
+            state = self.rebuild(cohort_id)
+        return state
+
+    def compute(self, cohort_id: str) -> dict:
+        """Compute full state for a cohort without storing it."""
+        where, params = "cohort_id = ?", [cohort_id]
+        as_of = self._today()
+
+        counts = {}
+        for entity_type, table_name in ENTITY_COUNT_TABLES.items():
+            try:
+                rows = _fetch(
+                    self.conn, f"SELECT COUNT(*) FROM {table_name} WHERE {where}", params
+                )
+            except Exception:
+                # Table may not exist or have cohort_id column
+                continue
+            if rows and rows[0][0] > 0:
+                counts[entity_type] = rows[0][0]
+
+        state: dict[str, Any] = {'version': STATE_VERSION, 'counts': counts}
+        for table_name, builder in SECTION_BUILDERS.items():
+            try:
+                state[table_name] = builder(self.conn, where, params, as_of)
+            except Exception:
+                state[table_name] = None
+
+        try:
+            rows = _fetch(self.conn, """
+                SELECT entity_type, COUNT(*) FROM cohort_entities
+                WHERE cohort_id = ?
+                GROUP BY entity_type
+            """, [cohort_id])
+            state['entity_store'] = {row[0]: row[1] for row in rows}
+        except Exception:
+            state['entity_store'] = None
+
+        return state
+
+    def rebuild(self, cohort_id: str) -> dict:
+        """Recompute a cohort's state from its rows and store it."""
+        state = self.compute(cohort_id)
+        self._store(cohort_id, state)
+        self.rebuilds += 1
+        return state
+
+    def _store(self, cohort_id: str, state: dict) -> None:
+        self._ensure_table()
+        self.conn.execute("""
+            INSERT OR REPLACE INTO cohort_summary_cache (cohort_id, state, as_of, updated_at)
+            VALUES (?, ?, ?, ?)
+        """, [cohort_id, json.dumps(state, default=str), self._today(), datetime.utcnow()])
+
+    def invalidate(self, cohort_id: str | None = None) -> None:
+        """Drop one cohort's cached state, or all of it."""
+        self._ensure_table()
+        if cohort_id is None:
+            self.conn.execute("DELETE FROM cohort_summary_cache")
+        else:
+            self.conn.execute(
+                "DELETE FROM cohort_summary_cache WHERE cohort_id = ?", [cohort_id]
+            )
+        self.invalidations += 1
+
+    def owners_of(self, table_name: str, id_column: str, entity_ids: list) -> set[str]:
+        """
+        Cohorts already holding any of these IDs.
+
+        Call before an upsert: rows that get overwritten cannot be
+        subtracted from mergeable aggregates, so their cohorts must be
+        invalidated instead of updated.
+        """
+        rows = _fetch(self.conn, f"""
+            SELECT DISTINCT cohort_id FROM {table_name}
+            WHERE CAST({id_column} AS VARCHAR) IN (SELECT UNNEST(?::VARCHAR[]))
+        """, [[str(entity_id) for entity_id in entity_ids]])
+        return {row[0] for row in rows}
+
+    def record_write(
+        self,
+        cohort_id: str,
+        table_name: str,
+        id_column: str,
+        entity_ids: list,
+        replaced: set[str] | None = None,
+    ) -> None:
+        """
+        Merge the aggregates of freshly written rows into a cohort's state.
+
+        Args:
+            cohort_id: Cohort the rows were written to
+            table_name: Entity table written
+            id_column: Primary key column of the table
+            entity_ids: IDs of the rows written
+            replaced: Result of owners_of() taken before the write; any
+                owner (and this cohort) is invalidated instead
+        """
+        if replaced:
+            for owner in replaced | {cohort_id}:
+                self.invalidate(owner)
+            return
+
+        state = self.get(cohort_id)
+        if state is None:
+            # Nothing cached yet; the next read builds it
+            return
+
+        where = (
+            f"cohort_id = ? AND CAST({id_column} AS VARCHAR) "
+            f"IN (SELECT UNNEST(?::VARCHAR[]))"
+        )
+        params = [cohort_id, [str(entity_id) for entity_id in entity_ids]]
+
+        rows = _fetch(self.conn, f"SELECT COUNT(*) FROM {table_name} WHERE {where}", params)
+        count_key = _COUNT_KEYS.get(table_name)
+        if count_key and rows and rows[0][0]:
+            state['counts'] = _add_counts(state['counts'], {count_key: rows[0][0]})
+
+        builder = SECTION_BUILDERS.get(table_name)
+        if builder is not None:
+            delta = builder(self.conn, where, params, self._today())
+            state[table_name] = merge_section(state.get(table_name), delta)
+
+        self._store(cohort_id, state)
+        self.incremental_updates += 1
+
+    def record_entity_store_write(self, cohort_id: str, added: dict[str, int]) -> dict | None:
+        """
+        Add newly inserted cohort_entities rows to a cohort's counts.
+
+        Args:
+            cohort_id: Cohort written to
+            added: Entity type -> number of rows that did not exist before
+
+        Returns:
+            Updated counts by entity type, or None if nothing was cached
+        """
+        state = self.get(cohort_id)
+        if state is None or state.get('entity_store') is None:
+            return None
+        state['entity_store'] = _add_counts(state['entity_store'], added)
+        self._store(cohort_id, state)
+        self.incremental_updates += 1
+        return state['entity_store']
+
+    def stats(self) -> dict[str, int]:
+        """Cache hit/miss and maintenance counters."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'rebuilds': self.rebuilds,
+            'incremental_updates': self.incremental_updates,
+            'invalidations': self.invalidations,
+        }
@@ -2,12 +2,14 @@
 
 This module provides all tools for the HealthSim Agent:
 - Base: ToolResult, ok, err helpers
-- Connection: ConnectionManager with close-before-write pattern
+- Connection: ConnectionManager (broker or close-before-write) and ManagedConnection
 - Cohort tools: list, load, save, add_entities, delete
 - Query tools: query, get_summary, list_tables
 - Reference tools: query_reference, search_providers
 - Format tools: transform_to_fhir, transform_to_x12, etc.
 - Validation tools: validate_data, fix_validation_issues
+- Result tools: budget_tool_result, fetch_tool_result for oversized results
+- Registry: ToolRegistry mapping agent tool names to executors and metadata
 
 Example:
     >>> from healthsim_agent.tools import list_cohorts, search_providers, validate_data
@@ -40,6 +42,7 @@ from .base import (
 
 from .connection import (
     ConnectionManager,
+    ManagedConnection,
     get_manager,
     reset_manager,
     get_db_path,
@@ -102,6 +105,17 @@ from .skill_tools import (
     get_skill_stats,
 )
 
+from .result_tools import (
+    budget_tool_result,
+    fetch_tool_result,
+)
+
+from .registry import (
+    ToolSpec,
+    ToolRegistry,
+    get_tool_registry,
+)
+
 
 __all__ = [
     # Base
@@ -116,6 +130,7 @@ __all__ = [
     "ALLOWED_ENTITY_TYPES",
     # Connection
     "ConnectionManager",
+    "ManagedConnection",
     "get_manager",
     "reset_manager",
     "get_db_path",
@@ -158,4 +173,11 @@ __all__ = [
     "get_skill_template",
     "create_skill_from_spec",
     "get_skill_stats",
+    # Result tools
+    "budget_tool_result",
+    "fetch_tool_result",
+    # Registry
+    "ToolSpec",
+    "ToolRegistry",
+    "get_tool_registry",
 ]
@@ -15,6 +15,8 @@ from typing import Any, Dict, List, Optional
 from uuid import uuid4
 import json
 
+from healthsim_agent.state.summary_cache import SummaryCache
+
 from .base import (
     ToolResult, ok, err,
     validate_entity_types, normalize_entity_type,
@@ -22,6 +24,115 @@ from .base import (
 from .connection import get_manager
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _resolve_entity_id(entity: Dict[str, Any], normalized: str) -> str:
+    """Pick the entity's natural ID, generating one if none is present."""
+    return (
+        entity.get('id') or 
+        entity.get(f'{normalized[:-1]}_id') or
+        entity.get('patient_id') or
+        entity.get('member_id') or
+        str(uuid4())
+    )
+
+
+def _upsert_entities(
+    conn,
+    cohort_id: str,
+    normalized: str,
+    entity_list: List[Dict[str, Any]],
+) -> tuple[List[str], int]:
+    """Upsert one entity type's batch with a staged, set-based merge.
+    
+    The batch is serialized once per entity, loaded into a temp table in a
+    single statement, then merged into cohort_entities with one
+    INSERT ... ON CONFLICT against UNIQUE(cohort_id, entity_type, entity_id).
+    
+    Args:
+        conn: Read-write DuckDB connection
+        cohort_id: Target cohort
+        normalized: Normalized (plural) entity type
+        entity_list: Entities to add or update
+        
+    Returns:
+        Entity IDs in payload order (duplicates included), and the number
+        of rows that were inserted rather than updated
+    """
+    entity_ids = []
+    staged: Dict[str, str] = {}
+    for entity in entity_list:
+        entity_id = _resolve_entity_id(entity, normalized)
+        entity_ids.append(entity_id)
+        # Later duplicates win, as with successive UPDATEs
+        staged[str(entity_id)] = json.dumps(entity, default=str)
+    
+    conn.execute(
+        """
+        CREATE OR REPLACE TEMP TABLE _staged_cohort_entities AS
+        SELECT UNNEST(?::VARCHAR[]) AS entity_id, UNNEST(?::VARCHAR[]) AS entity_data
+        """,
+        [list(staged.keys()), list(staged.values())]
+    )
+    try:
+        existing = conn.execute(
+            """
+            SELECT COUNT(*) FROM cohort_entities e
+            JOIN _staged_cohort_entities s ON e.entity_id = s.entity_id
+            WHERE e.cohort_id = ? AND e.entity_type = ?
+            """,
+            [cohort_id, normalized]
+        ).fetchone()[0]
+        conn.execute(
+            """
+            INSERT INTO cohort_entities (id, cohort_id, entity_type, entity_id, entity_data, created_at)
+            SELECT nextval('cohort_entities_seq'), ?, ?, entity_id, entity_data, ?
+            FROM _staged_cohort_entities
+            ON CONFLICT (cohort_id, entity_type, entity_id)
+            DO UPDATE SET entity_data = EXCLUDED.entity_data, created_at = EXCLUDED.created_at
+            """,
+            [cohort_id, normalized, datetime.utcnow()]
+        )
+    finally:
+        conn.execute("DROP TABLE IF EXISTS _staged_cohort_entities")
+    
+    return entity_ids, len(staged) - existing
+
+
+def _cohort_totals(conn, cohort_id: str, added: Dict[str, int]) -> Dict[str, int]:
+    """Entity totals by type after a write, kept in the summary cache.
+    
+    Newly inserted rows are merged into the cohort's cached counts; the
+    first write to an uncached cohort builds the entry. Falls back to a
+    GROUP BY over cohort_entities if the cache can't be used.
+    """
+    cache = SummaryCache(conn)
+    try:
+        totals = cache.record_entity_store_write(cohort_id, added)
+        if totals is None:
+            totals = cache.rebuild(cohort_id)['entity_store']
+        if totals is not None:
+            return totals
+    except Exception:
+        _invalidate_summary(conn, cohort_id)
+    
+    rows = conn.execute(
+        "SELECT entity_type, COUNT(*) FROM cohort_entities WHERE cohort_id = ? GROUP BY entity_type",
+        [cohort_id]
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def _invalidate_summary(conn, cohort_id: str) -> None:
+    """Drop a cohort's cached summary aggregates (best-effort)."""
+    try:
+        SummaryCache(conn).invalidate(cohort_id)
+    except Exception:
+        pass
+
+
 # =============================================================================
 # List Cohorts
 # =============================================================================
@@ -254,18 +365,14 @@ def save_cohort(
             for entity_type, entity_list in entities.items():
                 normalized = normalize_entity_type(entity_type)
                 for entity in entity_list:
-                    entity_id = (
-                        entity.get('id') or 
-                        entity.get(f'{normalized[:-1]}_id') or
-                        entity.get('patient_id') or
-                        entity.get('member_id') or
-                        str(uuid4())
-                    )
+                    entity_id = _resolve_entity_id(entity, normalized)
                     entity_json = json.dumps(entity, default=str)
                     conn.execute(
                         "INSERT INTO cohort_entities VALUES (nextval('cohort_entities_seq'), ?, ?, ?, ?, ?)",
                         [cohort_id, normalized, entity_id, entity_json, datetime.utcnow()]
                     )
+            
+            _invalidate_summary(conn, cohort_id)
         
         # Calculate entity counts
         entity_counts = {normalize_entity_type(k): len(v) for k, v in entities.items()}
@@ -358,46 +465,18 @@ def add_entities(
             # Add entities
             entity_counts = {}
             sample_ids = {}
+            inserted = {}
             
             for entity_type, entity_list in entities.items():
                 if not entity_list:
                     continue
                 
                 normalized = normalize_entity_type(entity_type)
-                added_ids = []
-                
-                for entity in entity_list:
-                    entity_id = (
-                        entity.get('id') or 
-                        entity.get(f'{normalized[:-1]}_id') or
-                        entity.get('patient_id') or
-                        entity.get('member_id') or
-                        str(uuid4())
-                    )
-                    
-                    entity_json = json.dumps(entity, default=str)
-                    
-                    # Upsert: check if exists
-                    existing_entity = conn.execute(
-                        "SELECT id FROM cohort_entities WHERE cohort_id = ? AND entity_type = ? AND entity_id = ?",
-                        [cohort_id, normalized, entity_id]
-                    ).fetchone()
-                    
-                    if existing_entity:
-                        conn.execute(
-                            "UPDATE cohort_entities SET entity_data = ?, created_at = ? WHERE cohort_id = ? AND entity_type = ? AND entity_id = ?",
-                            [entity_json, datetime.utcnow(), cohort_id, normalized, entity_id]
-                        )
-                    else:
-                        conn.execute(
-                            "INSERT INTO cohort_entities VALUES (nextval('cohort_entities_seq'), ?, ?, ?, ?, ?)",
-                            [cohort_id, normalized, entity_id, entity_json, datetime.utcnow()]
-                        )
-                    
-                    added_ids.append(entity_id)
+                added_ids, new_rows = _upsert_entities(conn, cohort_id, normalized, entity_list)
                 
                 entity_counts[normalized] = len(added_ids)
                 sample_ids[normalized] = added_ids[:5]
+                inserted[normalized] = inserted.get(normalized, 0) + new_rows
             
             # Update cohort timestamp
             conn.execute(
@@ -406,12 +485,7 @@ def add_entities(
             )
             
             # Get totals
-            total_result = conn.execute(
-                "SELECT entity_type, COUNT(*) FROM cohort_entities WHERE cohort_id = ? GROUP BY entity_type",
-                [cohort_id]
-            ).fetchall()
-            
-            totals_by_type = {row[0]: row[1] for row in total_result}
+            totals_by_type = _cohort_totals(conn, cohort_id, inserted)
             total_entities = sum(totals_by_type.values())
         
         # Build response
@@ -485,6 +559,7 @@ def delete_cohort(
             conn.execute("DELETE FROM cohort_entities WHERE cohort_id = ?", [actual_cohort_id])
             conn.execute("DELETE FROM cohort_tags WHERE cohort_id = ?", [actual_cohort_id])
             conn.execute("DELETE FROM cohorts WHERE id = ?", [actual_cohort_id])
+            _invalidate_summary(conn, actual_cohort_id)
         
         return ok({"cohort": cohort_id_clean}, status="deleted")
         
@@ -1,21 +1,39 @@
 """Connection management for HealthSim Agent tools.
 
-Implements the close-before-write pattern required by DuckDB:
+Two modes are available:
+
+Broker mode (default, single process):
+- One long-lived read-write connection owned by the manager
+- Reads get per-thread cursors on it, so they run concurrently
+- Writes are serialized by a lock and share one writer cursor
+- CHECKPOINT runs according to a CheckpointPolicy (default: on close)
+
+Close-before-write mode (opt-in):
 - Persistent read-only connection for queries (shared lock, fast repeated reads)
 - Write operations close read connection first, then open read-write connection
 - Read connection reopens lazily after writes complete
 
-This pattern is required because DuckDB does not allow simultaneous connections
-with different read_only configurations to the same database file, even within
-the same process.
+DuckDB does not allow simultaneous connections with different read_only
+configurations to the same database file, even within the same process.
+The broker holds the file's write lock for the life of the process, so
+everything in the process must go through the manager: the state managers
+(profiles, journeys, auto-persist, summaries) default to a
+ManagedConnection for that reason. Close-before-write costs >100 ms per
+write but never holds a read-write connection between writes; use it when
+other processes need to open the file while the agent runs.
+
+Select the mode with ``ConnectionManager(mode=...)`` or the
+HEALTHSIM_DB_MODE environment variable ("broker" or "close_before_write").
 """
 
 import atexit
 import os
 import signal
 import sys
+import threading
 import time
 from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Generator
 
@@ -48,12 +66,65 @@ def get_db_path() -> Path:
     return Path(os.environ.get("HEALTHSIM_DB_PATH", str(DEFAULT_DB_PATH)))
 
 
+BROKER_MODE = "broker"
+CLOSE_BEFORE_WRITE_MODE = "close_before_write"
+CONNECTION_MODES = (BROKER_MODE, CLOSE_BEFORE_WRITE_MODE)
+
+
+def get_db_mode() -> str:
+    """Get the connection mode from environment or default (broker).
+    
+    Returns:
+        One of CONNECTION_MODES
+    """
+    return os.environ.get("HEALTHSIM_DB_MODE", BROKER_MODE)
+
+
+@dataclass(frozen=True)
+class CheckpointPolicy:
+    """When the broker runs CHECKPOINT after a write.
+    
+    DuckDB also checkpoints on its own once the WAL grows past
+    ``wal_autocheckpoint``; this policy adds explicit checkpoints on top.
+    
+    Attributes:
+        every_writes: Checkpoint after this many write blocks (1 = after
+            every write, as in close-before-write mode)
+        interval_seconds: Checkpoint once this long has passed since the last one
+        on_close: Checkpoint when the manager closes
+    """
+    every_writes: Optional[int] = None
+    interval_seconds: Optional[float] = None
+    on_close: bool = True
+    
+    def due(self, writes: int, elapsed: float) -> bool:
+        """Whether a checkpoint is due after a write.
+        
+        Args:
+            writes: Write blocks since the last checkpoint
+            elapsed: Seconds since the last checkpoint
+        """
+        if self.every_writes is not None and writes >= self.every_writes:
+            return True
+        if self.interval_seconds is not None and elapsed >= self.interval_seconds:
+            return True
+        return False
+
+
 # =============================================================================
 # Connection Manager
 # =============================================================================
 
 class ConnectionManager:
-    """Manages DuckDB connections using close-before-write pattern.
+    """Manages DuckDB connections in broker or close-before-write mode.
+    
+    Broker mode (default):
+    - One read-write connection, opened lazily and kept open
+    - Read operations: per-thread cursor on that connection
+    - Write operations: take the write lock, use the shared writer cursor,
+      checkpoint when the CheckpointPolicy says so
+    
+    Close-before-write mode (opt-in):
     
     DuckDB Constraint: Cannot have simultaneous connections with different
     read_only configurations to the same database file, even in the same process.
@@ -77,32 +148,93 @@ class ConnectionManager:
         ...     conn.execute("INSERT INTO ...")
     """
     
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        mode: Optional[str] = None,
+        checkpoint_policy: Optional[CheckpointPolicy] = None,
+    ):
         """Initialize the connection manager.
         
         Args:
             db_path: Path to the DuckDB database file.
                      Defaults to HEALTHSIM_DB_PATH env var or built-in default.
+            mode: "broker" or "close_before_write".
+                  Defaults to HEALTHSIM_DB_MODE env var or "broker".
+            checkpoint_policy: Broker-mode checkpoint policy
+                  (default: checkpoint on close only)
         """
         self.db_path = db_path or get_db_path()
+        self.mode = mode or get_db_mode()
+        if self.mode not in CONNECTION_MODES:
+            raise ValueError(
+                f"Unknown connection mode: {self.mode} (expected one of {CONNECTION_MODES})"
+            )
+        self.checkpoint_policy = checkpoint_policy or CheckpointPolicy()
+        
+        # Close-before-write: the read-only connection.
+        # Broker: the shared read-write connection that cursors come from.
         self._read_conn: Optional[duckdb.DuckDBPyConnection] = None
         self._read_manager: Optional[StateManager] = None
+        
+        # Broker state
+        self._write_lock = threading.RLock()
+        self._connect_lock = threading.Lock()
+        self._local = threading.local()
+        self._cursors: list[duckdb.DuckDBPyConnection] = []
+        self._writer: Optional[duckdb.DuckDBPyConnection] = None
+        self._writes_since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        self.writes = 0
+        self.checkpoints = 0
+    
+    @property
+    def is_broker(self) -> bool:
+        """Whether the manager runs in broker mode."""
+        return self.mode == BROKER_MODE
+    
+    def _broker_connection(self) -> duckdb.DuckDBPyConnection:
+        """Open the shared read-write connection on first use."""
+        if self._read_conn is None:
+            with self._connect_lock:
+                if self._read_conn is None:
+                    self._read_conn = duckdb.connect(str(self.db_path))
+        return self._read_conn
+    
+    def _cursor(self) -> duckdb.DuckDBPyConnection:
+        """Get this thread's read cursor, creating it if needed."""
+        root = self._broker_connection()
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None or getattr(self._local, "root", None) is not root:
+            cursor = root.cursor()
+            self._local.cursor = cursor
+            self._local.root = root
+            with self._connect_lock:
+                self._cursors.append(cursor)
+        return cursor
     
     def get_read_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get persistent read-only connection.
+        """Get persistent connection for reads.
         
-        Uses shared lock - allows concurrent readers from other processes.
+        Broker mode: a cursor on the shared connection, one per thread, so
+        reads from different threads run concurrently.
+        
+        Close-before-write mode: the read-only connection. Uses shared lock -
+        allows concurrent readers from other processes.
         Connection is reused across all read operations.
         Will be automatically reopened after write operations.
         
         Includes retry logic in case a previous write lock hasn't fully released.
         
         Returns:
-            DuckDB connection in read-only mode
+            DuckDB connection (read-only in close-before-write mode)
             
         Raises:
             Exception: If connection cannot be established after retries
         """
+        if self.is_broker:
+            return self._cursor()
+        
         if self._read_conn is None:
             max_retries = 3
             retry_delay = 0.1  # 100ms between retries
@@ -137,14 +269,48 @@ class ConnectionManager:
             self._read_conn = None
             self._read_manager = None
     
+    def checkpoint(self) -> None:
+        """Flush the WAL into the database file (broker mode)."""
+        if self.is_broker and self._read_conn is not None:
+            with self._write_lock:
+                self._read_conn.execute("CHECKPOINT")
+                self._writes_since_checkpoint = 0
+                self._last_checkpoint = time.monotonic()
+                self.checkpoints += 1
+    
+    @contextmanager
+    def _broker_write(self) -> Generator[duckdb.DuckDBPyConnection, None, None]:
+        """Serialize a write block on the shared writer cursor."""
+        with self._write_lock:
+            outermost = self._writer is None
+            if outermost:
+                self._writer = self._broker_connection().cursor()
+            try:
+                yield self._writer
+            finally:
+                if outermost:
+                    self._writer.close()
+                    self._writer = None
+                    self.writes += 1
+                    self._writes_since_checkpoint += 1
+                    elapsed = time.monotonic() - self._last_checkpoint
+                    if self.checkpoint_policy.due(self._writes_since_checkpoint, elapsed):
+                        try:
+                            self.checkpoint()
+                        except Exception:
+                            pass  # Checkpoint is best-effort
+    
     @contextmanager
     def write_connection(self) -> Generator[duckdb.DuckDBPyConnection, None, None]:
         """Context manager for write operations.
         
-        IMPORTANT: Closes read connection first to avoid DuckDB's constraint
-        against mixing read_only=True and read_only=False connections to the
-        same database file.
+        Broker mode: holds the write lock (re-entrant within a thread) and
+        yields a cursor on the shared read-write connection. Reads on other
+        threads continue and see each statement once it commits.
         
+        Close-before-write mode: closes read connection first to avoid
+        DuckDB's constraint against mixing read_only=True and
+        read_only=False connections to the same database file.
         The read connection will be lazily reopened on the next read operation.
         
         Yields:
@@ -154,6 +320,11 @@ class ConnectionManager:
             >>> with manager.write_connection() as conn:
             ...     conn.execute("INSERT INTO cohorts VALUES (...)")
         """
+        if self.is_broker:
+            with self._broker_write() as conn:
+                yield conn
+            return
+        
         # Close read connection first - DuckDB doesn't allow mixed configurations
         self._close_read_connection()
         
@@ -183,12 +354,93 @@ class ConnectionManager:
         
         Should be called during shutdown to release database locks.
         """
+        if self.is_broker and self._read_conn is not None:
+            with self._write_lock:
+                if self.checkpoint_policy.on_close:
+                    try:
+                        self.checkpoint()
+                    except Exception:
+                        pass  # Checkpoint is best-effort
+                with self._connect_lock:
+                    for cursor in self._cursors:
+                        try:
+                            cursor.close()
+                        except Exception:
+                            pass
+                    self._cursors.clear()
+        
         if self._read_conn:
             self._read_conn.close()
             self._read_conn = None
             self._read_manager = None
 
 
+# =============================================================================
+# Connection-Style Access
+# =============================================================================
+
+# Leading keywords of statements that only read
+_READ_STATEMENTS = ("SELECT", "WITH", "FROM", "SHOW", "DESCRIBE", "SUMMARIZE", "EXPLAIN", "PRAGMA")
+
+
+@dataclass
+class StatementResult:
+    """Rows returned by one ManagedConnection statement."""
+    columns: list[str]
+    rows: list[tuple]
+    
+    def fetchall(self) -> list[tuple]:
+        return self.rows
+    
+    def fetchone(self) -> Optional[tuple]:
+        return self.rows[0] if self.rows else None
+
+
+class ManagedConnection:
+    """Connection-style access that runs every statement through a ConnectionManager.
+    
+    The state managers take a connection whose ``execute`` returns an object
+    with ``.rows``. This one runs reads on the manager's read connection and
+    everything else in a write block, so they share the tools' connection
+    instead of opening their own (which DuckDB refuses while the broker holds
+    the file read-write).
+    
+    Args:
+        manager: Manager to use; defaults to the global one, looked up on
+            each statement so reset_manager() is picked up
+    
+    Example:
+        >>> conn = ManagedConnection()
+        >>> conn.execute("SELECT COUNT(*) FROM cohorts").rows
+        [(3,)]
+    """
+    
+    def __init__(self, manager: Optional[ConnectionManager] = None):
+        self._manager = manager
+    
+    @property
+    def manager(self) -> ConnectionManager:
+        return self._manager or get_manager()
+    
+    def execute(self, sql: str, params: Optional[list] = None) -> StatementResult:
+        """Run one statement and fetch its rows."""
+        keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+        if keyword in _READ_STATEMENTS:
+            return self._run(self.manager.get_read_connection(), sql, params)
+        with self.manager.write_connection() as conn:
+            return self._run(conn, sql, params)
+    
+    @staticmethod
+    def _run(conn: duckdb.DuckDBPyConnection, sql: str, params: Optional[list]) -> StatementResult:
+        cursor = conn.execute(sql, params or [])
+        if cursor.description is None:
+            return StatementResult(columns=[], rows=[])
+        return StatementResult(
+            columns=[desc[0] for desc in cursor.description],
+            rows=cursor.fetchall(),
+        )
+
+
 # =============================================================================
 # Global Connection Manager Singleton
 # =============================================================================
@@ -4,7 +4,7 @@ Provides profile and journey management:
 - Profiles: Reusable generation specifications
 - Journeys: Multi-step cross-product workflows
 
-Uses the ConnectionManager's close-before-write pattern for DuckDB operations.
+Uses the shared ConnectionManager for DuckDB operations.
 """
 
 from datetime import datetime
@@ -9,6 +9,8 @@ These tools execute queries against the HealthSim database:
 from typing import Any, Dict, List, Optional
 import re
 
+from healthsim_agent.state.summary_cache import SummaryCache
+
 from .base import ToolResult, ok, err
 from .connection import get_manager
 
@@ -108,6 +110,17 @@ def query(
 # Get Summary
 # =============================================================================
 
+def _cached_entity_counts(conn, cohort_id: str) -> Optional[Dict[str, int]]:
+    """Entity counts from cohort_summary_cache, or None if not cached."""
+    try:
+        state = SummaryCache(conn, read_only=True).get(cohort_id)
+    except Exception:
+        return None
+    if state is None:
+        return None
+    return state.get('entity_store')
+
+
 def get_summary(
     cohort_id: str,
     include_samples: bool = True,
@@ -153,13 +166,14 @@ def get_summary(
         
         actual_cohort_id, name, description, created_at, updated_at = row
         
-        # Get entity counts by type
-        counts_result = conn.execute(
-            "SELECT entity_type, COUNT(*) as count FROM cohort_entities WHERE cohort_id = ? GROUP BY entity_type",
-            [actual_cohort_id]
-        ).fetchall()
-        
-        entity_counts = {row[0]: row[1] for row in counts_result}
+        # Get entity counts by type (cached by the write path when available)
+        entity_counts = _cached_entity_counts(conn, actual_cohort_id)
+        if entity_counts is None:
+            counts_result = conn.execute(
+                "SELECT entity_type, COUNT(*) as count FROM cohort_entities WHERE cohort_id = ? GROUP BY entity_type",
+                [actual_cohort_id]
+            ).fetchall()
+            entity_counts = {row[0]: row[1] for row in counts_result}
         total_entities = sum(entity_counts.values())
         
         # Get tags
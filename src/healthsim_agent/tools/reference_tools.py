@@ -7,6 +7,8 @@ These tools query real-world reference data:
 
 from typing import Any, Dict, List, Optional
 
+from healthsim_agent.db.reference.cache import get_reference_cache
+
 from .base import ToolResult, ok, err
 from .connection import get_manager
 
@@ -84,7 +86,9 @@ def query_reference(
         limit: Maximum rows to return (1-100, default 20)
         
     Returns:
-        ToolResult with columns and filtered rows
+        ToolResult with columns and filtered rows. Results are cached per
+        query until the reference data is reimported (see
+        healthsim_agent.db.reference.cache).
         
     Example:
         >>> result = query_reference("places_county", state="CA", limit=5)
@@ -137,8 +141,14 @@ def query_reference(
         where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
         sql = f"SELECT * FROM {full_table}{where_clause} LIMIT {limit}"
         
-        result = conn.execute(sql, query_params).fetchall()
-        columns = [desc[0] for desc in conn.description]
+        def run_query() -> tuple[list[str], list[tuple]]:
+            result = conn.execute(sql, query_params).fetchall()
+            return [desc[0] for desc in conn.description], result
+        
+        # Reference tables only change on reimport, which clears the cache
+        cache = get_reference_cache()
+        key = cache.make_key(sql, query_params, scope=str(get_manager().db_path))
+        columns, result = cache.get_or_compute(key, run_query)
         
         rows = []
         for row in result:
@@ -146,7 +156,7 @@ def query_reference(
         
         return ok({
             "table": full_table,
-            "columns": columns,
+            "columns": list(columns),
             "row_count": len(rows),
             "rows": rows,
         })
@@ -194,6 +204,20 @@ SPECIALTY_TAXONOMY_MAP = {
 }
 
 
+def specialty_taxonomy_patterns(specialty: str) -> list[str]:
+    """Taxonomy LIKE patterns (e.g. '207Q%') for a specialty keyword.
+    
+    Every SPECIALTY_TAXONOMY_MAP keyword contained in the specialty
+    contributes its patterns.
+    """
+    specialty_lower = specialty.lower().strip()
+    patterns = []
+    for keyword, keyword_patterns in SPECIALTY_TAXONOMY_MAP.items():
+        if keyword in specialty_lower:
+            patterns.extend(keyword_patterns)
+    return patterns
+
+
 def search_providers(
     state: str,
     city: Optional[str] = None,
@@ -299,13 +323,10 @@ def search_providers(
             
         elif specialty:
             # Map specialty keyword to taxonomy patterns
-            specialty_lower = specialty.lower().strip()
-            taxonomy_patterns = []
-            
-            for keyword, patterns in SPECIALTY_TAXONOMY_MAP.items():
-                if keyword in specialty_lower:
-                    for pattern in patterns:
-                        taxonomy_patterns.append(f"taxonomy_1 LIKE '{pattern}'")
+            taxonomy_patterns = [
+                f"taxonomy_1 LIKE '{pattern}'"
+                for pattern in specialty_taxonomy_patterns(specialty)
+            ]
             
             if taxonomy_patterns:
                 conditions.append(f"({' OR '.join(taxonomy_patterns)})")
@@ -0,0 +1,239 @@
+"""Tool dispatch registry for the agent loop.
+
+Maps every tool the agent exposes to Claude (agent.TOOL_DEFINITIONS) to its
+executor, together with the metadata the agent uses to schedule calls:
+
+- read_only: no persistent side effects; consecutive read-only calls in
+  one response may run concurrently
+- latency: rough cost class (LATENCY_FAST, LATENCY_IO, LATENCY_SLOW);
+  fast tools in a concurrent batch run inline rather than on the pool
+
+The registry is built once, on first use, and checked against the tool
+definitions when the agent starts so a definition without an executor (or
+with parameters the executor does not accept) fails fast instead of on the
+first call.
+
+Example:
+    >>> registry = get_tool_registry()
+    >>> registry.validate(TOOL_DEFINITIONS)
+    >>> spec = registry.get("query_reference")
+    >>> spec.read_only, spec.latency
+    (True, 'io')
+    >>> result = spec.executor(table="svi_county", state="CA")
+"""
+
+import inspect
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from .base import ToolResult
+
+# Latency classes
+LATENCY_FAST = "fast"  # In-memory, no database access
+LATENCY_IO = "io"  # One or a few database round trips
+LATENCY_SLOW = "slow"  # Generation or transformation over many entities
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """A tool executor and its scheduling metadata."""
+    name: str
+    executor: Callable[..., ToolResult]
+    read_only: bool
+    latency: str = LATENCY_IO
+
+
+def _build_specs() -> list[ToolSpec]:
+    """Import the tool modules and describe every agent tool."""
+    from .cohort_tools import (
+        list_cohorts, load_cohort, save_cohort, add_entities, delete_cohort
+    )
+    from .query_tools import query, get_summary, list_tables
+    from .reference_tools import query_reference, search_providers
+    from .format_tools import (
+        transform_to_fhir, transform_to_ccda, transform_to_hl7v2,
+        transform_to_x12, transform_to_ncpdp, transform_to_mimic, list_output_formats
+    )
+    from .generation_tools import (
+        generate_patients, generate_members, generate_subjects,
+        generate_rx_members, check_formulary, list_skills, describe_skill
+    )
+    from .validation_tools import validate_data, fix_validation_issues
+    from .profile_journey_tools import (
+        save_profile, load_profile, list_profiles, delete_profile, execute_profile,
+        save_journey, load_journey, list_journeys, delete_journey, execute_journey
+    )
+    from .export_tools import export_json, export_csv, export_ndjson
+    from .result_tools import fetch_tool_result
+
+    def read(executor, latency=LATENCY_IO) -> ToolSpec:
+        return ToolSpec(executor.__name__, executor, True, latency)
+
+    def write(executor, latency=LATENCY_IO) -> ToolSpec:
+        return ToolSpec(executor.__name__, executor, False, latency)
+
+    return [
+        # Cohort tools
+        read(list_cohorts),
+        read(load_cohort),
+        write(save_cohort),
+        write(add_entities),
+        write(delete_cohort),
+        # Query tools
+        read(query),
+        read(get_summary),
+        read(list_tables),
+        # Reference tools
+        read(query_reference),
+        read(search_providers),
+        # Format tools
+        read(transform_to_fhir, LATENCY_SLOW),
+        read(transform_to_ccda, LATENCY_SLOW),
+        read(transform_to_hl7v2, LATENCY_SLOW),
+        read(transform_to_x12, LATENCY_SLOW),
+        read(transform_to_ncpdp, LATENCY_SLOW),
+        read(transform_to_mimic, LATENCY_SLOW),
+        read(list_output_formats, LATENCY_FAST),
+        # Generation tools (results are returned, not persisted)
+        read(generate_patients, LATENCY_SLOW),
+        read(generate_members, LATENCY_SLOW),
+        read(generate_subjects, LATENCY_SLOW),
+        read(generate_rx_members, LATENCY_SLOW),
+        read(check_formulary, LATENCY_FAST),
+        read(list_skills, LATENCY_FAST),
+        read(describe_skill, LATENCY_FAST),
+        # Validation tools
+        read(validate_data, LATENCY_FAST),
+        read(fix_validation_issues, LATENCY_FAST),
+        # Profile tools
+        write(save_profile),
+        read(load_profile),
+        read(list_profiles),
+        write(delete_profile),
+        write(execute_profile, LATENCY_SLOW),
+        # Journey tools
+        write(save_journey),
+        read(load_journey),
+        read(list_journeys),
+        write(delete_journey),
+        write(execute_journey, LATENCY_SLOW),
+        # Export tools (write files when given a filepath)
+        write(export_json, LATENCY_FAST),
+        write(export_csv, LATENCY_FAST),
+        write(export_ndjson, LATENCY_FAST),
+        # Result paging
+        read(fetch_tool_result),
+    ]
+
+
+class ToolRegistry:
+    """Name -> ToolSpec lookup for agent tool dispatch."""
+
+    def __init__(self, specs: Iterable[ToolSpec]):
+        self._specs: dict[str, ToolSpec] = {}
+        for spec in specs:
+            if spec.name in self._specs:
+                raise ValueError(f"Duplicate tool in registry: {spec.name}")
+            self._specs[spec.name] = spec
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    @property
+    def names(self) -> list[str]:
+        """Registered tool names, in registration order."""
+        return list(self._specs)
+
+    def get(self, name: str) -> Optional[ToolSpec]:
+        """Get a tool's spec, or None if it is not registered."""
+        return self._specs.get(name)
+
+    def get_executor(self, name: str) -> Optional[Callable[..., ToolResult]]:
+        """Get a tool's executor, or None if it is not registered."""
+        spec = self._specs.get(name)
+        return spec.executor if spec is not None else None
+
+    def is_read_only(self, name: str) -> bool:
+        """Whether a tool has no side effects; unknown tools count as writes."""
+        spec = self._specs.get(name)
+        return spec is not None and spec.read_only
+
+    def is_fast(self, name: str) -> bool:
+        """Whether a tool runs in memory (LATENCY_FAST); unknown tools are not."""
+        spec = self._specs.get(name)
+        return spec is not None and spec.latency == LATENCY_FAST
+
+    def check(self, definitions: list[dict[str, Any]]) -> list[str]:
+        """Compare the registry with Claude tool definitions.
+
+        Reports definitions without an executor, executors without a
+        definition, schema properties the executor does not accept, and
+        executor parameters that are required but missing from the schema.
+
+        Returns:
+            Problem descriptions; empty if the two match
+        """
+        problems = []
+        defined = {d["name"]: d for d in definitions}
+
+        for name in defined.keys() - self._specs.keys():
+            problems.append(f"{name}: defined but has no executor")
+        for name in self._specs.keys() - defined.keys():
+            problems.append(f"{name}: has an executor but no definition")
+
+        for name in defined.keys() & self._specs.keys():
+            params = inspect.signature(self._specs[name].executor).parameters
+            if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+                continue
+            properties = defined[name].get("input_schema", {}).get("properties", {})
+            for prop in properties.keys() - params.keys():
+                problems.append(f"{name}: executor does not accept '{prop}'")
+            for param in params.values():
+                if (
+                    param.default is inspect.Parameter.empty
+                    and param.kind is not inspect.Parameter.VAR_POSITIONAL
+                    and param.name not in properties
+                ):
+                    problems.append(f"{name}: required parameter '{param.name}' is not in the schema")
+
+        return sorted(problems)
+
+    def validate(self, definitions: list[dict[str, Any]]) -> None:
+        """Raise ValueError if the registry does not match the definitions."""
+        problems = self.check(definitions)
+        if problems:
+            raise ValueError(
+                "Tool definitions and executors do not match:\n  " + "\n  ".join(problems)
+            )
+
+
+_registry: Optional[ToolRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get the agent tool registry, building it on first use.
+
+    Returns:
+        The shared ToolRegistry instance
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ToolRegistry(_build_specs())
+    return _registry
+
+
+__all__ = [
+    "ToolSpec",
+    "ToolRegistry",
+    "get_tool_registry",
+    "LATENCY_FAST",
+    "LATENCY_IO",
+    "LATENCY_SLOW",
+]
@@ -0,0 +1,521 @@
+"""Tool-result budgeting for the agent loop.
+
+Tools like query, load_cohort, transform_to_fhir and export_json can return
+megabytes, and whatever goes into a tool_result is resent on every later
+turn. budget_tool_result() passes small results through unchanged. Larger
+results are stored in the tool_result_cache table, keyed by a handle.
+If the database cannot be written, they go to a temp file instead. The
+model then gets a compact preview, never larger than the budget: the
+outline of the data, the row count and schema of the largest list (or the
+length of the largest string, or the key count of an object with many
+keys), the first few rows, and the handle. fetch_tool_result() pages through the
+stored payload, capping each page at MAX_FETCH_CHARS; items or values too
+large for a page come back as outlines.
+
+Example:
+    >>> content = budget_tool_result("query", result, max_chars=20_000)
+    >>> preview = json.loads(content)
+    >>> preview["handle"], preview["total_items"]
+    ('tr_3f9c0a1b2c4d', 5000)
+    >>> page = fetch_tool_result(preview["handle"], offset=100, limit=50)
+    >>> len(page.data["items"])
+    50
+"""
+
+import json
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Any, Optional
+from uuid import uuid4
+
+from .base import ToolResult, ok, err
+from .connection import get_manager
+
+TOOL_RESULT_TABLE = "tool_result_cache"
+
+# Default size above which a result is stored and replaced by a preview
+DEFAULT_MAX_RESULT_CHARS = 50_000
+
+# Preview shape
+PREVIEW_HEAD_ITEMS = 5
+PREVIEW_VALUE_CHARS = 500
+
+# Objects with more keys than this are outlined by their first keys only,
+# and are paged by key like a list
+OUTLINE_MAX_KEYS = 20
+
+# fetch_tool_result page caps; MAX_FETCH_CHARS bounds the whole serialized page
+MAX_FETCH_ITEMS = 100
+MAX_FETCH_CHARS = 20_000
+
+# Room left in a page for its handle, path, counts and hint
+PAGE_ENVELOPE_CHARS = 1000
+
+# Single-line text is paged in chunks of this many characters
+TEXT_CHUNK_CHARS = 2000
+
+# Fallback store when the database cannot be written
+SPILL_DIR = Path(tempfile.gettempdir()) / "healthsim-tool-results"
+
+# Retention, applied once per process: stored results older than this are
+# deleted, then the oldest until the rest fit in MAX_STORED_CHARS
+RESULT_RETENTION_HOURS = 24
+MAX_STORED_CHARS = 200_000_000
+
+
+# =============================================================================
+# Storage
+# =============================================================================
+
+_table_ensured = False
+_spill_pruned = False
+
+# Recently fetched payloads, so paging does not re-parse the full result
+_payload_cache: "OrderedDict[str, Any]" = OrderedDict()
+_payload_cache_lock = threading.Lock()
+_PAYLOAD_CACHE_SIZE = 4
+
+
+def _ensure_table() -> None:
+    """Ensure the tool result table exists and prune expired results."""
+    global _table_ensured
+    if _table_ensured:
+        return
+
+    _prune_spill_dir()
+    with get_manager().write_connection() as conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {TOOL_RESULT_TABLE} (
+                handle          VARCHAR PRIMARY KEY,
+                tool_name       VARCHAR NOT NULL,
+                payload         JSON NOT NULL,
+                size_chars      INTEGER,
+                created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute(
+            f"DELETE FROM {TOOL_RESULT_TABLE} "
+            "WHERE created_at < CURRENT_TIMESTAMP - to_hours(CAST(? AS BIGINT))",
+            [RESULT_RETENTION_HOURS],
+        )
+        conn.execute(f"""
+            DELETE FROM {TOOL_RESULT_TABLE} WHERE handle IN (
+                SELECT handle FROM (
+                    SELECT handle, SUM(size_chars) OVER (
+                        ORDER BY created_at DESC, handle
+                    ) AS kept_chars
+                    FROM {TOOL_RESULT_TABLE}
+                ) WHERE kept_chars > ?
+            )
+        """, [MAX_STORED_CHARS])
+
+    _table_ensured = True
+
+
+def _prune_spill_dir() -> None:
+    """Apply the result retention to spilled files, once per process."""
+    global _spill_pruned
+    if _spill_pruned:
+        return
+    _spill_pruned = True
+
+    try:
+        files = [(path, path.stat()) for path in SPILL_DIR.glob("tr_*.json")]
+    except OSError:
+        return
+    cutoff = time.time() - RESULT_RETENTION_HOURS * 3600
+    kept_chars = 0
+    for path, stat in sorted(files, key=lambda f: f[1].st_mtime, reverse=True):
+        kept_chars += stat.st_size
+        if stat.st_mtime < cutoff or kept_chars > MAX_STORED_CHARS:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _spill_path(handle: str) -> Path:
+    return SPILL_DIR / f"{handle}.json"
+
+
+def store_tool_result(tool_name: str, payload_json: str) -> str:
+    """Store a serialized tool result and return its handle.
+
+    Args:
+        tool_name: Tool that produced the result
+        payload_json: The full result, JSON-serialized
+
+    Returns:
+        Handle for fetch_tool_result
+    """
+    handle = f"tr_{uuid4().hex[:12]}"
+    try:
+        _ensure_table()
+        with get_manager().write_connection() as conn:
+            conn.execute(
+                f"INSERT INTO {TOOL_RESULT_TABLE} (handle, tool_name, payload, size_chars) "
+                "VALUES (?, ?, ?, ?)",
+                [handle, tool_name, payload_json, len(payload_json)],
+            )
+    except Exception:
+        _prune_spill_dir()
+        SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        _spill_path(handle).write_text(payload_json)
+    return handle
+
+
+def _load_payload(handle: str) -> Optional[Any]:
+    """Load and parse a stored result, or None if the handle is unknown."""
+    with _payload_cache_lock:
+        if handle in _payload_cache:
+            _payload_cache.move_to_end(handle)
+            return _payload_cache[handle]
+
+    payload_json = None
+    path = _spill_path(handle)
+    if path.exists():
+        payload_json = path.read_text()
+    else:
+        try:
+            _ensure_table()
+            row = get_manager().get_read_connection().execute(
+                f"SELECT payload FROM {TOOL_RESULT_TABLE} WHERE handle = ?", [handle]
+            ).fetchone()
+        except Exception:
+            row = None
+        if row is not None:
+            payload_json = row[0]
+
+    if payload_json is None:
+        return None
+
+    payload = json.loads(payload_json)
+    with _payload_cache_lock:
+        _payload_cache[handle] = payload
+        while len(_payload_cache) > _PAYLOAD_CACHE_SIZE:
+            _payload_cache.popitem(last=False)
+    return payload
+
+
+# =============================================================================
+# Previews
+# =============================================================================
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+def _is_wide(value: Any) -> bool:
+    return isinstance(value, dict) and len(value) > OUTLINE_MAX_KEYS
+
+
+def _find_pageable(value: Any, path: tuple = (), depth: int = 3) -> tuple[tuple, Any]:
+    """Find the largest list, string or wide object in a result (by serialized size)."""
+    best: tuple[tuple, Any] = ((), None)
+    best_size = -1
+    if isinstance(value, (list, str)) or _is_wide(value):
+        best, best_size = (path, value), _size(value)
+    if isinstance(value, dict) and depth > 0:
+        for key, child in value.items():
+            candidate = _find_pageable(child, path + (key,), depth - 1)
+            if candidate[1] is not None:
+                size = _size(candidate[1])
+                if size > best_size:
+                    best, best_size = candidate, size
+    return best
+
+
+def _outline(value: Any, depth: int = 2) -> Any:
+    """Keep small values; describe large ones by type and size."""
+    if _size(value) <= PREVIEW_VALUE_CHARS:
+        return value
+    if isinstance(value, dict) and depth > 0:
+        keys = list(value)[:OUTLINE_MAX_KEYS]
+        outline = {key: _outline(value[key], depth - 1) for key in keys}
+        if len(value) > len(keys):
+            outline["..."] = f"<object with {len(value)} keys>"
+        return outline
+    if isinstance(value, list):
+        return f"<list of {len(value)} items>"
+    if isinstance(value, str):
+        return f"<text of {len(value):,} chars>"
+    if isinstance(value, dict):
+        return f"<object with {len(value)} keys>"
+    return f"<{type(value).__name__}>"
+
+
+def _truncate_text(text: str, budget: int) -> str:
+    """Shorten text until its JSON serialization fits in budget."""
+    size = _size(text)
+    while text and size > budget:
+        # Escapes make the serialization longer than the text, so shrink
+        # in proportion until it fits
+        text = text[:len(text) * budget // size]
+        size = _size(text)
+    return text
+
+
+def _cap_value(value: Any, budget: int) -> tuple[Any, bool]:
+    """Return a value if it fits in budget, else its outline or truncated JSON.
+
+    Returns:
+        (value, truncated)
+    """
+    if _size(value) <= budget:
+        return value, False
+    outline = _outline(value)
+    if _size(outline) <= budget:
+        return outline, True
+    return _truncate_text(json.dumps(outline, default=str), budget), True
+
+
+def _text_items(text: str) -> list[str]:
+    """Split text into pageable items: lines, or fixed-size chunks."""
+    lines = text.splitlines()
+    if len(lines) > 1:
+        return lines
+    return [text[i:i + TEXT_CHUNK_CHARS] for i in range(0, len(text), TEXT_CHUNK_CHARS)]
+
+
+def _get_path(value: Any, path: tuple) -> Any:
+    for key in path:
+        value = value[key]
+    return value
+
+
+def build_preview(handle: str, payload: Any, size_chars: int, max_chars: int) -> dict[str, Any]:
+    """Build the compact preview sent in place of a stored result."""
+    path, pageable = _find_pageable(payload)
+    preview: dict[str, Any] = {
+        "truncated": True,
+        "handle": handle,
+        "size_chars": size_chars,
+        "outline": _outline(payload),
+        "path": ".".join(str(key) for key in path),
+    }
+
+    head_budget = max_chars // 2
+    if isinstance(pageable, list):
+        head = []
+        used = 0
+        for item in pageable[:PREVIEW_HEAD_ITEMS]:
+            used += _size(item)
+            if used > head_budget:
+                break
+            head.append(item)
+        preview["total_items"] = len(pageable)
+        first = pageable[0] if pageable else None
+        if isinstance(first, dict):
+            preview["schema"] = list(first.keys())
+        elif isinstance(payload, dict) and isinstance(payload.get("data"), dict):
+            columns = payload["data"].get("columns")
+            if columns:
+                preview["schema"] = columns
+        preview["head"] = head
+    elif isinstance(pageable, str):
+        items = _text_items(pageable)
+        preview["total_chars"] = len(pageable)
+        preview["total_items"] = len(items)
+        preview["head"] = "\n".join(items[:PREVIEW_HEAD_ITEMS])[:head_budget]
+    elif isinstance(pageable, dict):
+        head = {}
+        used = 0
+        for key, value in islice(pageable.items(), PREVIEW_HEAD_ITEMS):
+            used += _size(key) + _size(value)
+            if used > head_budget:
+                break
+            head[key] = value
+        preview["total_items"] = len(pageable)
+        preview["head"] = head
+
+    preview["hint"] = (
+        f"Result was too large to include. Call fetch_tool_result(handle='{handle}', "
+        "offset=0, limit=50) to page through it."
+    )
+    return _fit_preview(preview, payload, max_chars)
+
+
+def _fit_preview(preview: dict[str, Any], payload: Any, max_chars: int) -> dict[str, Any]:
+    """Shrink a preview until it serializes to at most max_chars.
+
+    Tries a shallower outline, then drops the head and schema, then cuts
+    the outline to truncated JSON.
+    """
+    shrink_steps = [
+        lambda: preview.update(outline=_outline(payload, depth=1)),
+        lambda: preview.update(outline=_outline(payload, depth=0)),
+        lambda: preview.pop("head", None),
+        lambda: preview.pop("schema", None),
+    ]
+    for shrink in shrink_steps:
+        if _size(preview) <= max_chars:
+            return preview
+        shrink()
+    excess = _size(preview) - max_chars
+    if excess > 0:
+        outline = json.dumps(preview["outline"], default=str)
+        preview["outline"] = _truncate_text(outline, max(0, _size(outline) - excess))
+    return preview
+
+
+def budget_tool_result(
+    tool_name: str,
+    result: Any,
+    max_chars: Optional[int] = DEFAULT_MAX_RESULT_CHARS,
+) -> str:
+    """Serialize a tool result for the conversation, spilling large ones.
+
+    Args:
+        tool_name: Tool that produced the result
+        result: The result dict
+        max_chars: Largest result included verbatim; None disables budgeting
+
+    Returns:
+        JSON content for the tool_result block
+    """
+    content = json.dumps(result, default=str)
+    if max_chars is None or len(content) <= max_chars:
+        return content
+    if tool_name == "fetch_tool_result" and len(content) <= MAX_FETCH_CHARS:
+        # Pages within the fetch cap pass even under a smaller budget;
+        # spilling them would send the model back to fetch the same page
+        return content
+
+    handle = store_tool_result(tool_name, content)
+    payload = json.loads(content)
+    preview = build_preview(handle, payload, len(content), max_chars)
+    if isinstance(result, dict):
+        for key in ("success", "error"):
+            if key in result:
+                preview = {key: result[key], **preview}
+    return json.dumps(preview, default=str)
+
+
+# =============================================================================
+# Fetch Tool
+# =============================================================================
+
+def fetch_tool_result(
+    handle: str,
+    offset: int = 0,
+    limit: int = 50,
+    path: Optional[str] = None,
+) -> ToolResult:
+    """Page through a tool result that was too large to include.
+
+    Args:
+        handle: Handle from the truncated result preview
+        offset: First item to return
+        limit: Items to return (max 100). Text is paged by line, or in
+            2000-character chunks if it is a single line. Pages are cut
+            short at about 20,000 characters; items or values larger than
+            that are returned as outlines, marked "truncated"
+        path: Dotted path of the list, text or object to page, e.g.
+            "data.entities.patients"; defaults to the path in the preview.
+            Objects with many keys are paged by key
+
+    Returns:
+        ToolResult with the requested page
+
+    Example:
+        >>> result = fetch_tool_result("tr_3f9c0a1b2c4d", offset=50, limit=50)
+        >>> result.data["items"]
+    """
+    payload = _load_payload(handle)
+    if payload is None:
+        return err(f"Unknown tool result handle: {handle}")
+
+    try:
+        if path:
+            keys = tuple(int(k) if k.isdigit() else k for k in path.split("."))
+            target = _get_path(payload, keys)
+        else:
+            keys, target = _find_pageable(payload)
+            if target is None:
+                keys, target = (), payload
+    except (KeyError, IndexError, TypeError):
+        return err(f"Path not found in result: {path}")
+
+    offset = max(0, offset)
+    limit = max(1, min(limit, MAX_FETCH_ITEMS))
+    path_str = ".".join(str(key) for key in keys)
+    budget = MAX_FETCH_CHARS - PAGE_ENVELOPE_CHARS
+    truncated = False
+    if isinstance(target, list):
+        # Stop early rather than return a page that would itself be too large
+        items = []
+        used = 0
+        for item in target[offset:offset + limit]:
+            item, cut = _cap_value(item, budget)
+            used += _size(item) + 2
+            if items and used > budget:
+                break
+            truncated = truncated or cut
+            items.append(item)
+        page = {
+            "handle": handle,
+            "path": path_str,
+            "total_items": len(target),
+            "offset": offset,
+            "items": items,
+            "has_more": offset + len(items) < len(target),
+        }
+    elif _is_wide(target):
+        # Paged by key, in insertion order
+        items = {}
+        used = 0
+        for key, value in islice(target.items(), offset, offset + limit):
+            value, cut = _cap_value(value, budget)
+            used += _size(key) + _size(value) + 4
+            if items and used > budget:
+                break
+            truncated = truncated or cut
+            items[key] = value
+        page = {
+            "handle": handle,
+            "path": path_str,
+            "total_items": len(target),
+            "offset": offset,
+            "items": items,
+            "has_more": offset + len(items) < len(target),
+        }
+    elif isinstance(target, str):
+        items = _text_items(target)
+        separator = "\n" if len(target.splitlines()) > 1 else ""
+        text = separator.join(items[offset:offset + limit])
+        page_text = _truncate_text(text, budget)
+        truncated = len(page_text) < len(text)
+        page = {
+            "handle": handle,
+            "path": path_str,
+            "total_items": len(items),
+            "offset": offset,
+            "text": page_text,
+            "has_more": offset + limit < len(items),
+        }
+    else:
+        value, truncated = _cap_value(target, budget)
+        page = {"handle": handle, "path": path_str, "value": value}
+
+    if truncated:
+        prefix = f"{path_str}." if path_str else ""
+        page["truncated"] = True
+        page["hint"] = (
+            "Part of this page was too large and is shown as an outline or cut short. "
+            f"Fetch a smaller part with path='{prefix}<key or index>' or a lower limit."
+        )
+    return ok(page)
+
+
+__all__ = [
+    "budget_tool_result",
+    "build_preview",
+    "fetch_tool_result",
+    "store_tool_result",
+    "TOOL_RESULT_TABLE",
+    "DEFAULT_MAX_RESULT_CHARS",
+]
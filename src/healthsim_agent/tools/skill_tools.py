@@ -11,11 +11,13 @@ Skills remain as markdown files for human readability and git version control,
 but are indexed in DuckDB for fast search and discovery.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 import json
 import re
+import time
 import yaml
 
 from .base import ToolResult, ok, err
@@ -104,6 +106,26 @@ def _ensure_tables() -> None:
             )
         """)
         
+        # Inverted index for ranked search (term frequencies per field)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS skill_terms (
+                skill_id        VARCHAR NOT NULL,
+                field           VARCHAR NOT NULL,
+                term            VARCHAR NOT NULL,
+                tf              INTEGER NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_skill_terms_term ON skill_terms(term)")
+        
+        # Token count per field, for BM25 length normalization
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS skill_field_lengths (
+                skill_id        VARCHAR NOT NULL,
+                field           VARCHAR NOT NULL,
+                length          INTEGER NOT NULL
+            )
+        """)
+        
         # Version history
         conn.execute("""
             CREATE TABLE IF NOT EXISTS skill_versions (
@@ -228,19 +250,328 @@ def _determine_skill_type(file_path: Path, parsed: dict) -> str:
     return 'scenario'
 
 
+# =============================================================================
+# Search Index
+# =============================================================================
+
+# Per-field BM25 weights; a match in the name outranks one in the body
+SEARCH_FIELD_BOOSTS = {
+    "name": 4.0,
+    "triggers": 3.0,
+    "description": 2.0,
+    "body": 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# SQL producing each searchable field's text from skill_index si and
+# skill_content sc
+_SEARCH_FIELD_SQL = {
+    "name": "si.name",
+    "triggers": "array_to_string(si.trigger_phrases::VARCHAR[], ' ')",
+    "description": "si.description",
+    "body": "sc.full_text",
+}
+
+# Terms are lowercase runs of letters, digits and underscores, with simple
+# plural folding. Indexed text is tokenized inside DuckDB (fold applied to
+# column t); queries are tokenized by _query_terms, which must agree.
+_TOKEN_REGEX = r"'[\p{L}\p{N}_]+'"
+_FOLD_SQL = (
+    "CASE WHEN length(t) > 3 AND suffix(t, 's') AND NOT suffix(t, 'ss') "
+    "THEN t[:-2] ELSE t END"
+)
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def _query_terms(query: str) -> list[str]:
+    """Tokenize a search query the same way indexed text is tokenized."""
+    terms = []
+    for t in _TOKEN_PATTERN.findall(query.lower()):
+        if len(t) > 3 and t.endswith('s') and not t.endswith('ss'):
+            t = t[:-1]
+        if t not in terms:
+            terms.append(t)
+    return terms
+
+
+def _index_search_terms(conn: Any, skill_ids: list[str]) -> None:
+    """Build skill_terms and skill_field_lengths rows for indexed skills."""
+    fields = ", ".join(f"'{field}'" for field in _SEARCH_FIELD_SQL)
+    texts = ", ".join(_SEARCH_FIELD_SQL.values())
+    conn.execute(f"""
+        INSERT INTO skill_terms
+        WITH tokens AS (
+            SELECT skill_id, field,
+                UNNEST(regexp_extract_all(lower(text), {_TOKEN_REGEX})) AS t
+            FROM (
+                SELECT si.id AS skill_id, UNNEST([{fields}]) AS field, UNNEST([{texts}]) AS text
+                FROM skill_index si JOIN skill_content sc ON sc.skill_id = si.id
+                WHERE si.id IN (SELECT UNNEST(?::VARCHAR[]))
+            )
+        )
+        SELECT skill_id, field, {_FOLD_SQL} AS term, COUNT(*)::INTEGER AS tf
+        FROM tokens GROUP BY ALL
+    """, [skill_ids])
+    
+    # Zero-length fields get rows too, marking the skill as indexed
+    conn.execute(f"""
+        INSERT INTO skill_field_lengths
+        SELECT ids.skill_id, fields.field, COALESCE(SUM(st.tf), 0)::INTEGER
+        FROM (SELECT UNNEST(?::VARCHAR[]) AS skill_id) ids
+        CROSS JOIN (SELECT UNNEST([{fields}]) AS field) fields
+        LEFT JOIN skill_terms st ON st.skill_id = ids.skill_id AND st.field = fields.field
+        GROUP BY ALL
+    """, [skill_ids])
+
+
+def _bm25_sql() -> str:
+    """Query scoring skills by BM25 summed over boosted fields.
+    
+    Parameters: query terms, field names, field boosts. Document
+    frequencies and average field lengths are computed at query time, so
+    the index stays correct as index_skills replaces individual skills.
+    """
+    return f"""
+        WITH query_terms AS (
+            SELECT UNNEST(?::VARCHAR[]) AS term
+        ),
+        boosts AS (
+            SELECT UNNEST(?::VARCHAR[]) AS field, UNNEST(?::DOUBLE[]) AS boost
+        ),
+        corpus AS (
+            SELECT COUNT(DISTINCT skill_id) AS docs FROM skill_field_lengths
+        ),
+        avg_lengths AS (
+            -- Averaged over non-empty fields; most skills have no triggers
+            SELECT field, AVG(length) AS avg_length
+            FROM skill_field_lengths WHERE length > 0 GROUP BY field
+        ),
+        matches AS (
+            SELECT st.* FROM skill_terms st JOIN query_terms USING (term)
+        ),
+        doc_freq AS (
+            SELECT term, COUNT(DISTINCT skill_id) AS df FROM matches GROUP BY term
+        )
+        SELECT m.skill_id, SUM(
+            b.boost
+            * LN(1 + (c.docs - d.df + 0.5) / (d.df + 0.5))
+            * m.tf * ({BM25_K1} + 1)
+            / (m.tf + {BM25_K1} * (1 - {BM25_B} + {BM25_B} * l.length / a.avg_length))
+        ) AS score
+        FROM matches m
+        JOIN doc_freq d USING (term)
+        JOIN boosts b USING (field)
+        JOIN skill_field_lengths l USING (skill_id, field)
+        JOIN avg_lengths a USING (field)
+        CROSS JOIN corpus c
+        GROUP BY m.skill_id
+    """
+
+
 # =============================================================================
 # Index Tools
 # =============================================================================
 
+# Threads overlap file reads; YAML parsing itself still holds the GIL
+INDEX_WORKERS = 8
+
+# Column -> DuckDB type for the columnar upserts in _write_skill_records
+_SKILL_INDEX_COLUMNS = {
+    "id": "VARCHAR",
+    "name": "VARCHAR",
+    "product": "VARCHAR",
+    "skill_type": "VARCHAR",
+    "description": "VARCHAR",
+    "trigger_phrases": "JSON",
+    "file_path": "VARCHAR",
+    "relative_path": "VARCHAR",
+    "subdirectory": "VARCHAR",
+    "tags": "JSON",
+    "related_skills": "JSON",
+    "word_count": "INTEGER",
+    "has_examples": "BOOLEAN",
+    "has_parameters": "BOOLEAN",
+    "content_hash": "VARCHAR",
+}
+
+_SKILL_CONTENT_COLUMNS = {
+    "skill_id": "VARCHAR",
+    "full_text": "VARCHAR",
+    "sections": "JSON",
+    "code_blocks": "JSON",
+}
+
+
+def _build_skill_record(file_path: Path) -> dict[str, dict[str, Any]] | None:
+    """Parse a skill file into its skill_index and skill_content rows.
+    
+    Returns:
+        Dict with "index" and "content" column values, or None if the
+        file could not be parsed
+    """
+    parsed = _parse_skill_file(file_path)
+    if not parsed:
+        return None
+    
+    # Determine product from path
+    rel_path = file_path.relative_to(SKILLS_DIR)
+    parts = rel_path.parts
+    skill_product = parts[0] if parts else 'common'
+    subdirectory = '/'.join(parts[1:-1]) if len(parts) > 2 else None
+    
+    # Build skill ID
+    skill_id = f"{skill_product}/{rel_path.stem}"
+    if subdirectory:
+        skill_id = f"{skill_product}/{subdirectory}/{rel_path.stem}"
+    
+    # Extract metadata
+    frontmatter = parsed.get('frontmatter', {})
+    sections = parsed.get('sections', {})
+    
+    # Extract tags
+    tags = frontmatter.get('tags', [])
+    if isinstance(tags, str):
+        tags = [t.strip() for t in tags.split(',')]
+    
+    # Extract related skills
+    related_skills = []
+    for section_name, section_content in sections.items():
+        if 'related' in section_name.lower():
+            # Find markdown links
+            links = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', section_content)
+            for text, href in links:
+                if href.endswith('.md'):
+                    related_skills.append(href)
+    
+    return {
+        "index": {
+            "id": skill_id,
+            "name": frontmatter.get('name', rel_path.stem),
+            "product": skill_product,
+            "skill_type": _determine_skill_type(file_path, parsed),
+            "description": frontmatter.get('description', ''),
+            "trigger_phrases": json.dumps(parsed.get('trigger_phrases', [])),
+            "file_path": str(file_path),
+            "relative_path": str(rel_path),
+            "subdirectory": subdirectory,
+            "tags": json.dumps(tags),
+            "related_skills": json.dumps(related_skills),
+            "word_count": parsed.get('word_count', 0),
+            "has_examples": any('example' in s.lower() for s in sections.keys()),
+            "has_parameters": any('parameter' in s.lower() for s in sections.keys()),
+            "content_hash": _compute_content_hash(parsed['full_text']),
+        },
+        "content": {
+            "skill_id": skill_id,
+            "full_text": parsed['full_text'],
+            "sections": json.dumps(parsed['sections']),
+            "code_blocks": json.dumps(
+                [{'lang': cb[0], 'code': cb[1]} for cb in parsed.get('code_blocks', [])]
+            ),
+        },
+    }
+
+
+def _parse_skill_files(
+    skill_files: list[Path],
+) -> tuple[list[dict[str, dict[str, Any]]], list[str]]:
+    """Parse and hash skill files on a thread pool.
+    
+    Returns:
+        Tuple of (records in file order, error messages)
+    """
+    def build(file_path: Path) -> tuple[dict | None, str | None]:
+        try:
+            record = _build_skill_record(file_path)
+        except Exception as e:
+            return None, f"{file_path.name}: {str(e)}"
+        if record is None:
+            return None, f"Failed to parse: {file_path.name}"
+        return record, None
+    
+    records = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=INDEX_WORKERS) as pool:
+        for record, error in pool.map(build, skill_files):
+            if error:
+                errors.append(error)
+            else:
+                records.append(record)
+    return records, errors
+
+
+def _changed_skill_records(
+    conn: Any, records: list[dict[str, dict[str, Any]]]
+) -> list[dict[str, dict[str, Any]]]:
+    """Drop records whose content hash matches skill_index, in one query.
+    
+    Skills with no search index rows (indexed before skill_terms existed)
+    always count as changed.
+    """
+    rows = conn.execute("""
+        SELECT si.file_path, si.content_hash FROM skill_index si
+        WHERE si.file_path IN (SELECT UNNEST(?::VARCHAR[]))
+        AND EXISTS (SELECT 1 FROM skill_field_lengths l WHERE l.skill_id = si.id)
+    """, [[r["index"]["file_path"] for r in records]]).fetchall()
+    indexed = dict(rows)
+    return [
+        r for r in records
+        if indexed.get(r["index"]["file_path"]) != r["index"]["content_hash"]
+    ]
+
+
+def _upsert_sql(table: str, columns: dict[str, str]) -> str:
+    names = ", ".join(columns)
+    values = ", ".join(f"UNNEST(?::{sql_type}[])" for sql_type in columns.values())
+    return f"INSERT OR REPLACE INTO {table} ({names}, indexed_at) SELECT {values}, ?"
+
+
+def _write_skill_records(conn: Any, records: list[dict[str, dict[str, Any]]]) -> None:
+    """Upsert records and their search index rows in one transaction."""
+    indexed_at = datetime.now()
+    skill_ids = [r["index"]["id"] for r in records]
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        for key, table, columns in (
+            ("index", "skill_index", _SKILL_INDEX_COLUMNS),
+            ("content", "skill_content", _SKILL_CONTENT_COLUMNS),
+        ):
+            params = [[r[key][name] for r in records] for name in columns]
+            conn.execute(_upsert_sql(table, columns), params + [indexed_at])
+        
+        for table in ("skill_terms", "skill_field_lengths"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE skill_id IN (SELECT UNNEST(?::VARCHAR[]))",
+                [skill_ids],
+            )
+        _index_search_terms(conn, skill_ids)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _elapsed_ms(since: float) -> tuple[float, float]:
+    """Milliseconds since a perf_counter mark, and the new mark."""
+    now = time.perf_counter()
+    return round((now - since) * 1000, 1), now
+
+
 def index_skills(product: str | None = None, force: bool = False) -> ToolResult:
     """Index all skills into the database for search.
     
+    Runs as a pipeline: parse and hash every file on a thread pool, diff
+    the hashes against skill_index in one query, then upsert only the
+    changed skills in a single write transaction.
+    
     Args:
         product: Only index skills for this product (default: all)
         force: Re-index even if content hasn't changed
     
     Returns:
-        ToolResult with indexing summary
+        ToolResult with indexing summary and per-stage timings
     """
     try:
         _ensure_tables()
@@ -248,120 +579,44 @@ def index_skills(product: str | None = None, force: bool = False) -> ToolResult:
         if not SKILLS_DIR.exists():
             return err(f"Skills directory not found: {SKILLS_DIR}")
         
-        indexed = 0
-        skipped = 0
-        errors = []
-        
-        # Find all skill files
+        # Find all skill files, skipping README files
         pattern = f"{product}/**/*.md" if product else "**/*.md"
         skill_files = list(SKILLS_DIR.glob(pattern))
+        to_parse = [f for f in skill_files if f.name not in ['README.md']]
         
-        for file_path in skill_files:
-            # Skip README files and main SKILL.md files
-            if file_path.name in ['README.md']:
-                skipped += 1
-                continue
-            
-            try:
-                # Parse the skill
-                parsed = _parse_skill_file(file_path)
-                if not parsed:
-                    errors.append(f"Failed to parse: {file_path.name}")
-                    continue
-                
-                # Compute content hash
-                content_hash = _compute_content_hash(parsed['full_text'])
-                
-                # Check if already indexed with same hash
-                # Get fresh connection each time since write_connection closes it
-                if not force:
-                    conn = get_manager().get_read_connection()
-                    existing = conn.execute("""
-                        SELECT content_hash FROM skill_index WHERE file_path = ?
-                    """, [str(file_path)]).fetchone()
-                    
-                    if existing and existing[0] == content_hash:
-                        skipped += 1
-                        continue
-                
-                # Determine product from path
-                rel_path = file_path.relative_to(SKILLS_DIR)
-                parts = rel_path.parts
-                skill_product = parts[0] if parts else 'common'
-                subdirectory = '/'.join(parts[1:-1]) if len(parts) > 2 else None
-                
-                # Build skill ID
-                skill_id = f"{skill_product}/{rel_path.stem}"
-                if subdirectory:
-                    skill_id = f"{skill_product}/{subdirectory}/{rel_path.stem}"
-                
-                # Extract metadata
-                frontmatter = parsed.get('frontmatter', {})
-                name = frontmatter.get('name', rel_path.stem)
-                description = frontmatter.get('description', '')
-                skill_type = _determine_skill_type(file_path, parsed)
-                
-                # Check for examples and parameters
-                sections = parsed.get('sections', {})
-                has_examples = any('example' in s.lower() for s in sections.keys())
-                has_parameters = any('parameter' in s.lower() for s in sections.keys())
-                
-                # Extract tags
-                tags = frontmatter.get('tags', [])
-                if isinstance(tags, str):
-                    tags = [t.strip() for t in tags.split(',')]
-                
-                # Extract related skills
-                related_skills = []
-                for section_name, section_content in sections.items():
-                    if 'related' in section_name.lower():
-                        # Find markdown links
-                        links = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', section_content)
-                        for text, href in links:
-                            if href.endswith('.md'):
-                                related_skills.append(href)
-                
-                # Insert or update index
-                with get_manager().write_connection() as wconn:
-                    wconn.execute("""
-                        INSERT OR REPLACE INTO skill_index 
-                        (id, name, product, skill_type, description, trigger_phrases,
-                         file_path, relative_path, subdirectory, tags, related_skills,
-                         word_count, has_examples, has_parameters, indexed_at, content_hash)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, [
-                        skill_id, name, skill_product, skill_type, description,
-                        json.dumps(parsed.get('trigger_phrases', [])),
-                        str(file_path), str(rel_path), subdirectory,
-                        json.dumps(tags), json.dumps(related_skills),
-                        parsed.get('word_count', 0), has_examples, has_parameters,
-                        datetime.now(), content_hash
-                    ])
-                    
-                    # Store full content for search
-                    wconn.execute("""
-                        INSERT OR REPLACE INTO skill_content
-                        (skill_id, full_text, sections, code_blocks, indexed_at)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, [
-                        skill_id,
-                        parsed['full_text'],
-                        json.dumps(parsed['sections']),
-                        json.dumps([{'lang': cb[0], 'code': cb[1]} for cb in parsed.get('code_blocks', [])]),
-                        datetime.now()
-                    ])
-                
-                indexed += 1
-                
-            except Exception as e:
-                errors.append(f"{file_path.name}: {str(e)}")
+        timings_ms = {"parse": 0.0, "diff": 0.0, "write": 0.0}
+        mark = time.perf_counter()
+        records, errors = _parse_skill_files(to_parse)
+        # Later files win on a duplicate skill ID, as with one upsert per file
+        records = list({r["index"]["id"]: r for r in records}.values())
+        timings_ms["parse"], mark = _elapsed_ms(mark)
         
+        indexed = 0
+        unchanged = 0
+        try:
+            changed = records
+            if records and not force:
+                changed = _changed_skill_records(get_manager().get_read_connection(), records)
+            unchanged = len(records) - len(changed)
+            timings_ms["diff"], mark = _elapsed_ms(mark)
+            
+            if changed:
+                with get_manager().write_connection() as conn:
+                    _write_skill_records(conn, changed)
+            indexed = len(changed)
+            timings_ms["write"], mark = _elapsed_ms(mark)
+        except Exception as e:
+            # The batch is all-or-nothing; report it alongside parse errors
+            errors.insert(0, f"Failed to update skill index: {str(e)}")
+        
+        skipped = len(skill_files) - len(to_parse) + unchanged
         return ok(
             data={
                 "indexed": indexed,
                 "skipped": skipped,
                 "errors": errors[:10],  # Limit error list
                 "total_files": len(skill_files),
+                "timings_ms": timings_ms,
             },
             message=f"Indexed {indexed} skills, skipped {skipped}, {len(errors)} errors"
         )
@@ -379,6 +634,12 @@ def search_skills(
 ) -> ToolResult:
     """Search skills by keyword, trigger phrase, or content.
     
+    Results are ranked by BM25 over the search index built by
+    index_skills, with matches in the name weighted above triggers,
+    description and body (see SEARCH_FIELD_BOOSTS). Multi-word queries
+    match any term; skills matching more terms rank higher. An empty
+    query lists skills by product and name.
+    
     Args:
         query: Search query (matches name, description, triggers, content)
         product: Filter by product
@@ -387,15 +648,13 @@ def search_skills(
         limit: Maximum results
     
     Returns:
-        ToolResult with matching skills
+        ToolResult with matching skills, best match first
     """
     try:
         _ensure_tables()
         conn = get_manager().get_read_connection()
         
-        # Build search query
-        sql = """
-            SELECT DISTINCT
+        columns = """
                 si.id,
                 si.name,
                 si.product,
@@ -406,23 +665,31 @@ def search_skills(
                 si.tags,
                 si.word_count,
                 si.has_examples,
-                si.relative_path
-            FROM skill_index si
-            LEFT JOIN skill_content sc ON si.id = sc.skill_id
-            WHERE 1=1
-        """
+                si.relative_path"""
         params = []
         
-        # Search across multiple fields
-        if query:
-            sql += """ AND (
-                si.name ILIKE ? 
-                OR si.description ILIKE ?
-                OR si.trigger_phrases::VARCHAR ILIKE ?
-                OR sc.full_text ILIKE ?
-            )"""
-            search_pattern = f"%{query}%"
-            params.extend([search_pattern] * 4)
+        terms = _query_terms(query) if query else []
+        if query and not terms:
+            return ok(
+                data={"skills": [], "count": 0, "query": query},
+                message=f"Found 0 skills matching '{query}'"
+            )
+        
+        if terms:
+            sql = f"""
+                WITH scores AS ({_bm25_sql()})
+                SELECT {columns}, scores.score
+                FROM scores
+                JOIN skill_index si ON si.id = scores.skill_id
+                WHERE 1=1
+            """
+            params.extend([
+                terms, list(SEARCH_FIELD_BOOSTS), list(SEARCH_FIELD_BOOSTS.values())
+            ])
+            order_by = "scores.score DESC, si.product, si.name"
+        else:
+            sql = f"SELECT {columns}, NULL AS score FROM skill_index si WHERE 1=1"
+            order_by = "si.product, si.name"
         
         if product:
             sql += " AND si.product = ?"
@@ -440,7 +707,7 @@ def search_skills(
                 params.append(f'%"{tag}"%')
             sql += f" AND ({' OR '.join(tag_conditions)})"
         
-        sql += " ORDER BY si.product, si.name LIMIT ?"
+        sql += f" ORDER BY {order_by} LIMIT ?"
         params.append(limit)
         
         rows = conn.execute(sql, params).fetchall()
@@ -459,6 +726,7 @@ def search_skills(
                 "word_count": row[8],
                 "has_examples": row[9],
                 "path": row[10],
+                "score": round(row[11], 3) if row[11] is not None else None,
             })
         
         return ok(
@@ -1279,6 +1547,8 @@ def delete_skill(
         # Remove from index
         with get_manager().write_connection() as conn:
             conn.execute("DELETE FROM skill_content WHERE skill_id = ?", [skill_id])
+            conn.execute("DELETE FROM skill_terms WHERE skill_id = ?", [skill_id])
+            conn.execute("DELETE FROM skill_field_lengths WHERE skill_id = ?", [skill_id])
             conn.execute("DELETE FROM skill_index WHERE id = ?", [skill_id])
         
         return ok(
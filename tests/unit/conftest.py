@@ -0,0 +1,116 @@
+"""Shared fixtures for unit tests."""
+
+import json
+
+import pytest
+from anthropic.types import Message, TextBlock, ToolUseBlock, Usage
+
+from healthsim_agent import agent as agent_module
+from healthsim_agent.agent import HealthSimAgent
+from healthsim_agent.tools import reset_manager
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the parsed-skill cache out of the real ~/.healthsim/cache."""
+    cache_dir = tmp_path / "healthsim-cache"
+    monkeypatch.setenv("HEALTHSIM_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+# =============================================================================
+# Stub Anthropic client
+# =============================================================================
+
+def make_response(*blocks, stop_reason=None, cache_read=0, cache_creation=0) -> Message:
+    """Build an API response with the given content blocks.
+
+    stop_reason defaults to "tool_use" if any block is a tool call, else "end_turn".
+    """
+    if stop_reason is None:
+        has_tools = any(isinstance(block, ToolUseBlock) for block in blocks)
+        stop_reason = "tool_use" if has_tools else "end_turn"
+    return Message(
+        id="msg_test",
+        type="message",
+        role="assistant",
+        model="stub",
+        content=list(blocks),
+        stop_reason=stop_reason,
+        usage=Usage(
+            input_tokens=20,
+            output_tokens=10,
+            cache_read_input_tokens=cache_read,
+            cache_creation_input_tokens=cache_creation,
+        ),
+    )
+
+
+class StubStream:
+    """Context manager mimicking messages.stream for one scripted response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.text_stream = [
+            block.text for block in response.content if isinstance(block, TextBlock)
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get_final_message(self):
+        return self.response
+
+
+class StubMessages:
+    """Returns scripted responses and records each request.
+
+    calls holds the request kwargs; requests holds them serialized at call
+    time, for comparing what was actually sent.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        self.requests.append(json.dumps(kwargs, default=str))
+        return self.responses.pop(0)
+
+    def stream(self, **kwargs):
+        return StubStream(self.create(**kwargs))
+
+
+class StubClient:
+    def __init__(self, responses):
+        self.messages = StubMessages(responses)
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    """Create an agent wired to a stub client.
+
+    The factory takes the scripted responses, an optional tools object whose
+    executor(name) replaces the registry lookup (by default every tool
+    returns {"tables": []}), and AgentConfig overrides.
+    """
+    def factory(responses, tools=None, **config):
+        monkeypatch.delenv("HEALTHSIM_DB_MODE", raising=False)
+        reset_manager()
+        client = StubClient(responses)
+        monkeypatch.setattr(agent_module, "Anthropic", lambda: client)
+        monkeypatch.setattr(HealthSimAgent, "_load_skills_context", lambda self: None)
+        executor = tools.executor if tools else lambda name: lambda **kw: {"tables": []}
+        monkeypatch.setattr(agent_module, "_get_tool_executor", executor)
+        agent = HealthSimAgent()
+        for key, value in config.items():
+            setattr(agent._config, key, value)
+        agent._prepare_static_prompt()
+        return agent, client
+    yield factory
+    reset_manager()
@@ -0,0 +1,102 @@
+"""Tests for static prompt assembly and prompt caching in HealthSimAgent."""
+
+import json
+
+import pytest
+from anthropic.types import TextBlock, ToolUseBlock
+
+from healthsim_agent.agent import TOOL_DEFINITIONS, HealthSimAgent
+from tests.unit.conftest import make_response
+
+
+def prefix(request: str) -> str:
+    """The tools + system part of a serialized request."""
+    data = json.loads(request)
+    return json.dumps({"tools": data["tools"], "system": data["system"]})
+
+
+class TestStaticPrompt:
+    """Tests for sending the same prompt prefix on every request."""
+
+    def test_prefix_identical_across_turns(self, make_agent, monkeypatch):
+        """Test tools and system prompt are byte-identical turn over turn."""
+        agent, client = make_agent([
+            make_response(
+                ToolUseBlock(id="t1", name="list_tables", input={}, type="tool_use"),
+                stop_reason="tool_use",
+                cache_creation=1000,
+            ),
+            make_response(TextBlock(type="text", text="Tables listed"), cache_read=1000),
+            make_response(TextBlock(type="text", text="Hello again"), cache_read=1000),
+        ])
+        build_calls = []
+        monkeypatch.setattr(
+            HealthSimAgent, "_build_system_prompt", lambda self: build_calls.append(1) or "x"
+        )
+
+        agent.process_message("What tables are there?")
+        agent.process_message("Thanks")
+
+        requests = client.messages.requests
+        assert len(requests) == 3
+        assert prefix(requests[0]) == prefix(requests[1]) == prefix(requests[2])
+        assert build_calls == []
+
+    def test_cache_breakpoints(self, make_agent):
+        """Test the tool schema, system prompt and history end with breakpoints."""
+        agent, client = make_agent([make_response(TextBlock(type="text", text="Hi"))])
+
+        agent.process_message("Hello")
+
+        request = json.loads(client.messages.requests[0])
+        assert request["tools"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert all("cache_control" not in tool for tool in request["tools"][:-1])
+        assert request["system"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert request["messages"][-1]["content"] == [
+            {"type": "text", "text": "Hello", "cache_control": {"type": "ephemeral"}}
+        ]
+        # The shared definitions and the session history are left unmarked
+        assert "cache_control" not in TOOL_DEFINITIONS[-1]
+        assert agent.session.get_messages_for_api()[0] == {"role": "user", "content": "Hello"}
+
+    def test_caching_disabled(self, make_agent):
+        """Test prompt_caching=False sends a plain system prompt and tools."""
+        agent, client = make_agent(
+            [make_response(TextBlock(type="text", text="Hi"))], prompt_caching=False
+        )
+
+        agent.process_message("Hello")
+
+        request = json.loads(client.messages.requests[0])
+        assert isinstance(request["system"], str)
+        assert request["tools"] == json.loads(json.dumps(TOOL_DEFINITIONS, default=str))
+        assert request["messages"][-1] == {"role": "user", "content": "Hello"}
+
+
+class TestCacheUsage:
+    """Tests for tracking prompt-cache usage."""
+
+    def test_usage_accumulated(self, make_agent, caplog):
+        """Test cache read/creation tokens are summed and logged."""
+        agent, _ = make_agent(
+            [
+                make_response(
+                    ToolUseBlock(id="t1", name="list_tables", input={}, type="tool_use"),
+                    stop_reason="tool_use",
+                    cache_creation=3000,
+                ),
+                make_response(TextBlock(type="text", text="Done"), cache_read=3000),
+            ],
+            log_cache_usage=True,
+        )
+
+        with caplog.at_level("INFO", logger="healthsim_agent.agent"):
+            agent.process_message("What tables are there?")
+
+        usage = agent.usage
+        assert usage.calls == 2
+        assert usage.cache_creation_input_tokens == 3000
+        assert usage.cache_read_input_tokens == 3000
+        assert usage.input_tokens == 40
+        assert usage.cache_hit_rate == pytest.approx(3000 / 6040)
+        assert "cache_read=3000" in caplog.text
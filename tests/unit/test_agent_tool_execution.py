@@ -0,0 +1,260 @@
+"""Tests for HealthSimAgent tool execution, using a stub Anthropic client."""
+
+import json
+import threading
+import time
+
+from anthropic.types import TextBlock, ToolUseBlock
+
+from healthsim_agent.agent import _schedule_tool_calls
+from healthsim_agent.tools import reset_manager
+from tests.unit.conftest import make_response
+
+
+def tool_use(tool_id: str, name: str, **tool_input) -> ToolUseBlock:
+    return ToolUseBlock(id=tool_id, name=name, input=tool_input, type="tool_use")
+
+
+class RecordingTools:
+    """Stub executors that sleep and record when they start and finish."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.events = []
+        self.threads = {}
+        self.lock = threading.Lock()
+
+    def executor(self, name):
+        def run(**kwargs):
+            with self.lock:
+                self.events.append(("start", name))
+                self.threads[name] = threading.current_thread()
+            time.sleep(self.delay)
+            with self.lock:
+                self.events.append(("end", name))
+            return {"tool": name, "input": kwargs}
+        return run
+
+
+class TestScheduleToolCalls:
+    """Tests for grouping tool calls into concurrent batches."""
+
+    def test_consecutive_reads_batched(self):
+        """Test runs of reads share a batch and writes stand alone."""
+        names = ["query_reference", "search_providers", "add_entities",
+                 "get_summary", "list_cohorts", "save_cohort", "delete_cohort"]
+
+        assert _schedule_tool_calls(names) == [[0, 1], [2], [3, 4], [5], [6]]
+
+    def test_unknown_tools_treated_as_writes(self):
+        """Test tools not classified as read-only run on their own."""
+        assert _schedule_tool_calls(["query", "mystery", "query"]) == [[0], [1], [2]]
+
+
+class TestConcurrentToolExecution:
+    """Tests for running a response's tool calls concurrently."""
+
+    def test_reads_run_concurrently_in_order(self, make_agent):
+        """Test independent reads overlap by default and keep tool_use order."""
+        tools = RecordingTools(delay=0.1)
+        agent, client = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "query_reference", table="svi_county"),
+                    tool_use("t2", "search_providers", state="TX"),
+                    tool_use("t3", "get_summary", cohort_id="c1"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+
+        assert agent.process_message("Look things up") == "Done"
+
+        starts = [i for i, (kind, _) in enumerate(tools.events) if kind == "start"]
+        assert starts == [0, 1, 2]
+
+        tool_results = client.messages.calls[1]["messages"][-1]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == ["t1", "t2", "t3"]
+        assert [json.loads(r["content"])["tool"] for r in tool_results] == [
+            "query_reference", "search_providers", "get_summary",
+        ]
+
+        stats = agent.tool_stats[-1]
+        assert stats.concurrent
+        assert stats.tool_count == 3
+        assert stats.wall_seconds < stats.serial_seconds
+        assert stats.saved_seconds > 0.1
+
+    def test_writes_keep_order(self, make_agent):
+        """Test a write waits for earlier reads and later reads wait for it."""
+        tools = RecordingTools(delay=0.02)
+        agent, client = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "load_cohort", cohort_id="c1"),
+                    tool_use("t2", "list_cohorts"),
+                    tool_use("t3", "add_entities", cohort_id="c1", entities={}),
+                    tool_use("t4", "save_cohort", description="c2", entities={}),
+                    tool_use("t5", "get_summary", cohort_id="c1"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+
+        agent.process_message("Update the cohort")
+
+        events = tools.events
+        assert events.index(("start", "add_entities")) > events.index(("end", "load_cohort"))
+        assert events.index(("start", "add_entities")) > events.index(("end", "list_cohorts"))
+        assert events.index(("start", "save_cohort")) > events.index(("end", "add_entities"))
+        assert events.index(("start", "get_summary")) > events.index(("end", "save_cohort"))
+
+        tool_results = client.messages.calls[1]["messages"][-1]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == ["t1", "t2", "t3", "t4", "t5"]
+
+    def test_parallel_tools_disabled(self, make_agent):
+        """Test parallel_tools=False runs every call sequentially."""
+        tools = RecordingTools(delay=0.01)
+        agent, _ = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "query_reference", table="svi_county"),
+                    tool_use("t2", "list_tables"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+            parallel_tools=False,
+        )
+
+        agent.process_message("Look things up")
+
+        assert [kind for kind, _ in tools.events] == ["start", "end", "start", "end"]
+        assert not agent.tool_stats[-1].concurrent
+
+    def test_close_before_write_runs_sequentially(self, make_agent, monkeypatch):
+        """Test tools run one at a time when the broker mode is switched off."""
+        tools = RecordingTools(delay=0.01)
+        agent, _ = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "query_reference", table="svi_county"),
+                    tool_use("t2", "search_providers", state="TX"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+        monkeypatch.setenv("HEALTHSIM_DB_MODE", "close_before_write")
+        reset_manager()
+
+        agent.process_message("Look things up")
+
+        assert [kind for kind, _ in tools.events] == ["start", "end", "start", "end"]
+        assert not agent.tool_stats[-1].concurrent
+
+    def test_fast_tools_run_inline(self, make_agent):
+        """Test in-memory tools skip the pool and only slower reads use it."""
+        tools = RecordingTools(delay=0.05)
+        agent, _ = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "list_output_formats"),
+                    tool_use("t2", "query_reference", table="svi_county"),
+                    tool_use("t3", "search_providers", state="TX"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+
+        agent.process_message("Look things up")
+
+        main = threading.current_thread()
+        assert tools.threads["list_output_formats"] is main
+        assert tools.threads["query_reference"] is not main
+        assert tools.threads["search_providers"] is not main
+        assert agent.tool_stats[-1].concurrent
+
+    def test_only_fast_tools_run_sequentially(self, make_agent):
+        """Test a batch of in-memory tools does not start a pool."""
+        tools = RecordingTools(delay=0.01)
+        agent, _ = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "list_output_formats"),
+                    tool_use("t2", "list_skills"),
+                    tool_use("t3", "query_reference", table="svi_county"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+
+        agent.process_message("Look things up")
+
+        assert [kind for kind, _ in tools.events] == ["start", "end"] * 3
+        assert not agent.tool_stats[-1].concurrent
+
+    def test_unknown_tool_reports_error(self, make_agent):
+        """Test an unknown tool returns an error result in its slot."""
+        tools = RecordingTools(delay=0)
+        tools.executor = lambda name: None
+        agent, client = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "no_such_tool"),
+                    tool_use("t2", "list_tables"),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+
+        agent.process_message("Try it")
+
+        tool_results = client.messages.calls[1]["messages"][-1]["content"]
+        assert json.loads(tool_results[0]["content"]) == {"error": "Unknown tool: no_such_tool"}
+
+    def test_streaming_runs_reads_concurrently(self, make_agent):
+        """Test streaming uses the same scheduler and reports every tool."""
+        tools = RecordingTools(delay=0.1)
+        agent, client = make_agent(
+            [
+                make_response(
+                    tool_use("t1", "query_reference", table="svi_county"),
+                    tool_use("t2", "search_providers", state="TX"),
+                    tool_use("t3", "add_entities", cohort_id="c1", entities={}),
+                ),
+                make_response(TextBlock(type="text", text="Done"), stop_reason="end_turn"),
+            ],
+            tools,
+        )
+        started, ended = [], []
+
+        response = agent.process_message_streaming(
+            "Look things up",
+            on_tool_start=lambda name, tool_input: started.append(name),
+            on_tool_end=lambda name, result: ended.append((name, result["tool"])),
+        )
+
+        assert response == "Done"
+        assert sorted(started[:2]) == ["query_reference", "search_providers"]
+        assert started[2] == "add_entities"
+        assert sorted(ended) == [
+            ("add_entities", "add_entities"),
+            ("query_reference", "query_reference"),
+            ("search_providers", "search_providers"),
+        ]
+        events = tools.events
+        assert events.index(("start", "add_entities")) > events.index(("end", "search_providers"))
+
+        tool_results = client.messages.calls[1]["messages"][-1]["content"]
+        assert [r["tool_use_id"] for r in tool_results] == ["t1", "t2", "t3"]
+
+        stats = agent.tool_stats[-1]
+        assert stats.concurrent
+        assert stats.tool_count == 3
+        assert stats.wall_seconds < stats.serial_seconds
@@ -1007,3 +1007,183 @@ class TestTableExists:
         
         # Should return False on error, not raise
         assert result is False
+
+
+class _DuckDBResultAdapter:
+    """Minimal rows/columns wrapper over an in-memory DuckDB connection."""
+    
+    def __init__(self):
+        import duckdb
+        self.raw = duckdb.connect()
+    
+    def execute(self, query, params=None):
+        cursor = self.raw.execute(query, params or [])
+        if cursor.description is None:
+            return MagicMock(rows=[], columns=[])
+        columns = [d[0] for d in cursor.description]
+        return MagicMock(rows=cursor.fetchall(), columns=columns)
+
+
+class TestBulkPersist:
+    """Tests for the columnar bulk-ingest path of persist_entities."""
+    
+    @pytest.fixture
+    def adapter(self):
+        adapter = _DuckDBResultAdapter()
+        adapter.raw.execute("""
+            CREATE TABLE cohorts (
+                id VARCHAR PRIMARY KEY, name VARCHAR, description VARCHAR,
+                created_at TIMESTAMP, updated_at TIMESTAMP
+            )
+        """)
+        adapter.raw.execute("CREATE TABLE cohort_tags (cohort_id VARCHAR, tag VARCHAR)")
+        adapter.raw.execute("""
+            CREATE TABLE patients (
+                id VARCHAR PRIMARY KEY, cohort_id VARCHAR,
+                given_name VARCHAR, age INTEGER, birth_date DATE
+            )
+        """)
+        return adapter
+    
+    def _persist(self, service, entities, **kwargs):
+        with patch('healthsim_agent.state.auto_persist.generate_summary', return_value=None), \
+             patch('healthsim_agent.state.auto_persist.get_serializer', return_value=None):
+            return service.persist_entities(entities=entities, entity_type="patient", **kwargs)
+    
+    def test_build_column_buffers_groups_by_columns(self):
+        """Test rows with different keys go to separate buffers."""
+        from healthsim_agent.state.auto_persist import _build_column_buffers
+        
+        buffers = _build_column_buffers(
+            [{'id': 'a', 'x': 1}, {'id': 'b', 'y': 2}, {'id': 'c', 'x': 3}],
+            'id',
+        )
+        
+        assert buffers == [{'id': ['a', 'c'], 'x': [1, 3]}, {'id': ['b'], 'y': [2]}]
+    
+    def test_build_column_buffers_merges_duplicates(self):
+        """Test duplicate IDs merge in order, later values winning."""
+        from healthsim_agent.state.auto_persist import _build_column_buffers
+        
+        buffers = _build_column_buffers(
+            [{'id': 'a', 'x': 1, 'y': 1}, {'id': 'a', 'x': 2}],
+            'id',
+        )
+        
+        assert buffers == [{'id': ['a'], 'x': [2], 'y': [1]}]
+    
+    def test_bulk_insert_single_statement(self, adapter):
+        """Test bulk mode writes all rows and reports throughput."""
+        from healthsim_agent.state.auto_persist import AutoPersistService
+        
+        service = AutoPersistService(connection=adapter)
+        entities = [{'id': f'p{i}', 'given_name': f'N{i}', 'age': i} for i in range(500)]
+        
+        result = self._persist(service, entities, cohort_name="bulk-cohort", bulk=True)
+        
+        assert result.entities_persisted == 500
+        assert result.entity_ids[:2] == ['p0', 'p1']
+        assert result.rows_per_second is not None and result.rows_per_second > 0
+        count = adapter.raw.execute(
+            "SELECT COUNT(*) FROM patients WHERE cohort_id = ?", [result.cohort_id]
+        ).fetchone()[0]
+        assert count == 500
+    
+    def test_throughput_excludes_owner_lookup(self, adapter, monkeypatch):
+        """Test rows_per_second times the writes, not the summary owner lookup."""
+        import time
+        from healthsim_agent.state.auto_persist import AutoPersistService
+        
+        service = AutoPersistService(connection=adapter)
+        
+        def slow_owners_of(*args, **kwargs):
+            time.sleep(0.5)
+            return {}
+        
+        monkeypatch.setattr(service.summary_cache, 'owners_of', slow_owners_of)
+        entities = [{'id': f'p{i}', 'given_name': f'N{i}', 'age': i} for i in range(100)]
+        
+        result = self._persist(service, entities, cohort_name="timed-cohort", bulk=True)
+        
+        assert result.rows_per_second > len(entities) / 0.5
+    
+    def test_bulk_upsert_updates_existing_rows(self, adapter):
+        """Test bulk mode resolves duplicate keys with an update."""
+        from healthsim_agent.state.auto_persist import AutoPersistService
+        
+        service = AutoPersistService(connection=adapter)
+        first = self._persist(
+            service, [{'id': 'p1', 'given_name': 'Old', 'age': 40}],
+            cohort_name="upsert-cohort",
+        )
+        self._persist(
+            service,
+            [{'id': 'p1', 'given_name': 'New', 'age': 41}, {'id': 'p2', 'given_name': 'B'}],
+            cohort_id=first.cohort_id,
+            bulk=True,
+        )
+        
+        rows = adapter.raw.execute(
+            "SELECT id, given_name, age FROM patients ORDER BY id"
+        ).fetchall()
+        assert rows == [('p1', 'New', 41), ('p2', 'B', None)]
+    
+    def test_bulk_missing_columns_keep_default_and_existing(self, adapter):
+        """Test columns absent from a row are neither nulled nor overwritten."""
+        from healthsim_agent.state.auto_persist import AutoPersistService
+        
+        adapter.raw.execute("ALTER TABLE patients ADD COLUMN status VARCHAR DEFAULT 'active'")
+        service = AutoPersistService(connection=adapter)
+        first = self._persist(
+            service, [{'id': 'p1', 'given_name': 'Old', 'age': 40}],
+            cohort_name="partial-cohort",
+        )
+        self._persist(
+            service,
+            [{'id': 'p1', 'given_name': 'New'}, {'id': 'p2', 'given_name': 'B', 'age': 7}],
+            cohort_id=first.cohort_id,
+            bulk=True,
+        )
+        
+        rows = adapter.raw.execute(
+            "SELECT id, given_name, age, status FROM patients ORDER BY id"
+        ).fetchall()
+        assert rows == [('p1', 'New', 40, 'active'), ('p2', 'B', 7, 'active')]
+    
+    def test_bulk_matches_row_mode(self, adapter):
+        """Test bulk and row-by-row modes store identical data."""
+        from datetime import date
+        from healthsim_agent.state.auto_persist import AutoPersistService
+        
+        service = AutoPersistService(connection=adapter)
+        entities = [
+            {'id': 'r1', 'given_name': 'A', 'age': 30, 'birth_date': date(1990, 1, 1)},
+            {'id': 'r2', 'given_name': 'B', 'age': None, 'birth_date': None},
+        ]
+        row_result = self._persist(service, entities, cohort_name="row-mode")
+        row_data = adapter.raw.execute(
+            "SELECT id, given_name, age, birth_date FROM patients ORDER BY id"
+        ).fetchall()
+        adapter.raw.execute("DELETE FROM patients")
+        
+        bulk_result = self._persist(
+            service, entities, cohort_id=row_result.cohort_id, bulk=True
+        )
+        bulk_data = adapter.raw.execute(
+            "SELECT id, given_name, age, birth_date FROM patients ORDER BY id"
+        ).fetchall()
+        
+        assert bulk_result.entity_ids == row_result.entity_ids
+        assert bulk_data == row_data
+    
+    def test_to_dict_includes_rows_per_second(self):
+        """Test PersistResult exposes throughput in to_dict."""
+        from healthsim_agent.state.auto_persist import PersistResult
+        
+        result = PersistResult(
+            cohort_id="c", cohort_name="n", entity_type="patients",
+            entities_persisted=1, entity_ids=["p1"], summary=None,
+            is_new_cohort=True, rows_per_second=1234.5,
+        )
+        
+        assert result.to_dict()['rows_per_second'] == 1234.5
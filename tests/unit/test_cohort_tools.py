@@ -52,7 +52,8 @@ def temp_db_env(monkeypatch):
             entity_type VARCHAR,
             entity_id VARCHAR,
             entity_data JSON,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(cohort_id, entity_type, entity_id)
         )
     """)
     conn.execute("""
@@ -0,0 +1,146 @@
+"""Tests for generation framework - compiled conditions."""
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+from healthsim_agent.generation import distributions
+from healthsim_agent.generation import (
+    ConditionalDistribution,
+    EventCondition,
+    compile_condition,
+)
+
+
+class TestCompileCondition:
+    """Tests for compile_condition."""
+
+    @pytest.mark.parametrize("expr,context,expected", [
+        ("severity == 'controlled'", {"severity": "controlled"}, True),
+        ("severity != 'controlled'", {"severity": "controlled"}, False),
+        ("age >= 65", {"age": 65}, True),
+        ("age > 65", {"age": 65}, False),
+        ("age < 18 or age > 64", {"age": 70}, True),
+        ("age <= 64 and gender == 'F'", {"age": 30, "gender": "M"}, False),
+        ("severity in ['moderate', 'severe']", {"severity": "severe"}, True),
+        ("severity not in ('moderate', 'severe')", {"severity": "mild"}, True),
+        ("not deceased", {"deceased": False}, True),
+        ("18 <= age < 65", {"age": 40}, True),
+        ("a1c > -1.5", {"a1c": 0}, True),
+        ("demographics.age >= 65", {"demographics": {"age": 72}}, True),
+    ])
+    def test_operators(self, expr, context, expected):
+        """Test supported operators evaluate like Python expressions."""
+        assert compile_condition(expr)(context) is expected
+
+    def test_prefix_names_are_independent(self):
+        """Test a key that prefixes another name does not rewrite it."""
+        predicate = compile_condition("age_band == '65+'")
+
+        assert predicate({"age": 70, "age_band": "65+"}) is True
+
+    def test_missing_name_is_false(self):
+        """Test unknown context names make the condition false."""
+        assert compile_condition("severity == 'severe'")({}) is False
+
+    def test_short_circuit_skips_missing_name(self):
+        """Test or short-circuits before touching a missing name."""
+        assert compile_condition("age > 1 or missing == 2")({"age": 5}) is True
+
+    def test_incomparable_values_are_false(self):
+        """Test type errors during comparison yield False."""
+        assert compile_condition("age > 5")({"age": None}) is False
+
+    @pytest.mark.parametrize("expr", [
+        "",
+        "age >",
+        "__import__('os').system('echo hi')",
+        "len(severity) > 2",
+        "age is None",
+        "age + 1 > 2",
+    ])
+    def test_rejected_expressions_are_false(self, expr):
+        """Test unsupported or malformed expressions never evaluate."""
+        assert compile_condition(expr)({"age": 5, "severity": "mild"}) is False
+
+
+class TestEventConditionOperators:
+    """EventCondition uses the shared operator table."""
+
+    @pytest.mark.parametrize("op,value,expected", [
+        ("eq", 5, True), ("ne", 5, False), ("gt", 4, True), ("gte", 5, True),
+        ("lt", 6, True), ("lte", 4, False), ("in", [5, 6], True),
+        ("not_in", [5, 6], False), ("unknown", 5, False),
+    ])
+    def test_operators(self, op, value, expected):
+        """Test each structured operator."""
+        condition = EventCondition(field="labs.count", operator=op, value=value)
+
+        assert condition.evaluate({"labs": {"count": 5}}) is expected
+
+    def test_contains(self):
+        """Test contains checks membership in the actual value."""
+        condition = EventCondition(field="conditions", operator="contains", value="E11")
+
+        assert condition.evaluate({"conditions": ["E11", "I10"]}) is True
+
+
+class TestConditionalDistribution:
+    """Tests for ConditionalDistribution rule compilation and caching."""
+
+    def _dist(self):
+        return ConditionalDistribution(
+            rules=[
+                {"condition": "severity == 'controlled'",
+                 "distribution": {"type": "normal", "mean": 6.5, "std_dev": 0.3}},
+                {"condition": "severity == 'uncontrolled'",
+                 "distribution": {"type": "normal", "mean": 9.5, "std_dev": 0.3}},
+            ],
+            default={"type": "uniform", "min": 0, "max": 1},
+        )
+
+    def test_selects_matching_rule(self):
+        """Test samples come from the rule whose condition matches."""
+        dist = self._dist()
+        rng = random.Random(42)
+
+        controlled = [dist.sample({"severity": "controlled"}, rng) for _ in range(200)]
+        uncontrolled = [dist.sample({"severity": "uncontrolled"}, rng) for _ in range(200)]
+
+        assert 6 < sum(controlled) / 200 < 7
+        assert 9 < sum(uncontrolled) / 200 < 10
+
+    def test_default_when_no_match(self):
+        """Test the default distribution is used when nothing matches."""
+        assert 0 <= self._dist().sample({"severity": "unknown"}, random.Random(1)) <= 1
+
+    def test_no_match_without_default_raises(self):
+        """Test missing default raises ValueError."""
+        dist = ConditionalDistribution(rules=[
+            {"condition": "x == 1", "distribution": {"type": "uniform", "min": 0, "max": 1}},
+        ])
+
+        with pytest.raises(ValueError, match="No condition matched"):
+            dist.sample({"x": 2})
+
+    def test_rule_distributions_are_cached(self):
+        """Test create_distribution runs once per rule, not per sample."""
+        dist = self._dist()
+        rng = random.Random(0)
+
+        with patch.object(
+            distributions, "create_distribution", wraps=distributions.create_distribution
+        ) as factory:
+            for _ in range(50):
+                dist.sample({"severity": "controlled"}, rng)
+                dist.sample({"severity": "other"}, rng)
+
+        assert factory.call_count == 2
+
+    def test_deterministic_for_seed(self):
+        """Test identical seeds give identical samples."""
+        a = [self._dist().sample({"severity": "controlled"}, random.Random(7)) for _ in range(3)]
+        b = [self._dist().sample({"severity": "controlled"}, random.Random(7)) for _ in range(3)]
+
+        assert a == b
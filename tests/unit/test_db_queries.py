@@ -591,3 +591,63 @@ class TestUtilityMethods:
         
         call_args = mock_conn.execute_query.call_args
         assert call_args[1]["limit"] == 50
+
+
+class TestReferenceQueriesCache:
+    """Tests for the ReferenceQueries result cache."""
+    
+    def test_repeated_query_uses_cache(self):
+        """Test a repeated lookup only hits the database once."""
+        mock_conn = MagicMock()
+        mock_conn.execute_query.return_value = QueryResult(
+            columns=["county_name"], data=[["Travis"]], row_count=1
+        )
+        
+        queries = ReferenceQueries(mock_conn)
+        first = queries.get_demographics_by_geography(state="TX")
+        first.data[0][0] = "Changed"
+        second = queries.get_demographics_by_geography(state="tx")
+        
+        mock_conn.execute_query.assert_called_once()
+        assert second.data == [["Travis"]]
+        assert queries.cache_stats()["hits"] == 1
+    
+    def test_different_params_miss(self):
+        """Test different filters and limits are cached separately."""
+        mock_conn = MagicMock()
+        mock_conn.execute_query.return_value = QueryResult(
+            columns=[], data=[], row_count=0
+        )
+        
+        queries = ReferenceQueries(mock_conn)
+        queries.get_health_indicators(state="TX")
+        queries.get_health_indicators(state="CA")
+        queries.get_health_indicators(state="CA", limit=10)
+        
+        assert mock_conn.execute_query.call_count == 3
+    
+    def test_errors_not_cached(self):
+        """Test failed queries are retried."""
+        mock_conn = MagicMock()
+        mock_conn.execute_query.return_value = QueryResult(
+            columns=[], data=[], row_count=0, error="Table not found"
+        )
+        
+        queries = ReferenceQueries(mock_conn)
+        queries.get_adi_by_geography(state="TX")
+        queries.get_adi_by_geography(state="TX")
+        
+        assert mock_conn.execute_query.call_count == 2
+    
+    def test_custom_queries_not_cached(self):
+        """Test execute_custom always runs the query."""
+        mock_conn = MagicMock()
+        mock_conn.execute_query.return_value = QueryResult(
+            columns=[], data=[], row_count=0
+        )
+        
+        queries = ReferenceQueries(mock_conn)
+        queries.execute_custom("SELECT 1")
+        queries.execute_custom("SELECT 1")
+        
+        assert mock_conn.execute_query.call_count == 2
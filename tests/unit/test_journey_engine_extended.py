@@ -139,3 +139,251 @@ class TestCreateSimpleJourney:
         )
         assert journey is not None
         assert journey.name == "test_journey"
+
+
+class TestTimeline:
+    """Tests for Timeline ordering and indexes."""
+    
+    @staticmethod
+    def _event(event_id, days):
+        from healthsim_agent.generation.journey_engine import JourneyTimelineEvent
+        
+        return JourneyTimelineEvent(
+            timeline_event_id=event_id,
+            journey_id="journey-001",
+            event_definition_id=event_id,
+            scheduled_date=date(2025, 1, 1) + timedelta(days=days),
+            event_type="encounter",
+            event_name=event_id,
+        )
+    
+    @pytest.fixture
+    def timeline(self):
+        from healthsim_agent.generation.journey_engine import Timeline
+        
+        timeline = Timeline(entity_id="p1", entity_type="patient")
+        for event_id, days in [("c", 10), ("a", 0), ("b1", 5), ("d", 20), ("b2", 5)]:
+            timeline.add_event(self._event(event_id, days))
+        return timeline
+    
+    def test_chronological_with_stable_ties(self, timeline):
+        """Test inserts keep date order and same-date insertion order."""
+        assert [e.timeline_event_id for e in timeline.events] == ["a", "b1", "b2", "c", "d"]
+    
+    def test_get_events_by_date(self, timeline):
+        """Test per-date lookup."""
+        events = timeline.get_events_by_date(date(2025, 1, 6))
+        
+        assert [e.timeline_event_id for e in events] == ["b1", "b2"]
+        assert timeline.get_events_by_date(date(2030, 1, 1)) == []
+    
+    def test_get_events_up_to_skips_executed(self, timeline):
+        """Test up-to lookup is inclusive and pending-only."""
+        timeline.mark_executed("b1", {"ok": True})
+        
+        events = timeline.get_events_up_to(date(2025, 1, 11))
+        assert [e.timeline_event_id for e in events] == ["a", "b2", "c"]
+    
+    def test_mark_executed_by_id(self, timeline):
+        """Test mark_executed updates the indexed event."""
+        timeline.mark_executed("d", {"value": 1})
+        
+        event = timeline.get_event("d")
+        assert event.status == "executed"
+        assert event.result == {"value": 1}
+        assert event.executed_at is not None
+        timeline.mark_executed("missing", {})
+        assert timeline.get_event("missing") is None
+    
+    def test_direct_append_is_reindexed(self, timeline):
+        """Test events appended to the list directly are picked up."""
+        timeline.events.append(self._event("early", -1))
+        
+        assert timeline.get_event("early") is not None
+        assert timeline.get_pending_events()[0].timeline_event_id == "early"
+        timeline.add_event(self._event("late", 30))
+        assert timeline.events[-1].timeline_event_id == "late"
+    
+    def test_in_place_replacement_is_reindexed(self, timeline):
+        """Test replacing an event by position is picked up."""
+        timeline.events[0] = self._event("a2", 40)
+        
+        assert timeline.get_event("a") is None
+        assert timeline.get_event("a2") is not None
+        assert timeline.events[-1].timeline_event_id == "a2"
+        assert timeline.get_events_by_date(date(2025, 1, 1)) == []
+    
+    def test_append_then_pop_is_reindexed(self, timeline):
+        """Test a same-length mutation sequence still invalidates the index."""
+        timeline.get_event("a")
+        timeline.events.append(self._event("x", 3))
+        timeline.events.pop(0)
+        
+        assert timeline.get_event("a") is None
+        assert [e.timeline_event_id for e in timeline.get_events_up_to(date(2025, 1, 6))] == [
+            "x", "b1", "b2"
+        ]
+    
+    def test_assigned_list_is_reindexed(self, timeline):
+        """Test assigning a new list to events is picked up."""
+        timeline.events = [self._event("z", 1)]
+        
+        assert timeline.get_event("z") is not None
+        assert timeline.get_event("a") is None
+    
+    def test_many_events(self):
+        """Test a long timeline stays ordered."""
+        from healthsim_agent.generation.journey_engine import Timeline
+        
+        timeline = Timeline(entity_id="p1", entity_type="patient")
+        for i in range(2000):
+            timeline.add_event(self._event(f"e{i}", (i * 7919) % 365))
+        
+        dates = [e.scheduled_date for e in timeline.events]
+        assert dates == sorted(dates)
+        assert len(timeline.get_events_by_date(date(2025, 1, 1))) == len(
+            [i for i in range(2000) if (i * 7919) % 365 == 0]
+        )
+
+
+def _record_handler(entity, event, context):
+    """Module-level handler so it can be pickled for process pools."""
+    return {"params": context["event_parameters"]}
+
+
+class TestRunPopulation:
+    """Tests for JourneyEngine.run_population."""
+    
+    @pytest.fixture
+    def journey(self):
+        from healthsim_agent.generation.journey_engine import create_simple_journey
+        
+        return create_simple_journey(
+            journey_id="j1",
+            name="Bulk",
+            events=[
+                {"event_id": "dx", "name": "Dx", "event_type": "diagnosis",
+                 "product": "patientsim", "parameters": {"who": "${entity.name}"}},
+                {"event_id": "lab", "name": "Lab", "event_type": "lab_order",
+                 "product": "patientsim", "depends_on": "dx",
+                 "delay": {"days": 5, "days_min": 1, "days_max": 10, "distribution": "uniform"}},
+                {"event_id": "visit", "name": "Visit", "event_type": "encounter",
+                 "product": "patientsim", "delay": {"days": 90}},
+            ],
+        )
+    
+    @pytest.fixture
+    def engine(self):
+        from healthsim_agent.generation.journey_engine import JourneyEngine
+        
+        engine = JourneyEngine(seed=7)
+        engine.register_handler("patientsim", "diagnosis", _record_handler)
+        engine.register_handler("patientsim", "lab_order", _record_handler)
+        return engine
+    
+    @pytest.fixture
+    def patients(self):
+        return [{"patient_id": f"p{i}", "name": f"Pat {i}"} for i in range(6)]
+    
+    def test_matches_per_entity_api(self, engine, journey, patients):
+        """Test bulk rows equal create_timeline + execute_timeline results."""
+        start = date(2025, 1, 1)
+        table = engine.run_population(patients, journey, start_date=start)
+        
+        rows = [r for r in table.to_records() if r["entity_id"] == "p2"]
+        timeline = engine.create_timeline(patients[2], "patient", journey, start)
+        results = engine.execute_timeline(timeline, patients[2])
+        assert [(r["timeline_event_id"], r["scheduled_date"].isoformat(), r["status"])
+                for r in rows] == [
+            (r["event_id"], r["scheduled_date"], r["status"]) for r in results
+        ]
+        assert rows[0]["parameters"] == {"who": "Pat 2"}
+    
+    def test_columnar_table(self, engine, journey, patients):
+        """Test the table has one row per event and aligned columns."""
+        table = engine.run_population(patients, journey, start_date=date(2025, 1, 1))
+        
+        assert len(table) == 18
+        assert all(len(column) == 18 for column in table.columns.values())
+        assert table.columns["entity_id"][:3] == ["p0", "p0", "p0"]
+        assert table.columns["status"][:3] == ["executed", "executed", "skipped"]
+    
+    def test_up_to_date_leaves_pending(self, engine, journey, patients):
+        """Test events after up_to_date are reported as pending."""
+        table = engine.run_population(
+            patients, journey, start_date=date(2025, 1, 1), up_to_date=date(2025, 1, 1)
+        )
+        
+        statuses = {r["event_definition_id"]: r["status"] for r in table.to_records()}
+        assert statuses["dx"] == "executed"
+        assert statuses["visit"] == "pending"
+    
+    def test_failed_handler(self, journey, patients):
+        """Test handler exceptions are captured per row."""
+        from healthsim_agent.generation.journey_engine import JourneyEngine
+        
+        def boom(entity, event, context):
+            raise RuntimeError("boom")
+        
+        engine = JourneyEngine(seed=1)
+        engine.register_handler("patientsim", "diagnosis", boom)
+        table = engine.run_population(patients[:1], journey, start_date=date(2025, 1, 1))
+        
+        assert table.columns["status"][0] == "failed"
+        assert table.columns["error"][0] == "boom"
+    
+    def test_probability_independent_of_order(self, engine, patients):
+        """Test probabilistic events do not depend on entity order."""
+        from healthsim_agent.generation.journey_engine import create_simple_journey
+        
+        journey = create_simple_journey("j2", "Maybe", [
+            {"event_id": "maybe", "name": "Maybe", "event_type": "diagnosis",
+             "product": "patientsim", "probability": 0.5},
+        ])
+        forward = engine.run_population(patients, journey, start_date=date(2025, 1, 1))
+        backward = engine.run_population(patients[::-1], journey, start_date=date(2025, 1, 1))
+        
+        assert sorted(forward.columns["timeline_event_id"]) == sorted(
+            backward.columns["timeline_event_id"]
+        )
+    
+    def test_compiled_journey_reused(self, engine, journey, patients):
+        """Test a precompiled journey gives the same table."""
+        from healthsim_agent.generation.journey_engine import CompiledJourney
+        
+        compiled = CompiledJourney.compile(journey)
+        assert compiled.events[0].templated_keys == ("who",)
+        assert compiled.events[1].fixed_delay is None
+        
+        first = engine.run_population(patients, compiled, start_date=date(2025, 1, 1))
+        second = engine.run_population(patients, journey, start_date=date(2025, 1, 1))
+        assert first.columns == second.columns
+    
+    def test_workers_match_serial(self, engine, journey, patients):
+        """Test process-pool shards merge in entity order."""
+        serial = engine.run_population(patients, journey, start_date=date(2025, 1, 1))
+        sharded = engine.run_population(
+            patients, journey, start_date=date(2025, 1, 1), workers=2, shard_size=2
+        )
+        
+        assert sharded.columns == serial.columns
+    
+    def test_workers_with_spawn_start_method(self, engine, journey, patients, monkeypatch):
+        """Test shards run under spawn, which pickles the engine and its registry."""
+        import functools
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from healthsim_agent.generation import journey_engine
+        from healthsim_agent.generation.timeline_registry import TimelineRegistry
+        
+        engine._active_timelines = TimelineRegistry(max_size=2, weak=True, drop_on_complete=True)
+        monkeypatch.setattr(journey_engine, "ProcessPoolExecutor", functools.partial(
+            ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")
+        ))
+        
+        serial = engine.run_population(patients, journey, start_date=date(2025, 1, 1))
+        sharded = engine.run_population(
+            patients, journey, start_date=date(2025, 1, 1), workers=2, shard_size=2
+        )
+        
+        assert sharded.columns == serial.columns
@@ -0,0 +1,176 @@
+"""Tests for generation framework - seeds, sharded and streaming profile execution."""
+
+import json
+
+import duckdb
+import pytest
+
+from healthsim_agent.generation import (
+    DuckDBSink,
+    HierarchicalSeedManager,
+    NDJSONSink,
+    ParquetSink,
+    ProfileExecutor,
+    ProfileSpecification,
+    ValidationAccumulator,
+)
+
+
+SPEC = {
+    "id": "sharded",
+    "name": "Sharded",
+    "generation": {"count": 250, "seed": 99},
+    "demographics": {
+        "age": {"type": "normal", "mean": 72, "std_dev": 8, "min": 65, "max": 95},
+        "gender": {"type": "categorical", "weights": {"M": 0.48, "F": 0.52}},
+    },
+    "clinical": {
+        "primary_condition": {"code": "E11", "prevalence": 0.8},
+        "lab_values": {"a1c": {"type": "normal", "mean": 7.5, "std_dev": 1.2}},
+    },
+    "coverage": {"type": "Medicare", "plan_distribution": {"MA": 0.55, "Original": 0.45}},
+}
+
+
+class TestHierarchicalSeedManager:
+    """Tests for HierarchicalSeedManager."""
+
+    def test_seed_is_independent_of_access_order(self):
+        """Test jumping straight to an index gives the sequential value."""
+        sequential = HierarchicalSeedManager(42)
+        expected = [sequential.get_entity_seed(i) for i in range(1001)]
+
+        direct = HierarchicalSeedManager(42)
+        assert direct.get_entity_seed(1000) == expected[1000]
+        assert direct.get_entity_seed(3) == expected[3]
+
+    def test_seeds_are_31_bit_and_distinct(self):
+        """Test seeds stay in the historic range and do not repeat."""
+        manager = HierarchicalSeedManager(7)
+        seeds = [manager.get_entity_seed(i) for i in range(10_000)]
+
+        assert all(0 <= seed < 2**31 for seed in seeds)
+        assert len(set(seeds)) == len(seeds)
+
+    def test_master_seed_changes_stream(self):
+        """Test different master seeds produce different entity seeds."""
+        a = HierarchicalSeedManager(1)
+        b = HierarchicalSeedManager(2)
+
+        assert [a.get_entity_seed(i) for i in range(5)] != [b.get_entity_seed(i) for i in range(5)]
+
+    def test_reset_keeps_seeds(self):
+        """Test reset leaves derived seeds unchanged."""
+        manager = HierarchicalSeedManager(5)
+        before = manager.get_entity_seed(10)
+        manager.reset()
+
+        assert manager.get_entity_seed(10) == before
+
+
+class TestShardedExecution:
+    """Tests for process-pool execution."""
+
+    @pytest.fixture
+    def profile(self):
+        return ProfileSpecification.model_validate(SPEC)
+
+    def test_sharded_matches_serial(self, profile):
+        """Test shards merge in index order and equal the serial run."""
+        serial = ProfileExecutor(profile, seed=99).execute(count_override=250)
+        sharded = ProfileExecutor(profile, seed=99).execute(
+            count_override=250, workers=2, shard_size=40
+        )
+
+        assert [e.index for e in sharded.entities] == list(range(250))
+        assert sharded.entities == serial.entities
+        assert repr(sharded.entities) == repr(serial.entities)
+
+    def test_sharded_validation(self, profile):
+        """Test validation runs over the merged entities."""
+        result = ProfileExecutor(profile, seed=99).execute(count_override=100, workers=2)
+
+        assert result.count == 100
+        assert [m.name for m in result.validation.metrics] == [
+            m.name for m in ProfileExecutor(profile, seed=99).execute(
+                count_override=100
+            ).validation.metrics
+        ]
+
+    def test_single_worker_runs_serially(self, profile):
+        """Test workers=1 does not start a pool."""
+        result = ProfileExecutor(profile, seed=1).execute(count_override=10, workers=1)
+
+        assert result.count == 10
+
+
+class TestStreamingExecution:
+    """Tests for execute_iter, execute_to_sink and the sinks."""
+
+    @pytest.fixture
+    def profile(self):
+        return ProfileSpecification.model_validate(SPEC)
+
+    def test_execute_iter_batches(self, profile):
+        """Test batches are bounded and concatenate to the full run."""
+        batches = list(ProfileExecutor(profile, seed=5).execute_iter(batch_size=100))
+
+        assert [len(b) for b in batches] == [100, 100, 50]
+        flat = [e for batch in batches for e in batch]
+        assert flat == ProfileExecutor(profile, seed=5).execute().entities
+
+    def test_invalid_batch_size(self, profile):
+        """Test batch_size must be positive."""
+        with pytest.raises(ValueError, match="batch_size"):
+            next(ProfileExecutor(profile).execute_iter(batch_size=0))
+
+    def test_streaming_validation_matches_full(self, profile, tmp_path):
+        """Test streamed metrics equal validating the whole list."""
+        full = ProfileExecutor(profile, seed=5).execute()
+        streamed = ProfileExecutor(profile, seed=5).execute_to_sink(
+            NDJSONSink(tmp_path / "out.ndjson"), batch_size=64
+        )
+
+        assert streamed.entities == []
+        assert streamed.count == full.count
+        assert [(m.name, m.actual) for m in streamed.validation.metrics] == [
+            (m.name, m.actual) for m in full.validation.metrics
+        ]
+
+    def test_validation_accumulator_empty(self, profile):
+        """Test an empty accumulator warns like an empty run."""
+        report = ValidationAccumulator(profile).report()
+
+        assert report.warnings == ["No entities generated"]
+
+    def test_ndjson_sink(self, profile, tmp_path):
+        """Test NDJSON output has one record per entity."""
+        path = tmp_path / "out.ndjson"
+        ProfileExecutor(profile, seed=5).execute_to_sink(NDJSONSink(path), batch_size=64)
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 250
+        assert records[0]["index"] == 0
+        assert isinstance(records[0]["birth_date"], str)
+
+    def test_duckdb_sink(self, profile):
+        """Test DuckDB sink appends every batch to the table."""
+        conn = duckdb.connect()
+        ProfileExecutor(profile, seed=5).execute_to_sink(DuckDBSink(conn), batch_size=64)
+
+        count, max_index, a1c = conn.execute(
+            "SELECT COUNT(*), MAX(index), MAX(lab_values->>'a1c') IS NOT NULL "
+            "FROM generated_entities"
+        ).fetchone()
+        assert (count, max_index, a1c) == (250, 249, True)
+
+    def test_parquet_sink(self, profile, tmp_path):
+        """Test Parquet sink writes one part file per batch."""
+        sink = ParquetSink(tmp_path / "parquet")
+        ProfileExecutor(profile, seed=5).execute_to_sink(sink, batch_size=100)
+
+        assert len(sink.files) == 3
+        count = duckdb.execute(
+            f"SELECT COUNT(*) FROM read_parquet('{tmp_path / 'parquet'}/*.parquet')"
+        ).fetchone()[0]
+        assert count == 250
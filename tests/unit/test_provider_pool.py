@@ -0,0 +1,226 @@
+"""Tests for generation framework - in-memory provider pool."""
+
+import random
+
+import duckdb
+import pytest
+
+from healthsim_agent.generation import (
+    EntityType,
+    ProviderPool,
+    assign_facility_to_patient,
+    assign_provider_to_patient,
+    get_provider_pool,
+    reset_provider_pools,
+)
+from healthsim_agent.generation import provider_pool
+
+
+PROVIDERS = [
+    # npi, entity, last, first, credential, org, city, state, taxonomy_1, taxonomy_2
+    ("1000000001", "1", "Adams", "Ann", "MD", None, "Austin", "TX", "207Q00000X", None),
+    ("1000000002", "1", "Baker", "Bob", "DO", None, "AUSTIN", "TX", "207R00000X", "207Q00000X"),
+    ("1000000003", "1", "Clark", "Cy", "MD", None, "Dallas", "TX", "207Q00000X", None),
+    ("1000000004", "2", None, None, None, "Austin Clinic", "Austin", "TX", "207Q00000X", None),
+    ("1000000005", "1", "Diaz", "Dee", "MD", None, "Houston", "TX", "207RC0000X", None),
+    ("1000000006", "1", "Evans", "Eve", "NP", None, "Reno", "NV", "207Q00000X", None),
+]
+
+FACILITIES = [
+    ("450001", "Austin General", "01", "Austin", "TX", "78701", None, 300, None),
+    ("450002", "Dallas Medical", "01", "Dallas", "TX", "75201", None, 500, None),
+    ("450003", "Austin Rehab", "04", "Austin", "TX", "78702", None, 40, None),
+]
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("CREATE SCHEMA network")
+    conn.execute("""
+        CREATE TABLE network.providers (
+            npi VARCHAR, entity_type_code VARCHAR, last_name VARCHAR, first_name VARCHAR,
+            middle_name VARCHAR, credential VARCHAR, gender VARCHAR,
+            organization_name VARCHAR, practice_city VARCHAR, practice_state VARCHAR,
+            practice_zip VARCHAR, practice_address_1 VARCHAR, practice_address_2 VARCHAR,
+            phone VARCHAR, taxonomy_1 VARCHAR, taxonomy_2 VARCHAR, taxonomy_3 VARCHAR
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO network.providers VALUES "
+        "(?, ?, ?, ?, NULL, ?, NULL, ?, ?, ?, NULL, NULL, NULL, NULL, ?, ?, NULL)",
+        PROVIDERS,
+    )
+    conn.execute("""
+        CREATE TABLE network.facilities (
+            ccn VARCHAR, name VARCHAR, type VARCHAR, city VARCHAR, state VARCHAR,
+            zip VARCHAR, phone VARCHAR, beds INTEGER, subtype VARCHAR
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO network.facilities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", FACILITIES,
+    )
+    yield conn
+    conn.close()
+
+
+class TestProviderPool:
+    """Tests for ProviderPool slices and draws."""
+
+    def test_slice_filters_and_order(self, conn):
+        """Test a slice holds the state's matching providers in NPI order."""
+        pool = ProviderPool(conn)
+
+        family = pool.provider_slice("tx", taxonomy="207Q00000X")
+        assert family.columns["npi"] == ["1000000001", "1000000002", "1000000003", "1000000004"]
+
+        individuals = pool.provider_slice(
+            "TX", taxonomy_patterns=["207R%"], entity_type=EntityType.INDIVIDUAL,
+        )
+        assert individuals.columns["npi"] == ["1000000002", "1000000005"]
+        assert individuals.provider(0).last_name == "Baker"
+        assert individuals.provider(0).entity_type == EntityType.INDIVIDUAL
+
+    def test_draw_prefers_city_then_state(self, conn):
+        """Test draws stay in the city when it has providers."""
+        pool = ProviderPool(conn)
+        rng = random.Random(1)
+
+        in_austin = {pool.draw_provider("TX", city="austin", rng=rng).npi for _ in range(50)}
+        assert in_austin == {"1000000001", "1000000002", "1000000004"}
+
+        anywhere = {pool.draw_provider("TX", city="El Paso", rng=rng).npi for _ in range(100)}
+        assert anywhere == {f"100000000{i}" for i in range(1, 6)}
+
+        assert pool.draw_provider("WY", rng=rng) is None
+
+    def test_draws_are_seeded(self, conn):
+        """Test the same seed gives the same providers."""
+        pool = ProviderPool(conn)
+
+        def draws(seed):
+            rng = random.Random(seed)
+            return [pool.draw_provider("TX", rng=rng).npi for _ in range(20)]
+
+        assert draws(7) == draws(7)
+
+    def test_slices_load_once(self, conn):
+        """Test repeated draws reuse the loaded slice."""
+        pool = ProviderPool(conn)
+        for _ in range(100):
+            pool.draw_provider("TX", taxonomy="207Q00000X")
+            pool.draw_facility("TX", city="Austin")
+
+        stats = pool.stats()
+        assert stats["loads"] == 2
+        assert stats["hits"] == 198
+        assert stats["slices"] == 2
+
+    def test_lru_eviction(self, conn):
+        """Test least recently used slices are evicted beyond max_rows."""
+        pool = ProviderPool(conn, max_rows=6)
+        tx = pool.provider_slice("TX")
+        pool.provider_slice("NV")
+        assert pool.provider_slice("TX") is tx
+        assert pool.stats()["rows"] == 6
+
+        pool.provider_slice("NV", taxonomy="207Q00000X")
+        stats = pool.stats()
+        assert stats["evictions"] == 1
+        assert stats["rows"] == 6
+        assert pool.provider_slice("TX") is tx
+        assert pool.stats()["loads"] == 3
+
+    def test_oversized_slice_kept_alone(self, conn):
+        """Test a slice larger than max_rows evicts the rest but is kept."""
+        pool = ProviderPool(conn, max_rows=2)
+        pool.provider_slice("NV")
+        tx = pool.provider_slice("TX")
+
+        assert pool.stats() == {
+            "slices": 1, "rows": 5, "hits": 0, "loads": 2, "evictions": 1,
+        }
+        assert pool.provider_slice("TX") is tx
+
+    def test_row_fetch_without_numpy(self, conn, monkeypatch):
+        """Test slices load the same columns when numpy is unavailable."""
+        with_numpy = ProviderPool(conn).provider_slice("TX").columns
+        monkeypatch.setattr(provider_pool, "np", None)
+
+        assert ProviderPool(conn).provider_slice("TX").columns == with_numpy
+        assert ProviderPool(conn).provider_slice("WY").columns["npi"] == []
+
+    def test_invalid_max_rows(self, conn):
+        """Test max_rows must be positive."""
+        with pytest.raises(ValueError):
+            ProviderPool(conn, max_rows=0)
+
+    def test_facility_slice(self, conn):
+        """Test facility slices filter by mapped facility type."""
+        pool = ProviderPool(conn)
+
+        hospitals = pool.facility_slice("TX", "hospital")
+        assert hospitals.columns["ccn"] == ["450001", "450002"]
+        assert pool.draw_facility("TX", city="Austin", facility_type="rehabilitation").name == (
+            "Austin Rehab"
+        )
+
+
+class TestSharedPools:
+    """Tests for the shared pools used by assignment functions and generators."""
+
+    def test_pool_shared_per_connection(self, conn):
+        """Test one pool is shared per connection until reset."""
+        pool = get_provider_pool(conn)
+        assert get_provider_pool(conn) is pool
+
+        reset_provider_pools()
+        assert get_provider_pool(conn) is not pool
+
+    def test_reference_import_resets_pools(self, conn, monkeypatch):
+        """Test importing reference data drops the shared pools."""
+        from healthsim_agent.db.reference import loader
+
+        for name in ("import_places_tract", "import_places_county", "import_svi_tract",
+                     "import_svi_county", "import_adi_blockgroup"):
+            monkeypatch.setattr(loader, name, lambda conn, replace, schema: 0)
+        pool = get_provider_pool(conn)
+        default_pool = get_provider_pool()
+
+        loader.import_all_reference_data(conn, verbose=False)
+
+        assert get_provider_pool(conn) is not pool
+        assert get_provider_pool() is not default_pool
+
+    def test_assign_queries_once_per_slice(self, conn):
+        """Test assigning many patients loads each slice once."""
+        reset_provider_pools()
+        providers = [
+            assign_provider_to_patient(conn, "TX", "Dallas", specialty="family_medicine")
+            for _ in range(200)
+        ]
+        assert {p.npi for p in providers} == {"1000000003"}
+
+        assert assign_provider_to_patient(conn, "TX", seed=3).npi == (
+            assign_provider_to_patient(conn, "TX", seed=3).npi
+        )
+        assert assign_facility_to_patient(conn, "TX", "Dallas").ccn == "450002"
+        assert get_provider_pool(conn).stats()["loads"] == 3
+
+    def test_member_claims_use_pool(self, conn, monkeypatch):
+        """Test MemberGenerator draws claim providers from the shared pool."""
+        from healthsim_agent.products.membersim.core.generator import MemberGenerator
+
+        monkeypatch.setattr(provider_pool, "_default_pool", ProviderPool(conn))
+        generator = MemberGenerator(seed=42)
+        member = generator.generate_member()
+
+        claims = [
+            generator.generate_claim(member, use_real_providers=True, provider_state="TX")
+            for _ in range(20)
+        ]
+
+        assert {c.provider_npi for c in claims} == {"1000000001", "1000000003"}
+        assert {c.provider_name for c in claims} == {"Ann Adams, MD", "Cy Clark, MD"}
+        assert {c.facility_name for c in claims} == {"Medical Practice"}
+        assert get_provider_pool().stats()["loads"] == 1
@@ -0,0 +1,143 @@
+"""Tests for db/reference/cache module."""
+
+import duckdb
+import pytest
+
+from healthsim_agent.db.reference import (
+    ReferenceQueryCache,
+    get_reference_cache,
+    import_all_reference_data,
+    invalidate_reference_caches,
+)
+from healthsim_agent.db.reference import cache as cache_module
+
+
+class Counter:
+    """Compute function that counts its calls."""
+
+    def __init__(self, value="rows"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class TestReferenceQueryCache:
+    """Tests for ReferenceQueryCache."""
+
+    def test_hit_after_miss(self):
+        """Test a repeated key is computed once and counted as a hit."""
+        cache = ReferenceQueryCache()
+        compute = Counter()
+        key = cache.make_key("SELECT 1")
+
+        assert cache.get_or_compute(key, compute) == "rows"
+        assert cache.get_or_compute(key, compute) == "rows"
+
+        assert compute.calls == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_key_normalization(self):
+        """Test keys ignore SQL whitespace but not params or scope."""
+        make_key = ReferenceQueryCache.make_key
+
+        assert make_key("SELECT *\n  FROM t WHERE a = ?", ["CA"]) == (
+            make_key(" SELECT * FROM t\tWHERE a = ? ", ("CA",))
+        )
+        assert make_key("SELECT 1", {"b": 2, "a": 1}) == make_key("SELECT 1", {"a": 1, "b": 2})
+        assert make_key("SELECT * FROM t WHERE a = ?", ["CA"]) != (
+            make_key("SELECT * FROM t WHERE a = ?", ["TX"])
+        )
+        assert make_key("SELECT 1", scope="a.duckdb") != make_key("SELECT 1", scope="b.duckdb")
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first."""
+        cache = ReferenceQueryCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == (True, 1)
+
+        cache.put("c", 3)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries older than the TTL are recomputed."""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = ReferenceQueryCache(ttl_seconds=60)
+        compute = Counter()
+
+        cache.get_or_compute("k", compute)
+        now[0] += 59
+        cache.get_or_compute("k", compute)
+        assert compute.calls == 1
+
+        now[0] += 1
+        cache.get_or_compute("k", compute)
+        assert compute.calls == 2
+        assert cache.stats()["expirations"] == 1
+
+    def test_uncacheable_results_not_stored(self):
+        """Test results rejected by cacheable are recomputed every time."""
+        cache = ReferenceQueryCache()
+        compute = Counter(value={"error": "boom"})
+
+        for _ in range(3):
+            cache.get_or_compute("k", compute, cacheable=lambda r: "error" not in r)
+
+        assert compute.calls == 3
+        assert len(cache) == 0
+
+    def test_disabled_cache(self):
+        """Test max_entries=0 disables caching."""
+        cache = ReferenceQueryCache(max_entries=0)
+        compute = Counter()
+
+        cache.get_or_compute("k", compute)
+        cache.get_or_compute("k", compute)
+
+        assert compute.calls == 2
+
+    def test_invalid_max_entries(self):
+        """Test max_entries must be non-negative."""
+        with pytest.raises(ValueError):
+            ReferenceQueryCache(max_entries=-1)
+
+
+class TestInvalidation:
+    """Tests for invalidating every cache when reference data changes."""
+
+    def test_invalidate_reference_caches(self):
+        """Test all live caches, including the shared one, are emptied."""
+        first, second = ReferenceQueryCache(), ReferenceQueryCache()
+        first.put("a", 1)
+        second.put("b", 2)
+        get_reference_cache().put("c", 3)
+
+        assert invalidate_reference_caches() >= 3
+
+        assert len(first) == len(second) == len(get_reference_cache()) == 0
+        assert first.stats()["invalidations"] == 1
+
+    def test_import_invalidates(self, monkeypatch):
+        """Test import_all_reference_data clears cached results."""
+        from healthsim_agent.db.reference import loader
+
+        for importer in ("places_tract", "places_county", "svi_tract", "svi_county",
+                         "adi_blockgroup"):
+            monkeypatch.setattr(loader, f"import_{importer}", lambda conn, **kw: 0)
+        cache = ReferenceQueryCache()
+        cache.put("a", 1)
+
+        conn = duckdb.connect(":memory:")
+        import_all_reference_data(conn, verbose=False)
+        conn.close()
+
+        assert cache.get("a") == (False, None)
@@ -0,0 +1,337 @@
+"""Tests for healthsim_agent.tools.result_tools module."""
+
+import json
+import os
+import tempfile
+import time
+
+import duckdb
+import pytest
+
+from healthsim_agent.tools import get_manager, reset_manager
+from healthsim_agent.tools import result_tools
+from healthsim_agent.tools.result_tools import (
+    TOOL_RESULT_TABLE,
+    budget_tool_result,
+    fetch_tool_result,
+)
+
+
+@pytest.fixture
+def temp_db_env(monkeypatch):
+    """Point the tools at an empty temporary database."""
+    with tempfile.NamedTemporaryFile(suffix=".duckdb", delete=False) as f:
+        db_path = f.name
+    os.unlink(db_path)
+
+    monkeypatch.setenv("HEALTHSIM_DB_PATH", db_path)
+    monkeypatch.setattr(result_tools, "_table_ensured", False)
+    reset_manager()
+
+    yield db_path
+
+    reset_manager()
+    try:
+        os.unlink(db_path)
+    except Exception:
+        pass
+
+
+def query_result(rows: int) -> dict:
+    """A result shaped like the agent's conversion of query()."""
+    return {
+        "success": True,
+        "data": {
+            "columns": ["id", "name"],
+            "row_count": rows,
+            "rows": [{"id": i, "name": f"patient-{i}"} for i in range(rows)],
+        },
+        "error": None,
+    }
+
+
+class TestBudgetToolResult:
+    """Tests for budget_tool_result."""
+
+    def test_small_result_passed_through(self, temp_db_env):
+        """Test results under the budget are serialized unchanged."""
+        result = query_result(3)
+
+        content = budget_tool_result("query", result, max_chars=10_000)
+
+        assert json.loads(content) == result
+
+    def test_no_budget(self, temp_db_env):
+        """Test max_chars=None never spills."""
+        result = query_result(2000)
+
+        assert json.loads(budget_tool_result("query", result, max_chars=None)) == result
+
+    def test_large_result_spilled_to_duckdb(self, temp_db_env):
+        """Test a large result is stored and replaced by a compact preview."""
+        result = query_result(2000)
+
+        content = budget_tool_result("query", result, max_chars=5000)
+        preview = json.loads(content)
+
+        assert len(content) < 5000
+        assert preview["success"] is True
+        assert preview["truncated"] is True
+        assert preview["path"] == "data.rows"
+        assert preview["total_items"] == 2000
+        assert preview["schema"] == ["id", "name"]
+        assert preview["head"] == result["data"]["rows"][:5]
+        assert preview["outline"]["data"]["row_count"] == 2000
+        assert preview["outline"]["data"]["rows"] == "<list of 2000 items>"
+
+        reset_manager()
+        conn = duckdb.connect(temp_db_env)
+        stored = conn.execute(
+            f"SELECT tool_name, payload FROM {TOOL_RESULT_TABLE} WHERE handle = ?",
+            [preview["handle"]],
+        ).fetchone()
+        conn.close()
+        assert stored[0] == "query"
+        assert json.loads(stored[1]) == result
+
+    def test_text_result_preview(self, temp_db_env):
+        """Test large text (e.g. an export) is previewed by line."""
+        csv = "\n".join(f"{i},patient-{i}" for i in range(5000))
+        result = {"success": True, "data": {"csv": csv, "rows": 5000}, "error": None}
+
+        preview = json.loads(budget_tool_result("export_csv", result, max_chars=5000))
+
+        assert preview["path"] == "data.csv"
+        assert preview["total_items"] == 5000
+        assert preview["head"].splitlines() == ["0,patient-0", "1,patient-1", "2,patient-2",
+                                                "3,patient-3", "4,patient-4"]
+
+    def test_falls_back_to_temp_file(self, temp_db_env, monkeypatch, tmp_path):
+        """Test results go to a temp file when the database cannot be written."""
+        def fail():
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(result_tools, "_ensure_table", fail)
+        monkeypatch.setattr(result_tools, "SPILL_DIR", tmp_path)
+
+        preview = json.loads(budget_tool_result("query", query_result(2000), max_chars=5000))
+
+        assert (tmp_path / f"{preview['handle']}.json").exists()
+        page = fetch_tool_result(preview["handle"], offset=10, limit=2)
+        assert page.data["items"] == [{"id": 10, "name": "patient-10"},
+                                      {"id": 11, "name": "patient-11"}]
+
+
+class TestRetention:
+    """Tests for pruning stored tool results."""
+
+    def stored_handles(self) -> set[str]:
+        rows = get_manager().get_read_connection().execute(
+            f"SELECT handle FROM {TOOL_RESULT_TABLE}"
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def test_expired_rows_pruned(self, temp_db_env, monkeypatch):
+        """Test rows older than the retention window are deleted on startup."""
+        handle = result_tools.store_tool_result("query", "[1, 2, 3]")
+        with get_manager().write_connection() as conn:
+            conn.execute(
+                f"INSERT INTO {TOOL_RESULT_TABLE} VALUES "
+                "('tr_old', 'query', '[]', 2, CURRENT_TIMESTAMP - INTERVAL 25 HOUR)"
+            )
+        monkeypatch.setattr(result_tools, "_table_ensured", False)
+
+        result_tools._ensure_table()
+
+        assert self.stored_handles() == {handle}
+
+    def test_oldest_rows_pruned_past_size_limit(self, temp_db_env, monkeypatch):
+        """Test the oldest rows are deleted once the total size is too large."""
+        result_tools._ensure_table()
+        with get_manager().write_connection() as conn:
+            for i, hours in enumerate([3, 2, 1]):
+                conn.execute(
+                    f"INSERT INTO {TOOL_RESULT_TABLE} VALUES "
+                    f"('tr_{i}', 'query', '[]', 100, "
+                    f"CURRENT_TIMESTAMP - INTERVAL {hours} HOUR)"
+                )
+        monkeypatch.setattr(result_tools, "_table_ensured", False)
+        monkeypatch.setattr(result_tools, "MAX_STORED_CHARS", 250)
+
+        result_tools._ensure_table()
+
+        assert self.stored_handles() == {"tr_1", "tr_2"}
+
+    def test_spill_dir_pruned(self, monkeypatch, tmp_path):
+        """Test expired and excess spill files are deleted."""
+        monkeypatch.setattr(result_tools, "SPILL_DIR", tmp_path)
+        monkeypatch.setattr(result_tools, "_spill_pruned", False)
+        monkeypatch.setattr(result_tools, "MAX_STORED_CHARS", 250)
+        now = time.time()
+        for name, age_hours in [("tr_new", 0), ("tr_recent", 1), ("tr_older", 2),
+                                ("tr_expired", 30)]:
+            path = tmp_path / f"{name}.json"
+            path.write_text("x" * 100)
+            os.utime(path, (now - age_hours * 3600,) * 2)
+        (tmp_path / "other.txt").write_text("kept")
+
+        result_tools._prune_spill_dir()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "other.txt", "tr_new.json", "tr_recent.json",
+        ]
+
+
+def page_chars(page) -> int:
+    """Size of a page as the agent serializes it."""
+    return len(json.dumps({"success": page.success, "data": page.data, "error": page.error}))
+
+
+class TestFetchToolResult:
+    """Tests for fetch_tool_result."""
+
+    def test_pages_through_rows(self, temp_db_env):
+        """Test rows are returned page by page."""
+        preview = json.loads(budget_tool_result("query", query_result(120), max_chars=1000))
+
+        first = fetch_tool_result(preview["handle"], offset=0, limit=50)
+        last = fetch_tool_result(preview["handle"], offset=100, limit=50)
+
+        assert first.success
+        assert [row["id"] for row in first.data["items"]] == list(range(50))
+        assert first.data["has_more"] is True
+        assert [row["id"] for row in last.data["items"]] == list(range(100, 120))
+        assert last.data["has_more"] is False
+        assert last.data["total_items"] == 120
+
+    def test_limit_capped(self, temp_db_env):
+        """Test a page never exceeds MAX_FETCH_ITEMS."""
+        preview = json.loads(budget_tool_result("query", query_result(500), max_chars=1000))
+
+        page = fetch_tool_result(preview["handle"], limit=10_000)
+
+        assert len(page.data["items"]) == result_tools.MAX_FETCH_ITEMS
+
+    def test_explicit_path(self, temp_db_env):
+        """Test paging a list other than the default one."""
+        result = {
+            "success": True,
+            "data": {"entities": {
+                "patients": [{"id": i} for i in range(300)],
+                "encounters": [{"id": i, "patient": i} for i in range(10)],
+            }},
+        }
+        preview = json.loads(budget_tool_result("load_cohort", result, max_chars=1000))
+        assert preview["path"] == "data.entities.patients"
+
+        page = fetch_tool_result(preview["handle"], path="data.entities.encounters", limit=3)
+
+        assert page.data["items"] == [{"id": 0, "patient": 0}, {"id": 1, "patient": 1},
+                                      {"id": 2, "patient": 2}]
+        assert not fetch_tool_result(preview["handle"], path="data.missing").success
+
+    def test_oversized_item_outlined(self, temp_db_env):
+        """Test a single item larger than the page cap is returned as an outline."""
+        result = {"success": True, "data": {"patients": [
+            {"id": 0, "notes": "x" * 30_000},
+            {"id": 1},
+        ]}}
+        preview = json.loads(budget_tool_result("load_cohort", result, max_chars=1000))
+
+        page = fetch_tool_result(preview["handle"], path="data.patients")
+
+        assert page.data["items"] == [{"id": 0, "notes": "<text of 30,000 chars>"}, {"id": 1}]
+        assert page.data["truncated"] is True
+        assert "data.patients.<key or index>" in page.data["hint"]
+        assert page_chars(page) <= result_tools.MAX_FETCH_CHARS
+
+    def test_oversized_value_outlined(self, temp_db_env):
+        """Test a large object at the path is outlined instead of returned whole."""
+        result = {"success": True, "data": {
+            "summary": {f"k{i}": "v" * 5000 for i in range(10)},
+            "nested": {f"a{i}": {f"b{j}": "x" * 400 for j in range(20)} for i in range(20)},
+        }}
+        preview = json.loads(budget_tool_result("get_summary", result, max_chars=1000))
+
+        summary = fetch_tool_result(preview["handle"], path="data.summary")
+        nested = fetch_tool_result(preview["handle"], path="data.nested")
+
+        assert summary.data["value"]["k0"] == "<text of 5,000 chars>"
+        assert summary.data["truncated"] is True
+        assert isinstance(nested.data["value"], str)
+        assert nested.data["value"].startswith('{"a0": {"b0": "xxx')
+        assert nested.data["truncated"] is True
+        for page in (summary, nested):
+            assert page_chars(page) <= result_tools.MAX_FETCH_CHARS
+
+    def test_wide_object_paged_by_key(self, temp_db_env):
+        """Test an object with many keys gets a bounded preview and pages by key."""
+        result = {"success": True, "data": {f"npi-{i}": f"provider {i}" for i in range(20_000)}}
+
+        content = budget_tool_result("search_providers", result, max_chars=50_000)
+        preview = json.loads(content)
+
+        assert len(content) <= 50_000
+        assert preview["path"] == "data"
+        assert preview["total_items"] == 20_000
+        assert preview["outline"]["data"]["..."] == "<object with 20000 keys>"
+        assert len(preview["outline"]["data"]) == result_tools.OUTLINE_MAX_KEYS + 1
+        assert preview["head"] == {f"npi-{i}": f"provider {i}" for i in range(5)}
+
+        page = fetch_tool_result(preview["handle"], offset=100, limit=3)
+        assert page.data["items"] == {
+            "npi-100": "provider 100", "npi-101": "provider 101", "npi-102": "provider 102",
+        }
+        assert page.data["has_more"] is True
+
+    def test_preview_fits_budget(self, temp_db_env):
+        """Test the preview is shrunk to fit max_chars when its outline is large."""
+        result = {"success": True, "data": {
+            f"a{i}": {f"b{j}": "x" * 400 for j in range(20)} for i in range(20)
+        }}
+
+        for max_chars in (50_000, 5000, 1000):
+            content = budget_tool_result("get_summary", result, max_chars=max_chars)
+            preview = json.loads(content)
+            assert len(content) <= max_chars
+            assert preview["handle"].startswith("tr_")
+
+        page = fetch_tool_result(preview["handle"])
+        assert page_chars(page) <= result_tools.MAX_FETCH_CHARS
+
+    def test_text_page_capped(self, temp_db_env):
+        """Test text pages stay under the cap after JSON escaping."""
+        line = '"quoted" ' * 50
+        result = {"success": True, "data": {"document": "\n".join([line] * 500)}}
+        preview = json.loads(budget_tool_result("transform_to_fhir", result, max_chars=1000))
+
+        short = fetch_tool_result(preview["handle"], limit=2)
+        long = fetch_tool_result(preview["handle"], limit=100)
+
+        assert short.data["text"] == f"{line}\n{line}"
+        assert "truncated" not in short.data
+        assert long.data["text"].startswith(line)
+        assert long.data["truncated"] is True
+        assert page_chars(long) <= result_tools.MAX_FETCH_CHARS
+
+    def test_unknown_handle(self, temp_db_env):
+        """Test an unknown handle is an error."""
+        result = fetch_tool_result("tr_doesnotexist")
+
+        assert not result.success
+        assert "Unknown tool result handle" in result.error
+
+    def test_fetch_results_not_spilled(self, temp_db_env):
+        """Test pages within the fetch cap are not spilled again."""
+        page = {"success": True, "data": {"items": ["x" * 100] * 100}}
+
+        assert json.loads(budget_tool_result("fetch_tool_result", page, max_chars=1000)) == page
+
+    def test_oversized_fetch_results_spilled(self, temp_db_env):
+        """Test a fetch result over the fetch cap is budgeted like any other."""
+        page = {"success": True, "data": {"items": ["x" * 100] * 300}}
+
+        preview = json.loads(budget_tool_result("fetch_tool_result", page, max_chars=1000))
+
+        assert preview["truncated"] is True
+        assert preview["total_items"] == 300
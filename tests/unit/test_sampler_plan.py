@@ -0,0 +1,284 @@
+"""Tests for generation framework - compiled sampler plans."""
+
+import random
+import pytest
+
+from healthsim_agent.generation import (
+    AgeBandDistribution,
+    CategoricalDistribution,
+    DistributionSpec,
+    ExplicitDistribution,
+    LogNormalDistribution,
+    NormalDistribution,
+    ProfileExecutor,
+    ProfileSpecification,
+    SamplerPlan,
+    compile_distribution,
+    execute_profile,
+)
+
+
+GOLDEN_SPEC = {
+    "id": "golden-a",
+    "name": "Golden A",
+    "generation": {"count": 5, "seed": 42},
+    "demographics": {
+        "age": {"type": "normal", "mean": 72, "std_dev": 8, "min": 65, "max": 95},
+        "gender": {"type": "categorical", "weights": {"M": 0.48, "F": 0.52}},
+        "race": {"type": "explicit", "values": [
+            {"value": "white", "weight": 0.6},
+            {"value": "black", "weight": 0.25},
+            {"value": "asian", "weight": 0.15},
+        ]},
+        "ethnicity": {"type": "categorical", "weights": {"hispanic": 0.3, "non_hispanic": 0.7}},
+    },
+    "clinical": {
+        "primary_condition": {"code": "E11", "prevalence": 0.8},
+        "comorbidities": [{"code": "I10", "prevalence": 0.7}, {"code": "E78", "prevalence": 0.5}],
+        "severity": {"type": "categorical", "weights": {"controlled": 0.6, "uncontrolled": 0.4}},
+        "lab_values": {
+            "a1c": {"type": "normal", "mean": 7.5, "std_dev": 1.2, "min": 5.0, "max": 14.0},
+            "cost": {"type": "log_normal", "mean": 5000, "std_dev": 8000},
+            "bmi": {"type": "uniform", "min": 18, "max": 40},
+        },
+    },
+    "coverage": {"type": "Medicare", "plan_distribution": {"MA": 0.55, "Original": 0.45}},
+}
+
+
+class TestGoldenOutput:
+    """Output for a given seed is pinned; any change here breaks reproducibility."""
+
+    def test_matches_recorded_output(self):
+        """Test seed 42 output matches recorded values."""
+        result = execute_profile(GOLDEN_SPEC)
+        observed = [
+            (e.seed, e.age, e.gender, e.race, e.ethnicity,
+             (e.birth_date.month, e.birth_date.day), e.conditions, e.severity,
+             round(e.lab_values["a1c"], 6), round(e.lab_values["cost"], 6), e.plan_type)
+            for e in result.entities
+        ]
+
+        assert observed == [
+            (737213789, 65, 'M', 'white', 'non_hispanic', (11, 16), ['E11', 'E78'],
+             'uncontrolled', 7.089687, 958.045933, 'MA'),
+            (2052450465, 69, 'M', 'asian', 'non_hispanic', (12, 3), ['E11', 'E78'],
+             'controlled', 7.304983, 11880.338374, 'MA'),
+            (1044427676, 65, 'F', 'black', 'hispanic', (10, 9), ['I10', 'E78'],
+             'controlled', 8.245979, 899.394014, 'MA'),
+            (144649974, 67, 'M', 'white', 'non_hispanic', (4, 1), ['E11', 'I10'],
+             'controlled', 9.257979, 1632.013302, 'Original'),
+            (1453665480, 68, 'F', 'black', 'non_hispanic', (3, 28), ['E11', 'I10', 'E78'],
+             'controlled', 6.769624, 1295.162505, 'MA'),
+        ]
+
+    def test_age_bands_recorded_output(self):
+        """Test age-band and plan_type sampling match recorded values."""
+        result = execute_profile({
+            "id": "golden-b",
+            "name": "Golden B",
+            "generation": {"count": 5, "seed": 7},
+            "demographics": {
+                "age": {"type": "age_bands",
+                        "bands": {"0-2": 0.15, "3-5": 0.15, "6-12": 0.35, "13-17": 0.35}},
+                "gender": {"type": "categorical", "weights": {"M": 0.51, "F": 0.49}},
+            },
+            "coverage": {"type": "Commercial",
+                         "plan_type": {"type": "categorical", "weights": {"PPO": 0.5, "HMO": 0.5}}},
+        })
+
+        assert [(e.age, e.gender, e.plan_type) for e in result.entities] == [
+            (3, 'F', 'HMO'), (4, 'F', 'PPO'), (10, 'F', 'HMO'), (14, 'M', 'PPO'), (8, 'F', 'HMO'),
+        ]
+
+
+class TestCompileDistribution:
+    """Tests for compile_distribution."""
+
+    def test_categorical_matches_model(self):
+        """Test compiled categorical draws equal CategoricalDistribution draws."""
+        weights = {"a": 0.2, "b": 0.5, "c": 0.3}
+        compiled = compile_distribution(DistributionSpec(type="categorical", weights=weights))
+        model = CategoricalDistribution(weights=weights)
+        rng_a, rng_b = random.Random(1), random.Random(1)
+
+        assert [compiled.sample(rng_a) for _ in range(200)] == [model.sample(rng_b) for _ in range(200)]
+
+    def test_age_bands_match_model(self):
+        """Test compiled age bands equal AgeBandDistribution draws."""
+        bands = {"18-34": 0.3, "35-64": 0.5, "65+": 0.2}
+        compiled = compile_distribution(DistributionSpec(type="age_bands", bands=bands))
+        model = AgeBandDistribution(bands=bands)
+        rng_a, rng_b = random.Random(3), random.Random(3)
+
+        assert [compiled.sample(rng_a) for _ in range(200)] == [model.sample(rng_b) for _ in range(200)]
+
+    def test_normal_and_lognormal_match_models(self):
+        """Test compiled continuous draws equal the model classes."""
+        normal = compile_distribution(DistributionSpec(type="normal", mean=10, std_dev=2))
+        lognormal = compile_distribution(DistributionSpec(type="log_normal", mean=100, std_dev=40))
+        rng_a, rng_b = random.Random(5), random.Random(5)
+
+        for _ in range(50):
+            assert normal.sample(rng_a) == NormalDistribution(mean=10, std_dev=2).sample(rng_b)
+            assert lognormal.sample(rng_a) == LogNormalDistribution(mean=100, std_dev=40).sample(rng_b)
+
+    def test_clamps_and_rounding(self):
+        """Test min/max clamps are bound into the compiled sampler."""
+        compiled = compile_distribution(
+            DistributionSpec(type="normal", mean=50, std_dev=100, min=40, max=60)
+        )
+        rng = random.Random(9)
+
+        values = [compiled.sample(rng, as_int=True) for _ in range(100)]
+        assert all(isinstance(v, int) and 40 <= v <= 60 for v in values)
+
+    def test_invalid_weights_fail_at_compile_time(self):
+        """Test weight validation happens once, when compiling."""
+        with pytest.raises(ValueError, match="sum to 1.0"):
+            compile_distribution(DistributionSpec(type="categorical", weights={"a": 0.2}))
+
+    def test_conditional_uses_context(self):
+        """Test conditional specs select rules from the sampling context."""
+        compiled = compile_distribution(DistributionSpec(
+            type="conditional",
+            rules=[{"condition": "severity == 'high'",
+                    "distribution": {"type": "uniform", "min": 100, "max": 101}}],
+            default={"type": "uniform", "min": 0, "max": 1},
+        ))
+        rng = random.Random(0)
+
+        assert compiled.sample(rng, context={"severity": "high"}) >= 100
+        assert compiled.sample(rng, context={}) <= 1
+
+
+class TestSamplerPlan:
+    """Tests for SamplerPlan compilation."""
+
+    def test_compile_profile(self):
+        """Test plan captures demographics, clinical and coverage."""
+        plan = SamplerPlan.compile(ProfileSpecification.model_validate(GOLDEN_SPEC))
+
+        assert plan.age is not None and plan.age.min == 65
+        assert plan.primary_condition == ("E11", 0.8)
+        assert [code for code, _ in plan.comorbidities] == ["I10", "E78"]
+        assert [name for name, _ in plan.lab_values] == ["a1c", "cost", "bmi"]
+        assert plan.plan_choice.items == ("MA", "Original")
+
+    def test_plan_is_immutable(self):
+        """Test plans cannot be mutated after compilation."""
+        plan = SamplerPlan.compile(ProfileSpecification.model_validate(GOLDEN_SPEC))
+
+        with pytest.raises(AttributeError):
+            plan.age = None
+
+    def test_executor_compiles_once(self):
+        """Test the executor reuses one plan across entities."""
+        executor = ProfileExecutor(ProfileSpecification.model_validate(GOLDEN_SPEC))
+        plan = executor.plan
+        executor.execute(count_override=20)
+
+        assert executor.plan is plan
+
+
+class TestVectorizedSampling:
+    """Tests for column-at-a-time sampling with numpy."""
+
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        self.np = pytest.importorskip("numpy")
+
+    def test_distribution_sample_array(self):
+        """Test model classes fill arrays within their supports."""
+        gen = self.np.random.default_rng(0)
+
+        ages = AgeBandDistribution(bands={"0-2": 0.5, "65+": 0.5}).sample_array(1000, gen)
+        assert ((ages <= 2) | ((ages >= 65) & (ages <= 100))).all()
+
+        genders = CategoricalDistribution(weights={"M": 0.3, "F": 0.7}).sample_array(5000, gen)
+        assert set(genders) == {"M", "F"}
+        assert abs((genders == "F").mean() - 0.7) < 0.03
+
+        costs = LogNormalDistribution(mean=100, std_dev=40, min_val=50).sample_array(1000, gen)
+        assert costs.min() >= 50
+
+    def test_base_sample_array_falls_back_to_scalar_draws(self):
+        """Test a distribution without a vectorized path still fills an array."""
+        from healthsim_agent.generation.distributions import Distribution
+
+        class Constant(Distribution):
+            def sample(self, rng=None):
+                return 3
+
+        values = Constant().sample_array(10, self.np.random.default_rng(0))
+        assert values.tolist() == [3] * 10
+
+    def test_compiled_sample_array_clamps_and_rounds(self):
+        """Test compiled array draws apply min/max and integer rounding."""
+        compiled = compile_distribution(
+            DistributionSpec(type="normal", mean=50, std_dev=100, min=40, max=60)
+        )
+
+        values = compiled.sample_array(1000, self.np.random.default_rng(1), as_int=True)
+        assert values.dtype.kind == "i"
+        assert values.min() >= 40 and values.max() <= 60
+
+    def test_conditional_sample_array_uses_context_columns(self):
+        """Test conditional rules are applied per row from context columns."""
+        compiled = compile_distribution(DistributionSpec(
+            type="conditional",
+            rules=[{"condition": "severity == 'high'",
+                    "distribution": {"type": "uniform", "min": 100, "max": 101}}],
+            default={"type": "uniform", "min": 0, "max": 1},
+        ))
+        severity = self.np.array(["high", "low", "high", "low"], dtype=object)
+
+        values = compiled.sample_array(
+            4, self.np.random.default_rng(2), context={"severity": severity}
+        )
+        assert (values[severity == "high"] >= 100).all()
+        assert (values[severity == "low"] <= 1).all()
+
+    def test_columns_deterministic_per_seed(self):
+        """Test the same seed reproduces every column."""
+        profile = ProfileSpecification.model_validate(GOLDEN_SPEC)
+        first = ProfileExecutor(profile, seed=11).sample_columns(500)
+        second = ProfileExecutor(profile, seed=11).sample_columns(500)
+
+        assert first.keys() == second.keys()
+        for name in first:
+            assert (first[name] == second[name]).all(), name
+        assert {"age", "gender", "condition:E11", "lab:a1c", "plan_type"} <= set(first)
+
+    def test_vectorized_execute(self):
+        """Test vectorized execution builds valid entities."""
+        profile = ProfileSpecification.model_validate(GOLDEN_SPEC)
+        result = ProfileExecutor(profile, seed=3).execute(count_override=2000, vectorized=True)
+
+        assert result.count == 2000
+        assert result.validation.passed
+        entity = result.entities[0]
+        assert isinstance(entity.age, int) and 65 <= entity.age <= 95
+        assert entity.birth_date.year == entity.birth_date.today().year - entity.age
+        assert set(entity.lab_values) == {"a1c", "cost", "bmi"}
+        assert entity.coverage_type == "Medicare"
+
+
+class TestSampleArrayWithoutNumpy:
+    """Tests for array sampling when numpy is not installed."""
+
+    @pytest.mark.parametrize("dist", [
+        CategoricalDistribution(weights={"M": 0.5, "F": 0.5}),
+        AgeBandDistribution(bands={"18-34": 1.0}),
+        ExplicitDistribution(values=[("a", 1.0)]),
+        compile_distribution(DistributionSpec(type="categorical", weights={"a": 1.0})).sampler,
+    ])
+    def test_requires_numpy(self, dist, monkeypatch):
+        """Test sample_array raises the install hint rather than AttributeError."""
+        from healthsim_agent.generation import distributions, sampler_plan
+
+        monkeypatch.setattr(distributions, "np", None)
+        monkeypatch.setattr(sampler_plan, "np", None)
+
+        with pytest.raises(ImportError, match="numpy is required"):
+            dist.sample_array(5, None)
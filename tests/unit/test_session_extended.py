@@ -279,3 +279,109 @@ class TestSessionContentBlocks:
         
         assert api_msgs[0]["content"][0]["type"] == "tool_use"
         assert api_msgs[0]["content"][0]["name"] == "generate_patient"
+
+
+class TestApiMessageCache:
+    """Tests for memoized API serialization."""
+    
+    def test_message_serialized_once(self):
+        """Test each block is converted once across repeated calls."""
+        class Block:
+            calls = 0
+            
+            def model_dump(self):
+                Block.calls += 1
+                return {"type": "text", "text": "hi"}
+        
+        session = SessionState()
+        session.add_message("assistant", [Block()])
+        
+        first = session.get_messages_for_api()
+        session.add_message("user", "next")
+        second = session.get_messages_for_api()
+        
+        assert Block.calls == 1
+        assert second[0] is first[0]
+        assert second[1] == {"role": "user", "content": "next"}
+    
+    def test_reassigned_content_reserialized(self):
+        """Test assigning new content invalidates the cached form."""
+        session = SessionState()
+        msg = session.add_message("user", "before")
+        session.get_messages_for_api()
+        
+        msg.content = "after"
+        
+        assert session.get_messages_for_api()[0]["content"] == "after"
+    
+    def test_invalidate_after_in_place_edit(self):
+        """Test invalidate picks up in-place content edits."""
+        session = SessionState()
+        msg = session.add_message("user", [{"type": "text", "text": "a"}])
+        session.get_messages_for_api()
+        
+        msg.content.append({"type": "text", "text": "b"})
+        assert len(session.get_messages_for_api()[0]["content"]) == 1
+        
+        session.invalidate_api_cache()
+        assert len(session.get_messages_for_api()[0]["content"]) == 2
+    
+    def test_cache_not_in_to_dict_or_equality(self):
+        """Test the cache does not leak into serialization or comparisons."""
+        session = SessionState()
+        msg = session.add_message("user", "hello")
+        session.get_messages_for_api()
+        
+        restored = SessionState.from_dict(session.to_dict())
+        
+        assert restored.messages[0] == msg
+
+
+class TestApiMessageWindowing:
+    """Tests for token-budget windowing of old tool results."""
+    
+    @staticmethod
+    def _session_with_tool_results(n: int, size: int = 4000) -> SessionState:
+        session = SessionState()
+        for i in range(n):
+            session.add_message("assistant", [
+                {"type": "tool_use", "id": f"t{i}", "name": "query", "input": {}},
+            ])
+            session.add_message("user", [
+                {"type": "tool_result", "tool_use_id": f"t{i}", "content": "x" * size},
+            ])
+        return session
+    
+    def test_no_budget_keeps_everything(self):
+        """Test the full history is sent without a budget."""
+        session = self._session_with_tool_results(3)
+        
+        api_msgs = session.get_messages_for_api()
+        
+        assert all(
+            len(m["content"][0]["content"]) == 4000
+            for m in api_msgs if m["role"] == "user"
+        )
+    
+    def test_old_tool_results_trimmed_to_budget(self):
+        """Test oldest tool results are trimmed first and recent ones kept."""
+        session = self._session_with_tool_results(5)
+        assert session.history_token_estimate() > 3000
+        
+        api_msgs = session.get_messages_for_api(token_budget=3000, keep_recent=2)
+        results = [m["content"][0] for m in api_msgs if m["role"] == "user"]
+        
+        assert results[0]["content"].startswith("[Earlier tool result trimmed")
+        assert results[0]["tool_use_id"] == "t0"
+        assert results[-1]["content"] == "x" * 4000
+        assert sum(len(str(m)) for m in api_msgs) // 4 <= 3000
+        # The stored history is untouched
+        assert session.messages[1].content[0]["content"] == "x" * 4000
+    
+    def test_within_budget_not_trimmed(self):
+        """Test nothing is trimmed while the history fits."""
+        session = self._session_with_tool_results(2)
+        
+        api_msgs = session.get_messages_for_api(token_budget=100_000)
+        
+        assert api_msgs == session.get_messages_for_api()
@@ -321,3 +321,82 @@ class TestSkillIndex:
         # May or may not exist depending on loaded skills
         if skill:
             assert skill.metadata.name == "diabetes-management"
+
+
+class TestParsedSkillCache:
+    """Tests for the on-disk parsed-skill cache."""
+    
+    @pytest.fixture
+    def skills_dir(self, tmp_path):
+        skills = tmp_path / "skills"
+        (skills / "patientsim").mkdir(parents=True)
+        (skills / "patientsim" / "asthma.md").write_text(
+            "---\nname: asthma\ndescription: 'Asthma. Triggers: asthma'\n---\n"
+            "# Asthma\n\n## Config\n```yaml\nseverity: mild\n```\n"
+        )
+        (skills / "patientsim" / "notes.md").write_text("# No frontmatter\n")
+        return skills
+    
+    def _loader(self, skills_dir, tmp_path):
+        return SkillLoader(skills_dir, cache_dir=tmp_path / "cache")
+    
+    def test_warm_start_skips_parsing(self, skills_dir, tmp_path, monkeypatch):
+        """Test a second loader reads unchanged skills from the cache."""
+        cold = self._loader(skills_dir, tmp_path).load_all()
+        assert self._loader(skills_dir, tmp_path).cache_path.exists()
+        
+        def fail_parse(self, path):
+            raise AssertionError(f"parsed {path}")
+        
+        monkeypatch.setattr(SkillLoader, "_parse_skill", fail_parse)
+        warm = self._loader(skills_dir, tmp_path).load_all()
+        
+        assert list(warm.skills) == list(cold.skills) == ["asthma"]
+        assert warm.skills["asthma"] == cold.skills["asthma"]
+        assert warm.skills["asthma"].embedded_configs[0].data == {"severity": "mild"}
+    
+    def test_changed_file_is_reparsed(self, skills_dir, tmp_path):
+        """Test edits, new files and deletions invalidate the cache."""
+        self._loader(skills_dir, tmp_path).load_all()
+        
+        (skills_dir / "patientsim" / "asthma.md").write_text(
+            "---\nname: asthma\ndescription: 'Asthma, pediatric. Triggers: wheeze'\n---\n"
+        )
+        (skills_dir / "patientsim" / "copd.md").write_text(
+            "---\nname: copd\ndescription: COPD\n---\n"
+        )
+        (skills_dir / "patientsim" / "notes.md").unlink()
+        loader = self._loader(skills_dir, tmp_path)
+        index = loader.load_all()
+        
+        assert sorted(index.skills) == ["asthma", "copd"]
+        assert index.skills["asthma"].triggers == ["wheeze"]
+        assert len(list(loader.cache_path.glob("*.pickle"))) == 2
+    
+    def test_corrupt_cache_is_rebuilt(self, skills_dir, tmp_path):
+        """Test unreadable cache entries are ignored and rewritten."""
+        loader = self._loader(skills_dir, tmp_path)
+        loader.load_all()
+        entries = list(loader.cache_path.glob("*.pickle"))
+        for entry in entries:
+            entry.write_bytes(b"not a pickle")
+        
+        assert list(self._loader(skills_dir, tmp_path).load_all().skills) == ["asthma"]
+        assert all(entry.read_bytes() != b"not a pickle" for entry in entries)
+    
+    def test_cache_disabled(self, skills_dir, tmp_path):
+        """Test use_cache=False never writes a cache file."""
+        loader = SkillLoader(skills_dir, cache_dir=tmp_path / "cache", use_cache=False)
+        
+        assert list(loader.load_all().skills) == ["asthma"]
+        assert not (tmp_path / "cache").exists()
+    
+    def test_cache_dir_from_environment(self, skills_dir, tmp_path, monkeypatch):
+        """Test HEALTHSIM_CACHE_DIR sets the default cache location."""
+        monkeypatch.setenv("HEALTHSIM_CACHE_DIR", str(tmp_path / "env-cache"))
+        
+        loader = SkillLoader(skills_dir)
+        loader.load_all()
+        
+        assert loader.cache_path.parent == tmp_path / "env-cache"
+        assert loader.cache_path.exists()
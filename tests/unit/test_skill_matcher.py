@@ -0,0 +1,57 @@
+"""Unit tests for the multi-phrase matcher."""
+import random
+
+from healthsim_agent.skills.matcher import PhraseMatcher
+
+
+class TestPhraseMatcher:
+    """Tests for PhraseMatcher."""
+    
+    def test_finds_overlapping_phrases(self):
+        """Test nested and overlapping phrases are all reported."""
+        matcher = PhraseMatcher(["type 2 diabetes", "diabetes", "2 diabetes care", "care"])
+        
+        assert matcher.find("type 2 diabetes care plan") == [
+            "type 2 diabetes", "diabetes", "2 diabetes care", "care",
+        ]
+    
+    def test_results_follow_phrase_order_once_each(self):
+        """Test results come back in phrase order without duplicates."""
+        matcher = PhraseMatcher(["claim", "", "member", "claim"])
+        
+        assert len(matcher) == 2
+        assert matcher.find("member claim, claim, member") == ["claim", "member"]
+    
+    def test_whole_words(self):
+        """Test matches must sit on word boundaries."""
+        matcher = PhraseMatcher(["ed", "rx", "pa"])
+        
+        assert matcher.find("generated rxnorm data for a patient") == []
+        assert matcher.find("an ed visit, rx fill; pa") == ["ed", "rx", "pa"]
+    
+    def test_plural_suffixes_allowed(self):
+        """Test a trailing s/es still counts as a whole-word match."""
+        matcher = PhraseMatcher(["patient", "diagnosis", "class"])
+        
+        assert matcher.find("patients with diagnoses") == ["patient"]
+        assert matcher.find("classes") == ["class"]
+        assert matcher.find("patiently") == []
+    
+    def test_non_word_edges(self):
+        """Test phrases starting or ending in punctuation or digits."""
+        matcher = PhraseMatcher(["in-network", "835", "-network", "c++"])
+        
+        assert matcher.find("in-network 835 files") == ["in-network", "835", "-network"]
+        assert matcher.find("x835 out-of-network c++x") == ["-network", "c++"]
+    
+    def test_substring_mode_matches_naive_scan(self):
+        """Test whole_words=False agrees with a brute-force substring scan."""
+        rng = random.Random(7)
+        phrases = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 5)))
+                   for _ in range(60)]
+        matcher = PhraseMatcher(phrases, whole_words=False)
+        
+        for _ in range(50):
+            text = "".join(rng.choice("abcd ") for _ in range(rng.randint(0, 40)))
+            expected = [p for p in dict.fromkeys(phrases) if p and p in text]
+            assert matcher.find(text) == expected
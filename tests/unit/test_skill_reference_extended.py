@@ -153,3 +153,165 @@ class TestSkillResolver:
         
         resolver = SkillResolver()
         assert resolver is not None
+    
+    def test_find_skill_file_uses_index(self, tmp_path, monkeypatch):
+        """Test skill files are located without walking the tree per lookup."""
+        from healthsim_agent.generation.skill_reference import SkillResolver
+        
+        skills = tmp_path / "skills"
+        for rel in ["patientsim/diabetes-management.md", "trialsim/deep/sepsis.md",
+                    "common/deep/diabetes-management.md"]:
+            (skills / rel).parent.mkdir(parents=True, exist_ok=True)
+            (skills / rel).write_text(f"---\nname: {Path(rel).stem}\ndescription: x\n---\n")
+        resolver = SkillResolver(skills)
+        resolver.loader.cache_dir = tmp_path / "cache"
+        
+        assert resolver._find_skill_file("Diabetes_Management") == (
+            skills / "patientsim" / "diabetes-management.md"
+        )
+        
+        def fail_rglob(self, pattern):
+            raise AssertionError("walked the skills tree")
+        
+        monkeypatch.setattr(Path, "rglob", fail_rglob)
+        assert resolver._find_skill_file("sepsis") == skills / "trialsim" / "deep" / "sepsis.md"
+        assert resolver._find_skill_file("missing") is None
+        assert resolver.load_skill("sepsis").metadata.name == "sepsis"
+        assert resolver.list_skills() == ["diabetes-management", "sepsis"]
+
+
+class TestCompiledSkillLookups:
+    """Tests for compiled lookup tables and memoized resolution."""
+    
+    SKILL = """---
+name: lab-skill
+description: Lab patterns
+---
+# Lab Skill
+
+## Lab Patterns by Control Status
+
+### Controlled (A1C < 7)
+{"loinc": "4548-4", "test_name": "Hemoglobin A1c", "range": "5.7-7.0"}
+
+### Poorly-Controlled
+{"loinc": "2345-7", "test_name": "Glucose", "range": "70-99"}
+
+## Labs
+- 4548-4 Hemoglobin A1c
+
+## Settings
+```yaml
+severity: moderate
+thresholds:
+  a1c: [7.0, 9.0]
+```
+"""
+    
+    @pytest.fixture
+    def resolver(self, tmp_path):
+        from healthsim_agent.generation.skill_reference import SkillResolver
+        
+        skills = tmp_path / "skills"
+        (skills / "patientsim").mkdir(parents=True)
+        (skills / "patientsim" / "lab-skill.md").write_text(self.SKILL)
+        resolver = SkillResolver(skills)
+        resolver.loader.cache_dir = tmp_path / "cache"
+        return resolver
+    
+    def _resolve(self, resolver, lookup, **entity):
+        from healthsim_agent.generation.skill_reference import SkillReference
+        
+        ref = SkillReference(
+            skill="lab-skill", lookup=lookup,
+            context={"control_status": "${entity.control_status}"},
+        )
+        return resolver.resolve(ref, entity).parameters
+    
+    def test_lookups(self, resolver):
+        """Test context, pattern and direct lookups against the compiled tables."""
+        assert self._resolve(resolver, "lab_order", control_status="poorly_controlled") == {
+            "loinc": "2345-7", "test_name": "Glucose", "range": "70-99",
+        }
+        assert self._resolve(resolver, "lab_order", control_status="controlled")["loinc"] == (
+            "4548-4"
+        )
+        assert self._resolve(resolver, "lab_order", control_status="unknown") == {}
+        assert self._resolve(resolver, "loinc") == {"value": "4548-4"}
+        assert self._resolve(resolver, "severity") == {"value": "moderate"}
+        assert self._resolve(resolver, "missing") == {}
+    
+    def test_results_are_memoized(self, resolver, monkeypatch):
+        """Test each (lookup, context value) is computed once per skill."""
+        calls = []
+        compute = resolver._compute_lookup
+        
+        def counting_compute(compiled, lookup, mapping, context_value):
+            calls.append((lookup, context_value))
+            return compute(compiled, lookup, mapping, context_value)
+        
+        monkeypatch.setattr(resolver, "_compute_lookup", counting_compute)
+        for status in ["controlled", "poorly_controlled"] * 50:
+            self._resolve(resolver, "lab_order", control_status=status)
+            self._resolve(resolver, "loinc")
+        
+        assert calls == [
+            ("lab_order", "controlled"), ("loinc", None), ("lab_order", "poorly_controlled"),
+        ]
+    
+    def test_memoized_results_are_copied(self, resolver):
+        """Test callers mutating a result do not change later results."""
+        first = self._resolve(resolver, "lab_order", control_status="controlled")
+        first["loinc"] = "changed"
+        
+        assert self._resolve(resolver, "lab_order", control_status="controlled")["loinc"] == (
+            "4548-4"
+        )
+    
+    def test_memoized_nested_results_are_copied(self, resolver):
+        """Test mutating a nested value does not change later results."""
+        first = self._resolve(resolver, "thresholds")
+        first["value"]["a1c"].append(11.0)
+        
+        assert self._resolve(resolver, "thresholds") == {"value": {"a1c": [7.0, 9.0]}}
+    
+    def test_non_string_context_on_empty_skill(self, resolver, tmp_path):
+        """Test a non-string context value is not normalized when there is no content."""
+        from healthsim_agent.skills.models import ParsedSkill, SkillMetadata
+        
+        skill = ParsedSkill(
+            path=tmp_path / "empty.md",
+            metadata=SkillMetadata(name="empty", description=""),
+            markdown_content="",
+        )
+        
+        assert resolver._lookup_value(skill, "diagnosis_by_stage", {"stage": 3}) is None
+    
+    def test_heading_table_matches_section_regex(self):
+        """Test the heading table agrees with the ### section regex it replaces."""
+        import json
+        import random
+        import re
+        from healthsim_agent.generation.skill_reference import SkillResolver, _heading_sections
+        
+        def regex_lookup(content, value):
+            pattern = rf"###\s*{re.escape(value)}.*?\n(.*?)(?=###|\Z)"
+            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+            if match:
+                json_match = re.search(r"\{[^}]+\}", match.group(1), re.DOTALL)
+                if json_match:
+                    try:
+                        return json.loads(json_match.group())
+                    except json.JSONDecodeError:
+                        pass
+            return None
+        
+        resolver = SkillResolver()
+        rng = random.Random(1)
+        tokens = ["###", "#", " ", "\n", "\t\n", "ab", "A", "b", '{"k": 1}', "{", "}", "x"]
+        for _ in range(3000):
+            content = "".join(rng.choice(tokens) for _ in range(rng.randint(0, 15)))
+            value = rng.choice(["", "a", "ab", "b", "x", "ab x"])
+            assert resolver._context_lookup(_heading_sections(content), value) == (
+                regex_lookup(content, value)
+            ), (content, value)
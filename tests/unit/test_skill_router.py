@@ -313,3 +313,64 @@ class TestFindRelatedSkills:
             related = router.find_related_skills(skill, max_results=3)
             
             assert len(related) <= 3
+
+
+class TestTriggerAutomaton:
+    """Tests for single-pass trigger and keyword matching."""
+    
+    @pytest.fixture
+    def skills_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HEALTHSIM_CACHE_DIR", str(tmp_path / "cache"))
+        skills = tmp_path / "skills"
+        (skills / "membersim").mkdir(parents=True)
+        (skills / "membersim" / "dental.md").write_text(
+            "---\nname: dental-claims\ndescription: 'Dental. Triggers: dental claim, ed'\n"
+            "---\n# Dental\n"
+        )
+        return skills
+    
+    def test_triggers_match_whole_words(self, skills_dir):
+        """Test short triggers do not fire inside longer words."""
+        router = SkillRouter(SkillLoader(skills_dir))
+        
+        assert router.route("generated records").matched_triggers == []
+        
+        result = router.route("Two dental claims after an ED visit")
+        assert result.matched_triggers == ["dental claim", "ed"]
+        assert [s.metadata.name for s in result.matched_skills] == ["dental-claims"]
+        assert result.suggested_product == "membersim"
+    
+    def test_automaton_rebuilt_on_reload(self, skills_dir):
+        """Test the automaton is reused until the loader reloads."""
+        router = SkillRouter(SkillLoader(skills_dir))
+        router.route("dental claim")
+        matcher = router._phrase_matcher()
+        
+        router.route("orthodontic claim")
+        assert router._phrase_matcher() is matcher
+        
+        (skills_dir / "membersim" / "ortho.md").write_text(
+            "---\nname: ortho\ndescription: 'Ortho. Triggers: orthodontic'\n---\n# Ortho\n"
+        )
+        router.loader.reload()
+        
+        result = router.route("orthodontic claim")
+        assert router._phrase_matcher() is not matcher
+        assert result.matched_triggers == ["orthodontic"]
+    
+    def test_skills_added_to_index_are_matched(self, skills_dir):
+        """Test adding a skill to the live index rebuilds the automaton."""
+        from healthsim_agent.skills.models import ParsedSkill, SkillMetadata
+        
+        router = SkillRouter(SkillLoader(skills_dir))
+        router.route("warm up")
+        router.loader.index.add_skill(ParsedSkill(
+            path=skills_dir / "membersim" / "vision.md",
+            metadata=SkillMetadata.from_frontmatter(
+                {"name": "vision", "trigger_phrases": ["vision benefit"]}
+            ),
+            markdown_content="",
+            embedded_configs=[],
+        ))
+        
+        assert router.route("vision benefits").matched_triggers == ["vision benefit"]
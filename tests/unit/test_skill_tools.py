@@ -227,6 +227,199 @@ class TestIndexSkills:
         assert isinstance(result.success, bool)
 
 
+@pytest.fixture
+def skills_dir(tmp_path, monkeypatch):
+    from healthsim_agent.tools import connection
+    
+    skills = tmp_path / "skills"
+    for i in range(5):
+        path = skills / "patientsim" / ("nested" if i % 2 else "") / f"skill-{i}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"---\nname: Skill {i}\n---\n## Purpose\nBody {i}\n## Examples\nx\n")
+    (skills / "patientsim" / "README.md").write_text("# Readme\n")
+    
+    monkeypatch.setenv("HEALTHSIM_DB_PATH", str(tmp_path / "skills.duckdb"))
+    monkeypatch.setattr("healthsim_agent.tools.skill_tools.SKILLS_DIR", skills)
+    monkeypatch.setattr("healthsim_agent.tools.skill_tools._tables_ensured", False)
+    # Use a private manager; the shared one is restored afterwards
+    monkeypatch.setattr(connection, "_manager", None)
+    yield skills
+    connection.reset_manager()
+
+
+class TestIndexPipeline:
+    """Tests for the parse/diff/write indexing pipeline against DuckDB."""
+    
+    def _rows(self):
+        from healthsim_agent.tools.connection import get_manager
+        
+        return get_manager().get_read_connection().execute("""
+            SELECT si.id, si.subdirectory, si.has_examples, sc.full_text
+            FROM skill_index si JOIN skill_content sc ON si.id = sc.skill_id
+            ORDER BY si.id
+        """).fetchall()
+    
+    def test_only_changed_files_are_rewritten(self, skills_dir):
+        """Test unchanged hashes are skipped and edits are re-indexed."""
+        first = index_skills()
+        assert first.data["indexed"] == 5
+        assert first.data["skipped"] == 1
+        assert set(first.data["timings_ms"]) == {"parse", "diff", "write"}
+        
+        assert index_skills().data["indexed"] == 0
+        
+        (skills_dir / "patientsim" / "nested" / "skill-1.md").write_text(
+            "---\nname: Skill 1\n---\n## Purpose\nEdited\n"
+        )
+        second = index_skills()
+        
+        assert second.data["indexed"] == 1
+        assert second.data["skipped"] == 5
+        rows = self._rows()
+        assert len(rows) == 5
+        assert ("patientsim/nested/skill-1", "nested", False, "## Purpose\nEdited") in rows
+        assert index_skills(force=True).data["indexed"] == 5
+    
+    def test_parse_failures_are_reported(self, skills_dir):
+        """Test files that fail to parse are listed and the rest indexed."""
+        from healthsim_agent.tools import skill_tools
+        
+        parse = skill_tools._parse_skill_file
+        with patch.object(
+            skill_tools, "_parse_skill_file",
+            side_effect=lambda p: None if p.stem == "skill-2" else parse(p),
+        ):
+            result = index_skills()
+        
+        assert result.data["indexed"] == 4
+        assert result.data["errors"] == ["Failed to parse: skill-2.md"]
+    
+    def test_failed_batch_is_reported(self, skills_dir):
+        """Test a failed write indexes nothing and reports the error."""
+        with patch(
+            "healthsim_agent.tools.skill_tools._write_skill_records",
+            side_effect=RuntimeError("disk full"),
+        ):
+            result = index_skills()
+        
+        assert result.data["indexed"] == 0
+        assert result.data["errors"] == ["Failed to update skill index: disk full"]
+        assert self._rows() == []
+    
+    def test_failed_write_rolls_back(self):
+        """Test a failing upsert rolls back the whole batch."""
+        from healthsim_agent.tools.skill_tools import _write_skill_records
+        
+        conn = MagicMock()
+        conn.execute.side_effect = [None, None, RuntimeError("boom"), None]
+        record = {
+            "index": {name: None for name in ("id", "name", "product", "skill_type",
+                                              "description", "trigger_phrases", "file_path",
+                                              "relative_path", "subdirectory", "tags",
+                                              "related_skills", "word_count", "has_examples",
+                                              "has_parameters", "content_hash")},
+            "content": {"skill_id": None, "full_text": None, "sections": None,
+                        "code_blocks": None},
+        }
+        
+        with pytest.raises(RuntimeError):
+            _write_skill_records(conn, [record])
+        
+        assert conn.execute.call_args_list[-1].args == ("ROLLBACK",)
+
+
+class TestRankedSearch:
+    """Tests for BM25 search over the skill_terms index."""
+    
+    def _write(self, skills_dir, stem, name, description="", body="Body"):
+        path = skills_dir / "membersim" / f"{stem}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            f"---\nname: {name}\ndescription: '{description}'\n---\n## Purpose\n{body}\n"
+        )
+        return path
+    
+    def _ids(self, query, **kwargs):
+        result = search_skills(query, **kwargs)
+        assert result.success, result.error
+        return [skill["id"] for skill in result.data["skills"]]
+    
+    def test_field_boosts_order_results(self, skills_dir):
+        """Test a match in the name outranks description, then body."""
+        self._write(skills_dir, "in-body", "Alpha", body="Dental coverage")
+        self._write(skills_dir, "in-description", "Beta", description="Dental coverage")
+        self._write(skills_dir, "in-name", "Dental Coverage")
+        index_skills()
+        
+        assert self._ids("dental") == [
+            "membersim/in-name", "membersim/in-description", "membersim/in-body",
+        ]
+    
+    def test_trigger_matches_outrank_description(self, skills_dir):
+        """Test trigger phrases are weighted above the rest of the description."""
+        self._write(skills_dir, "in-description", "Beta", description="Vision and dental plans")
+        self._write(skills_dir, "in-triggers", "Gamma",
+                    description="Vision plans. Triggers: dental plan")
+        index_skills()
+        
+        assert self._ids("dental")[0] == "membersim/in-triggers"
+    
+    def test_multi_term_queries_favor_more_matches(self, skills_dir):
+        """Test skills matching more query terms rank first, plurals fold."""
+        self._write(skills_dir, "both", "Renal", body="dialysis and transplants")
+        self._write(skills_dir, "one", "Renal Two", body="dialysis only")
+        index_skills()
+        
+        result = search_skills("Dialysis transplant")
+        
+        assert [s["id"] for s in result.data["skills"]] == ["membersim/both", "membersim/one"]
+        assert result.data["skills"][0]["score"] > result.data["skills"][1]["score"]
+        assert self._ids("dialysis", product="patientsim") == []
+        assert self._ids("!!!") == []
+    
+    def test_reindex_updates_terms(self, skills_dir):
+        """Test edited and deleted skills leave no stale terms behind."""
+        path = self._write(skills_dir, "edited", "Edited", body="hospice")
+        index_skills()
+        assert self._ids("hospice") == ["membersim/edited"]
+        
+        self._write(skills_dir, "edited", "Edited", body="palliative")
+        index_skills()
+        
+        assert self._ids("hospice") == []
+        assert self._ids("palliative") == ["membersim/edited"]
+    
+    def test_skills_without_terms_are_reindexed(self, skills_dir):
+        """Test rows indexed before skill_terms existed are picked up."""
+        from healthsim_agent.tools.connection import get_manager
+        
+        index_skills()
+        with get_manager().write_connection() as conn:
+            conn.execute("DELETE FROM skill_terms")
+            conn.execute("DELETE FROM skill_field_lengths")
+        
+        assert index_skills().data["indexed"] == 5
+        assert len(self._ids("body")) == 5
+    
+    def test_query_and_index_tokenizers_agree(self):
+        """Test _query_terms matches the SQL tokenizer used for indexing."""
+        import duckdb
+        from healthsim_agent.tools.skill_tools import (
+            _FOLD_SQL, _TOKEN_REGEX, _query_terms,
+        )
+        
+        text = "Patients' HbA1c_levels, ICD-10 codes; Glass class; Café naïve 患者 x²"
+        rows = duckdb.connect().execute(f"""
+            SELECT DISTINCT {_FOLD_SQL} FROM (
+                SELECT UNNEST(regexp_extract_all(lower(?), {_TOKEN_REGEX})) AS t
+            )
+        """, [text]).fetchall()
+        
+        assert sorted(_query_terms(text)) == sorted(row[0] for row in rows)
+        assert "patient" in _query_terms(text)
+        assert "glass" in _query_terms(text)
+
+
 class TestSearchSkills:
     """Tests for search_skills function."""
     
@@ -0,0 +1,229 @@
+"""Tests for state/summary_cache.py - incrementally maintained summary aggregates."""
+
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import duckdb
+import pytest
+
+from healthsim_agent.db.schema import ALL_DDL
+from healthsim_agent.state.auto_persist import AutoPersistService
+from healthsim_agent.state.summary import SummaryGenerator
+from healthsim_agent.state.summary_cache import (
+    SummaryCache,
+    merge_section,
+    statistics_from_state,
+)
+
+
+class _DuckDBResultAdapter:
+    """Minimal rows/columns wrapper over an in-memory DuckDB connection."""
+
+    def __init__(self):
+        self.raw = duckdb.connect()
+
+    def execute(self, query, params=None):
+        cursor = self.raw.execute(query, params or [])
+        if cursor.description is None:
+            return MagicMock(rows=[], columns=[])
+        columns = [d[0] for d in cursor.description]
+        return MagicMock(rows=cursor.fetchall(), columns=columns)
+
+
+def _patients(start, count, gender_every=3):
+    return [
+        {
+            'id': f'p{i}', 'mrn': f'M{i}', 'given_name': 'A', 'family_name': 'B',
+            'birth_date': date(1940 + i % 50, 1 + i % 12, 1 + i % 28),
+            'gender': 'M' if i % gender_every == 0 else 'F',
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def _encounters(start, count):
+    return [
+        {
+            'encounter_id': f'e{i}', 'patient_mrn': f'M{i}',
+            'class_code': ['AMB', 'IMP', 'EMER', 'AMB', 'AMB', 'IMP', 'OBS'][i % 7],
+            'status': 'finished',
+            'admission_time': datetime(2024, 1, 1) + timedelta(days=i),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def adapter():
+    adapter = _DuckDBResultAdapter()
+    for ddl in ALL_DDL:
+        adapter.raw.execute(ddl)
+    return adapter
+
+
+@pytest.fixture
+def service(adapter):
+    return AutoPersistService(connection=adapter)
+
+
+def _persist(service, entities, entity_type, **kwargs):
+    with patch('healthsim_agent.state.auto_persist.get_serializer', return_value=None):
+        return service.persist_entities(entities=entities, entity_type=entity_type, **kwargs)
+
+
+def _uncached(adapter, cohort_id):
+    summary = SummaryGenerator(adapter).generate(cohort_id, include_samples=False)
+    return summary.entity_counts, summary.statistics
+
+
+class TestIncrementalMaintenance:
+    """Tests for cache updates driven by persist_entities."""
+
+    def test_batches_merge_into_cached_summary(self, adapter, service):
+        """Test cached counts and statistics equal a full recompute."""
+        first = _persist(service, _patients(0, 40), 'patient', cohort_name='cache-a')
+        cohort_id = first.cohort_id
+        _persist(service, _patients(40, 25, gender_every=2), 'patient', cohort_id=cohort_id)
+        _persist(service, _encounters(0, 30), 'encounter', cohort_id=cohort_id, bulk=True)
+        last = _persist(service, _encounters(30, 12), 'encounter', cohort_id=cohort_id)
+
+        assert (last.summary.entity_counts, last.summary.statistics) == _uncached(
+            adapter, cohort_id
+        )
+        assert last.summary.entity_counts == {'patients': 65, 'encounters': 42}
+        assert service.summary_cache.rebuilds == 1
+        assert service.summary_cache.incremental_updates == 3
+
+    def test_summary_read_is_cache_hit(self, service):
+        """Test get_cohort_summary serves counts from the cache."""
+        result = _persist(service, _patients(0, 10), 'patient', cohort_name='cache-b')
+        hits = service.summary_cache.hits
+
+        summary = service.get_cohort_summary(cohort_id=result.cohort_id, include_samples=False)
+
+        assert summary.entity_counts == {'patients': 10}
+        assert service.summary_cache.hits == hits + 1
+
+    def test_overwritten_rows_invalidate(self, adapter, service):
+        """Test upserting existing IDs falls back to a full recompute."""
+        first = _persist(service, _patients(0, 10), 'patient', cohort_name='cache-c')
+        changed = _patients(0, 5, gender_every=1)
+        rebuilds = service.summary_cache.rebuilds
+
+        result = _persist(service, changed, 'patient', cohort_id=first.cohort_id)
+
+        assert service.summary_cache.rebuilds == rebuilds + 1
+        assert result.summary.statistics == _uncached(adapter, first.cohort_id)[1]
+        assert result.summary.statistics['gender_distribution'] == {'M': 7, 'F': 3}
+
+    def test_moved_rows_invalidate_previous_owner(self, adapter, service):
+        """Test rows taken over by another cohort invalidate their old cohort."""
+        first = _persist(service, _patients(0, 6), 'patient', cohort_name='cache-d')
+        second = _persist(service, _patients(100, 2), 'patient', cohort_name='cache-e')
+
+        _persist(service, _patients(0, 2), 'patient', cohort_id=second.cohort_id)
+
+        assert service.summary_cache.get(first.cohort_id) is None
+        summary = service.get_cohort_summary(cohort_id=first.cohort_id, include_samples=False)
+        assert summary.entity_counts == {'patients': 4}
+
+    def test_delete_cohort_invalidates(self, service):
+        """Test deleting a cohort drops its cache entry."""
+        result = _persist(service, _patients(0, 3), 'patient', cohort_name='cache-f')
+
+        service.delete_cohort(result.cohort_id, confirm=True)
+
+        assert service.summary_cache.get(result.cohort_id) is None
+
+    def test_entry_from_previous_day_is_stale(self, service):
+        """Test ages are recomputed once the cached day has passed."""
+        result = _persist(service, _patients(0, 3), 'patient', cohort_name='cache-g')
+        cache = service.summary_cache
+
+        with patch.object(SummaryCache, '_today', return_value=date.today() + timedelta(days=1)):
+            assert cache.get(result.cohort_id) is None
+
+
+class TestStateHelpers:
+    """Tests for merging and rendering aggregate state."""
+
+    def test_merge_section(self):
+        """Test histograms add, min/max keep extremes and sums add."""
+        left = {'min_date': '2024-01-05', 'max_date': '2024-02-01',
+                'class_code': [['AMB', 2], [None, 1]], 'total': 1.5}
+        right = {'min_date': '2024-01-01', 'max_date': None,
+                 'class_code': [['AMB', 1], ['IMP', 4]], 'total': 2.0}
+
+        merged = merge_section(left, right)
+
+        assert merged['min_date'] == '2024-01-01'
+        assert merged['max_date'] == '2024-02-01'
+        assert sorted(merged['class_code'], key=str) == sorted(
+            [['AMB', 3], [None, 1], ['IMP', 4]], key=str
+        )
+        assert merged['total'] == 3.5
+        assert merge_section(None, right) is None
+
+    def test_statistics_from_state(self):
+        """Test rendering matches SummaryGenerator's statistic shapes."""
+        state = {
+            'counts': {'patients': 3, 'claims': 2, 'diagnoses': 6},
+            'patients': {'ages': [[70, 2], [81, 1]], 'gender': [['F', 2], [None, 1]]},
+            'claims': {'total_charge': 300.0, 'total_paid': None,
+                       'patient_responsibility': 10.0, 'charge_count': 2,
+                       'claim_type': [['professional', 2]]},
+            'diagnoses': {'codes': [['E11', 'Diabetes', 5], [None, None, 1]]},
+        }
+
+        stats = statistics_from_state(state)
+
+        assert stats['age_range'] == {'min': 70, 'max': 81, 'avg': 73.7}
+        assert stats['gender_distribution'] == {'F': 2}
+        assert stats['financials'] == {
+            'total_billed': 300.0, 'total_paid': 0,
+            'total_patient_resp': 10.0, 'avg_charge': 150.0,
+        }
+        assert stats['top_diagnoses'] == [
+            {'code': 'E11', 'description': 'Diabetes', 'count': 5}
+        ]
+        assert 'date_range' not in stats
+
+
+class TestCohortToolsCache:
+    """Tests for the cohort_entities counts kept by add_entities."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path, monkeypatch):
+        from healthsim_agent.tools.connection import reset_manager
+
+        path = tmp_path / "cache.duckdb"
+        conn = duckdb.connect(str(path))
+        for ddl in ALL_DDL:
+            conn.execute(ddl)
+        conn.close()
+        monkeypatch.setenv("HEALTHSIM_DB_PATH", str(path))
+        reset_manager()
+        yield path
+        reset_manager()
+
+    def test_add_entities_maintains_counts(self, db_path):
+        """Test totals are merged incrementally and read by get_summary."""
+        from healthsim_agent.tools.cohort_tools import add_entities
+        from healthsim_agent.tools.connection import get_manager
+        from healthsim_agent.tools.query_tools import get_summary
+
+        first = add_entities({'patients': [{'id': 'a'}, {'id': 'b'}]}, cohort_name='tools-cache')
+        cohort_id = first.data['cohort_id']
+        second = add_entities(
+            {'patients': [{'id': 'b'}, {'id': 'c'}], 'claims': [{'id': 'x'}]},
+            cohort_id=cohort_id,
+        )
+
+        assert second.data['cohort_totals']['by_type'] == {'patients': 3, 'claims': 1}
+
+        conn = get_manager().get_read_connection()
+        state = SummaryCache(conn, read_only=True).get(cohort_id)
+        assert state['entity_store'] == {'patients': 3, 'claims': 1}
+
+        summary = get_summary(cohort_id, include_samples=False)
+        assert summary.data['entity_counts'] == {'patients': 3, 'claims': 1}
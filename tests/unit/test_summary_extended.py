@@ -4,12 +4,16 @@ Covers additional scenarios for CohortSummary, SummaryGenerator, and utility fun
 """
 
 import pytest
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import duckdb
+
 from healthsim_agent.state.summary import (
     CohortSummary,
     SummaryGenerator,
+    build_sample_query,
     generate_summary,
     get_cohort_by_name,
 )
@@ -332,3 +336,109 @@ class TestGetCohortByName:
         result = get_cohort_by_name('Nonexistent', connection=mock_conn)
         
         assert result is None
+
+
+class _DuckDBAdapter:
+    """Minimal connection exposing ``execute(...).rows/.columns``."""
+    
+    def __init__(self):
+        self.conn = duckdb.connect()
+    
+    def execute(self, sql, params=None):
+        cursor = self.conn.execute(sql, params or [])
+        return SimpleNamespace(
+            rows=cursor.fetchall(),
+            columns=[d[0] for d in cursor.description],
+        )
+
+
+@pytest.fixture
+def patient_db():
+    """In-memory patients table with 100 rows in one cohort."""
+    db = _DuckDBAdapter()
+    db.conn.execute("""
+        CREATE TABLE patients (
+            id VARCHAR, gender VARCHAR, birth_date DATE,
+            cohort_id VARCHAR, created_at TIMESTAMP
+        )
+    """)
+    start = datetime(2024, 1, 1)
+    rows = [
+        (f"p{i:03d}", "F" if i % 10 else "M", date(1940 + i % 60, 1, 1),
+         "coh-1", start + timedelta(seconds=i))
+        for i in range(100)
+    ]
+    db.conn.executemany("INSERT INTO patients VALUES (?, ?, ?, ?, ?)", rows)
+    return db
+
+
+class TestSampleQuery:
+    """Tests for in-database diverse sampling."""
+    
+    def test_evenly_spaced_matches_previous_selection(self, patient_db):
+        """Test unstratified samples are the evenly spaced rows."""
+        generator = SummaryGenerator(connection=patient_db)
+        samples = generator.get_diverse_samples('coh-1', 'patients', 'patients', 4)
+        
+        step = 100 / 4
+        assert [s['id'] for s in samples] == [f"p{int(i * step):03d}" for i in range(4)]
+        assert 'created_at' not in samples[0]
+    
+    def test_stratified_covers_minority_stratum(self, patient_db):
+        """Test stratified samples include the 10% gender."""
+        generator = SummaryGenerator(connection=patient_db)
+        samples = generator.get_diverse_samples(
+            'coh-1', 'patients', 'patients', 3, stratify_by='gender'
+        )
+        
+        assert len(samples) == 3
+        assert {s['gender'] for s in samples} == {'F', 'M'}
+    
+    def test_age_band_stratum(self, patient_db):
+        """Test age_band stratification spreads samples across decades."""
+        rows = patient_db.execute(
+            build_sample_query('patients', 6, stratify_by='age_band'), ['coh-1']
+        ).rows
+        
+        birth_years = {row[2].year // 10 for row in rows}
+        assert len(rows) == 6
+        assert len(birth_years) == 6
+    
+    def test_missing_stratum_column_falls_back(self, patient_db):
+        """Test an unknown stratification column falls back to even spacing."""
+        generator = SummaryGenerator(connection=patient_db)
+        samples = generator.get_diverse_samples(
+            'coh-1', 'patients', 'patients', 2, stratify_by='no_such_column'
+        )
+        
+        assert [s['id'] for s in samples] == ['p000', 'p050']
+    
+    def test_generate_stratifies_only_on_request(self, patient_db):
+        """Test generate() keeps evenly spaced samples unless asked to stratify."""
+        patient_db.conn.execute("""
+            CREATE TABLE cohorts (
+                id VARCHAR, name VARCHAR, description VARCHAR,
+                created_at TIMESTAMP, updated_at TIMESTAMP
+            )
+        """)
+        patient_db.conn.execute("CREATE TABLE cohort_tags (cohort_id VARCHAR, tag VARCHAR)")
+        patient_db.conn.execute(
+            "INSERT INTO cohorts VALUES ('coh-1', 'c', NULL, now(), now())"
+        )
+        generator = SummaryGenerator(connection=patient_db)
+        
+        with patch.object(generator, 'get_entity_counts', return_value={'patients': 100}), \
+             patch.object(generator, 'calculate_statistics', return_value={}), \
+             patch.object(generator, 'get_diverse_samples', return_value=[]) as samples:
+            generator.generate('coh-1', samples_per_type=2)
+            generator.generate('coh-1', samples_per_type=2, stratify_samples=True)
+        
+        assert samples.call_args_list[0].kwargs['stratify_by'] is None
+        assert samples.call_args_list[1].kwargs['stratify_by'] == 'gender'
+    
+    def test_rejects_unsafe_identifiers(self):
+        """Test stratify_by and order_by must be plain identifiers."""
+        with pytest.raises(ValueError):
+            build_sample_query('patients', 3, stratify_by='gender; DROP TABLE x')
+        with pytest.raises(ValueError):
+            build_sample_query('patients', 3, order_by='1=1 --')
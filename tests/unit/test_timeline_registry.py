@@ -0,0 +1,173 @@
+"""Tests for generation framework - active timeline registry."""
+
+import gc
+import pickle
+from datetime import date
+
+import pytest
+
+from healthsim_agent.generation import (
+    DuckDBTimelineStore,
+    JourneyEngine,
+    TimelineRegistry,
+    create_simple_journey,
+)
+from healthsim_agent.generation.journey_engine import JourneyTimelineEvent, Timeline
+from healthsim_agent.generation.timeline_registry import timeline_from_dict, timeline_to_dict
+
+
+def _timeline(entity_id, pending=True):
+    timeline = Timeline(entity_id=entity_id, entity_type="patient", start_date=date(2025, 1, 1))
+    timeline.add_event(JourneyTimelineEvent(
+        timeline_event_id=f"{entity_id}_dx",
+        journey_id="j1",
+        event_definition_id="dx",
+        scheduled_date=date(2025, 1, 2),
+        event_type="diagnosis",
+        event_name="Dx",
+        parameters={"code": "E11"},
+        status="pending" if pending else "executed",
+    ))
+    return timeline
+
+
+class TestTimelineRegistry:
+    """Tests for TimelineRegistry retention policies."""
+
+    def test_unbounded_by_default(self):
+        """Test the default registry keeps everything."""
+        registry = TimelineRegistry()
+        for i in range(50):
+            registry.register(_timeline(f"p{i}"))
+
+        assert len(registry) == 50
+        assert registry.stats()["evictions"] == 0
+
+    def test_lru_eviction(self):
+        """Test least recently used timelines are evicted first."""
+        registry = TimelineRegistry(max_size=2)
+        registry.register(_timeline("a"))
+        registry.register(_timeline("b"))
+        registry.get("a")
+        registry.register(_timeline("c"))
+
+        assert "a" in registry and "c" in registry
+        assert registry.get("b") is None
+        assert registry.stats()["evictions"] == 1
+        assert registry.stats()["peak_size"] == 3
+
+    def test_drop_on_complete(self):
+        """Test completed timelines are released, pending ones kept."""
+        registry = TimelineRegistry(drop_on_complete=True)
+        done, open_ = _timeline("done", pending=False), _timeline("open")
+        registry.register(done)
+        registry.register(open_)
+
+        assert registry.release_if_complete(done)
+        assert not registry.release_if_complete(open_)
+        assert "done" not in registry and "open" in registry
+        assert registry.stats()["completed_drops"] == 1
+
+    def test_drop_on_complete_keeps_newer_timeline(self):
+        """Test a stale completed timeline does not drop its replacement."""
+        registry = TimelineRegistry(drop_on_complete=True)
+        stale, current = _timeline("p1", pending=False), _timeline("p1")
+        registry.register(stale)
+        registry.register(current)
+
+        assert not registry.release_if_complete(stale)
+        assert registry.get("p1") is current
+        assert registry.stats()["completed_drops"] == 0
+
+    def test_weak_references(self):
+        """Test weakly held timelines disappear once unreferenced."""
+        registry = TimelineRegistry(weak=True)
+        kept = _timeline("kept")
+        registry.register(kept)
+        registry.register(_timeline("dropped"))
+        gc.collect()
+
+        assert registry.get("kept") is kept
+        assert registry.get("dropped") is None
+
+    def test_spill_and_reload(self):
+        """Test evicted timelines with pending events round-trip via DuckDB."""
+        store = DuckDBTimelineStore()
+        registry = TimelineRegistry(max_size=1, spill_store=store)
+        registry.register(_timeline("a"))
+        registry.register(_timeline("b", pending=False))
+        registry.register(_timeline("c"))
+
+        assert store.count() == 1  # "b" had nothing pending, so was dropped
+        reloaded = registry.get("a")
+        assert reloaded.events[0].parameters == {"code": "E11"}
+        assert reloaded.events[0].scheduled_date == date(2025, 1, 2)
+        stats = registry.stats()
+        assert stats["spill_writes"] == 2 and stats["spill_loads"] == 1
+        assert store.count() == 1  # "a" was reloaded, "c" spilled in its place
+
+    def test_invalid_max_size(self):
+        """Test negative sizes are rejected."""
+        with pytest.raises(ValueError, match="max_size"):
+            TimelineRegistry(max_size=-1)
+
+    def test_pickles_as_empty_registry(self):
+        """Test a registry pickles with its policy but not its timelines."""
+        registry = TimelineRegistry(
+            max_size=1, drop_on_complete=True, weak=True, spill_store=DuckDBTimelineStore()
+        )
+        registry.register(_timeline("a"))
+        registry.register(_timeline("b"))
+
+        restored = pickle.loads(pickle.dumps(registry))
+
+        assert (restored.max_size, restored.drop_on_complete, restored.weak) == (1, True, True)
+        assert restored.spill_store is None
+        assert len(restored) == 0 and "a" not in restored
+        restored.register(_timeline("c"))
+        assert "c" in restored
+
+    def test_round_trip_dict(self):
+        """Test timeline serialization preserves fields."""
+        timeline = _timeline("x")
+        timeline.linked_timelines["membersim"] = "m1"
+
+        restored = timeline_from_dict(timeline_to_dict(timeline))
+        assert restored.linked_timelines == {"membersim": "m1"}
+        assert restored.events == timeline.events
+
+
+class TestEngineRegistry:
+    """Tests for JourneyEngine integration."""
+
+    @pytest.fixture
+    def journey(self):
+        return create_simple_journey("j1", "One", [
+            {"event_id": "dx", "name": "Dx", "event_type": "diagnosis", "product": "patientsim"},
+        ])
+
+    def test_engine_registers_timelines(self, journey):
+        """Test created timelines are retrievable from the engine."""
+        engine = JourneyEngine(seed=1)
+        timeline = engine.create_timeline({"patient_id": "p1"}, "patient", journey)
+
+        assert engine.get_active_timeline("p1") is timeline
+        assert engine.timeline_registry.stats()["size"] == 1
+
+    def test_engine_bounded_registry(self, journey):
+        """Test the engine honours the registry size limit."""
+        engine = JourneyEngine(seed=1, timeline_registry=TimelineRegistry(max_size=10))
+        for i in range(100):
+            engine.create_timeline({"patient_id": f"p{i}"}, "patient", journey)
+
+        assert len(engine.timeline_registry) == 10
+        assert engine.get_active_timeline("p99") is not None
+
+    def test_execute_timeline_drops_completed(self, journey):
+        """Test execute_timeline releases timelines with nothing pending."""
+        engine = JourneyEngine(seed=1, timeline_registry=TimelineRegistry(drop_on_complete=True))
+        engine.register_handler("patientsim", "diagnosis", lambda e, ev, ctx: {})
+        timeline = engine.create_timeline({"patient_id": "p1"}, "patient", journey)
+        engine.execute_timeline(timeline, {"patient_id": "p1"})
+
+        assert engine.get_active_timeline("p1") is None
@@ -0,0 +1,113 @@
+"""Tests for the agent tool registry."""
+
+import pytest
+
+from healthsim_agent import agent as agent_module
+from healthsim_agent.agent import TOOL_DEFINITIONS, HealthSimAgent
+from healthsim_agent.tools.registry import (
+    LATENCY_FAST,
+    ToolRegistry,
+    ToolSpec,
+    get_tool_registry,
+)
+
+
+def lookup(name: str, limit: int = 10):
+    return {"name": name, "limit": limit}
+
+
+def definition(name: str, properties: dict) -> dict:
+    return {"name": name, "input_schema": {"type": "object", "properties": properties}}
+
+
+class TestToolRegistry:
+    """Tests for ToolRegistry."""
+
+    def test_matches_tool_definitions(self):
+        """Test every agent tool definition has an executor and vice versa."""
+        registry = get_tool_registry()
+
+        assert registry.check(TOOL_DEFINITIONS) == []
+        assert sorted(registry.names) == sorted(d["name"] for d in TOOL_DEFINITIONS)
+
+    def test_built_once(self):
+        """Test the shared registry is reused."""
+        assert get_tool_registry() is get_tool_registry()
+
+    def test_metadata(self):
+        """Test tools carry read/write and latency metadata."""
+        registry = get_tool_registry()
+
+        assert registry.is_read_only("query_reference")
+        assert not registry.is_read_only("add_entities")
+        assert not registry.is_read_only("no_such_tool")
+        assert registry.get("list_output_formats").latency == LATENCY_FAST
+        assert registry.is_fast("list_output_formats")
+        assert not registry.is_fast("query_reference")
+        assert not registry.is_fast("no_such_tool")
+        assert registry.get("no_such_tool") is None
+
+    def test_get_executor(self):
+        """Test executors are looked up by tool name."""
+        from healthsim_agent.tools.query_tools import query
+
+        registry = get_tool_registry()
+        assert registry.get_executor("query") is query
+        assert registry.get_executor("no_such_tool") is None
+
+    def test_duplicate_names_rejected(self):
+        """Test a tool can only be registered once."""
+        spec = ToolSpec("lookup", lookup, read_only=True)
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            ToolRegistry([spec, spec])
+
+
+class TestRegistryCheck:
+    """Tests for detecting definition/executor mismatches."""
+
+    def test_missing_and_extra_tools(self):
+        """Test definitions without executors and executors without definitions."""
+        registry = ToolRegistry([ToolSpec("lookup", lookup, read_only=True)])
+
+        problems = registry.check([definition("other", {})])
+
+        assert problems == [
+            "lookup: has an executor but no definition",
+            "other: defined but has no executor",
+        ]
+
+    def test_parameter_mismatch(self):
+        """Test unknown schema properties and unexposed required parameters."""
+        registry = ToolRegistry([ToolSpec("lookup", lookup, read_only=True)])
+
+        problems = registry.check([definition("lookup", {"query": {"type": "string"}})])
+
+        assert problems == [
+            "lookup: executor does not accept 'query'",
+            "lookup: required parameter 'name' is not in the schema",
+        ]
+
+    def test_kwargs_executor_accepts_anything(self):
+        """Test executors taking **kwargs are not checked property by property."""
+        registry = ToolRegistry([ToolSpec("lookup", lambda **kwargs: None, read_only=True)])
+
+        assert registry.check([definition("lookup", {"anything": {}})]) == []
+
+    def test_validate_raises(self):
+        """Test validate raises with every problem listed."""
+        registry = ToolRegistry([ToolSpec("lookup", lookup, read_only=True)])
+
+        with pytest.raises(ValueError, match="no definition"):
+            registry.validate([])
+
+    def test_agent_startup_detects_mismatch(self, monkeypatch):
+        """Test the agent refuses to start with a tool that has no executor."""
+        monkeypatch.setattr(agent_module, "Anthropic", lambda: None)
+        monkeypatch.setattr(HealthSimAgent, "_load_skills_context", lambda self: None)
+        monkeypatch.setattr(
+            agent_module, "TOOL_DEFINITIONS", TOOL_DEFINITIONS + [definition("new_tool", {})]
+        )
+
+        with pytest.raises(ValueError, match="new_tool: defined but has no executor"):
+            HealthSimAgent()
@@ -46,7 +46,8 @@ def temp_db_env(monkeypatch):
             entity_type VARCHAR,
             entity_id VARCHAR,
             entity_data JSON,
-            created_at TIMESTAMP
+            created_at TIMESTAMP,
+            UNIQUE(cohort_id, entity_type, entity_id)
         )
     """)
     conn.execute("""
@@ -232,6 +233,54 @@ class TestAddEntities:
         assert result.data["batch_number"] == 1
         assert result.data["total_batches"] == 5
         assert result.data["batches_remaining"] == 4
+    
+    def test_add_upserts_existing_entities(self, temp_db_env):
+        """Test re-adding an entity updates it instead of duplicating."""
+        result1 = add_entities(
+            cohort_name="Upsert",
+            entities={"patients": [{"patient_id": "P001", "age": 40}]}
+        )
+        cohort_id = result1.data["cohort_id"]
+        
+        result2 = add_entities(
+            cohort_id=cohort_id,
+            entities={"patients": [
+                {"patient_id": "P001", "age": 41},
+                {"patient_id": "P002", "age": 50},
+            ]}
+        )
+        assert result2.success
+        assert result2.data["cohort_totals"]["total_entities"] == 2
+        
+        reset_manager()
+        loaded = load_cohort(cohort_id)
+        ages = {p["patient_id"]: p["age"] for p in loaded.data["entities"]["patients"]}
+        assert ages == {"P001": 41, "P002": 50}
+    
+    def test_add_duplicate_ids_in_batch_last_wins(self, temp_db_env):
+        """Test duplicate IDs within one payload collapse to the last entity."""
+        result = add_entities(
+            cohort_name="Dupes",
+            entities={"patients": [
+                {"patient_id": "P001", "age": 1},
+                {"patient_id": "P001", "age": 2},
+            ]}
+        )
+        assert result.success
+        assert result.data["entities_added_this_batch"]["patients"] == 2
+        assert result.data["cohort_totals"]["total_entities"] == 1
+        
+        reset_manager()
+        loaded = load_cohort(result.data["cohort_id"])
+        assert loaded.data["entities"]["patients"][0]["age"] == 2
+    
+    def test_add_large_batch(self, temp_db_env):
+        """Test a large batch is staged and merged in one pass."""
+        patients = [{"patient_id": f"P{i:05d}"} for i in range(2000)]
+        result = add_entities(cohort_name="Large", entities={"patients": patients})
+        assert result.success
+        assert result.data["cohort_totals"]["total_entities"] == 2000
+        assert result.data["sample_ids"]["patients"] == [p["patient_id"] for p in patients[:5]]
 
 
 class TestLoadCohort:
@@ -8,7 +8,9 @@ import os
 import duckdb
 
 from healthsim_agent.tools.connection import (
+    CheckpointPolicy,
     ConnectionManager,
+    ManagedConnection,
     get_manager,
     reset_manager,
     get_db_path,
@@ -139,7 +141,7 @@ class TestConnectionManagerWithTempDB:
     
     def test_write_closes_read(self, temp_db):
         """Test that write operation closes read connection."""
-        manager = ConnectionManager(db_path=temp_db)
+        manager = ConnectionManager(db_path=temp_db, mode="close_before_write")
         try:
             # Get read connection
             manager.get_read_connection()
@@ -165,6 +167,150 @@ class TestConnectionManagerWithTempDB:
         assert manager._read_manager is None
 
 
+class TestBrokerMode:
+    """Tests for the single-writer broker mode."""
+    
+    @pytest.fixture
+    def temp_db(self, tmp_path):
+        db_path = tmp_path / "broker.duckdb"
+        conn = duckdb.connect(str(db_path))
+        conn.execute("CREATE TABLE items (id INTEGER, name VARCHAR)")
+        conn.close()
+        return db_path
+    
+    def test_mode_selection(self, monkeypatch, temp_db):
+        """Test broker is the default and the env var selects the mode."""
+        monkeypatch.delenv("HEALTHSIM_DB_MODE", raising=False)
+        assert ConnectionManager(db_path=temp_db).is_broker
+        
+        monkeypatch.setenv("HEALTHSIM_DB_MODE", "close_before_write")
+        assert not ConnectionManager(db_path=temp_db).is_broker
+        
+        with pytest.raises(ValueError, match="Unknown connection mode"):
+            ConnectionManager(db_path=temp_db, mode="exclusive")
+    
+    def test_close_before_write_coexists_with_read_only_connections(self, temp_db):
+        """Test close-before-write leaves the file open to read-only connections."""
+        from healthsim_agent.db import DatabaseConnection
+        
+        manager = ConnectionManager(db_path=temp_db, mode="close_before_write")
+        try:
+            with manager.write_connection() as conn:
+                conn.execute("INSERT INTO items VALUES (1, 'a')")
+            manager.get_read_connection()
+            
+            reader = DatabaseConnection(temp_db)
+            try:
+                assert reader.count_rows("items") == 1
+            finally:
+                reader.close()
+        finally:
+            manager.close()
+    
+    def test_managed_connection_routes_statements(self, temp_db):
+        """Test ManagedConnection reads on a cursor and writes in a write block."""
+        manager = ConnectionManager(db_path=temp_db, mode="broker")
+        conn = ManagedConnection(manager)
+        try:
+            conn.execute("INSERT INTO items VALUES (?, ?)", [1, "a"])
+            result = conn.execute("  select id, name FROM items")
+            
+            assert result.columns == ["id", "name"]
+            assert result.rows == [(1, "a")]
+            assert result.fetchone() == (1, "a")
+            assert manager.writes == 1
+        finally:
+            manager.close()
+    
+    def test_state_managers_share_broker_connection(self, monkeypatch, temp_db):
+        """Test the default state-manager connection works alongside the broker."""
+        from healthsim_agent.state.profile_manager import ProfileManager
+        
+        monkeypatch.setenv("HEALTHSIM_DB_PATH", str(temp_db))
+        monkeypatch.delenv("HEALTHSIM_DB_MODE", raising=False)
+        reset_manager()
+        try:
+            reader = get_manager().get_read_connection()
+            assert get_manager().is_broker
+            
+            profiles = ProfileManager()
+            profile_id = profiles.save_profile(name="diabetics", profile_spec={"profile": {}})
+            
+            assert [p.name for p in profiles.list_profiles()] == ["diabetics"]
+            assert reader.execute("SELECT id FROM profiles").fetchall() == [(profile_id,)]
+        finally:
+            reset_manager()
+    
+    def test_reads_see_writes_without_reopen(self, temp_db):
+        """Test the read cursor survives writes and sees committed rows."""
+        manager = ConnectionManager(db_path=temp_db, mode="broker")
+        try:
+            reader = manager.get_read_connection()
+            with manager.write_connection() as conn:
+                conn.execute("INSERT INTO items VALUES (1, 'a')")
+                # Nested write blocks share the writer
+                with manager.write_connection() as inner:
+                    assert inner is conn
+                    inner.execute("INSERT INTO items VALUES (2, 'b')")
+            
+            assert manager.get_read_connection() is reader
+            assert reader.execute("SELECT COUNT(*) FROM items").fetchone() == (2,)
+            assert manager.writes == 1
+        finally:
+            manager.close()
+    
+    def test_cursor_per_thread(self, temp_db):
+        """Test each thread gets its own read cursor."""
+        import threading
+        
+        manager = ConnectionManager(db_path=temp_db, mode="broker")
+        cursors = []
+        
+        def read():
+            cursor = manager.get_read_connection()
+            cursor.execute("SELECT 1").fetchone()
+            cursors.append(cursor)
+        
+        try:
+            threads = [threading.Thread(target=read) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            assert len({id(cursor) for cursor in cursors}) == 3
+        finally:
+            manager.close()
+    
+    def test_checkpoint_policy(self, temp_db):
+        """Test checkpoints follow the policy and run on close."""
+        manager = ConnectionManager(
+            db_path=temp_db, mode="broker",
+            checkpoint_policy=CheckpointPolicy(every_writes=2),
+        )
+        for i in range(5):
+            with manager.write_connection() as conn:
+                conn.execute("INSERT INTO items VALUES (?, 'x')", [i])
+        assert manager.checkpoints == 2
+        
+        manager.close()
+        assert manager.checkpoints == 3
+        assert manager._read_conn is None
+        
+        conn = duckdb.connect(str(temp_db), read_only=True)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone() == (5,)
+        finally:
+            conn.close()
+    
+    def test_policy_due(self):
+        """Test write-count and interval triggers."""
+        assert not CheckpointPolicy().due(1000, 1e6)
+        assert CheckpointPolicy(every_writes=3).due(3, 0)
+        assert CheckpointPolicy(interval_seconds=5).due(1, 6)
+        assert not CheckpointPolicy(interval_seconds=5).due(1, 4)
+
+
 class TestGlobalManager:
     """Tests for global manager functions."""
     
@@ -7,7 +7,7 @@ import os
 
 import duckdb
 
-from healthsim_agent.tools import reset_manager
+from healthsim_agent.tools import get_manager, reset_manager
 from healthsim_agent.tools.reference_tools import (
     query_reference,
     search_providers,
@@ -151,6 +151,28 @@ class TestQueryReference:
         result = query_reference("places_county", limit=999)
         # Should succeed with clamped limit
         assert result.success
+    
+    def test_repeated_query_cached(self, temp_db_env):
+        """Test a repeated query is served from the cache until reimport."""
+        from healthsim_agent.db.reference import get_reference_cache, invalidate_reference_caches
+        
+        cache = get_reference_cache()
+        first = query_reference("places_county", state="ca")
+        hits = cache.stats()["hits"]
+        first.data["rows"][0]["countyname"] = "Changed"
+        
+        second = query_reference("places_county", state="CA")
+        assert cache.stats()["hits"] == hits + 1
+        assert {row["countyname"] for row in second.data["rows"]} == {
+            "Los Angeles", "San Francisco",
+        }
+        
+        with get_manager().write_connection() as conn:
+            conn.execute("DELETE FROM population.places_county WHERE countyname = 'San Francisco'")
+        invalidate_reference_caches()
+        
+        third = query_reference("places_county", state="CA")
+        assert third.data["row_count"] == 1
 
 
 class TestSearchProviders: